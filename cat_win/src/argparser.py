@@ -15,6 +15,7 @@ from cat_win.src.const.argconstants import (
 from cat_win.src.const.regex import (
     RE_CUT,
     RE_ENCODING,
+    RE_HASH,
     RE_F_IND,
     RE_M_ATCH,
     RE_Q_FIND,
@@ -27,6 +28,7 @@ from cat_win.src.const.regex import (
     RE_T_RUNC,
     compile_re
 )
+from cat_win.src.service.checksum import DEFAULT_CHECKSUM_ALGORITHMS
 from cat_win.src.service.helper.environment import on_windows_os
 from cat_win.src.web.urls import sep_valid_urls
 
@@ -42,7 +44,8 @@ class ArgParser:
             unicode_echo: bool = True,
             unicode_find: bool = True,
             unicode_replace: bool = True,
-            custom_commands: dict = None
+            custom_commands: dict = None,
+            default_checksum_algorithms: str = DEFAULT_CHECKSUM_ALGORITHMS
     ) -> None:
         self.win_prefix_lit = '\\\\?\\' * on_windows_os
         self.default_file_encoding: str = default_file_encoding
@@ -50,6 +53,7 @@ class ArgParser:
         self.unicode_find = unicode_find
         self.unicode_replace = unicode_replace
         self.custom_commands = custom_commands or {}
+        self.default_checksum_algorithms: str = default_checksum_algorithms
         self._clear_values()
         self.reset_values()
 
@@ -71,6 +75,7 @@ class ArgParser:
         The here defined variables may be accessed from the outside.
         """
         self.file_encoding = self.default_file_encoding
+        self.checksum_algorithms = self.default_checksum_algorithms
         self.file_queries = []
         self.file_queries_replacement = []
         self.file_truncate = [None, None, None]
@@ -289,6 +294,10 @@ class ArgParser:
         if RE_ENCODING.match(param):
             self.file_encoding = param[4:]
             return False
+        # 'hash' + ('=' or ':') + checksum_algorithms
+        if RE_HASH.match(param):
+            self.checksum_algorithms = param[5:]
+            return False
         # 'match' + ('=' or ':') + file_queries pattern
         if RE_Q_MATCH.match(param) or RE_M_ATCH.match(param):
             p_length = 6 if RE_Q_MATCH.match(param) else 2
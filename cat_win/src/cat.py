@@ -23,6 +23,7 @@ from cat_win.src.const.argconstants import (
     ARGS_SSUM,
     ARGS_STDIN,
     ARGS_SUM,
+    ARGS_VISUALIZE_O,
     ARGS_WATCH
 )
 from cat_win.src.const.colorconstants import CKW, CVis
@@ -198,6 +199,7 @@ def init(repl: bool = False) -> None:
     More.set_colors(_ctx.color_dic)
     Visualizer.set_flags(
         _ctx.u_args[ARGS_DEBUG],
+        _ctx.u_args[ARGS_VISUALIZE_O],
     )
     Summary.set_flags(
         _ctx.const_dic[DKW.SUMMARY_UNIQUE_ELEMENTS],
@@ -250,6 +252,7 @@ def handle_args(tmp_file_helper: TmpFileHelper) -> None:
         _ctx.u_files.generate_values(
             _ctx.u_args[ARGS_SUM] or _ctx.u_args[ARGS_SSUM] or _ctx.u_args[ARGS_NUMBER],
             _ctx.u_args[ARGS_LLENGTH],
+            _ctx.const_dic[DKW.PERSISTENT_CACHE],
         )
 
     if run_pre_content_actions(_ctx) or len(_ctx.u_files) == 0:
@@ -42,6 +42,7 @@ ARGS_CHARCOUNT, ARGS_CCHARCOUNT                              = range(508, 510)
 ARGS_GREP, ARGS_GREP_ONLY, ARGS_NOKEYWORD, ARGS_NOBREAK = range(600, 604)
 # meta information
 ARGS_DATA, ARGS_CHECKSUM, ARGS_STRINGS = range(700, 703)
+ARGS_CHECKSUM_CHECK, = range(703, 704)
 # numbers
 ARGS_B64D, ARGS_B64E, ARGS_EVAL, ARGS_HEX = range(800, 804)
 ARGS_DEC, ARGS_OCT, ARGS_BIN              = range(804, 807)
@@ -52,7 +53,7 @@ ARGS_EDITOR, ARGS_HEX_EDITOR, ARGS_DIFF = range(1000, 1003)
 ARGS_MORE, ARGS_LESS, ARGS_RAW          = range(1003, 1006)
 # visualize
 ARGS_VISUALIZE_B, ARGS_VISUALIZE_Z, ARGS_VISUALIZE_H = range(1100, 1103)
-ARGS_VISUALIZE_E, ARGS_VISUALIZE_D                   = range(1103, 1105)
+ARGS_VISUALIZE_E, ARGS_VISUALIZE_D, ARGS_VISUALIZE_O = range(1103, 1106)
 # behavioural
 ARGS_CLIP, ARGS_WATCH, ARGS_DOTFILES, ARGS_PLAIN_ONLY = range(1200, 1204)
 ARGS_NOCOL, = range(1204, 1205)
@@ -159,6 +160,8 @@ ALL_ARGS = [
                 ARGS_DATA, show_arg_on_repl=False, section=7),
     ArgConstant('-m', '--checksum', 'show the checksums of all files',
                 ARGS_CHECKSUM, show_arg_on_repl=False, section=7),
+    ArgConstant('--check', '--checksum-check', 'verify the checksums listed in the files',
+                ARGS_CHECKSUM_CHECK, show_arg_on_repl=False, section=7),
     ArgConstant('--strings', '--strings', 'print the sequences of printable characters',
                 ARGS_STRINGS, section=7),
 
@@ -213,6 +216,8 @@ ALL_ARGS = [
                 ARGS_VISUALIZE_E, show_arg_on_repl=False, section=11),
     ArgConstant('--visd', '--visualized', 'visualize the data using digraph dot plot view',
                 ARGS_VISUALIZE_D, show_arg_on_repl=False, section=11),
+    ArgConstant('--viso', '--visualizeo', 'visualize an overview of the data, one cell per block',
+                ARGS_VISUALIZE_O, show_arg_on_repl=False, section=11),
 
     # behavioural
     ArgConstant('-c', '--clip', 'copy output to clipboard',
@@ -17,14 +17,20 @@ class DKW:
     BLANK_REMOVE_WS_LINES = 'blank_remove_ws_lines'
     PEEK_SIZE = 'peek_size'
     SUMMARY_UNIQUE_ELEMENTS = 'summary_unique_elements'
+    CHECKSUM_ALGORITHMS = 'checksum_algorithms'
     STRINGS_MIN_SEQUENCE_LENGTH = 'strings_minimum_sequence_length'
     STRINGS_DELIMETER = 'strings_delimeter'
+    STRINGS_OFFSETS = 'strings_offsets'
+    STRINGS_ENCODING = 'strings_encoding'
     GREP_CONTEXT_LINES = 'grep_context_lines'
     GREP_QUERY_SEPARATOR = 'grep_query_separator'
     EDITOR_INDENTATION = 'editor_indentation'
     EDITOR_AUTO_INDENT = 'editor_auto_indent'
     HEX_EDITOR_COLUMNS = 'hex_editor_columns'
     MORE_STEP_LENGTH = 'more_step_length'
+    PARALLEL_JOBS = 'parallel_jobs'
+    LINE_INDEX_CACHE_SIZE = 'line_index_cache_size'
+    PERSISTENT_CACHE = 'persistent_cache'
     UNICODE_ESCAPED_ECHO = 'unicode_escaped_echo'
     UNICODE_ESCAPED_EDITOR_SEARCH = 'unicode_escaped_editor_search'
     UNICODE_ESCAPED_EDITOR_REPLACE = 'unicode_escaped_editor_replace'
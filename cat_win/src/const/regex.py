@@ -19,6 +19,7 @@ DJANGO_VALID_URL_PATTERN = re.compile(
 )
 
 RE_ENCODING      = re.compile(r"\Aenc[\=\:].+\Z",      re.IGNORECASE)
+RE_HASH          = re.compile(r"\Ahash[\=\:].+\Z",     re.IGNORECASE)
 RE_Q_MATCH       = re.compile(r"\Amatch[\=\:].+\Z",    re.IGNORECASE)
 RE_M_ATCH        = re.compile(r"\Am[\=\:].+\Z",        re.IGNORECASE)
 RE_Q_FIND        = re.compile(r"\Afind[\=\:].*\Z",     re.IGNORECASE)
@@ -40,6 +41,11 @@ RE_REPLACE_COMMA = re.compile(r"(?<!\\)((?:\\\\)*)\\,")
 
 RE_TOKENIZER = re.compile(r"\w+|[^\s\w]")
 
+# '<hexdigest>  <path>' or '<hexdigest> *<path>' (sha256sum/md5sum-style)
+RE_MANIFEST_GNU  = re.compile(r"\A\\?([0-9a-fA-F]+) [ \*](.+)\Z")
+# '<ALGORITHM> (<path>) = <hexdigest>' (BSD-style, sha256sum --tag)
+RE_MANIFEST_BSD  = re.compile(r"\A\\?([A-Za-z0-9_\-]+) ?\((.+)\) ?= ?([0-9a-fA-F]+)\Z")
+
 CONFIG_VALID_COLOR = re.compile(
     r"\A(?:f|b)"
     r"(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])"
@@ -62,4 +62,5 @@ class AppContext:
             self.const_dic[DKW.UNICODE_ESCAPED_FIND],
             self.const_dic[DKW.UNICODE_ESCAPED_REPLACE],
             self.config.custom_commands,
+            self.const_dic[DKW.CHECKSUM_ALGORITHMS],
         )
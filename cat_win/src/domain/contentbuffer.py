@@ -2,19 +2,65 @@
 contentbuffer
 """
 
+from itertools import compress, repeat
+
 
 class ContentBuffer:
-    """A synchronized content container for prefixes, lines, and suffixes."""
+    """
+    A synchronized content container for prefixes, lines, and suffixes.
+    The prefix and suffix columns are only materialized as lists once they differ
+    from their default value, until then a single default string is stored.
+    """
 
-    __slots__ = ('lines', 'prefixes', 'suffixes')
+    __slots__ = ('lines', '_prefixes', '_suffixes', '_default_prefix', '_default_suffix')
 
-    def __init__(self, lines=None, prefixes=None, suffixes=None) -> None:
+    def __init__(self, lines=None, prefixes=None, suffixes=None,
+                 default_prefix: str = '', default_suffix: str = '') -> None:
         self.lines = list(lines or [])
-        self.prefixes = list(prefixes or [])
-        self.suffixes = list(suffixes or [])
-        if not len(self.lines) == len(self.prefixes) == len(self.suffixes):
+        self._prefixes = None if prefixes is None else list(prefixes)
+        self._suffixes = None if suffixes is None else list(suffixes)
+        self._default_prefix = default_prefix
+        self._default_suffix = default_suffix
+        if not all(len(self.lines) == len(column) for column in (
+            self._prefixes, self._suffixes) if column is not None):
             raise ValueError('prefixes, lines and suffixes must have the same length!')
 
+    @property
+    def prefixes(self) -> list:
+        """
+        the prefix column, materialized as a list on first access.
+        """
+        if self._prefixes is None:
+            self._prefixes = [self._default_prefix] * len(self.lines)
+        return self._prefixes
+
+    @prefixes.setter
+    def prefixes(self, prefixes) -> None:
+        self._prefixes = prefixes if isinstance(prefixes, list) else list(prefixes)
+
+    @property
+    def suffixes(self) -> list:
+        """
+        the suffix column, materialized as a list on first access.
+        """
+        if self._suffixes is None:
+            self._suffixes = [self._default_suffix] * len(self.lines)
+        return self._suffixes
+
+    @suffixes.setter
+    def suffixes(self, suffixes) -> None:
+        self._suffixes = suffixes if isinstance(suffixes, list) else list(suffixes)
+
+    def _iter_prefixes(self):
+        if self._prefixes is None:
+            return repeat(self._default_prefix, len(self.lines))
+        return iter(self._prefixes)
+
+    def _iter_suffixes(self):
+        if self._suffixes is None:
+            return repeat(self._default_suffix, len(self.lines))
+        return iter(self._suffixes)
+
     @classmethod
     def from_lines(cls, lines, default_prefix='', default_suffix='') -> None:
         """
@@ -32,12 +78,7 @@ class ContentBuffer:
         (ContentBuffer):
             a new ContentBuffer containing the specified lines.
         """
-        line_list = list(lines)
-        return cls(
-            line_list,
-            [default_prefix] * len(line_list),
-            [default_suffix] * len(line_list),
-        )
+        return cls(lines, default_prefix=default_prefix, default_suffix=default_suffix)
 
     @classmethod
     def from_rows(cls, rows) -> None:
@@ -98,27 +139,48 @@ class ContentBuffer:
         return bool(self.lines)
 
     def __iter__(self):
-        return iter(zip(self.lines, self.prefixes, self.suffixes))
+        return zip(self.lines, self._iter_prefixes(), self._iter_suffixes())
 
     def __getitem__(self, item):
         if isinstance(item, slice):
-            return ContentBuffer(self.lines[item], self.prefixes[item], self.suffixes[item])
-        return (self.lines[item], self.prefixes[item], self.suffixes[item])
+            # only the materialized columns have to be copied
+            return ContentBuffer(
+                self.lines[item],
+                None if self._prefixes is None else self._prefixes[item],
+                None if self._suffixes is None else self._suffixes[item],
+                self._default_prefix,
+                self._default_suffix,
+            )
+        return (
+            self.lines[item],
+            self._default_prefix if self._prefixes is None else self._prefixes[item],
+            self._default_suffix if self._suffixes is None else self._suffixes[item],
+        )
 
     def __add__(self, other):
         other = ContentBuffer.ensure(other)
+        lazy_prefixes = (
+            self._prefixes is None and other._prefixes is None and
+            self._default_prefix == other._default_prefix
+        )
+        lazy_suffixes = (
+            self._suffixes is None and other._suffixes is None and
+            self._default_suffix == other._default_suffix
+        )
         return ContentBuffer(
             self.lines + other.lines,
-            self.prefixes + other.prefixes,
-            self.suffixes + other.suffixes,
+            None if lazy_prefixes else self.prefixes + other.prefixes,
+            None if lazy_suffixes else self.suffixes + other.suffixes,
+            self._default_prefix,
+            self._default_suffix,
         )
 
     def __eq__(self, value):
         if not isinstance(value, ContentBuffer):
             return False
         return (self.lines == value.lines and
-                self.prefixes == value.prefixes and
-                self.suffixes == value.suffixes)
+                all(a == b for a, b in zip(self._iter_prefixes(), value._iter_prefixes())) and
+                all(a == b for a, b in zip(self._iter_suffixes(), value._iter_suffixes())))
 
     def append(self, line, prefix='', suffix='') -> None:
         """
@@ -132,17 +194,21 @@ class ContentBuffer:
         suffix (str):
             the suffix for the line.
         """
+        if self._prefixes is not None or prefix != self._default_prefix:
+            self.prefixes.append(prefix)
+        if self._suffixes is not None or suffix != self._default_suffix:
+            self.suffixes.append(suffix)
         self.lines.append(line)
-        self.prefixes.append(prefix)
-        self.suffixes.append(suffix)
 
     def reverse(self) -> None:
         """
         Reverse the order of lines in the buffer.
         """
         self.lines.reverse()
-        self.prefixes.reverse()
-        self.suffixes.reverse()
+        if self._prefixes is not None:
+            self._prefixes.reverse()
+        if self._suffixes is not None:
+            self._suffixes.reverse()
 
     def sort(self, key=None, reverse=False) -> None:
         """
@@ -154,13 +220,15 @@ class ContentBuffer:
         reverse (bool):
             whether to sort in reverse order.
         """
-        idx = list(range(len(self.lines)))
         if key is None:
             raise NotImplementedError('Sorting without a key is not supported.')
-        idx.sort(key=lambda i: key(self[i]), reverse=reverse)
-        self.lines = [self.lines[i] for i in idx]
-        self.prefixes = [self.prefixes[i] for i in idx]
-        self.suffixes = [self.suffixes[i] for i in idx]
+        keys = [key(row) for row in self]
+        idx = sorted(range(len(self.lines)), key=keys.__getitem__, reverse=reverse)
+        self.lines[:] = [self.lines[i] for i in idx]
+        if self._prefixes is not None:
+            self._prefixes[:] = [self._prefixes[i] for i in idx]
+        if self._suffixes is not None:
+            self._suffixes[:] = [self._suffixes[i] for i in idx]
 
     def filter(self, predicate):
         """
@@ -170,17 +238,12 @@ class ContentBuffer:
         predicate (Callable[[Tuple[str, str, str], bool]):
             a function that takes a line and returns True if it should be included.
         """
-        lines = []
-        prefixes = []
-        suffixes = []
-        for line, prefix, suffix in self:
-            if predicate(line, prefix, suffix):
-                lines.append(line)
-                prefixes.append(prefix)
-                suffixes.append(suffix)
-        self.lines = lines
-        self.prefixes = prefixes
-        self.suffixes = suffixes
+        selectors = [predicate(*row) for row in self]
+        self.lines[:] = compress(self.lines, selectors)
+        if self._prefixes is not None:
+            self._prefixes[:] = compress(self._prefixes, selectors)
+        if self._suffixes is not None:
+            self._suffixes[:] = compress(self._suffixes, selectors)
         return self
 
     def map(self, mapper):
@@ -2,12 +2,10 @@
 files
 """
 
-import heapq
-from functools import lru_cache
 from pathlib import Path
 
 from cat_win.src.domain.file import File
-from cat_win.src.service.helper.iohelper import IoHelper
+from cat_win.src.persistence.filemetadata import FileMetadata
 
 
 class Files:
@@ -32,6 +30,8 @@ class Files:
         # the amount of chars neccessary to display the longest line within all files
         # (breaks on base64 decoding)
         self.file_line_length_place_holder = 0
+        # the line count and longest line of every file, cached across runs
+        self.file_metadata = FileMetadata()
 
     def get_file_display_name(self, file: Path) -> str:
         """
@@ -115,30 +115,27 @@ class Files:
     def _calc_file_number_place_holder_(self) -> None:
         self.file_number_place_holder = len(str(len(self.files)))
 
-    def _count_generator_(self, reader):
+    def _get_file_metadata_(self, file: Path) -> tuple:
         """
         Parameters:
-        reader (method):
-            the method to read from
+        file (Path):
+            a string representation of a file (-path)
 
-        Yields:
-        byt (bytes):
-            the bytes in chunks read from the reader
+        Returns:
+        (line_feeds, max_line_length, size) (tuple):
+            the metadata of the file as returned by FileMetadata.scan(),
+            None if the file cannot be read
         """
-        byt = reader(1024 * 1024)
-        while byt:
-            yield byt
-            byt = reader(1024 * 1024)
-
-    @lru_cache(maxsize=10)
-    def _get_file_lines_sum_(self, file: Path) -> int:
         try:
-            with open(file, 'rb') as raw_f:
-                c_generator = self._count_generator_(raw_f.raw.read)
-                lines_sum = sum(buffer.count(b'\n') for buffer in c_generator) + 1
-            return lines_sum
+            return self.file_metadata.get(file)
         except OSError:
+            return None
+
+    def _get_file_lines_sum_(self, file: Path) -> int:
+        metadata = self._get_file_metadata_(file)
+        if metadata is None:
             return 0
+        return metadata[0] + 1
 
     def _calc_place_holder_(self) -> None:
         file_lines = []
@@ -148,7 +145,6 @@ class Files:
             self.all_files_lines[str(file.path)] = file_line_sum
         self.all_line_number_place_holder = len(str(max(file_lines)))
 
-    @lru_cache(maxsize=10)
     def _calc_max_line_length_(self, file: Path) -> int:
         """
         Calculate self.file_line_length_place_holder for a single file.
@@ -162,21 +158,17 @@ class Files:
             the length of the placeholder to represent
             the longest line within the file
         """
-        try:
-            lines = IoHelper.read_file(file, True).splitlines()
-        except OSError:
-            return 0
-        heap = heapq.nlargest(1, lines, len)
-        if not heap:
+        metadata = self._get_file_metadata_(file)
+        if metadata is None or not metadata[2]:
             return 0
-        return len(str(len(heap[0])))
+        return len(str(metadata[1]))
 
     def _calc_file_line_length_place_holder_(self) -> None:
         self.file_line_length_place_holder = max(
             self._calc_max_line_length_(file.path) for file in self.files
         )
 
-    def generate_values(self, calc_l_: bool, calc_ll_: bool) -> None:
+    def generate_values(self, calc_l_: bool, calc_ll_: bool, cache_metadata: bool = True) -> None:
         """
         generate the metadata for all files
 
@@ -185,12 +177,17 @@ class Files:
             calculate the place holders
         calc_ll_ (bool):
             calculate the file line length place holder
+        cache_metadata (bool):
+            persist the metadata of the files within the cache directory
         """
+        self.file_metadata.persistent = cache_metadata
         self._calc_file_number_place_holder_()
         if calc_l_:
             self._calc_place_holder_()
         if calc_ll_:
             self._calc_file_line_length_place_holder_()
+        if calc_l_ or calc_ll_:
+            self.file_metadata.save()
 
     def __getitem__(self, o: int) -> str:
         return self.files[o]
@@ -12,6 +12,7 @@ import sys
 from cat_win.src.const.argconstants import ALL_ARGS
 from cat_win.src.const.defaultconstants import DKW
 from cat_win.src.persistence.xdgconfig import xdg_config
+from cat_win.src.service.checksum import DEFAULT_CHECKSUM_ALGORITHMS, get_algorithms
 from cat_win.src.service.helper.iohelper import logger
 
 BOOL_POS_RESPONSE = ['TRUE','YES','Y','1']
@@ -57,6 +58,27 @@ def validator_encoding(value: str, d_h: bool=False) -> bool:
     except LookupError:
         return False
 
+def validator_checksum_algorithms(value: str, d_h: bool=False) -> bool:
+    if d_h:
+        logger('Comma separated Checksum Algorithms (e.g. crc32,md5,sha256)', priority=logger.INFO)
+        return False
+    try:
+        return bool(get_algorithms(value))
+    except ValueError:
+        return False
+
+def validator_strings_offsets(value: str, d_h: bool=False) -> bool:
+    if d_h:
+        logger("'' (none), 'd' (decimal), 'o' (octal) or 'x' (hexadecimal)", priority=logger.INFO)
+        return False
+    return value in ['', 'd', 'o', 'x']
+
+def validator_strings_encoding(value: str, d_h: bool=False) -> bool:
+    if d_h:
+        logger("'s' (7-bit), 'l' (16-bit littleendian) or 'b' (16-bit bigendian)", priority=logger.INFO)
+        return False
+    return value in ['s', 'l', 'b']
+
 
 class Config:
     """
@@ -74,14 +96,20 @@ class Config:
         DKW.BLANK_REMOVE_WS_LINES: False,
         DKW.PEEK_SIZE: 5,
         DKW.SUMMARY_UNIQUE_ELEMENTS: False,
+        DKW.CHECKSUM_ALGORITHMS: DEFAULT_CHECKSUM_ALGORITHMS,
         DKW.STRINGS_MIN_SEQUENCE_LENGTH: 4,
         DKW.STRINGS_DELIMETER: '\n',
+        DKW.STRINGS_OFFSETS: '',
+        DKW.STRINGS_ENCODING: 's',
         DKW.GREP_CONTEXT_LINES: 0,
         DKW.GREP_QUERY_SEPARATOR: ',',
         DKW.EDITOR_INDENTATION: '\t',
         DKW.EDITOR_AUTO_INDENT: False,
         DKW.HEX_EDITOR_COLUMNS: 16,
         DKW.MORE_STEP_LENGTH: 0,
+        DKW.PARALLEL_JOBS: 1,
+        DKW.LINE_INDEX_CACHE_SIZE: 16777216,
+        DKW.PERSISTENT_CACHE: True,
         DKW.UNICODE_ESCAPED_ECHO: True,
         DKW.UNICODE_ESCAPED_EDITOR_SEARCH: True,
         DKW.UNICODE_ESCAPED_EDITOR_REPLACE: True,
@@ -101,14 +129,20 @@ class Config:
         DKW.BLANK_REMOVE_WS_LINES: validator_bool,
         DKW.PEEK_SIZE: validator_int_pos,
         DKW.SUMMARY_UNIQUE_ELEMENTS: validator_bool,
+        DKW.CHECKSUM_ALGORITHMS: validator_checksum_algorithms,
         DKW.STRINGS_MIN_SEQUENCE_LENGTH: validator_int_pos,
         DKW.STRINGS_DELIMETER: validator_string,
+        DKW.STRINGS_OFFSETS: validator_strings_offsets,
+        DKW.STRINGS_ENCODING: validator_strings_encoding,
         DKW.GREP_CONTEXT_LINES: validator_int,
         DKW.GREP_QUERY_SEPARATOR: validator_string,
         DKW.EDITOR_INDENTATION: validator_string,
         DKW.EDITOR_AUTO_INDENT: validator_bool,
         DKW.HEX_EDITOR_COLUMNS: validator_int_pos,
         DKW.MORE_STEP_LENGTH: validator_int,
+        DKW.PARALLEL_JOBS: validator_int_pos,
+        DKW.LINE_INDEX_CACHE_SIZE: validator_int,
+        DKW.PERSISTENT_CACHE: validator_bool,
         DKW.UNICODE_ESCAPED_ECHO: validator_bool,
         DKW.UNICODE_ESCAPED_EDITOR_SEARCH: validator_bool,
         DKW.UNICODE_ESCAPED_EDITOR_REPLACE: validator_bool,
@@ -0,0 +1,188 @@
+"""
+digestcache
+"""
+
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+from cat_win.src.persistence.xdgconfig import xdg_cache
+
+
+class DigestCache:
+    """
+    caches the checksums of files within the cache directory, keyed by the
+    device, inode, size and modification time of each file, such that
+    unchanged files do not have to be read again.
+    Next to them the block digests of the 'merkle' algorithm are kept by the
+    path of each file, such that the changes of a file can be located.
+    """
+    MAX_ENTRIES = 16384
+    MAX_BLOCK_ENTRIES = 64
+
+    def __init__(self, cache_file: Path = None, blocks_file: Path = None,
+                 persistent: bool = True) -> None:
+        """
+        Parameters:
+        cache_file (Path):
+            the file to persist the checksums in, defaults to the cache directory
+        blocks_file (Path):
+            the file to persist the block digests in, defaults to the cache directory
+        persistent (bool):
+            whether to load and persist the checksums and block digests,
+            or only cache them in memory
+        """
+        self.persistent = persistent
+        self.cache_file = cache_file
+        # the cached {algorithm: hexdigest} of each key, in the order of their last use
+        self.entries = None
+        self.changed = False
+        self.blocks_file = blocks_file
+        # the (block_size, size, digests) of each path, in the order of their last use
+        self.block_entries = None
+        self.blocks_changed = False
+
+    @staticmethod
+    def get_key(src_file: Path) -> str:
+        """
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+
+        Returns:
+        (str):
+            the key identifying the current state of the file
+
+        Raises:
+        OSError:
+            if the file cannot be accessed
+        """
+        f_stat = os.stat(src_file)
+        return f"{f_stat.st_dev}:{f_stat.st_ino}:{f_stat.st_size}:{f_stat.st_mtime_ns}"
+
+    def load(self) -> None:
+        """
+        load the persisted checksums, if not already loaded.
+        """
+        if self.entries is not None:
+            return
+        self.entries = OrderedDict()
+        if not self.persistent:
+            return
+        if self.cache_file is None:
+            self.cache_file = xdg_cache('checksums.json')
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as c_f:
+                entries = json.load(c_f)
+            for key, digests in entries.items():
+                self.entries[key] = {str(k): str(v) for k, v in digests.items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            self.entries = OrderedDict()
+
+    def get(self, key: str) -> dict:
+        """
+        get the cached checksums of a file, without changing the cache,
+        such that it can be called from multiple threads.
+        Expects load() to have been called.
+
+        Parameters:
+        key (str):
+            the key of the file, as returned by get_key()
+
+        Returns:
+        (dict):
+            a copy of the cached {algorithm: hexdigest}, possibly empty
+        """
+        return dict(self.entries.get(key, {}))
+
+    def put(self, key: str, digests: dict) -> None:
+        """
+        cache the checksums of a file.
+        Expects load() to have been called.
+
+        Parameters:
+        key (str):
+            the key of the file, as returned by get_key()
+        digests (dict):
+            the calculated {algorithm: hexdigest}
+        """
+        entry = self.entries.setdefault(key, {})
+        self.entries.move_to_end(key)
+        if not digests.items() <= entry.items():
+            entry.update(digests)
+            self.changed = True
+        while len(self.entries) > DigestCache.MAX_ENTRIES:
+            self.entries.popitem(last=False)
+
+    def _load_blocks(self) -> None:
+        if self.block_entries is not None:
+            return
+        self.block_entries = OrderedDict()
+        if not self.persistent:
+            return
+        if self.blocks_file is None:
+            self.blocks_file = xdg_cache('checksum_blocks.json')
+        try:
+            with open(self.blocks_file, 'r', encoding='utf-8') as b_f:
+                entries = json.load(b_f)
+            for path, (block_size, size, digests) in entries.items():
+                self.block_entries[path] = (int(block_size), int(size), bytes.fromhex(digests))
+        except (OSError, ValueError, TypeError, AttributeError):
+            self.block_entries = OrderedDict()
+
+    def put_blocks(self, src_file: Path, blocks: tuple) -> tuple:
+        """
+        remember the block digests of a file, replacing the previous ones.
+        The block digests are loaded on first use, as they can be large.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        blocks (tuple):
+            the (block_size, size, digests) of the file
+
+        Returns:
+        (tuple):
+            the previous (block_size, size, digests) of the file, or None
+        """
+        self._load_blocks()
+        path = os.path.realpath(src_file)
+        previous = self.block_entries.pop(path, None)
+        self.block_entries[path] = blocks
+        if previous != blocks:
+            self.blocks_changed = True
+        while len(self.block_entries) > DigestCache.MAX_BLOCK_ENTRIES:
+            self.block_entries.popitem(last=False)
+        return previous
+
+    @staticmethod
+    def _write(dst_file: Path, entries: dict) -> bool:
+        tmp_file = f"{dst_file}.{os.getpid()}.tmp"
+        try:
+            Path(dst_file).parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'w', encoding='utf-8') as c_f:
+                json.dump(entries, c_f, separators=(',', ':'))
+            os.replace(tmp_file, dst_file)
+            return True
+        except OSError:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+        return False
+
+    def save(self) -> None:
+        """
+        persist the cached checksums and block digests, if they have changed.
+        Failing to write the cache is not an error.
+        """
+        if not self.persistent:
+            return
+        if self.changed:
+            self.changed = not self._write(self.cache_file, self.entries)
+        if self.blocks_changed:
+            self.blocks_changed = not self._write(self.blocks_file, {
+                path: [block_size, size, digests.hex()]
+                for path, (block_size, size, digests) in self.block_entries.items()
+            })
@@ -0,0 +1,154 @@
+"""
+filemetadata
+"""
+
+import json
+import os
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+from cat_win.src.persistence.xdgconfig import xdg_cache
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class FileMetadata:
+    """
+    scans the metadata of files (line count, longest line, size) in a single pass,
+    and caches the results within the cache directory, keyed by the device,
+    inode, size and modification time of each file.
+    """
+    MAX_ENTRIES = 4096
+
+    def __init__(self, cache_file: Path = None, persistent: bool = True) -> None:
+        """
+        Parameters:
+        cache_file (Path):
+            the file to persist the metadata in, defaults to the cache directory
+        persistent (bool):
+            whether to load and persist the metadata, or only cache it in memory
+        """
+        self.cache_file = cache_file
+        self.persistent = persistent
+        # the cached (line_feeds, max_line_length) of each key, in the order of their last use
+        self.entries = None
+        self.changed = False
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def scan(src_file: Path, block_size: int = 1048576) -> tuple:
+        """
+        scan a file in chunks, without holding more than one chunk in memory.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        block_size (int):
+            the amount of bytes to read at once
+
+        Returns:
+        (line_feeds, max_line_length, size) (tuple):
+            the amount of b'\\n' within the file, the length (in bytes) of the
+            longest line, equivalent to max(map(len, content.splitlines())),
+            and the amount of bytes of the file
+        """
+        line_feeds, max_line_length, size = 0, 0, 0
+        # the length of the last line of the previous chunk, that might continue
+        carry = 0
+        with open(src_file, 'rb') as raw_f:
+            while True:
+                byte_chunk = raw_f.read(block_size)
+                if not byte_chunk:
+                    break
+                size += len(byte_chunk)
+                line_feeds += byte_chunk.count(b'\n')
+                lines = byte_chunk.splitlines()
+                first_line = carry + len(lines[0])
+                max_line_length = max(max_line_length, first_line, max(map(len, lines)))
+                if byte_chunk.endswith((b'\n', b'\r')):
+                    carry = 0
+                elif len(lines) == 1:
+                    carry = first_line
+                else:
+                    carry = len(lines[-1])
+        return (line_feeds, max_line_length, size)
+
+    def _load(self) -> None:
+        self.entries = OrderedDict()
+        if not self.persistent:
+            return
+        if self.cache_file is None:
+            self.cache_file = xdg_cache('file_metadata.json')
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as c_f:
+                entries = json.load(c_f)
+            for key, (line_feeds, max_line_length) in entries.items():
+                self.entries[key] = (int(line_feeds), int(max_line_length))
+        except (OSError, ValueError, TypeError, AttributeError):
+            self.entries = OrderedDict()
+
+    def get(self, src_file: Path) -> tuple:
+        """
+        get the metadata of a file, scanning it only if it has changed.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+
+        Returns:
+        (line_feeds, max_line_length, size) (tuple):
+            as returned by scan()
+
+        Raises:
+        OSError:
+            if the file cannot be read
+        """
+        f_stat = os.stat(src_file)
+        key = f"{f_stat.st_dev}:{f_stat.st_ino}:{f_stat.st_size}:{f_stat.st_mtime_ns}"
+        if self.entries is None:
+            self._load()
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key] + (f_stat.st_size,)
+        self.misses += 1
+        line_feeds, max_line_length, size = FileMetadata.scan(src_file)
+        # files changing while being scanned are not cached
+        if size == f_stat.st_size:
+            self.entries[key] = (line_feeds, max_line_length)
+            self.changed = True
+            while len(self.entries) > FileMetadata.MAX_ENTRIES:
+                self.entries.popitem(last=False)
+        return (line_feeds, max_line_length, size)
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Returns:
+        (CacheInfo):
+            the statistics of the cache, like functools.lru_cache().cache_info()
+        """
+        return CacheInfo(
+            self.hits, self.misses, FileMetadata.MAX_ENTRIES,
+            0 if self.entries is None else len(self.entries)
+        )
+
+    def save(self) -> None:
+        """
+        persist the cached metadata, if new files have been scanned.
+        Failing to write the cache is not an error.
+        """
+        if not (self.persistent and self.changed):
+            return
+        tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            Path(self.cache_file).parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'w', encoding='utf-8') as c_f:
+                json.dump(self.entries, c_f, separators=(',', ':'))
+            os.replace(tmp_file, self.cache_file)
+            self.changed = False
+        except OSError:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
@@ -0,0 +1,284 @@
+"""
+lineindex
+"""
+
+import codecs
+import hashlib
+import json
+import os
+import re
+from array import array
+from itertools import islice
+from pathlib import Path
+
+from cat_win.src.persistence.xdgconfig import xdg_cache
+from cat_win.src.service.helper.iohelper import IoHelper
+
+
+class LineIndex:
+    """
+    An index of the byte offsets of every sample_rate-th line of a file.
+    The index is persisted within the cache directory, keyed by the path,
+    inode, size and modification time of the file. If the file has only been
+    appended to, the index gets extended instead of rebuilt.
+    """
+    SAMPLE_RATE = 4096
+    TAIL_SIZE = 64
+
+    def __init__(self, src_file: Path, file_encoding: str = 'utf-8',
+                 sample_rate: int = SAMPLE_RATE) -> None:
+        """
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        file_encoding (str):
+            the encoding of the file, expects supports_byte_lines(file_encoding) to be True
+        sample_rate (int):
+            the amount of lines between two indexed offsets
+        """
+        self.src_file = src_file
+        self.file_encoding = file_encoding
+        self.sample_rate = sample_rate
+        # the (inode, size, modified time) of the file when it has been indexed
+        self.key = None
+        # offsets[i] is the byte offset of the line i * sample_rate
+        self.offsets = array('Q', [0])
+        # the file has been scanned up to scan_offset, containing scan_lines line breaks
+        self.scan_offset = 0
+        self.scan_lines = 0
+        self.line_count = 0
+        # the bytes in front of the indexed size, to verify the file has only been appended to
+        self.tail = b''
+
+    @staticmethod
+    def get_index_file(src_file: Path, file_encoding: str) -> Path:
+        """
+        get the path of the persisted index of a file
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        file_encoding (str):
+            the encoding of the file
+
+        Returns:
+        (Path):
+            the path of the index file within the cache directory
+        """
+        name = f"{os.path.realpath(src_file)}\x00{codecs.lookup(file_encoding).name}"
+        name = hashlib.sha1(name.encode('utf-8', errors='surrogateescape')).hexdigest()
+        return xdg_cache('line_index', f"{name}.idx")
+
+    def _to_bytes(self) -> bytes:
+        header = {
+            'key': self.key,
+            'sample_rate': self.sample_rate,
+            'scan_offset': self.scan_offset,
+            'scan_lines': self.scan_lines,
+            'line_count': self.line_count,
+            'tail': self.tail.hex(),
+        }
+        return json.dumps(header).encode('utf-8') + b'\n' + self.offsets.tobytes()
+
+    def _from_bytes(self, data: bytes) -> None:
+        header, offsets = data.split(b'\n', 1)
+        header = json.loads(header.decode('utf-8'))
+        if header['sample_rate'] != self.sample_rate:
+            raise ValueError('sample rate does not match')
+        self.offsets = array('Q')
+        self.offsets.frombytes(offsets)
+        self.key = tuple(header['key'])
+        self.scan_offset = header['scan_offset']
+        self.scan_lines = header['scan_lines']
+        self.line_count = header['line_count']
+        self.tail = bytes.fromhex(header['tail'])
+
+    @staticmethod
+    def _find_nth(data: bytes, sub: bytes, start: int, end: int, n: int) -> int:
+        """
+        find the position behind the n-th occurence of sub within data[start:end],
+        by bisecting on the (C-level) count of occurences.
+        """
+        low, high, found = start, end - 1, 0
+        while low < high:
+            mid = (low + high) // 2
+            count = data.count(sub, low, mid + 1)
+            if found + count >= n:
+                high = mid
+            else:
+                found += count
+                low = mid + 1
+        return low + len(sub)
+
+    def _index_region(self, data: bytes, length: int, offset: int) -> None:
+        """
+        index the complete lines within data[:length], found at the byte offset
+        """
+        line_breaks = IoHelper.get_encoded_line_breaks(self.file_encoding)
+        line_feed = '\n'.encode(self.file_encoding)
+        crlf = '\r\n'.encode(self.file_encoding)
+        line_count = sum(data.count(line_break, 0, length) for line_break in line_breaks)
+        line_count -= data.count(crlf, 0, length)
+        next_line = len(self.offsets) * self.sample_rate
+        # every line break ends with '\n', so the offsets can be found by counting
+        only_line_feeds = line_count == data.count(line_feed, 0, length)
+        line_break_pattern = re.compile(b'|'.join(map(re.escape, [crlf] + line_breaks)))
+        position, counted = 0, self.scan_lines
+        while next_line <= self.scan_lines + line_count:
+            if only_line_feeds:
+                position = LineIndex._find_nth(
+                    data, line_feed, position, length, next_line - counted
+                )
+            else:
+                position = next(islice(
+                    line_break_pattern.finditer(data, position, length),
+                    next_line - counted - 1, None
+                )).end()
+            self.offsets.append(offset + position)
+            counted = next_line
+            next_line += self.sample_rate
+        self.scan_lines += line_count
+
+    def _scan(self, raw_f, file_size: int, block_size: int = 1048576) -> None:
+        """
+        scan the file from scan_offset up to file_size
+        """
+        line_breaks = IoHelper.get_encoded_line_breaks(self.file_encoding)
+        carriage_return = '\r'.encode(self.file_encoding)
+        max_length = max(map(len, line_breaks)) + 1
+        raw_f.seek(self.scan_offset)
+        offset, data = self.scan_offset, b''
+        remaining = file_size - self.scan_offset
+        while remaining > 0:
+            byte_chunk = raw_f.read(min(block_size, remaining))
+            if not byte_chunk:
+                break
+            remaining -= len(byte_chunk)
+            data += byte_chunk
+            # a trailing '\r' might still be followed by '\n'
+            search_end = len(data) - len(carriage_return) * data.endswith(carriage_return)
+            length = max((
+                position + len(line_break)
+                for line_break in line_breaks
+                for position in (data.rfind(line_break, 0, search_end),)
+                if position >= 0
+            ), default=0)
+            if length:
+                self._index_region(data, length, offset)
+                offset += length
+                data = data[length:]
+            elif len(data) > max_length:
+                # only the offsets of the line breaks are needed, not the lines themselves
+                offset += len(data) - max_length
+                data = data[-max_length:]
+        self.scan_offset = offset
+        self.line_count = self.scan_lines + bool(data)
+
+    def update(self, block_size: int = 1048576) -> bool:
+        """
+        update the index, if the file has changed since it has been indexed.
+
+        Parameters:
+        block_size (int):
+            the amount of bytes to read at once
+
+        Returns:
+        (bool):
+            True if the index has changed
+        """
+        f_stat = os.stat(self.src_file)
+        key = (f_stat.st_ino, f_stat.st_size, f_stat.st_mtime_ns)
+        if key == self.key:
+            return False
+        with open(self.src_file, 'rb') as raw_f:
+            appended = self.key is not None and key[0] == self.key[0] and key[1] >= self.key[1]
+            if appended:
+                raw_f.seek(self.key[1] - len(self.tail))
+                appended = raw_f.read(len(self.tail)) == self.tail
+            if not appended:
+                self.offsets = array('Q', [0])
+                self.scan_offset = self.scan_lines = self.line_count = 0
+            self._scan(raw_f, key[1], block_size)
+            raw_f.seek(max(key[1] - LineIndex.TAIL_SIZE, 0))
+            self.tail = raw_f.read(min(key[1], LineIndex.TAIL_SIZE))
+        self.key = key
+        return True
+
+    def seek_line(self, raw_f, line: int) -> int:
+        """
+        seek an opened binary file to the start of a line.
+
+        Parameters:
+        raw_f (BufferedReader):
+            the binary file
+        line (int):
+            the (0-based) index of the line
+
+        Returns:
+        offset (int):
+            the byte offset of the line (or the end of the file)
+        """
+        sample = min(line // self.sample_rate, len(self.offsets) - 1)
+        raw_f.seek(self.offsets[sample])
+        offset = IoHelper.skip_lines(
+            raw_f, line - sample * self.sample_rate, self.file_encoding
+        )
+        raw_f.seek(offset)
+        return offset
+
+    @staticmethod
+    def _limit_cache(index_dir: Path, cache_size: int) -> None:
+        """
+        remove the least recently used index files, until the
+        directory is not larger than cache_size bytes.
+        """
+        index_files = []
+        for entry in os.scandir(index_dir):
+            if entry.name.endswith('.idx'):
+                e_stat = entry.stat()
+                index_files.append((e_stat.st_mtime_ns, e_stat.st_size, entry.path))
+        index_files.sort(reverse=True)
+        total_size = 0
+        for _, size, path in index_files:
+            total_size += size
+            if total_size > cache_size:
+                os.remove(path)
+
+    @staticmethod
+    def load(src_file: Path, file_encoding: str = 'utf-8', cache_size: int = 16777216) -> 'LineIndex':
+        """
+        load the persisted index of a file, update it and persist it again.
+        Failing to read or write the persisted index is not an error.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        file_encoding (str):
+            the encoding of the file
+        cache_size (int):
+            the maximum amount of bytes of all persisted indices
+
+        Returns:
+        (LineIndex):
+            the up to date index of the file
+        """
+        line_index = LineIndex(src_file, file_encoding)
+        index_file = LineIndex.get_index_file(src_file, file_encoding)
+        try:
+            with open(index_file, 'rb') as i_f:
+                line_index._from_bytes(i_f.read())
+        except (OSError, ValueError, KeyError, TypeError):
+            line_index = LineIndex(src_file, file_encoding)
+        changed = line_index.update()
+        try:
+            if changed:
+                index_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(index_file, 'wb') as i_f:
+                    i_f.write(line_index._to_bytes())
+                LineIndex._limit_cache(index_file.parent, cache_size)
+            else:
+                # mark the index as recently used
+                os.utime(index_file)
+        except OSError:
+            pass
+        return line_index
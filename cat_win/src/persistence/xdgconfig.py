@@ -7,6 +7,7 @@ import sys
 from pathlib import Path
 
 ENV_OVERRIDE = "CAT_WIN_CONFIG_DIR"
+ENV_CACHE_OVERRIDE = "CAT_WIN_CACHE_DIR"
 
 
 def _config_root() -> Path:
@@ -40,6 +41,36 @@ def _config_root() -> Path:
     return Path.home() / ".config"
 
 
+def _cache_root() -> Path:
+    """
+    Return the OS-appropriate base directory for cache files.
+
+    Returns:
+    (Path):
+        the base directory for cache files, determined by the OS and environment variables.
+    """
+    override = os.environ.get(ENV_CACHE_OVERRIDE)
+    if override:
+        return Path(os.path.expanduser(override))
+
+    plat = sys.platform
+
+    if plat.startswith("win"):
+        env_path = os.environ.get("LOCALAPPDATA")
+        if env_path:
+            return Path(env_path)
+        return Path.home() / "AppData" / "Local"
+
+    if plat == "darwin":
+        return Path.home() / "Library" / "Caches"
+
+    xdg_path = os.environ.get("XDG_CACHE_HOME")
+    if xdg_path:
+        return Path(xdg_path)
+
+    return Path.home() / ".cache"
+
+
 def xdg_config(*parts: str, ensure_dir: bool = False) -> Path:
     """
     Return a configuration path under cat_win/config for the current OS.
@@ -67,3 +98,20 @@ def xdg_config(*parts: str, ensure_dir: bool = False) -> Path:
         target_dir.mkdir(parents=True, exist_ok=True)
 
     return path
+
+
+def xdg_cache(*parts: str) -> Path:
+    """
+    Return a cache path under cat_win for the current OS.
+    The cached files can be deleted at any time, the directories
+    are created by the caller when writing them.
+
+    Parameters:
+    *parts (str):
+        path components to append to the base cache directory, e.g. ("line_index", "x.idx").
+
+    Returns:
+    (Path):
+        the full path to the cache file or directory.
+    """
+    return Path(_cache_root(), 'cat_win', *parts)
@@ -40,8 +40,6 @@ def _print_cache_debug_info(ctx) -> None:
         remove_ansi_codes_from_line,
         _calculate_line_prefix_spacing,
         _calculate_line_length_prefix_spacing,
-        ctx.u_files._get_file_lines_sum_,
-        ctx.u_files._calc_max_line_length_,
         Visualizer.get_color_byte_view,
         Visualizer.get_color_entropy,
         is_special_character,
@@ -56,6 +54,7 @@ def _print_cache_debug_info(ctx) -> None:
         )
         for cache in caches
     ]
+    caches_info.append(('file_metadata', *map(str, ctx.u_files.file_metadata.cache_info())))
     max_val = [max(len(_c) for _c in c_info) + 1 for c_info in zip(*caches_info)]
     for name, hits, misses, maxsize, currsize in caches_info:
         cache_info  = f"def:{name.ljust(max_val[0])}"
@@ -3,10 +3,12 @@ contentpreccesor
 """
 
 import sys
+from itertools import repeat
 
 from cat_win.src.const.argconstants import (
     ARGS_CCHARCOUNT,
     ARGS_CHECKSUM,
+    ARGS_CHECKSUM_CHECK,
     ARGS_DATA,
     ARGS_DDIRECTORIES,
     ARGS_DIFF,
@@ -30,6 +32,7 @@ from cat_win.src.const.argconstants import (
     ARGS_VISUALIZE_D,
     ARGS_VISUALIZE_E,
     ARGS_VISUALIZE_H,
+    ARGS_VISUALIZE_O,
     ARGS_VISUALIZE_Z,
     ARGS_WWORDCOUNT
 )
@@ -41,9 +44,15 @@ from cat_win.src.processor.registerwrapper import (
     PRE_CONTENT_ACTIONS,
     register_pre
 )
-from cat_win.src.service.checksum import print_checksum
+from cat_win.src.persistence.digestcache import DigestCache
+from cat_win.src.service.checksum import (
+    get_algorithms,
+    print_checksum,
+    verify_manifest,
+    yield_checksums
+)
 from cat_win.src.service.fileattributes import print_meta
-from cat_win.src.service.helper.iohelper import IoHelper
+from cat_win.src.service.helper.iohelper import IoHelper, logger
 from cat_win.src.service.more import More
 from cat_win.src.service.summary import Summary
 from cat_win.src.service.visualizer import Visualizer
@@ -225,11 +234,62 @@ def _show_files_only(ctx) -> bool:
 
 @register_pre(ARGS_DATA, ARGS_CHECKSUM)
 def _show_meta_and_checksum(ctx) -> bool:
-    for file in ctx.u_files:
+    files = [file.path for file in ctx.u_files]
+    checksums = repeat(None)
+    if ctx.u_args[ARGS_CHECKSUM]:
+        try:
+            algorithms = get_algorithms(ctx.arg_parser.checksum_algorithms)
+        except ValueError as exc:
+            logger(str(exc), priority=logger.ERROR)
+            sys.exit(1)
+        digest_cache = DigestCache(persistent=ctx.const_dic[DKW.PERSISTENT_CACHE])
+        checksums = yield_checksums(
+            files, algorithms, ctx.const_dic[DKW.PARALLEL_JOBS], digest_cache
+        )
+    for file, file_checksums in zip(files, checksums):
         if ctx.u_args[ARGS_DATA]:
-            print_meta(file.path, ctx.color_dic)
+            print_meta(file, ctx.color_dic)
         if ctx.u_args[ARGS_CHECKSUM]:
-            print_checksum(file.path, ctx.color_dic)
+            print_checksum(file, ctx.color_dic, file_checksums)
+    if ctx.u_args[ARGS_CHECKSUM]:
+        digest_cache.save()
+    return True
+
+
+@register_pre(ARGS_CHECKSUM_CHECK)
+def _check_checksums(ctx) -> bool:
+    digest_cache = DigestCache(persistent=ctx.const_dic[DKW.PERSISTENT_CACHE])
+    failed = False
+    for file in ctx.u_files:
+        try:
+            results = verify_manifest(
+                file.path, ctx.color_dic, ctx.arg_parser.file_encoding,
+                ctx.const_dic[DKW.PARALLEL_JOBS], digest_cache,
+            )
+        except OSError as exc:
+            logger(f"{file.displayname}: {type(exc).__name__}", priority=logger.ERROR)
+            failed = True
+            continue
+        for result, message in [
+            ('INVALID', 'line(s) are improperly formatted'),
+            ('MISSING', 'listed file(s) could not be found'),
+            ('FAILED', 'computed checksum(s) did NOT match'),
+        ]:
+            if results[result]:
+                logger(
+                    f"{file.displayname}: {results[result]} {message}",
+                    priority=logger.WARNING,
+                )
+        if not results['OK'] + results['FAILED'] + results['MISSING']:
+            logger(
+                f"{file.displayname}: no properly formatted checksum lines found",
+                priority=logger.WARNING,
+            )
+        # improperly formatted lines are ignored, like 'sha256sum -c' without --strict
+        failed = failed or not results['OK'] or results['FAILED'] + results['MISSING'] > 0
+    digest_cache.save()
+    if failed:
+        sys.exit(1)
     return True
 
 
@@ -250,6 +310,19 @@ def _visualize_files(view_name: str):
     return _run
 
 
+@register_pre(ARGS_VISUALIZE_O)
+def _visualize_overview(ctx) -> bool:
+    # combined with another view, the overview is displayed by that view instead
+    if any(ctx.u_args[arg] for arg in (ARGS_VISUALIZE_B, ARGS_VISUALIZE_Z, ARGS_VISUALIZE_H,
+                                       ARGS_VISUALIZE_E, ARGS_VISUALIZE_D)):
+        return False
+    Visualizer(
+        [f.path for f in ctx.u_files],
+        'HilbertCurveView', ctx.arg_parser.file_truncate
+    ).visualize_files()
+    return True
+
+
 register_pre(ARGS_LESS)
 def _page_files_lazily(ctx) -> bool:
     for file in ctx.u_files:
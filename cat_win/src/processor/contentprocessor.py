@@ -2,9 +2,11 @@
 contentprocessor
 """
 
+import codecs
 import os
 import sys
 from datetime import datetime
+from itertools import chain, islice
 
 from cat_win.src.const.argconstants import (
     ARGS_B64E,
@@ -19,6 +21,8 @@ from cat_win.src.const.argconstants import (
     ARGS_EVAL,
     ARGS_FFILE_PREFIX,
     ARGS_FILE_PREFIX,
+    ARGS_GREP,
+    ARGS_GREP_ONLY,
     ARGS_HEX,
     ARGS_LLENGTH,
     ARGS_MORE,
@@ -41,10 +45,21 @@ from cat_win.src.processor.lineprefixprocessor import (
     get_line_length_prefix,
     get_line_prefix
 )
-from cat_win.src.processor.outputprocessor import print_file
+from cat_win.src.processor.outputprocessor import (
+    STREAM_BATCH_SIZE,
+    print_base64,
+    print_file,
+    print_stream
+)
 from cat_win.src.processor.registerwrapper import (
+    LINE_FILTER_ACTIONS,
+    LINE_MAPPER_ACTIONS,
     PRO_CONTENT_ACTIONS,
-    register_pro
+    STREAM_CONTENT_ACTIONS,
+    register_line_filter,
+    register_line_mapper,
+    register_pro,
+    register_stream
 )
 from cat_win.src.service.cbase64 import encode_base64
 from cat_win.src.service.clipboard import Clipboard
@@ -54,7 +69,7 @@ from cat_win.src.service.helper.iohelper import logger
 from cat_win.src.service.more import More
 from cat_win.src.service.querymanager import (
     _build_ansi_restore,
-    _map_display_pos,
+    _build_display_offsets,
     remove_ansi_codes_from_line,
     replace_queries_in_line
 )
@@ -80,6 +95,8 @@ def _ansi_aware_slice_line(param: tuple, reset_all: str):
     slice_obj = slice(*param)
 
     def _slice_line(line: str) -> str: # TODO: what about negative step in slice?
+        if '\x1b' not in line:
+            return line[slice_obj]
         plain_line = remove_ansi_codes_from_line(line)
         start, stop, step = slice_obj.indices(len(plain_line))
         selected_positions = list(range(start, stop, step))
@@ -87,6 +104,7 @@ def _ansi_aware_slice_line(param: tuple, reset_all: str):
             return ''
 
         ansi_restore, _ = _build_ansi_restore(reset_all, line)
+        display_offsets = _build_display_offsets(line)
 
         # Handles all slice steps (including step=1) without leaking ANSI state
         # from skipped plain-text positions.
@@ -102,8 +120,7 @@ def _ansi_aware_slice_line(param: tuple, reset_all: str):
                     parts.append(reset_all)
                 previous_state = active_state
 
-            display_start = _map_display_pos(line, plain_pos)
-            parts.append(line[display_start])
+            parts.append(line[display_offsets[plain_pos]])
 
         tail_state = ansi_restore.get(selected_positions[-1] + 1, '')
         if tail_state:
@@ -114,34 +131,62 @@ def _ansi_aware_slice_line(param: tuple, reset_all: str):
     return _slice_line
 
 
-@register_pro(ARGS_CUT)
-def _apply_cut(ctx, param: tuple) -> None:
+@register_line_mapper(ARGS_CUT)
+def _map_cut(ctx, param: tuple):
     slice_line = _ansi_aware_slice_line(param, ctx.color_dic[CKW.RESET_ALL])
-    ctx.content.lines[:] = [
-        slice_line(line) for line in ctx.content.lines
-    ]
+    def _cut(line: str, prefix: str, suffix: str) -> tuple:
+        return slice_line(line), prefix, suffix
+    return _cut
 
 
-@register_pro(ARGS_ENDS)
-def _apply_ends(ctx, _param) -> None:
-    emarker = (
+def _get_end_marker(ctx) -> str:
+    return (
         ctx.color_dic[CKW.ENDS]
         + ctx.const_dic[DKW.END_MARKER_SYMBOL]
         + ctx.color_dic[CKW.RESET_ALL]
     )
-    ctx.content.suffixes[:] = [suffix + emarker for suffix in ctx.content.suffixes]
 
 
+def _get_chr_table(ctx) -> dict:
+    # none of the markers contain a special char themselves, so translating
+    # all of them at once equals replacing them one after another
+    return {
+        c_id: f"{ctx.color_dic[CKW.CHARS]}^{char}{ctx.color_dic[CKW.RESET_ALL]}"
+        for c_id, char, _, possible in SPECIAL_CHARS if possible
+    }
 
-@register_pro(ARGS_CHR)
-def _apply_chr(ctx, _param) -> None:
-    for c_id, char, _, possible in SPECIAL_CHARS:
-        if not possible:
-            continue
-        marker = f"{ctx.color_dic[CKW.CHARS]}^{char}{ctx.color_dic[CKW.RESET_ALL]}"
-        ctx.content.lines[:] = [
-            line.replace(chr(c_id), marker) for line in ctx.content.lines
-        ]
+
+def _get_squeeze_suffix(ctx, suffix: str, count: int) -> str:
+    if not ctx.const_dic[DKW.SQUEEZE_COLLAPSE_SUFFIXES]:
+        return suffix
+    return suffix + (
+        f" {ctx.color_dic[CKW.SQUEEZE]}[x{count+1}]{ctx.color_dic[CKW.RESET_ALL]}"
+    ) * bool(count)
+
+
+def _get_eol_suffix(ctx, line: str) -> str:
+    return ctx.color_dic[CKW.CHARS] + (
+        '<CRLF>' if line.endswith('\r\n') else
+        '<LF>'   if line.endswith('\n') else
+        '<CR>'   if line.endswith('\r') else
+        '<EOF-noeol>'
+    ) + ctx.color_dic[CKW.RESET_ALL]
+
+
+@register_line_mapper(ARGS_ENDS)
+def _map_ends(ctx, _param):
+    emarker = _get_end_marker(ctx)
+    def _ends(line: str, prefix: str, suffix: str) -> tuple:
+        return line, prefix, suffix + emarker
+    return _ends
+
+
+@register_line_mapper(ARGS_CHR)
+def _map_chr(ctx, _param):
+    chr_table = _get_chr_table(ctx)
+    def _chr(line: str, prefix: str, suffix: str) -> tuple:
+        return line.translate(chr_table), prefix, suffix
+    return _chr
 
 
 @register_pro(ARGS_SQUEEZE)
@@ -162,15 +207,10 @@ def _apply_squeeze(ctx, _param) -> None:
 
     ctx.content.lines[:] = new_lines
     ctx.content.prefixes[:] = new_prefixes
-    if ctx.const_dic[DKW.SQUEEZE_COLLAPSE_SUFFIXES]:
-        ctx.content.suffixes[:] = [
-            suffix + (
-                f" {ctx.color_dic[CKW.SQUEEZE]}[x{count+1}]{ctx.color_dic[CKW.RESET_ALL]}"
-            ) * bool(count)
-            for suffix, count in zip(new_suffixes, dup_counter)
-        ]
-    else:
-        ctx.content.suffixes[:] = new_suffixes
+    ctx.content.suffixes[:] = [
+        _get_squeeze_suffix(ctx, suffix, count)
+        for suffix, count in zip(new_suffixes, dup_counter)
+    ]
 
 
 @register_pro(ARGS_REVERSE)
@@ -188,12 +228,12 @@ def _apply_sort_length(ctx, _param) -> None:
     ctx.content.sort(key=lambda l: len(l[0]))
 
 
-@register_pro(ARGS_BLANK)
-def _apply_blank(ctx, _param) -> None:
+@register_line_filter(ARGS_BLANK)
+def _filter_blank(ctx, _param):
     strip_obj = None if ctx.const_dic[DKW.BLANK_REMOVE_WS_LINES] else ''
-    ctx.content.filter(
-        lambda line, _, __: line.strip(strip_obj)
-    )
+    def _blank(line: str, _prefix: str, _suffix: str) -> bool:
+        return bool(line.strip(strip_obj))
+    return _blank
 
 
 @register_pro(ARGS_EVAL)
@@ -206,34 +246,281 @@ def _apply_convert(ctx, param: str) -> None:
     ctx.content = comp_conv(ctx.content, param, remove_ansi_codes_from_line)
 
 
-@register_pro(ARGS_REPLACE)
-def _apply_replace(ctx, param: tuple) -> None:
+@register_line_mapper(ARGS_REPLACE)
+def _map_replace(ctx, param: tuple):
     replace_this, replace_with = param
-    ctx.content.lines[:] = [
-        replace_queries_in_line(
+    def _replace(line: str, prefix: str, suffix: str) -> tuple:
+        return replace_queries_in_line(
             line,
             [(replace_this, False)],
             [replace_with],
             ctx.color_dic
-        )[0] for line in ctx.content.lines
-    ]
+        )[0], prefix, suffix
+    return _replace
 
 
 def _apply_eol_suffixes(ctx) -> None:
-    ctx.content.suffixes[:] = [
-        ctx.color_dic[CKW.CHARS] + (
-            '<CRLF>' if line.endswith('\r\n') else
-            '<LF>'   if line.endswith('\n') else
-            '<CR>'   if line.endswith('\r') else
-            '<EOF-noeol>'
-        ) + ctx.color_dic[CKW.RESET_ALL]
-        for line in ctx.content.lines
+    ctx.content.suffixes = [
+        _get_eol_suffix(ctx, line) for line in ctx.content.lines
     ]
     ctx.content.lines[:] = [
         line.rstrip('\n\r') for line in ctx.content.lines
     ]
 
 
+@register_stream(ARGS_SQUEEZE)
+def _stream_squeeze(ctx, _param, rows):
+    last_row, dup_count = None, 0
+    for row in rows:
+        if last_row is not None and last_row[0] == row[0]:
+            dup_count += 1
+            continue
+        if last_row is not None:
+            yield last_row[0], last_row[1], _get_squeeze_suffix(ctx, last_row[2], dup_count)
+        last_row, dup_count = row, 0
+    if last_row is not None:
+        yield last_row[0], last_row[1], _get_squeeze_suffix(ctx, last_row[2], dup_count)
+
+
+def _fuse_line_actions(line_actions: list):
+    """
+    Fuse consecutive line-mappers and line-filters into a single function,
+    so all of them are applied within one pass over the rows.
+
+    Parameters:
+    line_actions (list):
+        list of (is_filter, action) tuples in the order they should be applied
+
+    Returns:
+    _apply_fused (Callable[[Iterable[tuple]], Iterator[tuple]]):
+        a generator function yielding the transformed (line, prefix, suffix) rows
+    """
+    if len(line_actions) == 1 and not line_actions[0][0]:
+        mapper = line_actions[0][1]
+        def _apply_fused(rows):
+            for row in rows:
+                yield mapper(*row)
+        return _apply_fused
+
+    def _apply_fused(rows):
+        for row in rows:
+            for is_filter, action in line_actions:
+                if not is_filter:
+                    row = action(*row)
+                elif not action(*row):
+                    break
+            else:
+                yield row
+    return _apply_fused
+
+
+def _compile_content_plan(ctx, barrier_actions: dict) -> list:
+    """
+    Compile the ordered parameters into a transformation plan. Consecutive
+    stateless parameters (line-mappers and line-filters) get fused into a single
+    step, while every other parameter (e.g. --sort, --squeeze) stays its own step.
+
+    Parameters:
+    ctx (AppContext):
+        the current invocation context
+    barrier_actions (dict):
+        the actions to use for parameters which cannot be fused
+        (PRO_CONTENT_ACTIONS or STREAM_CONTENT_ACTIONS)
+
+    Returns:
+    plan (list):
+        list of (fused, action, param) steps, where fused indicates that the action
+        is a generator function over rows created by _fuse_line_actions, and
+        param is the list of (is_filter, action) tuples it has been created from
+    """
+    plan = []
+    line_actions = []
+    for arg, param in ctx.u_args:
+        if arg in LINE_MAPPER_ACTIONS:
+            line_actions.append((False, LINE_MAPPER_ACTIONS[arg](ctx, param)))
+            continue
+        if arg in LINE_FILTER_ACTIONS:
+            line_actions.append((True, LINE_FILTER_ACTIONS[arg](ctx, param)))
+            continue
+        handler = barrier_actions.get(arg)
+        if handler is None:
+            continue
+        if line_actions:
+            plan.append((True, _fuse_line_actions(line_actions), line_actions))
+            line_actions = []
+        plan.append((False, handler, param))
+    if line_actions:
+        plan.append((True, _fuse_line_actions(line_actions), line_actions))
+    return plan
+
+
+def _apply_content_plan(ctx) -> None:
+    for fused, action, param in _compile_content_plan(ctx, PRO_CONTENT_ACTIONS):
+        if not fused:
+            action(ctx, param)
+            continue
+        if all(is_filter for is_filter, _ in param):
+            # the lines get filtered in place, without materializing the default columns
+            ctx.content.filter(param[0][1] if len(param) == 1 else (
+                lambda *row: all(line_filter(*row) for _, line_filter in param)
+            ))
+            continue
+        content = ContentBuffer()
+        # the prefixes/suffixes only get materialized once a mapper changes them
+        append_row = content.append
+        for line, prefix, suffix in action(ctx.content):
+            append_row(line, prefix, suffix)
+        ctx.content = content
+
+
+def _stream_content_plan(ctx, rows):
+    for fused, action, param in _compile_content_plan(ctx, STREAM_CONTENT_ACTIONS):
+        rows = action(rows) if fused else action(ctx, param, rows)
+    return rows
+
+
+def _alters_content(arg_id: int) -> bool:
+    return (
+        arg_id in PRO_CONTENT_ACTIONS or
+        arg_id in LINE_MAPPER_ACTIONS or
+        arg_id in LINE_FILTER_ACTIONS
+    )
+
+
+def can_stream_content(ctx) -> bool:
+    """
+    Check if the active parameters can be applied to a stream of lines,
+    meaning every parameter only needs to look at one line at a time.
+
+    Parameters:
+    ctx (AppContext):
+        the current invocation context
+
+    Returns:
+    (bool):
+        True if the content does not have to be materialized as a whole
+    """
+    if any(ctx.u_args[arg_id] for arg_id in (
+        ARGS_STRINGS, ARGS_SPECIFIC_FORMATS, ARGS_PEEK, ARGS_MORE, ARGS_CLIP,
+    )):
+        return False
+    if any(trunc is not None for trunc in ctx.arg_parser.file_truncate):
+        return False
+    # the queries would have to be found within the encoded content
+    if ctx.u_args[ARGS_B64E] and any([
+        ctx.arg_parser.file_queries, ctx.u_args[ARGS_GREP], ctx.u_args[ARGS_GREP_ONLY]
+    ]):
+        return False
+    # the line-mappers and line-filters are applied to one line at a time anyway
+    return all(
+        arg_id in STREAM_CONTENT_ACTIONS
+        for arg_id, _ in ctx.u_args if arg_id in PRO_CONTENT_ACTIONS
+    )
+
+
+def can_passthrough_content(ctx) -> bool:
+    """
+    Check if no active parameter alters the content of a file,
+    meaning the file could be copied to the stdout as it is.
+
+    Parameters:
+    ctx (AppContext):
+        the current invocation context
+
+    Returns:
+    (bool):
+        True if the content would be printed unchanged
+    """
+    if any(ctx.u_args[arg_id] for arg_id in (
+        ARGS_NUMBER, ARGS_LLENGTH, ARGS_FILE_PREFIX, ARGS_FFILE_PREFIX, ARGS_EOL, ARGS_PEEK,
+        ARGS_STRINGS, ARGS_SPECIFIC_FORMATS, ARGS_B64E, ARGS_MORE, ARGS_CLIP,
+        ARGS_GREP, ARGS_GREP_ONLY,
+    )):
+        return False
+    if ctx.arg_parser.file_queries or any(t is not None for t in ctx.arg_parser.file_truncate):
+        return False
+    return not any(_alters_content(arg_id) for arg_id, _ in ctx.u_args)
+
+
+def can_grep_content(ctx) -> bool:
+    """
+    Check if --grep/--grep-only can be applied while reading the file, meaning
+    only the lines containing a query (and their context lines) have to be read.
+
+    Parameters:
+    ctx (AppContext):
+        the current invocation context
+
+    Returns:
+    (bool):
+        True if the lines without any query are never needed
+    """
+    if not ctx.arg_parser.file_queries or ctx.arg_parser.file_queries_replacement:
+        return False
+    if not (ctx.u_args[ARGS_GREP] or ctx.u_args[ARGS_GREP_ONLY]):
+        return False
+    if any(ctx.u_args[arg_id] for arg_id in (
+        ARGS_EOL, ARGS_PEEK, ARGS_STRINGS, ARGS_SPECIFIC_FORMATS, ARGS_B64E, ARGS_CLIP,
+    )):
+        return False
+    if any(trunc is not None for trunc in ctx.arg_parser.file_truncate):
+        return False
+    return not any(_alters_content(arg_id) for arg_id, _ in ctx.u_args)
+
+
+def can_peek_content(ctx) -> bool:
+    """
+    Check if --peek can be applied while reading the file, meaning only the
+    first and last lines have to be read.
+
+    Parameters:
+    ctx (AppContext):
+        the current invocation context
+
+    Returns:
+    (bool):
+        True if the content in between the peeked lines is never needed
+    """
+    if not ctx.u_args[ARGS_PEEK] or ctx.u_args[ARGS_STRINGS] or ctx.u_args[ARGS_SPECIFIC_FORMATS]:
+        return False
+    return all(trunc is None for trunc in ctx.arg_parser.file_truncate)
+
+
+def can_truncate_content(ctx) -> bool:
+    """
+    Check if the [start:stop:step] truncation can be applied while reading the file,
+    meaning the lines outside of the slice are never needed.
+
+    Parameters:
+    ctx (AppContext):
+        the current invocation context
+
+    Returns:
+    (bool):
+        True if only the lines within the slice have to be read
+    """
+    if ctx.u_args[ARGS_STRINGS] or ctx.u_args[ARGS_SPECIFIC_FORMATS]:
+        return False
+    return any(trunc is not None for trunc in ctx.arg_parser.file_truncate)
+
+
+def _warn_if_piped_into_itself(ctx, file_index: int) -> None:
+    # if the content of the file is empty, we check if maybe the file is its own pipe-target.
+    # in this case the stdout cannot be atty.
+    # also the repl would not produce this problem.
+    # also the temp-files (stdin, echo, url, ...) are (most likely) safe.
+    # an indicator would be if the file has just been modified to be empty (by the shell).
+    # checking if the file is an _unknown_file is not valid, because by using '--stdin'
+    # the stdin will be used to write the file
+    file_mtime = get_file_mtime(ctx.u_files[file_index].path)
+    if abs(datetime.timestamp(datetime.now()) - file_mtime) < 0.5:
+        logger(
+            'Warning: It looks like you are trying to pipe a file into itself.',
+            priority=logger.WARNING
+        )
+        logger('In this case you might have lost all data.', priority=logger.WARNING)
+
+
 def edit_raw_content(ctx, raw_content: bytes, file_index: int) -> None:
     """
     Write raw binary content, honouring --strings and --b64e.
@@ -259,7 +546,9 @@ def edit_raw_content(ctx, raw_content: bytes, file_index: int) -> None:
     sys.stdout.buffer.write(raw_content)
 
 
-def edit_content(ctx, file_index: int, line_offset: int) -> None:
+def edit_content(ctx, file_index: int, line_offset: int,
+                 excluded_by_peek: int = 0, line_numbers=None,
+                 strings_extracted: bool = False) -> None:
     """
     Apply all active transformation parameters to ctx.content and print it.
 
@@ -270,6 +559,15 @@ def edit_content(ctx, file_index: int, line_offset: int) -> None:
         index into ctx.u_files; negative values indicate the REPL
     line_offset (int):
         line-number offset when running in REPL mode
+    excluded_by_peek (int):
+        the amount of lines already excluded by --peek while reading the file,
+        in which case ctx.content only contains the peeked lines
+    line_numbers (Iterable[int]):
+        the original line numbers of ctx.content, in case the file has already
+        been truncated/peeked while reading it
+    strings_extracted (bool):
+        indicates if ctx.content already contains the strings found
+        in the file, in case they have been extracted while reading it
     """
     if not (
         ctx.content or
@@ -277,29 +575,17 @@ def edit_content(ctx, file_index: int, line_offset: int) -> None:
         file_index < 0 or
         ctx.u_files.is_temp_file(file_index)
     ):
-        # if the content of the file is empty, we check if maybe the file is its own pipe-target.
-        # in this case the stdout cannot be atty.
-        # also the repl would not produce this problem.
-        # also the temp-files (stdin, echo, url, ...) are (most likely) safe.
-        # an indicator would be if the file has just been modified to be empty (by the shell).
-        # checking if the file is an _unknown_file is not valid, because by using '--stdin'
-        # the stdin will be used to write the file
-        file_mtime = get_file_mtime(ctx.u_files[file_index].path)
-        if abs(datetime.timestamp(datetime.now()) - file_mtime) < 0.5:
-            logger(
-                'Warning: It looks like you are trying to pipe a file into itself.',
-                priority=logger.WARNING
-            )
-            logger('In this case you might have lost all data.', priority=logger.WARNING)
+        _warn_if_piped_into_itself(ctx, file_index)
         return
 
 
     if ctx.u_args[ARGS_STRINGS]:
-        ctx.content = get_strings(
-            ctx.content,
-            ctx.const_dic[DKW.STRINGS_MIN_SEQUENCE_LENGTH],
-            ctx.const_dic[DKW.STRINGS_DELIMETER],
-        )
+        if not strings_extracted:
+            ctx.content = get_strings(
+                ctx.content,
+                ctx.const_dic[DKW.STRINGS_MIN_SEQUENCE_LENGTH],
+                ctx.const_dic[DKW.STRINGS_DELIMETER],
+            )
     elif ctx.u_args[ARGS_EOL]:
         _apply_eol_suffixes(ctx)
 
@@ -307,40 +593,36 @@ def edit_content(ctx, file_index: int, line_offset: int) -> None:
         ctx.content = Formatter.format(ctx.content)
 
     if ctx.u_args[ARGS_NUMBER]:
-        ctx.content.prefixes[:] = [
-            get_line_prefix(ctx, i, file_index + 1) for i in range(
-                1 + line_offset,
-                len(ctx.content) + 1 + line_offset
+        ctx.content.prefixes = [
+            get_line_prefix(ctx, i, file_index + 1) for i in (
+                range(1 + line_offset, len(ctx.content) + 1 + line_offset)
+                if line_numbers is None else line_numbers
             )
         ]
 
     start, stop, step = ctx.arg_parser.file_truncate
-    if start is not None or stop is not None or step is not None:
+    if line_numbers is None and (start is not None or stop is not None or step is not None):
         slice_obj = slice(start, stop, step)
         ctx.content = ctx.content[slice_obj]
 
-    excluded_by_peek = 0
     if ctx.u_args[ARGS_PEEK] and len(ctx.content) > 2 * ctx.const_dic[DKW.PEEK_SIZE]:
         excluded_by_peek = len(ctx.content) - 2 * ctx.const_dic[DKW.PEEK_SIZE]
         peek_size = ctx.const_dic[DKW.PEEK_SIZE]
         ctx.content = ctx.content[:peek_size] + ctx.content[-peek_size:]
 
-    for arg, param in ctx.u_args:
-        handler = PRO_CONTENT_ACTIONS.get(arg)
-        if handler is not None:
-            handler(ctx, param)
+    _apply_content_plan(ctx)
 
     if ctx.u_args[ARGS_LLENGTH]:
-        ctx.content.prefixes[:] = [
+        ctx.content.prefixes = [
             get_line_length_prefix(ctx, prefix, line) for line, prefix, _ in ctx.content
         ]
 
     if ctx.u_args[ARGS_FILE_PREFIX]:
-        ctx.content.prefixes[:] = [
+        ctx.content.prefixes = [
             get_file_prefix(ctx, prefix, file_index) for prefix in ctx.content.prefixes
         ]
     elif ctx.u_args[ARGS_FFILE_PREFIX]:
-        ctx.content.prefixes[:] = [
+        ctx.content.prefixes = [
             get_file_prefix(ctx, prefix, file_index, hyper=True) for prefix in ctx.content.prefixes
         ]
 
@@ -364,3 +646,84 @@ def edit_content(ctx, file_index: int, line_offset: int) -> None:
         Clipboard.clipboard += '\n'.join(
             prefix + line + suffix for line, prefix, suffix in ctx.content
         )
+
+
+def _join_rows(rows):
+    """
+    join a stream of rows with line feeds, like the content would be joined
+    as a whole, yielding the text in batches.
+    """
+    rendered = (prefix + line + suffix for line, prefix, suffix in rows)
+    separator = ''
+    while True:
+        batch = list(islice(rendered, STREAM_BATCH_SIZE))
+        if not batch:
+            return
+        yield separator + '\n'.join(batch)
+        separator = '\n'
+
+
+def edit_content_stream(ctx, file_index: int, lines, line_offset: int = 0) -> None:
+    """
+    Apply all active transformation parameters to a stream of lines and print
+    them, without ever holding the entire file content in memory.
+    Expects can_stream_content(ctx) to be True.
+
+    Parameters:
+    ctx (AppContext):
+        the current invocation context
+    file_index (int):
+        index into ctx.u_files
+    lines (Iterable[str]):
+        the lines of the file
+    line_offset (int):
+        the amount of lines in front of the given lines (used for numbering)
+    """
+    lines = iter(lines)
+    first_line = next(lines, None)
+    if first_line is None:
+        if not (os.isatty(sys.stdout.fileno()) or ctx.u_files.is_temp_file(file_index)):
+            _warn_if_piped_into_itself(ctx, file_index)
+        return
+    lines = chain((first_line,), lines)
+
+    if ctx.u_args[ARGS_EOL]:
+        rows = (
+            (line.rstrip('\n\r'), '', _get_eol_suffix(ctx, line)) for line in lines
+        )
+    else:
+        rows = ((line, '', '') for line in lines)
+
+    if ctx.u_args[ARGS_NUMBER]:
+        rows = (
+            (line, get_line_prefix(ctx, i, file_index + 1), suffix)
+            for i, (line, _, suffix) in enumerate(rows, start=line_offset + 1)
+        )
+
+    rows = _stream_content_plan(ctx, rows)
+
+    if ctx.u_args[ARGS_LLENGTH]:
+        rows = (
+            (line, get_line_length_prefix(ctx, prefix, line), suffix)
+            for line, prefix, suffix in rows
+        )
+
+    if ctx.u_args[ARGS_FILE_PREFIX]:
+        rows = (
+            (line, get_file_prefix(ctx, prefix, file_index), suffix)
+            for line, prefix, suffix in rows
+        )
+    elif ctx.u_args[ARGS_FFILE_PREFIX]:
+        rows = (
+            (line, get_file_prefix(ctx, prefix, file_index, hyper=True), suffix)
+            for line, prefix, suffix in rows
+        )
+
+    if ctx.u_args[ARGS_B64E]:
+        print_base64(codecs.iterencode(
+            _join_rows(rows), ctx.arg_parser.file_encoding, 'ignore'
+        ))
+        ctx.u_files[file_index].set_contains_queried(False)
+        return
+
+    ctx.u_files[file_index].set_contains_queried(print_stream(ctx, rows))
@@ -2,32 +2,295 @@
 fileprocessor
 """
 
+import codecs
+import multiprocessing
 import os
+import shutil
 import sys
-from time import sleep
+import tempfile
+from itertools import chain
 
 from cat_win.src.const.argconstants import (
+    ARGS_B64E,
     ARGS_BINVIEW,
+    ARGS_CLIP,
     ARGS_DIFF,
     ARGS_EOL,
+    ARGS_GREP,
+    ARGS_GREP_ONLY,
     ARGS_HEXVIEW,
+    ARGS_MORE,
+    ARGS_NOBREAK,
     ARGS_PLAIN_ONLY,
     ARGS_RAW,
     ARGS_REVERSE,
+    ARGS_STRINGS,
     ARGS_WATCH
 )
 from cat_win.src.const.defaultconstants import DKW
 from cat_win.src.domain.contentbuffer import ContentBuffer
+from cat_win.src.persistence.lineindex import LineIndex
 from cat_win.src.processor.contentprocessor import (
+    can_grep_content,
+    can_passthrough_content,
+    can_peek_content,
+    can_stream_content,
+    can_truncate_content,
     edit_content,
+    edit_content_stream,
     edit_raw_content
 )
-from cat_win.src.processor.outputprocessor import print_raw_view
-from cat_win.src.service.cbase64 import decode_base64
-from cat_win.src.service.fileattributes import _convert_size, get_file_mtime
+from cat_win.src.processor.outputprocessor import print_base64, print_raw_view
+from cat_win.src.processor.registerwrapper import STREAM_CONTENT_ACTIONS
+from cat_win.src.service.cbase64 import yield_decoded_base64
+from cat_win.src.service.clipboard import Clipboard
+from cat_win.src.service.fileattributes import _convert_size
 from cat_win.src.service.helper.archiveviewer import display_archive
+from cat_win.src.service.helper.environment import on_windows_os
+from cat_win.src.service.helper.filewatcher import FileWatcher
 from cat_win.src.service.helper.iohelper import IoHelper, logger
-from cat_win.src.service.querymanager import remove_ansi_codes_from_line
+from cat_win.src.service.querymanager import build_bytes_prefilter, remove_ansi_codes_from_line
+from cat_win.src.service.strings import strip_ansi_chunks, yield_strings
+
+
+def _passthrough_file(ctx, file_index: int) -> bool:
+    """
+    Copy one file to the stdout as it is, if printing it line by line would not
+    change its content anyway.
+
+    Parameters:
+    ctx (AppContext):
+        The current invocation context, containing parsed arguments and other state.
+    file_index (int):
+        The index of the file in ctx.u_files to process.
+
+    Returns:
+    (bool):
+        True if the file has been copied, False if it has to be processed.
+    """
+    # the stdout would translate the line feeds on windows
+    if on_windows_os:
+        return False
+    try:
+        if codecs.lookup(ctx.arg_parser.file_encoding).name != \
+            codecs.lookup(sys.stdout.encoding).name:
+            return False
+    except (LookupError, TypeError):
+        return False
+    path = ctx.u_files[file_index].path
+    src_length = IoHelper.scan_plain_lines(
+        path, ctx.arg_parser.file_encoding,
+        allow_esc=os.isatty(sys.stdout.fileno()) or not ctx.const_dic[DKW.STRIP_COLOR_ON_PIPE],
+    )
+    # empty files are processed, to warn about files being piped into themselves
+    if src_length <= 0:
+        return False
+    sys.stdout.flush()
+    IoHelper.copy_file(path, sys.stdout.fileno(), src_length)
+    if IoHelper.read_file_slice(path, slice(src_length-1, src_length)) != b'\n':
+        print()
+    ctx.u_files[file_index].set_contains_queried(False)
+    return True
+
+
+def _grep_file(ctx, file_index: int) -> bool:
+    """
+    Read only the lines of one file, that may contain a query (--grep/--grep-only),
+    and the context lines around them, and process them.
+
+    Parameters:
+    ctx (AppContext):
+        The current invocation context, containing parsed arguments and other state.
+    file_index (int):
+        The index of the file in ctx.u_files to process.
+
+    Returns:
+    (bool):
+        True if the file has been processed, False if the queries cannot be
+        searched for within the raw file.
+    """
+    candidate_pattern = build_bytes_prefilter(
+        ctx.arg_parser.file_queries, ctx.arg_parser.file_encoding
+    )
+    if candidate_pattern is None:
+        return False
+    lines, line_numbers = IoHelper.grep_lines(
+        ctx.u_files[file_index].path,
+        candidate_pattern,
+        0 if ctx.u_args[ARGS_GREP_ONLY] else ctx.const_dic[DKW.GREP_CONTEXT_LINES],
+        file_encoding=ctx.arg_parser.file_encoding,
+    )
+    if not lines:
+        ctx.u_files[file_index].set_contains_queried(False)
+        return True
+    if not os.isatty(sys.stdout.fileno()) and ctx.const_dic[DKW.STRIP_COLOR_ON_PIPE]:
+        lines = list(map(remove_ansi_codes_from_line, lines))
+    ctx.content = ContentBuffer.from_lines(lines)
+    edit_content(ctx, file_index, 0, line_numbers=line_numbers)
+    return True
+
+
+def _stream_file(ctx, file_index: int, errors: str = 'strict') -> None:
+    """
+    Stream one (large) file line by line through the content processor.
+
+    Parameters:
+    ctx (AppContext):
+        The current invocation context, containing parsed arguments and other state.
+    file_index (int):
+        The index of the file in ctx.u_files to process.
+    errors (str):
+        The error handling used to decode the first block of the file.
+        Every following block falls back to replacing/ignoring unknown bytes,
+        marking the file as not plaintext.
+
+    Raises:
+    UnicodeError:
+        if the file cannot be decoded strictly and only plaintext files
+        are to be shown, before anything of the file is printed.
+    """
+    if errors == 'strict' and ctx.u_args[ARGS_PLAIN_ONLY]:
+        # the first lines would already be printed, when an unknown byte
+        # is found later on, so the entire file has to be decoded beforehand
+        for _ in IoHelper.yield_blocks(
+            ctx.u_files[file_index].path, ctx.arg_parser.file_encoding
+        ):
+            pass
+    lines = IoHelper.yield_lines(
+        ctx.u_files[file_index].path,
+        file_encoding=ctx.arg_parser.file_encoding,
+        errors=errors,
+        keepends=ctx.u_args[ARGS_EOL],
+        fallback_errors='ignore' if ctx.const_dic[DKW.IGNORE_UNKNOWN_BYTES] else 'replace',
+        on_fallback=lambda: ctx.u_files[file_index].set_plaintext(plain=False),
+    )
+    if not os.isatty(sys.stdout.fileno()) and ctx.const_dic[DKW.STRIP_COLOR_ON_PIPE]:
+        lines = map(remove_ansi_codes_from_line, lines)
+    edit_content_stream(ctx, file_index, lines)
+
+
+def _strings_file(ctx, file_index: int) -> None:
+    """
+    Find the strings of one file within its raw bytes, read in chunks,
+    without decoding the file (like 'strings').
+
+    Parameters:
+    ctx (AppContext):
+        The current invocation context, containing parsed arguments and other state.
+    file_index (int):
+        The index of the file in ctx.u_files to process.
+    """
+    chunks = IoHelper.yield_file_chunks(ctx.u_files[file_index].path)
+    if ctx.const_dic[DKW.STRINGS_ENCODING] == 's' and \
+        not os.isatty(sys.stdout.fileno()) and ctx.const_dic[DKW.STRIP_COLOR_ON_PIPE]:
+        chunks = strip_ansi_chunks(chunks)
+    lines = yield_strings(
+        chunks,
+        ctx.const_dic[DKW.STRINGS_MIN_SEQUENCE_LENGTH],
+        ctx.const_dic[DKW.STRINGS_DELIMETER],
+        file_encoding=ctx.arg_parser.file_encoding,
+        encoding=ctx.const_dic[DKW.STRINGS_ENCODING],
+        offsets=ctx.const_dic[DKW.STRINGS_OFFSETS],
+    )
+    ctx.content = ContentBuffer.from_lines(lines)
+    edit_content(ctx, file_index, 0, strings_extracted=True)
+
+
+def _get_line_index(ctx, file_index: int):
+    """
+    Load the persisted index of the line offsets of one file.
+
+    Parameters:
+    ctx (AppContext):
+        The current invocation context, containing parsed arguments and other state.
+    file_index (int):
+        The index of the file in ctx.u_files.
+
+    Returns:
+    (LineIndex):
+        The up to date index of the file, None if the line index is disabled.
+    """
+    cache_size = ctx.const_dic[DKW.LINE_INDEX_CACHE_SIZE]
+    if cache_size <= 0:
+        return None
+    return LineIndex.load(ctx.u_files[file_index].path, ctx.arg_parser.file_encoding, cache_size)
+
+
+def _peek_file(ctx, file_index: int, errors: str = 'strict') -> bool:
+    """
+    Read only the first and last lines of one file (--peek) and process them.
+
+    Parameters:
+    ctx (AppContext):
+        The current invocation context, containing parsed arguments and other state.
+    file_index (int):
+        The index of the file in ctx.u_files to process.
+    errors (str):
+        The error handling used to decode the file.
+
+    Returns:
+    (bool):
+        True if the file has been processed, False if the file is too short
+        to be peeked, meaning it has to be read entirely.
+    """
+    path = ctx.u_files[file_index].path
+    peek_size = ctx.const_dic[DKW.PEEK_SIZE]
+    line_index = _get_line_index(ctx, file_index)
+    if line_index is not None:
+        line_count = line_index.line_count
+    else:
+        line_count = IoHelper.count_lines(path, ctx.arg_parser.file_encoding)
+    if line_count <= 2 * peek_size:
+        return False
+    head, tail = IoHelper.peek_lines(
+        path, peek_size,
+        file_encoding=ctx.arg_parser.file_encoding,
+        errors=errors,
+        keepends=ctx.u_args[ARGS_EOL],
+    )
+    lines = head + tail
+    if not os.isatty(sys.stdout.fileno()) and ctx.const_dic[DKW.STRIP_COLOR_ON_PIPE]:
+        lines = list(map(remove_ansi_codes_from_line, lines))
+    ctx.content = ContentBuffer.from_lines(lines)
+    edit_content(
+        ctx, file_index, 0, line_count - 2 * peek_size,
+        chain(range(1, peek_size + 1), range(line_count - peek_size + 1, line_count + 1)),
+    )
+    return True
+
+
+def _truncate_file(ctx, file_index: int, errors: str = 'strict') -> None:
+    """
+    Read only the lines of one file within the [start:stop:step] slice and process them.
+
+    Parameters:
+    ctx (AppContext):
+        The current invocation context, containing parsed arguments and other state.
+    file_index (int):
+        The index of the file in ctx.u_files to process.
+    errors (str):
+        The error handling used to decode the file.
+    """
+    file_slice = slice(*ctx.arg_parser.file_truncate)
+    # the index is only worth loading (or building) if the lines have to be counted,
+    # or if more lines than in between two indexed offsets have to be skipped
+    use_line_index = (
+        (file_slice.step or 1) < 0 or
+        (file_slice.start or 0) >= LineIndex.SAMPLE_RATE or
+        any(i is not None and i < 0 for i in (file_slice.start, file_slice.stop))
+    )
+    lines, line_numbers = IoHelper.read_lines_slice(
+        ctx.u_files[file_index].path,
+        file_slice,
+        file_encoding=ctx.arg_parser.file_encoding,
+        errors=errors,
+        keepends=ctx.u_args[ARGS_EOL],
+        line_index=_get_line_index(ctx, file_index) if use_line_index else None,
+    )
+    if not os.isatty(sys.stdout.fileno()) and ctx.const_dic[DKW.STRIP_COLOR_ON_PIPE]:
+        lines = list(map(remove_ansi_codes_from_line, lines))
+    ctx.content = ContentBuffer.from_lines(lines)
+    edit_content(ctx, file_index, 0, line_numbers=line_numbers)
 
 
 def edit_file(ctx, file_index: int) -> None:
@@ -41,6 +304,9 @@ def edit_file(ctx, file_index: int) -> None:
         The index of the file in ctx.u_files to process.
     """
     if ctx.u_args[ARGS_RAW]:
+        if ctx.u_args[ARGS_B64E] and not (ctx.u_args[ARGS_STRINGS] or ctx.u_args[ARGS_CLIP]):
+            print_base64(IoHelper.yield_file_chunks(ctx.u_files[file_index].path))
+            return
         raw_content = IoHelper.read_file(ctx.u_files[file_index].path, True)
         edit_raw_content(ctx, raw_content, file_index)
         return
@@ -49,7 +315,45 @@ def edit_file(ctx, file_index: int) -> None:
         ctx.u_files[file_index].file_size < ctx.const_dic[DKW.LARGE_FILE_SIZE]
     ) else ctx.u_files[file_index].file_size
 
+    # the strings of large files are found within their bytes, without decoding them,
+    # the byte offsets and 16-bit strings can only be found within the bytes of any file
+    strings_content = ctx.u_args[ARGS_STRINGS] and not ctx.u_args[ARGS_PLAIN_ONLY] and (
+        file_size >= 0 or
+        ctx.const_dic[DKW.STRINGS_OFFSETS] or ctx.const_dic[DKW.STRINGS_ENCODING] != 's'
+    ) and IoHelper.supports_byte_lines(ctx.arg_parser.file_encoding)
+
+    # large files are copied as they are, when no parameter alters the content,
+    # or only the lines containing a query are read, when grepping,
+    # or streamed line by line, when no parameter needs the entire content,
+    # or only their first and last lines are read, when peeking,
+    # or only the lines within the [start:stop:step] slice are read, when truncating
+    passthrough_content = file_size >= 0 and can_passthrough_content(ctx) and \
+        IoHelper.supports_byte_lines(ctx.arg_parser.file_encoding)
+    grep_content = file_size >= 0 and not passthrough_content and can_grep_content(ctx) and \
+        IoHelper.supports_byte_lines(ctx.arg_parser.file_encoding)
+    stream_content = file_size >= 0 and can_stream_content(ctx)
+    peek_content = file_size >= 0 and not stream_content and can_peek_content(ctx) and \
+        IoHelper.supports_byte_lines(ctx.arg_parser.file_encoding)
+    truncate_content = file_size >= 0 and not (stream_content or peek_content) and \
+        can_truncate_content(ctx) and \
+        IoHelper.supports_byte_lines(ctx.arg_parser.file_encoding)
+
     try:
+        if strings_content:
+            _strings_file(ctx, file_index)
+            return
+        if passthrough_content and _passthrough_file(ctx, file_index):
+            return
+        if grep_content and _grep_file(ctx, file_index):
+            return
+        if stream_content:
+            _stream_file(ctx, file_index)
+            return
+        if peek_content and _peek_file(ctx, file_index):
+            return
+        if truncate_content:
+            _truncate_file(ctx, file_index)
+            return
         file_content = IoHelper.read_file(
             ctx.u_files[file_index].path,
             file_encoding=ctx.arg_parser.file_encoding,
@@ -72,6 +376,9 @@ def edit_file(ctx, file_index: int) -> None:
             priority=logger.ERROR,
         )
         return
+    except BrokenPipeError:
+        # the streamed content is written inside the try-block
+        raise
     except (OSError, UnicodeError):
         ctx.u_files[file_index].set_plaintext(plain=False)
         if ctx.u_args[ARGS_PLAIN_ONLY]:
@@ -79,6 +386,23 @@ def edit_file(ctx, file_index: int) -> None:
         if display_archive(ctx.u_files[file_index].path, _convert_size):
             return
         try:
+            if stream_content:
+                _stream_file(
+                    ctx, file_index,
+                    'ignore' if ctx.const_dic[DKW.IGNORE_UNKNOWN_BYTES] else 'replace',
+                )
+                return
+            if peek_content and _peek_file(
+                ctx, file_index,
+                'ignore' if ctx.const_dic[DKW.IGNORE_UNKNOWN_BYTES] else 'replace',
+            ):
+                return
+            if truncate_content:
+                _truncate_file(
+                    ctx, file_index,
+                    'ignore' if ctx.const_dic[DKW.IGNORE_UNKNOWN_BYTES] else 'replace',
+                )
+                return
             file_content = IoHelper.read_file(
                 ctx.u_files[file_index].path,
                 file_encoding=ctx.arg_parser.file_encoding,
@@ -99,7 +423,8 @@ def edit_file(ctx, file_index: int) -> None:
 
 def decode_files_base64(ctx, tmp_file_helper) -> None:
     """
-    Decode every file in ctx.u_files from base64 into a temporary file.
+    Decode every file in ctx.u_files from base64 into a temporary file,
+    streaming the content in chunks.
 
     Parameters:
     ctx (AppContext):
@@ -110,19 +435,16 @@ def decode_files_base64(ctx, tmp_file_helper) -> None:
     for i, file in enumerate(ctx.u_files):
         try:
             tmp_file_path = tmp_file_helper.generate_temp_file_name()
-            f_read_content = IoHelper.read_file(
-                file.path,
-                file_encoding=ctx.arg_parser.file_encoding,
-                errors='replace',
-            )
-            if ctx.u_args[ARGS_RAW]:
-                IoHelper.write_file(tmp_file_path, decode_base64(f_read_content))
-            else:
-                IoHelper.write_file(
-                    tmp_file_path,
-                    decode_base64(f_read_content, True, ctx.arg_parser.file_encoding),
+            decoded_chunks = yield_decoded_base64(codecs.iterdecode(
+                IoHelper.yield_file_chunks(file.path), ctx.arg_parser.file_encoding, 'replace'
+            ))
+            if not ctx.u_args[ARGS_RAW]:
+                # drop every byte sequence that is invalid within the file encoding
+                decoded_chunks = codecs.iterencode(
+                    codecs.iterdecode(decoded_chunks, ctx.arg_parser.file_encoding, 'ignore'),
                     ctx.arg_parser.file_encoding,
                 )
+            IoHelper.write_file_chunks(tmp_file_path, decoded_chunks)
             ctx.u_files[i].path = tmp_file_path
         except (OSError, UnicodeError):
             logger(
@@ -131,6 +453,115 @@ def decode_files_base64(ctx, tmp_file_helper) -> None:
             )
 
 
+# the state shared with the worker processes of edit_files_parallel(),
+# inherited when forking instead of being pickled
+_parallel_state = {}
+
+
+def _process_file(ctx, file_index: int, raw_view_mode) -> None:
+    if raw_view_mode is None:
+        edit_file(ctx, file_index)
+    else:
+        print_raw_view(ctx, file_index, raw_view_mode)
+
+
+def _process_file_job(file_index: int) -> tuple:
+    """
+    Process one file within a worker process, while writing the output
+    into a temporary file instead of the stdout.
+
+    Parameters:
+    file_index (int):
+        The index of the file in ctx.u_files to process.
+
+    Returns:
+    (out_file, contains_queried, plaintext, clipboard) (tuple):
+        the path of the file containing the output (None if there is none),
+        and the state of the processed file to merge back into the context
+    """
+    ctx = _parallel_state['ctx']
+    out_fd, out_file = tempfile.mkstemp(dir=_parallel_state['out_dir'])
+    stdout_fd = sys.stdout.fileno()
+    stdout_backup = os.dup(stdout_fd)
+    Clipboard.clipboard = ''
+    try:
+        os.dup2(out_fd, stdout_fd)
+        try:
+            _process_file(ctx, file_index, _parallel_state['raw_view_mode'])
+        finally:
+            sys.stdout.flush()
+            os.dup2(stdout_backup, stdout_fd)
+        empty_output = os.fstat(out_fd).st_size == 0
+    finally:
+        os.close(stdout_backup)
+        os.close(out_fd)
+    if empty_output:
+        os.remove(out_file)
+        out_file = None
+    file = ctx.u_files[file_index]
+    return (out_file, file.contains_queried, file.plaintext, Clipboard.clipboard)
+
+
+def can_edit_files_parallel(ctx) -> bool:
+    """
+    Check if the files can be processed by multiple worker processes, meaning
+    the output does not depend on the order of processing or a terminal.
+
+    Parameters:
+    ctx (AppContext):
+        The current invocation context, containing parsed arguments and other state.
+
+    Returns:
+    (bool):
+        True if the files can be processed in parallel
+    """
+    if ctx.const_dic[DKW.PARALLEL_JOBS] < 2 or len(ctx.u_files) < 2:
+        return False
+    if on_windows_os or 'fork' not in multiprocessing.get_all_start_methods():
+        return False
+    if os.isatty(sys.stdout.fileno()) or ctx.u_args[ARGS_MORE]:
+        return False
+    # every found query would prompt the user to continue
+    if len(ctx.arg_parser.file_queries) > len(ctx.arg_parser.file_queries_replacement):
+        return any(ctx.u_args[arg_id] for arg_id in (ARGS_GREP, ARGS_GREP_ONLY, ARGS_NOBREAK))
+    return True
+
+
+def edit_files_parallel(ctx, file_indices, raw_view_mode) -> None:
+    """
+    Process the files by multiple worker processes and print their output
+    in the given order, as soon as it is available.
+    Expects can_edit_files_parallel(ctx) to be True.
+
+    Parameters:
+    ctx (AppContext):
+        The current invocation context, containing parsed arguments and other state.
+    file_indices (range):
+        The indices of the files in ctx.u_files to process, in the order to print them.
+    raw_view_mode (str):
+        the mode of print_raw_view(), or None to use edit_file()
+    """
+    jobs = min(ctx.const_dic[DKW.PARALLEL_JOBS], len(file_indices))
+    out_dir = tempfile.mkdtemp()
+    _parallel_state.update(ctx=ctx, out_dir=out_dir, raw_view_mode=raw_view_mode)
+    # buffered output would otherwise be written by every worker process
+    sys.stdout.flush()
+    try:
+        with multiprocessing.get_context('fork').Pool(jobs) as pool:
+            results = pool.imap(_process_file_job, file_indices)
+            for file_index, result in zip(file_indices, results):
+                out_file, contains_queried, plaintext, clipboard = result
+                ctx.u_files[file_index].set_contains_queried(contains_queried)
+                ctx.u_files[file_index].set_plaintext(plaintext)
+                Clipboard.clipboard += clipboard
+                if out_file is not None:
+                    IoHelper.copy_file(out_file, sys.stdout.fileno())
+                    os.remove(out_file)
+    finally:
+        _parallel_state.clear()
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
 def edit_files(ctx) -> None:
     """
     Iterate over all files in ctx.u_files and process each one.
@@ -150,27 +581,168 @@ def edit_files(ctx) -> None:
             'X' if raw_view_mode[1].isupper() else 'x'
         )
 
-    def _process(i: int) -> None:
-        if raw_view_mode is None:
-            edit_file(ctx, i)
-        else:
-            print_raw_view(ctx, i, raw_view_mode)
+    if ctx.u_args[ARGS_WATCH] and not ctx.u_args[ARGS_DIFF]:
+        watch_files(ctx, range(start, end, step), raw_view_mode)
+    else:
+        _process_files(ctx, range(start, end, step), raw_view_mode)
 
-    for i in range(start, end, step):
-        _process(i)
 
-    if ctx.u_args[ARGS_WATCH] and not ctx.u_args[ARGS_DIFF]:
-        mtimes = {f.path: get_file_mtime(f.path) for f in ctx.u_files}
+def _process_files(ctx, file_indices, raw_view_mode) -> None:
+    if can_edit_files_parallel(ctx):
+        edit_files_parallel(ctx, file_indices, raw_view_mode)
+    else:
+        for i in file_indices:
+            _process_file(ctx, i, raw_view_mode)
+
+
+def can_append_content(ctx) -> bool:
+    """
+    Check if the lines appended to a file can be processed on their own,
+    meaning no parameter depends on the lines printed before.
+
+    Parameters:
+    ctx (AppContext):
+        The current invocation context, containing parsed arguments and other state.
+
+    Returns:
+    (bool):
+        True if only the appended lines of a file have to be processed
+    """
+    if not IoHelper.supports_byte_lines(ctx.arg_parser.file_encoding):
+        return False
+    # the appended lines cannot be encoded on their own
+    if ctx.u_args[ARGS_B64E] or not can_stream_content(ctx):
+        return False
+    return not any(arg_id in STREAM_CONTENT_ACTIONS for arg_id, _ in ctx.u_args)
+
+
+def _get_append_state(ctx, file_index: int, file_stat: tuple) -> tuple:
+    """
+    Get the state of a file, that is needed to only process the lines appended to it.
+
+    Parameters:
+    ctx (AppContext):
+        The current invocation context, containing parsed arguments and other state.
+    file_index (int):
+        The index of the file in ctx.u_files.
+    file_stat (tuple):
+        the stats of the file (as returned by FileWatcher.get_stat()),
+        taken before the file has been processed
+
+    Returns:
+    (offset, line_count, tail) (tuple):
+        the byte offset behind the last line, the amount of lines and the
+        bytes in front of the offset, or None if the last line is not
+        terminated by a line break (it could still be continued), or if
+        the file has changed since file_stat was taken (it is unknown which
+        of the lines have been processed)
+    """
+    if file_stat is None:
+        return None
+    path = ctx.u_files[file_index].path
+    file_size = file_stat[1]
+    try:
+        if os.path.getsize(path) != file_size:
+            return None
+        tail = IoHelper.read_file_slice(path, slice(max(file_size - 64, 0), file_size))
+        line_breaks = IoHelper.get_encoded_line_breaks(ctx.arg_parser.file_encoding)
+        if tail and (
+            not tail.endswith(tuple(line_breaks)) or
+            tail.endswith('\r'.encode(ctx.arg_parser.file_encoding))
+        ):
+            return None
+        line_count = IoHelper.count_lines(path, ctx.arg_parser.file_encoding)
+        if os.path.getsize(path) != file_size:
+            return None
+        return (file_size, line_count, tail)
+    except OSError:
+        return None
+
+
+def _append_file(ctx, file_index: int, append_state: tuple) -> tuple:
+    """
+    Process only the lines appended to one file (like 'tail -f').
+
+    Parameters:
+    ctx (AppContext):
+        The current invocation context, containing parsed arguments and other state.
+    file_index (int):
+        The index of the file in ctx.u_files to process.
+    append_state (tuple):
+        the state of the file, as returned by _get_append_state()
+
+    Returns:
+    (tuple):
+        the new state of the file, or None if the content in front of the
+        appended lines has changed and the file has to be processed entirely
+    """
+    offset, line_count, tail = append_state
+    path = ctx.u_files[file_index].path
+    try:
+        if IoHelper.read_file_slice(path, slice(offset - len(tail), offset)) != tail:
+            return None
+        while True:
+            # the appended region is read block by block, however large it is
+            lines, new_offset = IoHelper.read_appended_lines(
+                path, offset, ctx.arg_parser.file_encoding,
+                errors='ignore' if ctx.const_dic[DKW.IGNORE_UNKNOWN_BYTES] else 'replace',
+                keepends=ctx.u_args[ARGS_EOL],
+            )
+            if new_offset == offset:
+                break
+            tail = IoHelper.read_file_slice(path, slice(max(new_offset - 64, 0), new_offset))
+            offset = new_offset
+            if not os.isatty(sys.stdout.fileno()) and ctx.const_dic[DKW.STRIP_COLOR_ON_PIPE]:
+                lines = list(map(remove_ansi_codes_from_line, lines))
+            edit_content_stream(ctx, file_index, lines, line_offset=line_count)
+            line_count += len(lines)
+    except OSError:
+        return None
+    return (offset, line_count, tail)
+
+
+def watch_files(ctx, file_indices, raw_view_mode) -> None:
+    """
+    Process the files, then watch them for changes and process them again,
+    until interrupted. If a file only grew, only the appended lines are
+    processed, if possible.
+
+    Parameters:
+    ctx (AppContext):
+        The current invocation context, containing parsed arguments and other state.
+    file_indices (range):
+        The indices of the files in ctx.u_files to watch, in the order to print them.
+    raw_view_mode (str):
+        the mode of print_raw_view(), or None to use edit_file()
+    """
+    append_content = raw_view_mode is None and can_append_content(ctx)
+    # the stats are taken before the files are processed, so that any change
+    # made while processing them is still noticed
+    with FileWatcher([ctx.u_files[i].path for i in file_indices]) as watcher:
+        _process_files(ctx, file_indices, raw_view_mode)
+        append_states = {
+            i: _get_append_state(ctx, i, watcher.stats[ctx.u_files[i].path])
+            for i in file_indices
+        } if append_content else {}
         try:
             while True:
-                sleep(2)
-                for i in range(start, end, step):
-                    if get_file_mtime(ctx.u_files[i].path) != mtimes[ctx.u_files[i].path]:
-                        mtimes[ctx.u_files[i].path] = get_file_mtime(ctx.u_files[i].path)
-                        logger(
-                            f"File '{ctx.u_files[i].displayname}' has been modified. Reloading ...",
-                            priority=logger.INFO,
-                        )
-                        _process(i)
+                changes = watcher.wait_for_changes()
+                for i in file_indices:
+                    if ctx.u_files[i].path not in changes:
+                        continue
+                    old_stat, new_stat = changes[ctx.u_files[i].path]
+                    if append_states.get(i) is not None and old_stat is not None and \
+                        new_stat is not None and new_stat[0] == old_stat[0] and \
+                        new_stat[1] > old_stat[1]:
+                        append_states[i] = _append_file(ctx, i, append_states[i])
+                        if append_states[i] is not None:
+                            continue
+                    logger(
+                        f"File '{ctx.u_files[i].displayname}' has been modified. Reloading ...",
+                        priority=logger.INFO,
+                    )
+                    _process_file(ctx, i, raw_view_mode)
+                    if append_content:
+                        append_states[i] = _get_append_state(ctx, i, new_stat)
         except KeyboardInterrupt:
             pass
@@ -3,6 +3,7 @@ outputprocessor
 """
 
 from collections import deque
+from itertools import islice
 
 from cat_win.src.const.argconstants import (
     ARGS_GREP,
@@ -15,15 +16,22 @@ from cat_win.src.const.argconstants import (
 )
 from cat_win.src.const.colorconstants import CKW
 from cat_win.src.const.defaultconstants import DKW
+from cat_win.src.service.cbase64 import yield_encoded_base64
 from cat_win.src.service.helper.iohelper import IoHelper
 from cat_win.src.service.querymanager import (
     QueryManager,
     _build_ansi_restore,
-    _map_display_pos,
+    _build_display_offsets,
     remove_ansi_codes_from_line,
     replace_queries_in_line
 )
-from cat_win.src.service.rawviewer import get_raw_view_lines_gen
+from cat_win.src.service.rawviewer import (
+    get_raw_view_blocks_gen,
+    get_raw_view_lines_gen,
+    get_raw_view_peek
+)
+
+STREAM_BATCH_SIZE = 4096
 
 
 def _print_excluded_by_peek(prefix_len: int, excluded_by_peek: int, color_dic: dict) -> None:
@@ -90,25 +98,42 @@ def print_raw_view(ctx, file_index: int, mode: str) -> None:
         either 'x', 'X' for hexadecimal (lower- or upper case letters),
         or 'b' for binary
     """
-    queue = []
-    skipped = 0
+    peek_size = ctx.const_dic[DKW.PEEK_SIZE]
 
     print(ctx.u_files[file_index].displayname, ':', sep='')
+    if ctx.u_args[ARGS_PEEK] and all(trunc is None for trunc in ctx.arg_parser.file_truncate):
+        head, excluded_by_peek, tail = get_raw_view_peek(ctx, file_index, mode, peek_size)
+        print(*head, sep='\n')
+        if excluded_by_peek:
+            _print_excluded_by_peek(21, excluded_by_peek, ctx.color_dic)
+        if tail:
+            print(*tail, sep='\n')
+        print()
+        return
+
+    if not ctx.u_args[ARGS_PEEK]:
+        # the rows are rendered and written in blocks
+        for block in get_raw_view_blocks_gen(ctx, file_index, mode):
+            print(block)
+        print()
+        return
+
+    queue = deque(maxlen=peek_size)
+    skipped = 0
+
     raw_gen = get_raw_view_lines_gen(ctx, file_index, mode)
     print(next(raw_gen))  # header is always available
     for line in raw_gen:
         skipped += 1
-        if ctx.u_args[ARGS_PEEK] and skipped > ctx.const_dic[DKW.PEEK_SIZE]:
+        if ctx.u_args[ARGS_PEEK] and skipped > peek_size:
             queue.append(line)
-            if len(queue) > ctx.const_dic[DKW.PEEK_SIZE]:
-                queue = queue[1:]
             continue
         print(line)
     if queue:
-        if skipped > 2 * ctx.const_dic[DKW.PEEK_SIZE]:
+        if skipped > 2 * peek_size:
             _print_excluded_by_peek(
                 21,
-                skipped - 2 * ctx.const_dic[DKW.PEEK_SIZE],
+                skipped - 2 * peek_size,
                 ctx.color_dic
             )
         print('\n'.join(queue))
@@ -137,10 +162,7 @@ def print_file(ctx, stepper, excluded_by_peek: int) -> bool:
 
     u_args = ctx.u_args
     arg_parser = ctx.arg_parser
-    const_dic = ctx.const_dic
-    color_dic = ctx.color_dic
 
-    reset_all = color_dic[CKW.RESET_ALL]
     content_len = len(content) // 2
 
 
@@ -170,13 +192,82 @@ def print_file(ctx, stepper, excluded_by_peek: int) -> bool:
         return False
 
 
+    return _print_queried_rows(ctx, stepper, content, content_len, excluded_by_peek)
+
+
+def print_stream(ctx, rows) -> bool:
+    """
+    Print a stream of rows, applying search/replace/grep filtering and keyword highlighting.
+
+    Parameters:
+    ctx (AppContext):
+        the app context
+    rows (Iterable[Tuple[str, str, str]]):
+        the (line, prefix, suffix) rows to print
+
+    Returns:
+    (bool):
+        True if any queried keyword/pattern was found in the content
+    """
+    if any([ctx.arg_parser.file_queries, ctx.u_args[ARGS_GREP], ctx.u_args[ARGS_GREP_ONLY]]):
+        return _print_queried_rows(ctx, None, rows, -1, 0)
+
+    rendered = (prefix + line + suffix for line, prefix, suffix in rows)
+    while True:
+        batch = list(islice(rendered, STREAM_BATCH_SIZE))
+        if not batch:
+            return False
+        print(*batch, sep='\n')
+
+
+def print_base64(chunks) -> None:
+    """
+    Print a stream of bytes encoded to base64 (as one line),
+    without holding the entire content in memory.
+
+    Parameters:
+    chunks (Iterable[bytes]):
+        the content to encode
+    """
+    for encoded_chunk in yield_encoded_base64(chunks):
+        print(encoded_chunk.decode('ascii'), end='')
+    print()
+
+
+def _print_queried_rows(ctx, stepper, rows, content_len: int, excluded_by_peek: int) -> bool:
+    """
+    Print rows line by line, applying search/replace/grep filtering and keyword highlighting.
+
+    Parameters:
+    ctx (AppContext):
+        the app context
+    stepper:
+        More instance for paged output
+    rows (Iterable[Tuple[str, str, str]]):
+        the (line, prefix, suffix) rows to print
+    content_len (int):
+        the row index at which the --peek separator will be printed
+    excluded_by_peek (int):
+        lines excluded by --peek
+
+    Returns:
+    (bool):
+        True if any queried keyword/pattern was found in the content
+    """
+    u_args = ctx.u_args
+    arg_parser = ctx.arg_parser
+    const_dic = ctx.const_dic
+    color_dic = ctx.color_dic
+
+    reset_all = color_dic[CKW.RESET_ALL]
+
     string_finder = QueryManager(arg_parser.file_queries[len(arg_parser.file_queries_replacement):])
 
     contains_queried = False
     last_grep_line = -const_dic[DKW.GREP_CONTEXT_LINES] - 1
     grep_context_dq = deque(maxlen=const_dic[DKW.GREP_CONTEXT_LINES])
 
-    for c_idx, (line, line_prefix, line_suffix) in enumerate(content):
+    for c_idx, (line, line_prefix, line_suffix) in enumerate(rows):
         if c_idx == content_len:
             print_excluded_by_peek(ctx, excluded_by_peek)
 
@@ -247,6 +338,10 @@ def print_file(ctx, stepper, excluded_by_peek: int) -> bool:
             #   - active ANSI state at each plain position (restore after CLOSE)
             #   - positions where RESET_ALL occurred (re-inject colour inside span)
             ansi_restore, ansi_set = _build_ansi_restore(reset_all, display_line)
+            # the display positions of the original line, shifted by the length of
+            # the codes already inserted in front of (or at) the plain position
+            display_offsets = _build_display_offsets(display_line)
+            inserted = []
             found_closes = (pos for pos, code in intervals if code == CKW.RESET_FOUND)
             matched_closes = (pos for pos, code in intervals if code == CKW.RESET_MATCHED)
             span_end = {}
@@ -255,8 +350,12 @@ def print_file(ctx, stepper, excluded_by_peek: int) -> bool:
                     span_end[(pos, code)] = next(found_closes)
                 elif code == CKW.MATCHED:
                     span_end[(pos, code)] = next(matched_closes)
+            def _display_pos(plain_pos: int) -> int:
+                return display_offsets[min(plain_pos, len(display_offsets) - 1)] + sum(
+                    length for pos, length in inserted if pos <= plain_pos
+                )
             for kw_pos, kw_code in intervals:
-                mapped = _map_display_pos(display_line, kw_pos)
+                mapped = _display_pos(kw_pos)
                 if kw_code in (CKW.FOUND, CKW.MATCHED):
                     # Re-inject open colour before any char inside the span that
                     # was preceded by an ANSI code, so the keyword colour wins.
@@ -264,16 +363,19 @@ def print_file(ctx, stepper, excluded_by_peek: int) -> bool:
                     for r in sorted(
                         [r for r in ansi_set if kw_pos < r < close_pos], reverse=True
                     ):
-                        r_mapped = _map_display_pos(display_line, r)
+                        r_mapped = _display_pos(r)
                         display_line = (
                             display_line[:r_mapped] + color_dic[kw_code] + display_line[r_mapped:]
                         )
+                        inserted.append((r, len(color_dic[kw_code])))
                     display_line = display_line[:mapped] + color_dic[kw_code] + display_line[mapped:]
+                    inserted.append((kw_pos, len(color_dic[kw_code])))
                 else:
                     restore = ansi_restore.get(kw_pos, '')
                     display_line = (
                         display_line[:mapped] + color_dic[kw_code] + restore + display_line[mapped:]
                     )
+                    inserted.append((kw_pos, len(color_dic[kw_code]) + len(restore)))
 
         if u_args[ARGS_MORE]:
             stepper.add_line(line_prefix + display_line + line_suffix)
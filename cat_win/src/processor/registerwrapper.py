@@ -26,3 +26,12 @@ register_pro = _wrapper_factory(PRO_CONTENT_ACTIONS)
 
 POST_CONTENT_ACTIONS = {}
 register_post = _wrapper_factory(POST_CONTENT_ACTIONS)
+
+STREAM_CONTENT_ACTIONS = {}
+register_stream = _wrapper_factory(STREAM_CONTENT_ACTIONS)
+
+LINE_MAPPER_ACTIONS = {}
+register_line_mapper = _wrapper_factory(LINE_MAPPER_ACTIONS)
+
+LINE_FILTER_ACTIONS = {}
+register_line_filter = _wrapper_factory(LINE_FILTER_ACTIONS)
@@ -3,6 +3,13 @@ cbase64
 """
 
 import base64
+import binascii
+
+# the amount of bytes encoded at once (a multiple of 3 to not produce padding)
+B64_ENCODE_CHUNK_SIZE = 786432  # 768kb
+B64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+# every byte that is not part of the base64 alphabet (e.g. whitespace, line breaks, padding)
+B64_IGNORED_BYTES = bytes(byte for byte in range(256) if byte not in B64_ALPHABET)
 
 
 def encode_base64(content, decode_bytes: bool = False,
@@ -51,16 +58,63 @@ def decode_base64(content: str, decode_bytes: bool = False,
     decoded_content (bytes|str):
         the base64 decoded content as string or bytes depending on decode_bytes
     """
-    chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
-
-    # base64.b64decode() would raise an error on corrupted base64.
-    # the following algorithm decodes as much as possible:
-    binary_str = ''.join(f"{chars.index(char):06b}" for char in content if char in chars)
-    if len(binary_str) % 8 != 0:
-        binary_str = binary_str[:-(len(binary_str)%8)]
-    decoded_content = bytearray()
-    decoded_content.extend([int(binary_str[i:i+8], 2) for i in range(0, len(binary_str), 8)])
+    decoded_content = b''.join(yield_decoded_base64([content]))
 
     if decode_bytes:
         return decoded_content.decode(file_encoding, errors='ignore')
-    return decoded_content
+    return bytearray(decoded_content)
+
+
+def yield_encoded_base64(chunks):
+    """
+    Encode a stream of bytes to base64, without holding
+    the entire content in memory.
+
+    Parameters:
+    chunks (Iterable[bytes]):
+        the content to encode
+
+    Yields:
+    encoded_chunk (bytes):
+        the next part of the base64 encoded content,
+        only the last one contains padding
+    """
+    pending = b''
+    for chunk in chunks:
+        pending += chunk
+        if len(pending) < B64_ENCODE_CHUNK_SIZE:
+            continue
+        aligned = len(pending) - len(pending) % 3
+        yield base64.b64encode(pending[:aligned])
+        pending = pending[aligned:]
+    if pending:
+        yield base64.b64encode(pending)
+
+
+def yield_decoded_base64(chunks):
+    """
+    Decode a stream of base64 content, without holding the entire content in memory.
+    Like decode_base64() every character outside of the base64 alphabet
+    (whitespace, line breaks, padding, ...) is ignored, such that corrupted
+    base64 is decoded as far as possible.
+
+    Parameters:
+    chunks (Iterable[bytes|str]):
+        the base64 content to decode
+
+    Yields:
+    decoded_chunk (bytes):
+        the next part of the decoded content
+    """
+    pending = b''
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('ascii', errors='ignore')
+        pending += chunk.translate(None, B64_IGNORED_BYTES)
+        aligned = len(pending) - len(pending) % 4
+        if aligned:
+            yield binascii.a2b_base64(pending[:aligned])
+            pending = pending[aligned:]
+    # a single remaining character does not make up a full byte
+    if len(pending) > 1:
+        yield binascii.a2b_base64(pending + b'=' * (4 - len(pending)))
@@ -3,20 +3,476 @@ checksum
 """
 
 import hashlib
+import re
 import zlib
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 from cat_win.src.const.colorconstants import CKW
+from cat_win.src.const.regex import RE_MANIFEST_BSD, RE_MANIFEST_GNU
 
+CHECKSUM_BUFFER_SIZE = 4194304  # 4mb
+MERKLE_BLOCK_SIZE = 4194304  # 4mb
+MERKLE_DIGEST_SIZE = 32
+# the amount of changed byte ranges to display at most
+MAX_CHANGED_RANGES = 16
+DEFAULT_CHECKSUM_ALGORITHMS = 'crc32,md5,sha1,sha256,sha512'
+# the algorithms assumed for manifests, if the length of a hexdigest is ambiguous
+DEFAULT_MANIFEST_ALGORITHMS = 'crc32,md5,sha1,sha224,sha256,sha384,sha512'
 
-def get_checksum_from_file(file: Path, color_dic: dict) -> str:
+
+class _ZlibChecksum:
     """
-    Calculates and returns the CRC32, MD5, SHA1, SHA256, SHA512
-    hashes of a file.
+    wraps a zlib checksum function to behave like a hashlib hash object.
+    """
+    def __init__(self, checksum_func) -> None:
+        self.checksum_func = checksum_func
+        self.value = checksum_func(b'')
+
+    def update(self, data) -> None:
+        """
+        Parameters:
+        data (bytes-like):
+            the data to continue the checksum with
+        """
+        self.value = self.checksum_func(data, self.value)
+
+    def hexdigest(self) -> str:
+        """
+        Returns:
+        (str):
+            the checksum as (uppercase) hexadecimal string
+        """
+        return f"{(self.value & 0xFFFFFFFF):08X}"
+
+
+def get_merkle_root(blocks: list) -> bytes:
+    """
+    combine the block digests pairwise to the root of a merkle tree.
+
+    Parameters:
+    blocks (list):
+        the digests (bytes) of all blocks, at least one
+
+    Returns:
+    (bytes):
+        the root digest
+    """
+    level = blocks
+    while len(level) > 1:
+        level = [
+            hashlib.blake2b(
+                level[i] + level[i + 1], digest_size=MERKLE_DIGEST_SIZE, person=b'catw-node'
+            ).digest() if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+    return level[0]
+
+
+class _MerkleChecksum:
+    """
+    hashes the data in fixed-size blocks and combines the block digests to
+    a merkle tree, such that changed blocks can be located by their digests.
+    """
+    def __init__(self, block_size: int = MERKLE_BLOCK_SIZE) -> None:
+        self.block_size = block_size
+        self.size = 0
+        # the digests of all complete blocks
+        self.blocks = []
+        self.block = bytearray()
+
+    @staticmethod
+    def _hash_block(data) -> bytes:
+        return hashlib.blake2b(data, digest_size=MERKLE_DIGEST_SIZE, person=b'catw-block').digest()
+
+    def update(self, data) -> None:
+        """
+        Parameters:
+        data (bytes-like):
+            the data to continue the checksum with
+        """
+        view = memoryview(data)
+        self.size += len(view)
+        while view:
+            take = min(len(view), self.block_size - len(self.block))
+            if not self.block and take == self.block_size:
+                # aligned blocks are hashed without copying them
+                self.blocks.append(self._hash_block(view[:take]))
+            else:
+                self.block += view[:take]
+                if len(self.block) == self.block_size:
+                    self.blocks.append(self._hash_block(self.block))
+                    self.block.clear()
+            view = view[take:]
+
+    def get_blocks(self) -> list:
+        """
+        Returns:
+        (list):
+            the digests of all blocks, including the trailing partial block
+        """
+        if self.block or not self.blocks:
+            return self.blocks + [self._hash_block(self.block)]
+        return list(self.blocks)
+
+    def hexdigest(self) -> str:
+        """
+        Returns:
+        (str):
+            the root of the merkle tree as hexadecimal string
+        """
+        return get_merkle_root(self.get_blocks()).hex()
+
+
+# the constructor of each supported algorithm (variable length digests are not supported)
+CHECKSUM_ALGORITHMS = {
+    'crc32': partial(_ZlibChecksum, zlib.crc32),
+    'adler32': partial(_ZlibChecksum, zlib.adler32),
+    'merkle': _MerkleChecksum,
+}
+CHECKSUM_ALGORITHMS.update(
+    (algorithm, partial(hashlib.new, algorithm))
+    for algorithm in sorted(hashlib.algorithms_guaranteed)
+    if not algorithm.startswith('shake')
+)
+# the length of the hexdigest of each algorithm
+DIGEST_SIZES = {
+    algorithm: len(constructor().hexdigest())
+    for algorithm, constructor in CHECKSUM_ALGORITHMS.items()
+}
+# the exceptions meaning a listed file does not exist
+MISSING_FILE_ERRORS = ('FileNotFoundError', 'NotADirectoryError')
+
+
+def get_algorithms(algorithms: str) -> list:
+    """
+    parse a comma separated list of checksum algorithms.
+
+    Parameters:
+    algorithms (str):
+        the algorithms, e.g. 'sha256,crc32' or 'SHA-256,sha3-256' (not case sensitive)
+
+    Returns:
+    (list):
+        the unique names of the algorithms, in the given order
+
+    Raises:
+    ValueError:
+        if an algorithm is not supported
+    """
+    names = []
+    for algorithm in algorithms.split(','):
+        algorithm = algorithm.strip().lower()
+        # e.g. 'sha-256', 'sha-1' or 'md-5', and 'sha3-256' or 'sha512-224'
+        name = next((
+            name for name in (algorithm, algorithm.replace('-', ''), algorithm.replace('-', '_'))
+            if name in CHECKSUM_ALGORITHMS
+        ), None)
+        if name is None:
+            raise ValueError(f"unknown checksum algorithm '{algorithm}'")
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def calc_checksums(file: Path, algorithms: list, buf_size: int = CHECKSUM_BUFFER_SIZE,
+                   hash_objs: dict = None) -> dict:
+    """
+    calculate the checksums of a file, reading it only once.
 
     Parameters:
     file (Path):
         a string representation of a file (-path)
+    algorithms (list):
+        the names of the algorithms, as returned by get_algorithms()
+    buf_size (int):
+        the amount of bytes to read at once
+    hash_objs (dict):
+        if given, is filled with the hash object of each algorithm,
+        e.g. to retrieve the block digests of the 'merkle' algorithm
+
+    Returns:
+    (dict):
+        the hexdigest of each algorithm
+
+    Raises:
+    OSError:
+        if the file cannot be read
+    """
+    hashes = [CHECKSUM_ALGORITHMS[algorithm]() for algorithm in algorithms]
+    buffer = bytearray(buf_size)
+    view = memoryview(buffer)
+    with open(file, 'rb', buffering=0) as raw_f:
+        while True:
+            size = raw_f.readinto(buffer)
+            if not size:
+                break
+            data = view[:size]
+            for hash_obj in hashes:
+                hash_obj.update(data)
+    if hash_objs is not None:
+        hash_objs.update(zip(algorithms, hashes))
+    return {algorithm: hash_obj.hexdigest() for algorithm, hash_obj in zip(algorithms, hashes)}
+
+
+def _get_checksums(file: Path, algorithms: list, digest_cache) -> tuple:
+    """
+    get the checksums of a file, from the digest cache if the file has not changed.
+
+    Returns:
+    (key, checksums, blocks) (tuple):
+        the key of the file to cache the checksums with (or None),
+        the hexdigest of each algorithm, or the name of the exception
+        if the file cannot be read, and the (block_size, size, digests)
+        of the blocks hashed for the 'merkle' algorithm (or None)
+    """
+    try:
+        if digest_cache is None:
+            return (None, calc_checksums(file, algorithms), None)
+        key = digest_cache.get_key(file)
+        checksums = digest_cache.get(key)
+        missing = [algorithm for algorithm in algorithms if algorithm not in checksums]
+        blocks = None
+        if missing:
+            hash_objs = {}
+            checksums.update(calc_checksums(file, missing, hash_objs=hash_objs))
+            # files changing while being read are not cached
+            if digest_cache.get_key(file) != key:
+                key = None
+            elif 'merkle' in hash_objs:
+                merkle = hash_objs['merkle']
+                blocks = (merkle.block_size, merkle.size, b''.join(merkle.get_blocks()))
+        return (key, {algorithm: checksums[algorithm] for algorithm in algorithms}, blocks)
+    except OSError as exc:
+        return (None, type(exc).__name__, None)
+
+
+def get_changed_ranges(previous: tuple, current: tuple) -> list:
+    """
+    compare the block digests of two states of a file.
+
+    Parameters:
+    previous (tuple):
+        the (block_size, size, digests) of the previous state
+    current (tuple):
+        the (block_size, size, digests) of the current state
+
+    Returns:
+    (list):
+        the (start, end) byte ranges (end exclusive) of the blocks that changed,
+        were appended or truncated, or None if the states are not comparable
+    """
+    block_size, size = current[:2]
+    if previous[0] != block_size:
+        return None
+    old_digests, new_digests = previous[2], current[2]
+    end = max(previous[1], size)
+    ranges = []
+    for offset in range(0, max(len(old_digests), len(new_digests)), MERKLE_DIGEST_SIZE):
+        next_offset = offset + MERKLE_DIGEST_SIZE
+        if old_digests[offset:next_offset] == new_digests[offset:next_offset]:
+            continue
+        start = offset // MERKLE_DIGEST_SIZE * block_size
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], min(start + block_size, end))
+        else:
+            ranges.append((start, min(start + block_size, end)))
+    return ranges
+
+
+def _format_ranges(ranges: list) -> str:
+    if not ranges:
+        return 'none'
+    formatted = ', '.join(f"{start:#x}-{end-1:#x}" for start, end in ranges[:MAX_CHANGED_RANGES])
+    if len(ranges) > MAX_CHANGED_RANGES:
+        formatted += f", ... ({len(ranges) - MAX_CHANGED_RANGES} more)"
+    return formatted
+
+
+def _pop_result(pending: deque, digest_cache) -> tuple:
+    task, future = pending.popleft()
+    key, checksums, blocks = future.result()
+    if key is not None:
+        digest_cache.put(key, checksums)
+    if blocks is not None:
+        previous = digest_cache.put_blocks(task[0], blocks)
+        changed_ranges = None if previous is None else get_changed_ranges(previous, blocks)
+        if changed_ranges is not None:
+            checksums = dict(checksums, changed=_format_ranges(changed_ranges))
+    return (task, checksums)
+
+
+def _yield_ordered_checksums(tasks, jobs: int, digest_cache):
+    """
+    calculate the checksums of the tasks by multiple threads,
+    holding only a few of them in memory at once.
+
+    Parameters:
+    tasks (Iterable[tuple]):
+        the file (-path) and the list of algorithms as the first two elements of each task
+
+    Yields:
+    (task, checksums) (tuple):
+        each task and its checksums as returned by _get_checksums(), in the given order
+    """
+    jobs = max(jobs, 1)
+    if digest_cache is not None:
+        digest_cache.load()
+    with ThreadPoolExecutor(jobs) as pool:
+        # only a few files are submitted ahead, to yield the results as soon as possible
+        pending = deque()
+        for task in tasks:
+            pending.append((task, pool.submit(_get_checksums, task[0], task[1], digest_cache)))
+            if len(pending) >= 2 * jobs:
+                yield _pop_result(pending, digest_cache)
+        while pending:
+            yield _pop_result(pending, digest_cache)
+
+
+def yield_checksums(files: list, algorithms: list, jobs: int = 1, digest_cache=None):
+    """
+    calculate the checksums of multiple files, using multiple threads
+    (hashlib releases the GIL while hashing large buffers).
+
+    Parameters:
+    files (list):
+        the files (-paths) to calculate the checksums of
+    algorithms (list):
+        the names of the algorithms, as returned by get_algorithms()
+    jobs (int):
+        the amount of files to read at once
+    digest_cache (DigestCache):
+        the cache to look up and store the checksums in, or None
+
+    Yields:
+    checksums (dict|str):
+        the checksums of each file in the given order, as returned by calc_checksums(),
+        or the name of the exception if the file cannot be read.
+        If the 'merkle' algorithm is used with a digest cache, the byte ranges that
+        changed since the file has last been hashed are included as 'changed'
+    """
+    tasks = ((file, algorithms) for file in files)
+    for _, checksums in _yield_ordered_checksums(tasks, jobs, digest_cache):
+        yield checksums
+
+
+def _get_manifest_algorithm(manifest: Path, hexdigest: str) -> str:
+    """
+    guess the algorithm of a manifest entry by the length of its hexdigest,
+    preferring the algorithm named by the manifest file (e.g. 'SHA256SUMS', 'b2sums').
+    """
+    candidates = [
+        algorithm for algorithm, digest_size in DIGEST_SIZES.items()
+        if digest_size == len(hexdigest)
+    ]
+    manifest_name = Path(manifest).name.lower().replace('-', '_').replace('b2', 'blake2b')
+    for algorithm in sorted(candidates, key=len, reverse=True):
+        if algorithm in manifest_name:
+            return algorithm
+    for algorithm in get_algorithms(DEFAULT_MANIFEST_ALGORITHMS):
+        if algorithm in candidates:
+            return algorithm
+    return candidates[0] if candidates else None
+
+
+def parse_manifest(manifest: Path, file_encoding: str = 'utf-8'):
+    """
+    read a checksum manifest line by line, in the format written by
+    'sha256sum', 'md5sum', ... (optionally using --tag).
+
+    Parameters:
+    manifest (Path):
+        a string representation of the manifest file (-path)
+    file_encoding (str):
+        the encoding of the manifest
+
+    Yields:
+    (file, algorithm, hexdigest) (tuple):
+        the file (-path) of each entry, the name of the algorithm and the
+        expected (lowercase) hexdigest, or (None, None, line) if the line
+        is improperly formatted
+
+    Raises:
+    OSError:
+        if the manifest cannot be read
+    """
+    with open(manifest, 'r', encoding=file_encoding, errors='replace') as manifest_f:
+        for line in manifest_f:
+            line = line.rstrip('\r\n')
+            if not line.strip() or line.startswith('#'):
+                continue
+            bsd_match = RE_MANIFEST_BSD.match(line)
+            gnu_match = RE_MANIFEST_GNU.match(line)
+            if bsd_match:
+                tag, file, hexdigest = bsd_match.groups()
+                try:
+                    algorithm = get_algorithms(tag)[0]
+                except ValueError:
+                    algorithm = None
+            elif gnu_match:
+                hexdigest, file = gnu_match.groups()
+                algorithm = _get_manifest_algorithm(manifest, hexdigest)
+            else:
+                algorithm = None
+            if algorithm is None or DIGEST_SIZES[algorithm] != len(hexdigest):
+                yield (None, None, line)
+                continue
+            # escaped file names contain '\\' and '\n'
+            if line.startswith('\\'):
+                file = re.sub(r'\\(.)', lambda m: '\n' if m.group(1) == 'n' else m.group(1), file)
+            yield (file, algorithm, hexdigest.lower())
+
+
+def verify_manifest(manifest: Path, color_dic: dict, file_encoding: str = 'utf-8',
+                    jobs: int = 1, digest_cache=None) -> Counter:
+    """
+    verify the checksums listed in a manifest (like 'sha256sum -c') and
+    print the result of each entry.
+
+    Parameters:
+    manifest (Path):
+        a string representation of the manifest file (-path)
+    color_dic (dict):
+        color dictionary containing all configured ANSI color values
+    file_encoding (str):
+        the encoding of the manifest
+    jobs (int):
+        the amount of files to read at once
+    digest_cache (DigestCache):
+        the cache to look up and store the checksums in, or None
+
+    Returns:
+    (Counter):
+        the amount of entries per result ('OK', 'FAILED', 'MISSING', 'INVALID')
+    """
+    results = Counter()
+    def _get_tasks():
+        for file, algorithm, hexdigest in parse_manifest(manifest, file_encoding):
+            if file is None:
+                results['INVALID'] += 1
+                continue
+            yield (file, [algorithm], hexdigest)
+
+    template = f"{color_dic[CKW.CHECKSUM]}%s: %s{color_dic[CKW.RESET_ALL]}"
+    for (file, algorithms, hexdigest), checksums in _yield_ordered_checksums(
+        _get_tasks(), jobs, digest_cache):
+        if isinstance(checksums, str):
+            result = 'MISSING' if checksums in MISSING_FILE_ERRORS else 'FAILED'
+            message = result if result == 'MISSING' else f"{result} ({checksums})"
+        else:
+            result = message = 'OK' if checksums[algorithms[0]].lower() == hexdigest else 'FAILED'
+        print(template % (file, message))
+        results[result] += 1
+    return results
+
+
+def format_checksums(checksums, color_dic: dict) -> str:
+    """
+    Parameters:
+    checksums (dict|str):
+        the hexdigest of each algorithm, or an error message
     color_dic (dict):
         color dictionary containing all configured ANSI color values
 
@@ -24,37 +480,41 @@ def get_checksum_from_file(file: Path, color_dic: dict) -> str:
     checksum (str):
         a formatted string representation of all checksums calculated
     """
-    buf_size = 65536  # 64kb
-    md5 = hashlib.md5()
-    sha1 = hashlib.sha1()
-    sha256 = hashlib.sha256()
-    sha512 = hashlib.sha512()
-    crc32 = 0
+    if isinstance(checksums, str):
+        return checksums
+    width = max([9] + [len(algorithm) + 2 for algorithm in checksums])
+    template = f"\t{color_dic[CKW.CHECKSUM]}%s{color_dic[CKW.RESET_ALL]}\n"
+    return ''.join(
+        template % f"{algorithm.upper() + ':': <{width}}{hexdigest}"
+        for algorithm, hexdigest in checksums.items()
+    )
+
 
+def get_checksum_from_file(file: Path, color_dic: dict,
+                           algorithms: str = DEFAULT_CHECKSUM_ALGORITHMS) -> str:
+    """
+    Calculates and returns the CRC32, MD5, SHA1, SHA256, SHA512
+    (or any other given) hashes of a file.
+
+    Parameters:
+    file (Path):
+        a string representation of a file (-path)
+    color_dic (dict):
+        color dictionary containing all configured ANSI color values
+    algorithms (str):
+        the comma separated names of the algorithms to use
+
+    Returns:
+    checksum (str):
+        a formatted string representation of all checksums calculated
+    """
     try:
-        with open(file, 'rb') as raw_f:
-            while True:
-                data = raw_f.read(buf_size)
-                if not data:
-                    break
-                md5.update(data)
-                sha1.update(data)
-                sha256.update(data)
-                sha512.update(data)
-                crc32 = zlib.crc32(data, crc32)
+        checksums = calc_checksums(file, get_algorithms(algorithms))
     except OSError as exc:
         return type(exc).__name__
-    crc32 = f"{(crc32 & 0xFFFFFFFF):08X}"
-
-    template = f"\t{color_dic[CKW.CHECKSUM]}%s{color_dic[CKW.RESET_ALL]}\n"
-    checksum =  template % f"{'CRC32:' : <9}{str(crc32)}"
-    checksum += template % f"{'MD5:'   : <9}{str(md5.hexdigest())}"
-    checksum += template % f"{'SHA1:'  : <9}{str(sha1.hexdigest())}"
-    checksum += template % f"{'SHA256:': <9}{str(sha256.hexdigest())}"
-    checksum += template % f"{'SHA512:': <9}{str(sha512.hexdigest())}"
-    return checksum
+    return format_checksums(checksums, color_dic)
 
-def print_checksum(file: Path, color_dic: dict) -> None:
+def print_checksum(file: Path, color_dic: dict, checksums=None) -> None:
     """
     print the information retrieved by get_checksum_from_file()
 
@@ -63,6 +523,11 @@ def print_checksum(file: Path, color_dic: dict) -> None:
         a string representation of a file (-path)
     color_dic (dict):
         color dictionary containing all configured ANSI color values
+    checksums (dict|str):
+        the already calculated checksums of the file, as yielded by yield_checksums()
     """
     print(f"{color_dic[CKW.CHECKSUM]}Checksum of '{file}':{color_dic[CKW.RESET_ALL]}")
-    print(get_checksum_from_file(file, color_dic))
+    if checksums is None:
+        print(get_checksum_from_file(file, color_dic))
+    else:
+        print(format_checksums(checksums, color_dic))
@@ -0,0 +1,180 @@
+"""
+filewatcher
+"""
+
+import os
+import select
+import struct
+from pathlib import Path
+from time import sleep
+
+try:
+    import ctypes
+    import ctypes.util
+
+    libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    inotify_init1 = libc.inotify_init1 # throws AttributeError on non-Linux OS
+    inotify_init1.argtypes = [ctypes.c_int]
+    inotify_init1.restype = ctypes.c_int
+    inotify_add_watch = libc.inotify_add_watch
+    inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    inotify_add_watch.restype = ctypes.c_int
+
+    INOTIFY_MODULE_ERROR = False
+except (ImportError, OSError, AttributeError):
+    INOTIFY_MODULE_ERROR = True
+
+IN_MODIFY      = 0x00000002
+IN_ATTRIB      = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM  = 0x00000040
+IN_MOVED_TO    = 0x00000080
+IN_CREATE      = 0x00000100
+IN_DELETE      = 0x00000200
+IN_Q_OVERFLOW  = 0x00004000
+IN_WATCH_MASK  = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | \
+                 IN_CREATE | IN_DELETE
+INOTIFY_EVENT  = struct.Struct('iIII')
+
+
+class FileWatcher:
+    """
+    watches files for changes. On Linux the parent directories get watched
+    using inotify, otherwise the stats of all files get polled.
+    """
+    def __init__(self, files: list, poll_interval: float = 2.0,
+                 debounce_interval: float = 0.02) -> None:
+        """
+        Parameters:
+        files (list):
+            the (paths of the) files to watch
+        poll_interval (float):
+            the seconds to wait between two polls, if inotify is not available
+        debounce_interval (float):
+            the seconds to wait for further events, after one has been received
+        """
+        self.files = list(dict.fromkeys(files))
+        self.poll_interval = poll_interval
+        self.debounce_interval = debounce_interval
+        self.stats = {file: FileWatcher.get_stat(file) for file in self.files}
+        self.inotify_fd = -1
+        # the watched files of each watched directory: wd -> {name: [files]}
+        self.watched_names = {}
+        self._init_inotify()
+
+    @staticmethod
+    def get_stat(file: Path) -> tuple:
+        """
+        get the stats of a file, that indicate a change
+
+        Parameters:
+        file (Path):
+            a string representation of a file (-path)
+
+        Returns:
+        (tuple):
+            the inode, size and modified time of the file, None if it does not exist
+        """
+        try:
+            f_stat = os.stat(file)
+        except OSError:
+            return None
+        return (f_stat.st_ino, f_stat.st_size, f_stat.st_mtime_ns)
+
+    def _init_inotify(self) -> None:
+        if INOTIFY_MODULE_ERROR:
+            return
+        inotify_fd = inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if inotify_fd < 0:
+            return
+        watched_names = {}
+        for file in self.files:
+            # the directory is watched, so that replacing the file (e.g. when saving
+            # it within an editor) does not remove the watch
+            dir_name, name = os.path.split(os.path.realpath(file))
+            w_d = inotify_add_watch(inotify_fd, os.fsencode(dir_name), IN_WATCH_MASK)
+            if w_d < 0:
+                os.close(inotify_fd)
+                return
+            watched_names.setdefault(w_d, {}).setdefault(os.fsencode(name), []).append(file)
+        self.inotify_fd = inotify_fd
+        self.watched_names = watched_names
+
+    @property
+    def uses_inotify(self) -> bool:
+        """
+        Returns:
+        (bool):
+            True if the files are watched using inotify
+        """
+        return self.inotify_fd >= 0
+
+    def _read_events(self) -> set:
+        """
+        read all pending inotify events
+
+        Returns:
+        (set):
+            the watched files, that might have changed
+        """
+        candidates = set()
+        while True:
+            try:
+                buffer = os.read(self.inotify_fd, 65536)
+            except BlockingIOError:
+                return candidates
+            offset = 0
+            while offset < len(buffer):
+                w_d, mask, _, name_len = INOTIFY_EVENT.unpack_from(buffer, offset)
+                offset += INOTIFY_EVENT.size
+                name = buffer[offset:offset+name_len].rstrip(b'\x00')
+                offset += name_len
+                if mask & IN_Q_OVERFLOW:
+                    candidates.update(self.files)
+                    continue
+                candidates.update(self.watched_names.get(w_d, {}).get(name, ()))
+
+    def _collect_changes(self, candidates) -> dict:
+        changes = {}
+        for file in candidates:
+            new_stat = FileWatcher.get_stat(file)
+            if new_stat != self.stats[file]:
+                changes[file] = (self.stats[file], new_stat)
+                self.stats[file] = new_stat
+        return changes
+
+    def wait_for_changes(self) -> dict:
+        """
+        block until at least one of the files has changed
+
+        Returns:
+        (dict):
+            the changed files, mapped to their previous and current stats
+            (as returned by get_stat())
+        """
+        while True:
+            if self.uses_inotify:
+                select.select([self.inotify_fd], [], [])
+                # writes usually come in bursts, so they are handled at once
+                sleep(self.debounce_interval)
+                candidates = self._read_events()
+            else:
+                sleep(self.poll_interval)
+                candidates = self.files
+            changes = self._collect_changes(candidates)
+            if changes:
+                return changes
+
+    def close(self) -> None:
+        """
+        stop watching the files
+        """
+        if self.inotify_fd >= 0:
+            os.close(self.inotify_fd)
+            self.inotify_fd = -1
+
+    def __enter__(self) -> 'FileWatcher':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
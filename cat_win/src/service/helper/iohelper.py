@@ -2,18 +2,24 @@
 iohelper
 """
 
+import codecs
 import contextlib
 import ctypes
-import io
 import logging
 import os
+import re
 import sys
+from collections import deque
+from itertools import islice
 from pathlib import Path
 
 from cat_win.src.const.colorconstants import CKW
 from cat_win.src.service.helper.environment import on_windows_os
 from cat_win.src.service.helper.progressbar import PBar
 
+# every character str.splitlines() considers a line boundary (besides '\r\n')
+LINE_BREAKS = '\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+
 
 class StatusLogger:
     """
@@ -283,6 +289,48 @@ def create_file(file: Path, content: str, file_encoding: str) -> bool:
     return True
 
 
+class FileSlice:
+    """
+    a read-only view of a slice of the bytes of a file, equivalent to
+    IoHelper.read_file(src_file, True)[file_slice].
+    the bytes are only read when the view gets indexed or sliced, such that
+    files larger than the available memory can be processed in chunks.
+    """
+
+    def __init__(self, src_file: Path, file_slice: slice = slice(None)) -> None:
+        self.raw_f = open(src_file, 'rb')
+        self.positions = range(*file_slice.indices(self.raw_f.seek(0, os.SEEK_END)))
+
+    def __enter__(self) -> 'FileSlice':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, key):
+        positions = self.positions[key]
+        if isinstance(positions, int):
+            self.raw_f.seek(positions)
+            return self.raw_f.read(1)[0]
+        if not positions:
+            return b''
+        first, last = min(positions[0], positions[-1]), max(positions[0], positions[-1])
+        self.raw_f.seek(first)
+        content = self.raw_f.read(last - first + 1)
+        if positions.step > 0:
+            return content[::positions.step]
+        return content[::-1][::-positions.step]
+
+    def close(self) -> None:
+        """
+        close the underlying file.
+        """
+        self.raw_f.close()
+
+
 class IoHelper:
     """
     IoHelper
@@ -313,21 +361,24 @@ class IoHelper:
             the content of the given file
         """
         if file_length >= 0 and not binary:
-            src_content, src_length = '', 0
+            # the incremental decoder keeps multi-byte sequences split by the
+            # block boundaries, the blocks are only joined once at the end
+            decoder = codecs.getincrementaldecoder(file_encoding)(errors)
+            src_blocks, src_length = [], 0
             with PBar(
                 file_length, prefix='Reading file',
                 length=100, fill_l='━', fill_r='╺', erase=True, decimals=5
             ).init() as p_bar, open(src_file, 'rb') as file:
-                buf_reader = io.BufferedReader(file, buffer_size=262144000) # 250MB
                 while True:
-                    byte_chunk = buf_reader.read(262144000)
-                    src_length += 262144000
+                    byte_chunk = file.read(16777216) # 16MB
                     if not byte_chunk:
                         break
+                    src_length += len(byte_chunk)
                     p_bar(src_length)
-                    src_content += byte_chunk.decode(file_encoding, errors)
+                    src_blocks.append(decoder.decode(byte_chunk))
+                src_blocks.append(decoder.decode(b'', True))
                 p_bar(file_length)
-            return src_content
+            return ''.join(src_blocks)
         if not binary:
             # Keep original line endings instead of universal-newline normalization.
             with open(src_file, 'r', encoding=file_encoding, errors=errors, newline='') as file:
@@ -385,6 +436,680 @@ class IoHelper:
         finally:
             file.close()
 
+    @staticmethod
+    def yield_file_chunks(src_file: Path, chunk_size: int = 1048576):
+        """
+        Yields the bytes of a given file in chunks, without reading
+        the entire file into memory.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        chunk_size (int):
+            the amount of bytes to read at once
+
+        Yields:
+        byte_chunk (bytes):
+            the next chunk of the file, only the last one may be shorter
+        """
+        with open(src_file, 'rb') as raw_f:
+            while True:
+                byte_chunk = raw_f.read(chunk_size)
+                if not byte_chunk:
+                    break
+                yield byte_chunk
+
+    @staticmethod
+    def yield_blocks(src_file: Path, file_encoding: str = 'utf-8', errors: str = 'strict',
+                     fallback_errors: str = None, block_size: int = 1048576, offset: int = 0,
+                     on_fallback=None):
+        """
+        Yields the decoded content of a given file in blocks, that each end with
+        a complete line (except for the last one). Joining the blocks is equivalent
+        to read_file(...), and so is joining the lines of every block.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        file_encoding (str):
+            an encoding to open the file with
+        errors (str):
+            the type of error handling when decoding the file
+        fallback_errors (str):
+            the type of error handling to switch to, when a block after the
+            first one cannot be decoded. If None the error will be raised.
+        block_size (int):
+            the amount of bytes to read and decode at once
+        offset (int):
+            the byte offset to start reading at (should be the start of a line)
+        on_fallback (callable):
+            called once without arguments, when switching to the fallback_errors
+
+        Yields:
+        text (str):
+            the next block of complete lines of the given file
+        """
+        decoder = codecs.getincrementaldecoder(file_encoding)(errors)
+        # the parts of the last line are only joined, once it is complete,
+        # so a single long line is not copied again with every block
+        carry, first_block = [], True
+        with open(src_file, 'rb') as raw_f:
+            if offset:
+                raw_f.seek(offset)
+            while True:
+                byte_chunk = raw_f.read(block_size)
+                try:
+                    text = decoder.decode(byte_chunk, not byte_chunk)
+                except UnicodeDecodeError:
+                    if first_block or fallback_errors is None:
+                        raise
+                    # the decoder keeps its buffered bytes on failure,
+                    # so the same chunk can simply be decoded again
+                    decoder.errors = fallback_errors
+                    text = decoder.decode(byte_chunk, not byte_chunk)
+                    if on_fallback is not None:
+                        on_fallback()
+                first_block = False
+                if not byte_chunk:
+                    text = ''.join(carry) + text
+                    if text:
+                        yield text
+                    return
+                # the last line is held back, as it may continue in the next block
+                # (this includes a trailing '\r' that may be followed by '\n')
+                search_end = len(text) - text.endswith('\r')
+                length = max(text.rfind(line_break, 0, search_end) for line_break in LINE_BREAKS) + 1
+                if not length:
+                    carry.append(text)
+                    continue
+                carry.append(text[:length])
+                yield ''.join(carry)
+                carry = [text[length:]]
+
+    @staticmethod
+    def yield_lines(src_file: Path, file_encoding: str = 'utf-8', errors: str = 'strict',
+                    keepends: bool = False, fallback_errors: str = None,
+                    block_size: int = 1048576, offset: int = 0, on_fallback=None):
+        """
+        Yields the lines of a given file, equivalent to read_file(...).splitlines().
+        The file gets decoded block by block, so only a single block has to be
+        held in memory at any time.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        file_encoding (str):
+            an encoding to open the file with
+        errors (str):
+            the type of error handling when decoding the file
+        keepends (bool):
+            indicates if the line endings should be kept
+        fallback_errors (str):
+            the type of error handling to switch to, when a block after the
+            first one cannot be decoded. If None the error will be raised.
+        block_size (int):
+            the amount of bytes to read and decode at once
+        offset (int):
+            the byte offset to start reading at (should be the start of a line)
+        on_fallback (callable):
+            called once without arguments, when switching to the fallback_errors
+
+        Yields:
+        line (str):
+            the next line of the given file
+        """
+        for text in IoHelper.yield_blocks(
+            src_file, file_encoding, errors, fallback_errors, block_size, offset, on_fallback
+        ):
+            yield from text.splitlines(keepends)
+
+    @staticmethod
+    def supports_byte_lines(file_encoding: str) -> bool:
+        """
+        Check if the line feeds of an encoding can be found on byte level,
+        meaning the file can be split into lines without decoding it.
+
+        Parameters:
+        file_encoding (str):
+            the encoding of the file
+
+        Returns:
+        (bool):
+            True if the encoding is ascii compatible regarding line breaks
+        """
+        try:
+            return '\r\n'.encode(file_encoding) == b'\r\n'
+        except (LookupError, UnicodeError):
+            return False
+
+    @staticmethod
+    def get_encoded_line_breaks(file_encoding: str) -> list:
+        """
+        Encodes every possible line break, that can be encoded with the given encoding.
+
+        Parameters:
+        file_encoding (str):
+            the encoding of the file
+
+        Returns:
+        line_breaks (list):
+            the encoded line breaks (bytes)
+        """
+        line_breaks = []
+        for line_break in LINE_BREAKS:
+            try:
+                line_breaks.append(line_break.encode(file_encoding))
+            except UnicodeError:
+                pass
+        return line_breaks
+
+    @staticmethod
+    def skip_lines(raw_f, line_count: int, file_encoding: str = 'utf-8',
+                   block_size: int = 1048576) -> int:
+        """
+        Skips lines of an opened binary file, starting from the current position,
+        by searching the encoded line breaks without decoding the file.
+        Expects supports_byte_lines(file_encoding) to be True.
+
+        Parameters:
+        raw_f (BufferedReader):
+            the binary file, positioned at the start of a line
+        line_count (int):
+            the amount of lines to skip
+        file_encoding (str):
+            the encoding of the file
+        block_size (int):
+            the amount of bytes to read at once
+
+        Returns:
+        offset (int):
+            the byte offset of the first line after the skipped ones
+            (or the end of the file)
+        """
+        line_breaks = IoHelper.get_encoded_line_breaks(file_encoding)
+        line_break_pattern = re.compile(b'|'.join(
+            map(re.escape, ['\r\n'.encode(file_encoding)] + line_breaks)
+        ))
+        max_length = max(map(len, line_breaks)) + 1
+        offset, data = raw_f.tell(), b''
+        while line_count > 0:
+            byte_chunk = raw_f.read(block_size)
+            data += byte_chunk
+            # line breaks ending within the last bytes may continue in the next block
+            limit = len(data) - max_length if byte_chunk else len(data)
+            position = 0
+            for match in line_break_pattern.finditer(data):
+                if match.end() > limit:
+                    break
+                position = match.end()
+                line_count -= 1
+                if not line_count:
+                    break
+            if not line_count:
+                return offset + position
+            if not byte_chunk:
+                return offset + len(data)
+            position = max(position, len(data) - 2 * max_length)
+            offset += position
+            data = data[position:]
+        return offset
+
+    @staticmethod
+    def grep_lines(src_file: Path, candidate_pattern, context_lines: int = 0,
+                   file_encoding: str = 'utf-8', block_size: int = 1048576) -> tuple:
+        """
+        Reads only the lines of a given file containing a match of the candidate
+        pattern, and the context lines around them. Every other line is only
+        counted (and validated to be decodable) without splitting or decoding it.
+        Expects supports_byte_lines(file_encoding) to be True.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        candidate_pattern (re_pattern):
+            the bytes pattern to search each line for
+        context_lines (int):
+            the amount of lines to read in front of and behind each candidate line
+        file_encoding (str):
+            an encoding to decode the file with
+        block_size (int):
+            the amount of bytes to read at once
+
+        Returns:
+        (lines, line_numbers) (tuple):
+            the decoded lines and their (1-based) line numbers
+        """
+        line_breaks = IoHelper.get_encoded_line_breaks(file_encoding)
+        crlf = '\r\n'.encode(file_encoding)
+        line_break_pattern = re.compile(b'|'.join(map(re.escape, [crlf] + line_breaks)))
+        max_length = max(map(len, line_breaks)) + 1
+        ascii_bytes = bytes(range(0x80))
+        decoder = codecs.getincrementaldecoder(file_encoding)('strict')
+
+        lines, line_numbers = [], []
+        before = deque(maxlen=context_lines)
+        remaining_after = 0
+        line_index = 0
+
+        def _emit(index: int, line: bytes) -> None:
+            lines.append(line.decode(file_encoding))
+            line_numbers.append(index + 1)
+
+        def _process(region: bytes) -> int:
+            nonlocal remaining_after
+            if remaining_after or candidate_pattern.search(region):
+                region_lines = line_break_pattern.split(region)
+                if not region_lines[-1]:
+                    region_lines.pop()
+                for index, line in enumerate(region_lines, start=line_index):
+                    if candidate_pattern.search(line):
+                        for before_line in before:
+                            _emit(*before_line)
+                        before.clear()
+                        _emit(index, line)
+                        remaining_after = context_lines
+                    elif remaining_after:
+                        _emit(index, line)
+                        remaining_after -= 1
+                    else:
+                        before.append((index, line))
+                return len(region_lines)
+            line_count = sum(region.count(line_break) for line_break in line_breaks)
+            line_count -= region.count(crlf)
+            line_count += bool(region) and not region.endswith(tuple(line_breaks))
+            # only the last lines of the region may be needed in front of a candidate line
+            tail_size = 256 * (context_lines + 1)
+            while context_lines:
+                tail_lines = line_break_pattern.split(region[-tail_size:])
+                if not tail_lines[-1]:
+                    tail_lines.pop()
+                if tail_size >= len(region) or len(tail_lines) > context_lines:
+                    tail_lines = tail_lines[-context_lines:]
+                    before.extend(zip(
+                        range(line_index + line_count - len(tail_lines), line_index + line_count),
+                        tail_lines,
+                    ))
+                    break
+                tail_size *= 4
+            return line_count
+
+        with open(src_file, 'rb') as raw_f:
+            # the blocks behind the last processed line, and the last bytes of them,
+            # that have not been searched for a line break yet
+            pending, pending_length, pending_tail = [], 0, b''
+            while True:
+                byte_chunk = raw_f.read(block_size)
+                if byte_chunk.translate(None, ascii_bytes) or decoder.getstate()[0]:
+                    decoder.decode(byte_chunk)
+                if not byte_chunk:
+                    decoder.decode(b'', True)
+                    line_index += _process(b''.join(pending))
+                    return lines, line_numbers
+                window = pending_tail + byte_chunk
+                window_start = pending_length - len(pending_tail)
+                pending.append(byte_chunk)
+                pending_length += len(byte_chunk)
+                pending_tail = window[-2*max_length:]
+                # line breaks ending within the last bytes may continue in the next block
+                limit = pending_length - max_length - window_start
+                if limit <= 0:
+                    continue
+                cut = max(
+                    (position + len(line_break) for position, line_break in (
+                        (window.rfind(line_break, 0, limit), line_break) for line_break in line_breaks
+                    ) if position >= 0),
+                    default=0,
+                )
+                if not cut:
+                    continue
+                cut += window_start
+                data = b''.join(pending)
+                if data[cut-1:cut+1] == crlf:
+                    cut += 1
+                line_index += _process(data[:cut])
+                data = data[cut:]
+                pending, pending_length, pending_tail = [data], len(data), data[-2*max_length:]
+
+    @staticmethod
+    def read_lines_slice(src_file: Path, file_slice: slice, file_encoding: str = 'utf-8',
+                         errors: str = 'strict', keepends: bool = False,
+                         line_index=None) -> tuple:
+        """
+        Reads the lines of a given file within a slice, equivalent to
+        read_file(...).splitlines()[file_slice]. The lines in front of the slice
+        are skipped without decoding them, the lines behind are never read.
+        Expects supports_byte_lines(file_encoding) to be True.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        file_slice (slice):
+            the slice of lines to read
+        file_encoding (str):
+            an encoding to decode the file with
+        errors (str):
+            the type of error handling when decoding the file
+        keepends (bool):
+            indicates if the line endings should be kept
+        line_index (LineIndex):
+            an up to date index of the line offsets of the file, used to
+            count and skip the lines instead of scanning the file
+
+        Returns:
+        (lines, line_numbers) (tuple):
+            the lines within the slice, and the original line numbers (starting at 1)
+            of these lines
+        """
+        step = 1 if file_slice.step is None else file_slice.step
+        line_count = sys.maxsize
+        # negative indices, and the defaults of a negative step, refer to the end of the file
+        if line_index is not None:
+            line_count = line_index.line_count
+        elif step < 0 or any(i is not None and i < 0 for i in (file_slice.start, file_slice.stop)):
+            line_count = IoHelper.count_lines(src_file, file_encoding)
+        start, stop, step = file_slice.indices(line_count)
+        first, last = (start, stop) if step > 0 else (stop + 1, start + 1)
+        if first >= last:
+            return [], range(0)
+
+        with open(src_file, 'rb') as raw_f:
+            if line_index is not None:
+                offset = line_index.seek_line(raw_f, first)
+            else:
+                offset = IoHelper.skip_lines(raw_f, first, file_encoding)
+        lines_gen = IoHelper.yield_lines(
+            src_file, file_encoding, errors, keepends, offset=offset
+        )
+        try:
+            if step > 0:
+                lines = list(islice(lines_gen, 0, last - first, step))
+            else:
+                lines = list(islice(lines_gen, last - first))[::-1][::-step]
+        finally:
+            lines_gen.close()
+        return lines, range(start + 1, stop + 1, step)[:len(lines)]
+
+    @staticmethod
+    def read_file_slice(src_file: Path, file_slice: slice) -> bytes:
+        """
+        Reades a slice of the bytes of a given file, equivalent to
+        read_file(src_file, True)[file_slice], by seeking to the start of the slice.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        file_slice (slice):
+            the slice of bytes to read
+
+        Returns:
+        src_content (bytes):
+            the bytes of the given file within the slice
+        """
+        if file_slice == slice(None):
+            return IoHelper.read_file(src_file, True)
+        with FileSlice(src_file, file_slice) as src_content:
+            return src_content[:]
+
+    @staticmethod
+    def read_appended_lines(src_file: Path, offset: int, file_encoding: str = 'utf-8',
+                            errors: str = 'strict', keepends: bool = False,
+                            block_size: int = 1048576) -> tuple:
+        """
+        Reads the complete lines of a given file behind a byte offset. A last line,
+        that is not terminated by a line break yet, is not read.
+        The file is read block by block, until a block contains a line break,
+        so only the lines up to that block are read at once.
+        Expects supports_byte_lines(file_encoding) to be True.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        offset (int):
+            the byte offset of the first line to read
+        file_encoding (str):
+            the encoding of the file
+        errors (str):
+            the error handling used to decode the lines
+        keepends (bool):
+            keep the line breaks at the end of each line
+        block_size (int):
+            the amount of bytes to read at once
+
+        Returns:
+        (lines, offset) (tuple):
+            the decoded lines and the byte offset behind the last one
+        """
+        line_breaks = IoHelper.get_encoded_line_breaks(file_encoding)
+        carriage_return = '\r'.encode(file_encoding)
+        # a line break might be split between two blocks
+        overlap = max(map(len, line_breaks)) + len(carriage_return)
+        chunks, read_length, length = [], 0, 0
+        with open(src_file, 'rb') as raw_f:
+            raw_f.seek(offset)
+            while not length:
+                block = raw_f.read(block_size)
+                if not block:
+                    break
+                window = (chunks[-1][-overlap:] if chunks else b'') + block
+                window_start = read_length + len(block) - len(window)
+                chunks.append(block)
+                read_length += len(block)
+                # a trailing '\r' might still be followed by a '\n'
+                if window.endswith(carriage_return):
+                    window = window[:-len(carriage_return)]
+                line_ends = [
+                    window.rfind(line_break) + len(line_break)
+                    for line_break in line_breaks
+                    if line_break in window
+                ]
+                if line_ends:
+                    length = window_start + max(line_ends)
+        data = b''.join(chunks)[:length]
+        lines = data.decode(file_encoding, errors=errors).splitlines(keepends)
+        return (lines, offset + length)
+
+    @staticmethod
+    def scan_plain_lines(src_file: Path, file_encoding: str = 'utf-8', allow_esc: bool = True,
+                         block_size: int = 1048576) -> int:
+        """
+        Checks if the content of a given file stays the same, when it gets decoded,
+        split into lines and joined with line feeds again. This is the case if the
+        content is valid within the encoding and only contains line feeds as line breaks.
+        Expects supports_byte_lines(file_encoding) to be True.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        file_encoding (str):
+            the encoding of the file
+        allow_esc (bool):
+            indicates if the content may contain escape characters
+        block_size (int):
+            the amount of bytes to read at once
+
+        Returns:
+        src_length (int):
+            the amount of bytes checked, or -1 if the content would change
+        """
+        # deleting every unproblematic ascii byte only leaves the ones to look at
+        safe_bytes = bytes(
+            b for b in range(0x80) if chr(b) == '\n' or (
+                chr(b) not in LINE_BREAKS and (allow_esc or b != 0x1b)
+            )
+        )
+        decoder = codecs.getincrementaldecoder(file_encoding)('strict')
+        src_length = 0
+        with open(src_file, 'rb') as raw_f:
+            while True:
+                byte_chunk = raw_f.read(block_size)
+                src_length += len(byte_chunk)
+                remaining = byte_chunk.translate(None, safe_bytes)
+                if remaining.translate(None, bytes(range(0x80, 0x100))):
+                    return -1
+                # non-ascii bytes (and multibyte sequences overlapping the block boundary)
+                # have to be decoded, as they may be invalid or encode a line break
+                if remaining or decoder.getstate()[0] or not byte_chunk:
+                    try:
+                        text = decoder.decode(byte_chunk, not byte_chunk)
+                    except UnicodeDecodeError:
+                        return -1
+                    if any(line_break in text for line_break in LINE_BREAKS[1:]):
+                        return -1
+                if not byte_chunk:
+                    return src_length
+
+    @staticmethod
+    def copy_file(src_file: Path, dst_fd: int, src_length: int = -1,
+                  block_size: int = 1048576) -> None:
+        """
+        Copies the bytes of a given file to a file descriptor, without reading them
+        into memory if possible (os.sendfile, os.copy_file_range).
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        dst_fd (int):
+            the file descriptor to write to (e.g. sys.stdout.fileno())
+        src_length (int):
+            the amount of bytes to copy, -1 to copy the entire file
+        block_size (int):
+            the amount of bytes to copy at once, if the data has to be buffered
+        """
+        with open(src_file, 'rb') as raw_f:
+            src_fd = raw_f.fileno()
+            if src_length < 0:
+                src_length = os.fstat(src_fd).st_size
+            offset = 0
+            for zero_copy in (getattr(os, 'sendfile', None), getattr(os, 'copy_file_range', None)):
+                if zero_copy is None:
+                    continue
+                try:
+                    while offset < src_length:
+                        if zero_copy is os.sendfile:
+                            copied = zero_copy(dst_fd, src_fd, offset, src_length - offset)
+                        else:
+                            copied = zero_copy(src_fd, dst_fd, src_length - offset, offset)
+                        if not copied:
+                            break
+                        offset += copied
+                    return
+                except BrokenPipeError:
+                    raise
+                except OSError:
+                    # not supported for these kind of file descriptors (e.g. on some platforms)
+                    continue
+            buffer = memoryview(bytearray(block_size))
+            raw_f.seek(offset)
+            while offset < src_length:
+                read = raw_f.readinto(buffer[:min(block_size, src_length - offset)])
+                if not read:
+                    break
+                written = 0
+                while written < read:
+                    written += os.write(dst_fd, buffer[written:read])
+                offset += read
+
+    @staticmethod
+    def count_lines(src_file: Path, file_encoding: str = 'utf-8',
+                    block_size: int = 1048576) -> int:
+        """
+        Counts the lines of a given file, equivalent to len(read_file(...).splitlines()),
+        by counting the encoded line breaks without decoding the file.
+        Expects supports_byte_lines(file_encoding) to be True.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        file_encoding (str):
+            the encoding of the file
+        block_size (int):
+            the amount of bytes to read at once
+
+        Returns:
+        line_count (int):
+            the amount of lines within the file
+        """
+        line_breaks = IoHelper.get_encoded_line_breaks(file_encoding)
+        # every '\r\n' has been counted twice, once as '\r' and once as '\n'
+        crlf = '\r\n'.encode(file_encoding)
+        overlap = max(map(len, line_breaks + [crlf])) - 1
+        line_count, carry, ends_with_break = 0, b'', True
+        with open(src_file, 'rb') as raw_f:
+            while True:
+                byte_chunk = raw_f.read(block_size)
+                if not byte_chunk:
+                    break
+                # line breaks overlapping the block boundary are found within the carry,
+                # while the ones already counted (entirely within the carry) get subtracted
+                data = carry + byte_chunk
+                for line_break in line_breaks:
+                    line_count += data.count(line_break) - carry.count(line_break)
+                line_count -= data.count(crlf) - carry.count(crlf)
+                ends_with_break = data.endswith(tuple(line_breaks))
+                carry = data[len(data)-overlap:] if overlap else b''
+        return line_count + (not ends_with_break)
+
+    @staticmethod
+    def peek_lines(src_file: Path, peek_size: int, file_encoding: str = 'utf-8',
+                   errors: str = 'strict', keepends: bool = False,
+                   block_size: int = 65536) -> tuple:
+        """
+        Reads the first and the last lines of a given file, without reading
+        the content in between. The end of the file is read backwards in blocks.
+        Expects supports_byte_lines(file_encoding) to be True and the file
+        to contain more than 2*peek_size lines.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        peek_size (int):
+            the amount of lines to read from the start and from the end
+        file_encoding (str):
+            an encoding to decode the file with
+        errors (str):
+            the type of error handling when decoding the file
+        keepends (bool):
+            indicates if the line endings should be kept
+        block_size (int):
+            the amount of bytes to read at once
+
+        Returns:
+        (head, tail) (tuple):
+            the first and the last peek_size lines of the file
+        """
+        lines_gen = IoHelper.yield_lines(
+            src_file, file_encoding, errors, keepends, block_size=block_size
+        )
+        try:
+            head = [line for _, line in zip(range(peek_size), lines_gen)]
+        finally:
+            lines_gen.close()
+        if peek_size <= 0:
+            return head, []
+
+        line_feed = '\n'.encode(file_encoding)
+        with open(src_file, 'rb') as raw_f:
+            position = raw_f.seek(0, os.SEEK_END)
+            byte_chunk = b''
+            while True:
+                read_size = min(max(block_size, len(byte_chunk)), position)
+                position -= read_size
+                raw_f.seek(position)
+                byte_chunk = raw_f.read(read_size) + byte_chunk
+                if position > 0:
+                    # a line feed always ends a line (even as part of '\r\n'), so the
+                    # content after the first one can be split just like the entire file
+                    line_start = byte_chunk.find(line_feed)
+                    if line_start < 0:
+                        continue
+                    lines = byte_chunk[line_start+len(line_feed):].decode(
+                        file_encoding, errors
+                    ).splitlines(keepends)
+                else:
+                    lines = byte_chunk.decode(file_encoding, errors).splitlines(keepends)
+                if len(lines) >= peek_size or position <= 0:
+                    return head, lines[-peek_size:]
+
     @staticmethod
     def get_newline(file: Path, default: str = '\n') -> str:
         """
@@ -443,6 +1168,28 @@ class IoHelper:
         return src_file
 
 
+    @staticmethod
+    def write_file_chunks(src_file: Path, chunks) -> Path:
+        """
+        Writes a stream of bytes into a given file, without
+        holding the entire content in memory.
+
+        Parameters:
+        src_file (Path):
+            a string representation of a file (-path)
+        chunks (Iterable[bytes]):
+            the content to write in the file
+
+        Returns:
+        src_file (Path):
+            the path to the file written
+        """
+        with open(src_file, 'wb') as raw_f:
+            for chunk in chunks:
+                if raw_f.write(chunk) != len(chunk):
+                    raise OSError('Not all bytes could be written to the file.')
+        return src_file
+
     @staticmethod
     def get_stdin_content(one_line: bool = False, raw: bool = False):
         """
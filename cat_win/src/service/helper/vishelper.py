@@ -3,9 +3,36 @@ vishelper
 """
 
 import math
+import sys
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 from cat_win.src.service.helper.progressbar import PBar
 
+# the amount of curve permutations (one for each curve and width) kept in memory
+CURVE_CACHE_SIZE = 8
+
+# the amount of bytes counted at once for the digraph dot plot
+DIGRAPH_CHUNK_SIZE = 1 << 22
+# the amount of bytes read at once when calculating the overview
+OVERVIEW_CHUNK_SIZE = 1 << 22
+# a representative byte for each byte class, in the order:
+# 0x00, control characters, printable characters, extended (>=0x80), 0xFF
+BYTE_CLASS_BYTES = (0, 1, 65, 128, 255)
+
+ENTROPY_WINDOW = 128
+ENTROPY_SCALE = 14.286  # 100 / log2(ENTROPY_WINDOW)
+# the amount of windows calculated between two updates of the progress bar
+ENTROPY_STEPS = 65536
+# c * log2(c) of every count a byte can have within a window
+C_LOG_C = [c * math.log2(c) if c else 0.0 for c in range(ENTROPY_WINDOW + 1)]
+
 
 def get_fit_terminal_square(length: int, width: int) -> int:
     """
@@ -28,6 +55,41 @@ def get_fit_terminal_square(length: int, width: int) -> int:
         w *= 2
     return w
 
+def get_fit_overview_square(length: int, max_side: int) -> int:
+    """
+    calculate the size of the overview square, such that each cell
+    summarizes at least one byte.
+
+    Parameters:
+    length (int):
+        the length of the data stream
+    max_side (int):
+        the max amount of cells displayable in each direction
+
+    Returns:
+    side (int):
+        largest power of two not exceeding the max side,
+        that when squared does not exceed the (data stream) length
+    """
+    side = 1
+    while side*2 <= max_side and (side*2)**2 <= length:
+        side *= 2
+    return side
+
+def _get_byte_class(byte: int) -> int:
+    if byte == 0:
+        return 0
+    if byte == 255:
+        return 4
+    if byte >= 128:
+        return 3
+    if 32 <= byte < 127 or byte in [9,10,13]:
+        return 2
+    return 1
+
+# maps every byte to the index of its class in BYTE_CLASS_BYTES
+BYTE_CLASS_TABLE = bytes(_get_byte_class(byte) for byte in range(256))
+
 class SpaceFilling:
     """
     SpaceFilling curves
@@ -96,23 +158,7 @@ class SpaceFilling:
         _list_chunk
             the next chunk to display
         """
-        _length = len(_list)
-        width = get_fit_terminal_square(_length, width)
-
-        i, n = 0, width**2
-        while i*n <= _length:
-            _list_chunk = _list[i*n:(i+1)*n]
-            for y in range(width):
-                row = []
-                for x in range(width):
-                    try:
-                        row.append(_list_chunk[SpaceFilling._get_zorder_index(y, x)])
-                    except IndexError:
-                        row.append(-1)
-                if row[0] < 0:
-                    break
-                yield row
-            i += 1
+        yield from SpaceFilling._get_curve(_list, width, 'zorder')
 
     @staticmethod
     def _get_hilbert_index(n: int, y: int, x: int) -> int:
@@ -160,23 +206,77 @@ class SpaceFilling:
         _list_chunk
             the next chunk to display
         """
+        yield from SpaceFilling._get_curve(_list, width, 'hilbert')
+
+    @staticmethod
+    @lru_cache(maxsize=CURVE_CACHE_SIZE)
+    def _get_curve_permutation(curve: str, width: int) -> tuple:
+        """
+        calculate the index within a chunk (of width*width elements)
+        of every cell of a curve, row by row.
+
+        Parameters:
+        curve (str):
+            the curve to calculate, either 'zorder' or 'hilbert'
+        width (int):
+            the width of the (square) curve
+
+        Returns:
+        (tuple):
+            a getter gathering the cells from a chunk, and the
+            indices as numpy array (or None if numpy is not available)
+        """
+        if curve == 'hilbert':
+            indices = [SpaceFilling._get_hilbert_index(width, y, x)
+                       for y in range(width) for x in range(width)]
+        else:
+            indices = [SpaceFilling._get_zorder_index(y, x)
+                       for y in range(width) for x in range(width)]
+        if len(indices) > 1:
+            getter = itemgetter(*indices)
+        else:
+            getter = lambda _list_chunk: (_list_chunk[0],)
+        return getter, (np.array(indices, dtype=np.intp) if np is not None else None)
+
+    @staticmethod
+    def _get_curve(_list: bytes, width: int, curve: str):
+        """
+        break the given list into chunks, and yield the rows of each chunk
+        as ordered by the given curve.
+
+        Parameters:
+        _list (iterable):
+            the list or bytearray (or FileSlice) to put in pattern
+        width (int):
+            the max displayable width
+        curve (str):
+            the curve to use, either 'zorder' or 'hilbert'
+
+        Yields:
+        row (list):
+            the next row to display, cells behind the data are -1
+        """
         _length = len(_list)
         width = get_fit_terminal_square(_length, width)
-
-        i, n = 0, width**2
-        while i*n <= _length:
-            _list_chunk = _list[i*n:(i+1)*n]
-            for y in range(width):
-                row = []
-                for x in range(width):
-                    try:
-                        row.append(_list_chunk[SpaceFilling._get_hilbert_index(width, y, x)])
-                    except IndexError:
-                        row.append(-1)
+        getter, indices = SpaceFilling._get_curve_permutation(curve, width)
+
+        n = width**2
+        for i in range(0, _length+1, n):
+            _list_chunk = _list[i:i+n]
+            if len(_list_chunk) == n and indices is not None and \
+                isinstance(_list_chunk, (bytes, bytearray)):
+                yield from np.frombuffer(_list_chunk, dtype=np.uint8)[indices].reshape(
+                    width, width
+                ).tolist()
+                continue
+            if len(_list_chunk) < n:
+                _list_chunk = list(_list_chunk) + [-1] * (n-len(_list_chunk))
+            cells = getter(_list_chunk)
+            for y in range(0, n, width):
+                row = list(cells[y:y+width])
                 if row[0] < 0:
                     break
                 yield row
-            i += 1
 
 
 class Entropy:
@@ -184,47 +284,309 @@ class Entropy:
     Entropy
     """
     @staticmethod
-    def normalized_shannon_entropy(data: bytes) -> list:
+    def _to_entropy(c_log_c_sum: float) -> int:
+        # -sum(p * log2(p)) with p = c / w equals log2(w) - sum(c * log2(c)) / w
+        return int((7 - c_log_c_sum / ENTROPY_WINDOW) * ENTROPY_SCALE)
+
+    @staticmethod
+    def _sliding_entropy(data: bytes, data_length: int, p_bar) -> bytearray:
+        """
+        calculate the entropy of every window, updating the sum of c * log2(c)
+        in constant time for each byte entering and leaving the window.
+        """
+        entropy = bytearray(data_length)
+        # the change of the sum, when a count is decreased/increased to c
+        dec_delta = [0.0] + [C_LOG_C[c-1] - C_LOG_C[c] for c in range(1, ENTROPY_WINDOW + 1)]
+        inc_delta = [0.0] + [C_LOG_C[c] - C_LOG_C[c-1] for c in range(1, ENTROPY_WINDOW + 1)]
+        counter = [0] * 256
+        for byte in data[:ENTROPY_WINDOW]:
+            counter[byte] += 1
+        c_log_c_sum = sum(C_LOG_C[count] for count in counter)
+        entropy[0] = Entropy._to_entropy(c_log_c_sum)
+
+        fmin1 = ENTROPY_WINDOW - 1
+        for start in range(1, data_length, ENTROPY_STEPS):
+            stop = min(start + ENTROPY_STEPS, data_length)
+            for i in range(start, stop):
+                byte_out, byte_in = data[i-1], data[i+fmin1]
+                if byte_out != byte_in:
+                    count = counter[byte_out]
+                    counter[byte_out] = count - 1
+                    c_log_c_sum += dec_delta[count]
+                    count = counter[byte_in] + 1
+                    counter[byte_in] = count
+                    c_log_c_sum += inc_delta[count]
+                entropy[i] = int((7 - c_log_c_sum / ENTROPY_WINDOW) * ENTROPY_SCALE)
+            # recalculate the sum, such that rounding errors cannot accumulate
+            c_log_c_sum = sum(C_LOG_C[count] for count in counter)
+            p_bar(stop)
+        return entropy
+
+    @staticmethod
+    def _sliding_entropy_np(data: bytes, data_length: int, p_bar) -> bytearray:
+        """
+        calculate the entropy of every window, vectorized using numpy.
+        the change of the sum of c * log2(c) for every window is derived from the
+        counts of the leaving and entering byte (within the neighbouring window),
+        which are found by ranking the positions of equal bytes.
+        """
+        window = ENTROPY_WINDOW
+        c_log_c = np.array(C_LOG_C)
+        data = np.frombuffer(data, dtype=np.uint8)
+        entropy = bytearray(data_length)
+        entropy_view = np.frombuffer(entropy, dtype=np.uint8)
+        entropy[0] = Entropy._to_entropy(
+            c_log_c[np.bincount(data[:window], minlength=256)].sum()
+        )
+
+        chunk_size = ENTROPY_STEPS * 16
+        for start in range(1, data_length, chunk_size):
+            stop = min(start + chunk_size, data_length)
+            # the windows start-1 to stop-1 (inclusive)
+            chunk = data[start-1:stop+window-1]
+            positions = np.arange(len(chunk))
+            # the position of every byte sorted by the byte, keeping equal bytes
+            # in order, such that the bytes of each window form consecutive ranges
+            order = np.argsort(chunk, kind='stable').astype(np.int32)
+            keys = chunk[order].astype(np.int32) * np.int32(len(chunk) + 2 * window) + order
+            # the first sorted index within the window ending at each position,
+            # and (derived from it) the first one behind the window starting there
+            lower = np.searchsorted(keys, keys - (window-1))
+            upper = np.cumsum(np.bincount(lower, minlength=len(chunk)))
+            # the count of each byte within the window ending/starting at its position
+            counts_back = np.empty(len(chunk), dtype=np.int32)
+            counts_back[order] = positions - lower + 1
+            counts_forward = np.empty(len(chunk), dtype=np.int32)
+            counts_forward[order] = upper - positions
+            counts_out = counts_forward[:stop-start]
+            counts_in = counts_back[window:window+stop-start]
+            c_log_c_sums = np.cumsum(
+                c_log_c[counts_out-1] - c_log_c[counts_out] +
+                c_log_c[counts_in] - c_log_c[counts_in-1]
+            )
+            c_log_c_sums += c_log_c[np.bincount(chunk[:window], minlength=256)].sum()
+            entropy_view[start:stop] = (
+                (7 - c_log_c_sums / window) * ENTROPY_SCALE
+            ).astype(np.uint8)
+            p_bar(stop)
+        return entropy
+
+    @staticmethod
+    def normalized_shannon_entropy(data: bytes) -> bytearray:
         """
-        calculate the normalized shannon entropy
+        calculate the normalized shannon entropy of the window (128 bytes)
+        starting at each byte, wrapping around at the end of the data.
+        uses numpy if it is installed.
 
         Parameters:
         data (bytes):
             the data to calculate
 
         Returns:
-        (list):
-            the calculated shannony entropy data
+        (bytearray):
+            the calculated shannon entropy (0-100) of each byte
         """
         data_length = len(data)
-        frame_window = 128
-        fmin1 = frame_window-1
+        if not data_length:
+            return bytearray()
+        fmin1 = ENTROPY_WINDOW - 1
+        data = bytes(data)
+        data += data[:fmin1] # try wrap around
+        data += bytes(fmin1 + data_length - len(data)) # otherwise add 0 bytes
 
-        data = list(data + data[:fmin1]) # try wrap around
-        data += [0]*(fmin1+data_length-len(data)) # otherwise add 0 bytes
+        with PBar(data_length, prefix='Calculating Entropy',
+                  length=100, fill_l='━', fill_r='╺').init() as p_bar:
+            if np is not None:
+                return Entropy._sliding_entropy_np(data, data_length, p_bar)
+            return Entropy._sliding_entropy(data, data_length, p_bar)
 
-        counter = dict(zip(range(256), [0]*256))
 
-        with PBar(data_length, prefix='Calculating Entropy',
+class Digraph:
+    """
+    Digraph
+    """
+    @staticmethod
+    def _count_chunk(chunk: bytes, counter: Counter) -> None:
+        """
+        count the pairs of consecutive bytes within a chunk, each pair
+        (a, b) read as one native 16 bit integer.
+        """
+        chunk_view = memoryview(chunk)
+        counter.update(chunk_view[:len(chunk) & ~1].cast('H'))
+        counter.update(chunk_view[1:1 + ((len(chunk)-1) & ~1)].cast('H'))
+
+    @staticmethod
+    def count_pairs(_list: bytes) -> list:
+        """
+        count every pair of consecutive bytes. the data is processed in chunks,
+        overlapping by one byte such that no pair gets lost.
+        uses numpy if it is installed.
+
+        Parameters:
+        _list (bytes):
+            the bytes (or FileSlice) to count
+
+        Returns:
+        digraph (list):
+            the count of every pair (a, b) at the index a*256+b
+        """
+        _length = len(_list)
+        if np is not None:
+            digraph = np.zeros(65536, dtype=np.int64)
+            for i in range(0, _length-1, DIGRAPH_CHUNK_SIZE):
+                chunk = _list[i:i+DIGRAPH_CHUNK_SIZE+1]
+                # big endian 16 bit integers equal a*256+b
+                digraph += np.bincount(np.frombuffer(chunk, dtype='>u2', count=len(chunk)//2),
+                                       minlength=65536)
+                digraph += np.bincount(np.frombuffer(chunk, dtype='>u2', offset=1,
+                                                     count=(len(chunk)-1)//2),
+                                       minlength=65536)
+            return digraph.tolist()
+
+        counter = Counter()
+        for i in range(0, _length-1, DIGRAPH_CHUNK_SIZE):
+            Digraph._count_chunk(_list[i:i+DIGRAPH_CHUNK_SIZE+1], counter)
+        digraph = [0] * 65536
+        for pair, count in counter.items():
+            if sys.byteorder == 'little':
+                pair = (pair & 255) << 8 | pair >> 8
+            digraph[pair] = count
+        return digraph
+
+
+class Overview:
+    """
+    Overview
+    """
+    @staticmethod
+    def _yield_blocks(_list: bytes, cells: int, p_bar = None):
+        """
+        split the data into (almost) equally sized blocks, one for each cell.
+        the data is read sequentially in chunks, such that a block may be
+        yielded in multiple parts.
+
+        Parameters:
+        _list (bytes):
+            the bytes (or FileSlice) to split, at least as long as there are cells
+        cells (int):
+            the amount of blocks
+        p_bar (PBar):
+            the progress bar to update after each chunk
+
+        Yields:
+        (cell, part) (tuple):
+            the index of the block, and (a part of) its bytes
+        """
+        _length = len(_list)
+        # the block of a cell k ranges from k*_length//cells to (k+1)*_length//cells
+        cell, cell_end = 0, _length // cells
+        for start in range(0, _length, OVERVIEW_CHUNK_SIZE):
+            chunk = _list[start:start+OVERVIEW_CHUNK_SIZE]
+            pos, end = start, start + len(chunk)
+            while pos < end:
+                while cell_end <= pos:
+                    cell += 1
+                    cell_end = (cell+1) * _length // cells
+                stop = min(cell_end, end)
+                yield cell, chunk[pos-start:stop-start]
+                pos = stop
+            if p_bar is not None:
+                p_bar(end)
+
+    @staticmethod
+    def _count_bytes_np(stat, part: bytes) -> None:
+        stat += np.bincount(np.frombuffer(part, dtype=np.uint8), minlength=256)
+
+    @staticmethod
+    def _get_block_stats(_list: bytes, cells: int, prefix: str, new_stat, update_stat,
+                         get_stat) -> list:
+        """
+        calculate a statistic for every block, created by new_stat(),
+        updated with every part of the block and finally evaluated by get_stat().
+        """
+        stats = []
+        if not _list:
+            return stats
+        with PBar(len(_list), prefix=prefix,
                   length=100, fill_l='━', fill_r='╺').init() as p_bar:
+            current_cell, stat = 0, new_stat()
+            for cell, part in Overview._yield_blocks(_list, cells, p_bar):
+                if cell != current_cell:
+                    stats.append(get_stat(stat))
+                    current_cell, stat = cell, new_stat()
+                update_stat(stat, part)
+            stats.append(get_stat(stat))
+        return stats
+
+    @staticmethod
+    def get_block_classes(_list: bytes, cells: int) -> list:
+        """
+        summarize each block of bytes by its dominant byte class.
+
+        Parameters:
+        _list (bytes):
+            the bytes (or FileSlice) to summarize, at least as long as there are cells
+        cells (int):
+            the amount of blocks
 
-            # first frame:
-            for i in range(frame_window):
-                counter[data[i]] += 1
-            probabilities = [count / frame_window for count in counter.values()]
-            entropy = -sum(p * math.log2(p) for p in probabilities if p > 0) * 14.286
-            p_bar(0)
-
-            # rest of frames
-            for i in range(1, data_length):
-                counter[data[i-    1]] -= 1
-                counter[data[i+fmin1]] += 1
-                probabilities[data[i-    1]] = counter[data[i-    1]] / 128
-                probabilities[data[i+fmin1]] = counter[data[i+fmin1]] / 128
-                data[i-1] = int(entropy)
-                entropy = -sum(p * math.log2(p) for p in probabilities if p > 0) * 14.286
-                p_bar(i)
-            data[len(data)-frame_window] = int(entropy)
-            p_bar(data_length)
-
-        return data[:-fmin1]
+        Returns:
+        (list):
+            a representative byte (see BYTE_CLASS_BYTES) of the most frequent
+            byte class within each block
+        """
+        if np is not None:
+            byte_classes = np.frombuffer(BYTE_CLASS_TABLE, dtype=np.uint8)
+            new_stat = lambda: np.zeros(256, dtype=np.int64)
+            update_stat = Overview._count_bytes_np
+            def get_stat(stat) -> int:
+                class_counts = np.bincount(byte_classes, weights=stat,
+                                           minlength=len(BYTE_CLASS_BYTES))
+                return BYTE_CLASS_BYTES[int(np.argmax(class_counts))]
+        else:
+            new_stat = lambda: [0] * len(BYTE_CLASS_BYTES)
+            def update_stat(stat: list, part: bytes) -> None:
+                part = part.translate(BYTE_CLASS_TABLE)
+                for byte_class in range(len(stat)):
+                    stat[byte_class] += part.count(byte_class)
+            def get_stat(stat: list) -> int:
+                return BYTE_CLASS_BYTES[stat.index(max(stat))]
+
+        return Overview._get_block_stats(_list, cells, 'Calculating Overview',
+                                         new_stat, update_stat, get_stat)
+
+    @staticmethod
+    def get_block_entropy(_list: bytes, cells: int) -> list:
+        """
+        summarize each block of bytes by its normalized shannon entropy.
+        uses numpy if it is installed.
+
+        Parameters:
+        _list (bytes):
+            the bytes (or FileSlice) to summarize, at least as long as there are cells
+        cells (int):
+            the amount of blocks
+
+        Returns:
+        (list):
+            the shannon entropy (0-100) of each block, normalized by the highest
+            entropy possible for the size of the block
+        """
+        if np is not None:
+            new_stat = lambda: np.zeros(256, dtype=np.int64)
+            update_stat = Overview._count_bytes_np
+            to_counts = lambda stat: stat[stat > 0].tolist()
+        else:
+            new_stat = Counter
+            update_stat = Counter.update
+            to_counts = lambda stat: stat.values()
+
+        def get_stat(stat) -> int:
+            counts = to_counts(stat)
+            total = sum(counts)
+            if total < 2:
+                return 0
+            entropy = math.log2(total) - sum(c * math.log2(c) for c in counts) / total
+            return int(entropy / math.log2(min(total, 256)) * 100)
+
+        return Overview._get_block_stats(_list, cells, 'Calculating Entropy',
+                                         new_stat, update_stat, get_stat)
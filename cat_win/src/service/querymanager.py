@@ -2,10 +2,14 @@
 stringfinder
 """
 
+import codecs
+import re
+from collections import deque
 from functools import lru_cache
 
 from cat_win.src.const.colorconstants import CKW
 from cat_win.src.const.regex import RE_ANSI_CSI
+from cat_win.src.service.helper.iohelper import LINE_BREAKS
 
 
 @lru_cache(maxsize=256)
@@ -24,36 +28,31 @@ def remove_ansi_codes_from_line(line: str) -> str:
     return RE_ANSI_CSI.sub('', line)
 
 
-def _map_display_pos(display_str: str, plain_pos: int) -> int:
+def _build_display_offsets(display_str: str):
     """
-    Map a character position in the ANSI-stripped version of *display_str*
-    to the corresponding position in *display_str* itself.
-
-    ANSI escape sequences are skipped first; the plain-character count is
-    incremented only for non-escape bytes.
+    Map every character position in the ANSI-stripped version of *display_str*
+    to the corresponding position in *display_str* itself, within a single scan.
+    ANSI escape sequences are skipped, and the position behind the stripped
+    string is mapped to the end of *display_str*.
 
     Parameters:
     display_str (str):
-        the string containing ANSI codes to map a position in
-    plain_pos (int):
-        the character position in the ANSI-stripped version of *display_str* to map
+        the string containing ANSI codes to map the positions of
 
     Returns:
-    i (int):
-        the corresponding character position in *display_str* itself
+    offsets (Sequence[int]):
+        the display positions indexed by plain positions
     """
-    plain_count = 0
-    i = 0
-    while i < len(display_str):
-        ansi_m = RE_ANSI_CSI.match(display_str, i)
-        if ansi_m:
-            i = ansi_m.end()
-            continue
-        if plain_count == plain_pos:
-            return i
-        plain_count += 1
-        i += 1
-    return i
+    if '\x1b' not in display_str:
+        return range(len(display_str) + 1)
+    offsets = []
+    plain_start = 0
+    for ansi_m in RE_ANSI_CSI.finditer(display_str):
+        offsets.extend(range(plain_start, ansi_m.start()))
+        plain_start = ansi_m.end()
+    offsets.extend(range(plain_start, len(display_str)))
+    offsets.append(len(display_str))
+    return offsets
 
 def _build_ansi_restore(reset_all: str, display_str: str) -> tuple:
     """
@@ -64,6 +63,7 @@ def _build_ansi_restore(reset_all: str, display_str: str) -> tuple:
       - a set of plain-text positions preceded by at least one ANSI code
         (used to re-inject the open keyword colour after any ANSI override
         inside a keyword span, so the keyword colour always wins).
+    Lines without any escape code result in an empty dict and set.
 
     Parameters:
     reset_all (str):
@@ -80,29 +80,29 @@ def _build_ansi_restore(reset_all: str, display_str: str) -> tuple:
             a set of plain-text positions preceded by at least one ANSI code
     """
     restore = {}
-    active = []
     ansi_set = set()
-    had_ansi = False
+    if '\x1b' not in display_str:
+        return restore, ansi_set
+    active = []
+    active_codes = ''
     pc = 0
-    i = 0
-    while i < len(display_str):
-        ansi_m = RE_ANSI_CSI.match(display_str, i)
-        if ansi_m:
-            code = ansi_m.group(0)
-            if code == reset_all:
-                active = []
-            else:
-                active.append(code)
-            had_ansi = True
-            i = ansi_m.end()
+    plain_start = 0
+    for ansi_m in RE_ANSI_CSI.finditer(display_str):
+        if plain_start < ansi_m.start():
+            restore.update(dict.fromkeys(range(pc, pc + ansi_m.start() - plain_start), active_codes))
+            pc += ansi_m.start() - plain_start
+        ansi_set.add(pc)
+        code = ansi_m.group(0)
+        if code == reset_all:
+            active = []
         else:
-            if had_ansi:
-                ansi_set.add(pc)
-                had_ansi = False
-            restore[pc] = ''.join(active)
-            pc += 1
-            i += 1
-    restore[pc] = ''.join(active)  # state at end of string
+            active.append(code)
+        active_codes = ''.join(active)
+        plain_start = ansi_m.end()
+    restore.update(dict.fromkeys(range(pc, pc + len(display_str) - plain_start), active_codes))
+    pc += len(display_str) - plain_start
+    ansi_set.discard(pc)  # no character follows the trailing codes
+    restore[pc] = active_codes  # state at end of string
     return restore, ansi_set
 
 def find_literals(sub: str, _s: str, ignore_case: bool):
@@ -170,6 +170,149 @@ def find_regex(pattern, _s: str):
     for _match in pattern.finditer(_s):
         yield list(_match.span())
 
+# below this many literals searching each literal with str.find is faster
+# than a single scan of the python automaton
+AHO_CORASICK_MIN_LITERALS = 256
+
+class _LiteralScanner:
+    """
+    reports all (overlapping) occurrences of multiple literals by
+    searching the string once per literal.
+    """
+    def __init__(self, literals: list) -> None:
+        """
+        Parameters:
+        literals (list):
+            the unique, non-empty literals to search for
+        """
+        self.literals = literals
+
+    def find_all(self, _s: str):
+        """
+        Generate the positions of all literals in _s.
+
+        Parameters:
+        _s (str):
+            the string to search in
+
+        Yields:
+        (tuple):
+            containing the start index, end index and literal index
+        """
+        for l_idx, literal in enumerate(self.literals):
+            _l = len(literal)
+            i = _s.find(literal)
+            while i != -1:
+                yield i, i+_l, l_idx
+                i = _s.find(literal, i+1)
+
+class _AhoCorasick:
+    """
+    an Aho-Corasick automaton reporting all (overlapping) occurrences of
+    multiple literals within a single scan over the string.
+    """
+    def __init__(self, literals: list) -> None:
+        """
+        build the automaton.
+
+        Parameters:
+        literals (list):
+            the unique, non-empty literals to search for
+        """
+        self.literals = literals
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for l_idx, literal in enumerate(literals):
+            state = 0
+            for char in literal:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._out[state].append(l_idx)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail_state = self._fail[state]
+                while fail_state and char not in self._goto[fail_state]:
+                    fail_state = self._fail[fail_state]
+                self._fail[next_state] = self._goto[fail_state].get(char, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+        # the regex engine finds the leftmost hit much faster than the python loop,
+        # lines without any hit therefore never have to be scanned by the automaton
+        self._prefilter = re.compile('|'.join(map(re.escape, literals)))
+
+    def find_all(self, _s: str):
+        """
+        Generate the positions of all literals in _s.
+
+        Parameters:
+        _s (str):
+            the string to search in
+
+        Yields:
+        (tuple):
+            containing the start index, end index and literal index
+        """
+        first_hit = self._prefilter.search(_s)
+        if first_hit is None:
+            return
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i in range(first_hit.start(), len(_s)):
+            char = _s[i]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for l_idx in out[state]:
+                yield i + 1 - len(self.literals[l_idx]), i + 1, l_idx
+
+def build_bytes_prefilter(queries: list, file_encoding: str):
+    """
+    Build a bytes pattern matching every encoded line, that may contain one of
+    the literal queries. Lines containing an escape character always match, as
+    the queries get searched within the line without ANSI codes.
+
+    Parameters:
+    queries (list):
+        the (query, ignore_case) tuples to search for
+    file_encoding (str):
+        the encoding of the lines to search in
+
+    Returns:
+    (re_pattern):
+        the compiled bytes pattern, or None if the queries cannot be searched
+        for within the encoded lines (regular expressions, empty literals,
+        case insensitive non-ascii literals or encodings other than utf-8)
+    """
+    try:
+        if codecs.lookup(file_encoding).name != 'utf-8':
+            return None
+    except LookupError:
+        return None
+    sub_patterns = [re.escape('\x1b'.encode(file_encoding))]
+    for query, ignore_case in queries:
+        if not isinstance(query, str) or not query:
+            return None
+        if ignore_case and any(ord(char) > 127 for char in query):
+            return None
+        # the query can never be found within a single line
+        if any(line_break in query for line_break in LINE_BREAKS):
+            continue
+        sub_pattern = re.escape(query.encode(file_encoding))
+        if ignore_case:
+            sub_pattern = b'(?i:' + sub_pattern + b')'
+        sub_patterns.append(sub_pattern)
+    if any(ignore_case for _, ignore_case in queries):
+        # the only non-ascii characters with an ascii character in their lowercase version
+        sub_patterns += [re.escape(char.encode(file_encoding)) for char in '\u0130\u212a']
+    return re.compile(b'|'.join(sub_patterns))
+
 def replace_queries_in_line(
         line: str, queries: list, replacements: list, color_dic: dict
 ) -> tuple:
@@ -197,11 +340,11 @@ def replace_queries_in_line(
     for q_idx, replacement in enumerate(replacements):
         query, ignore_case = queries[q_idx]
         ansi_restore, _ = _build_ansi_restore(color_dic[CKW.RESET_ALL], display_line)
+        display_offsets = _build_display_offsets(display_line)
         if isinstance(query, str):
             matches = list(find_literals_no_overlap(query, plain_line, ignore_case))
             disp_pos = [
-                (_map_display_pos(display_line, f_s), _map_display_pos(display_line, f_e))
-                for f_s, f_e in matches
+                (display_offsets[f_s], display_offsets[f_e]) for f_s, f_e in matches
             ]
             for (f_s, f_e), (d_s, d_e) in reversed(list(zip(matches, disp_pos))):
                 plain_line = plain_line[:f_s] + replacement + plain_line[f_e:]
@@ -214,8 +357,7 @@ def replace_queries_in_line(
         else:
             matches = list(query.finditer(plain_line))
             disp_pos = [
-                (_map_display_pos(display_line, m.start()), _map_display_pos(display_line, m.end()))
-                for m in matches
+                (display_offsets[m.start()], display_offsets[m.end()]) for m in matches
             ]
             for m, (d_s, d_e) in reversed(list(zip(matches, disp_pos))):
                 repl = m.expand(replacement)
@@ -234,6 +376,51 @@ class QueryManager:
     """
     def __init__(self, queries: set = None) -> None:
         self.kw_queries = queries
+        # literal queries get searched by one finder per case sensitivity,
+        # (name, query index) tuples are stored per literal of a finder
+        self._literal_queries = ([], [])
+        self._empty_literal_queries = []
+        self._literal_finders = (None, None)
+        # regex queries without groups get combined to reject lines without any match
+        self._regex_queries = []
+        self._regex_prefilter = None
+        if queries:
+            self._build_finders()
+
+    def _build_finders(self) -> None:
+        literals = ({}, {})
+        combinable = []
+        for q_idx, (query, ignore_case) in enumerate(self.kw_queries):
+            if not isinstance(query, str):
+                flags = ''.join(
+                    f_char for flag, f_char in ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'),
+                                                (re.DOTALL, 's')) if query.flags & flag
+                )
+                sub_pattern = f"(?{flags}:{query.pattern})" if flags else f"(?:{query.pattern})"
+                is_combinable = not query.groups and not (
+                    query.flags & ~(re.IGNORECASE | re.MULTILINE | re.DOTALL | re.UNICODE)
+                )
+                if is_combinable:
+                    try:
+                        re.compile(sub_pattern)
+                    except re.error:
+                        is_combinable = False
+                if is_combinable:
+                    combinable.append(sub_pattern)
+                self._regex_queries.append((q_idx, query, is_combinable))
+            elif not query:
+                self._empty_literal_queries.append((q_idx, ignore_case))
+            else:
+                literal = query.lower() if ignore_case else query
+                literals[ignore_case].setdefault(literal, []).append((q_idx, query))
+        self._literal_queries = tuple(list(l_dict.values()) for l_dict in literals)
+        self._literal_finders = tuple(
+            (_AhoCorasick if len(l_dict) >= AHO_CORASICK_MIN_LITERALS else _LiteralScanner)(
+                list(l_dict)
+            ) if l_dict else None for l_dict in literals
+        )
+        if combinable:
+            self._regex_prefilter = re.compile('|'.join(combinable))
 
     def _optimize_intervals(self, intervals: list) -> list:
         """
@@ -295,15 +482,41 @@ class QueryManager:
         matched_list = []
         matched_position = []
 
-        for query, ignore_case in self.kw_queries:
-            if isinstance(query, str):
-                for _f in find_literals(query, line, ignore_case):
-                    found_position.append(_f[:])
-                    found_list.append((query, _f))
+        found_hits = []
+        lower_line = None
+        for ignore_case, finder in enumerate(self._literal_finders):
+            if finder is None:
+                continue
+            if ignore_case and lower_line is None:
+                lower_line = line.lower()
+            for f_s, f_e, l_idx in finder.find_all(lower_line if ignore_case else line):
+                for q_idx, query in self._literal_queries[ignore_case][l_idx]:
+                    found_hits.append((f_s, q_idx, f_e, query))
+        for q_idx, ignore_case in self._empty_literal_queries:
+            if ignore_case and lower_line is None:
+                lower_line = line.lower()
+            for f_s in range(len(lower_line if ignore_case else line) + 1):
+                found_hits.append((f_s, q_idx, f_s, ''))
+        # the queries used to be searched one after another
+        found_hits.sort(key=lambda hit: hit[:2])
+        for f_s, _, f_e, query in found_hits:
+            found_position.append([f_s, f_e])
+            found_list.append((query, [f_s, f_e]))
+
+        first_match = None
+        if self._regex_prefilter is not None:
+            first_match = self._regex_prefilter.search(line)
+        for _, query, is_combined in self._regex_queries:
+            if not is_combined:
+                matches = find_regex(query, line)
+            elif first_match is None:
+                continue
             else:
-                for _m in find_regex(query, line):
-                    matched_position.append(_m[:])
-                    matched_list.append((query.pattern, _m))
+                # no combined pattern matches anywhere before the first match
+                matches = (list(_m.span()) for _m in query.finditer(line, first_match.start()))
+            for _m in matches:
+                matched_position.append(_m[:])
+                matched_list.append((query.pattern, _m))
         # sort by start position (necessary for a deterministic output)
         found_list.sort(key = lambda x: x[1][0])
         matched_list.sort(key = lambda x: x[1][0])
@@ -2,8 +2,10 @@
 rawviewer
 """
 
+import os
+
 from cat_win.src.const.colorconstants import CKW
-from cat_win.src.service.helper.iohelper import IoHelper
+from cat_win.src.service.helper.iohelper import FileSlice, IoHelper
 
 SPECIAL_CHARS = [
     ( 0, 'NUL', '␀', True), # ^@ \0 null
@@ -41,6 +43,15 @@ SPECIAL_CHARS = [
     # (127,'DEL', '␡', False), # delete
 ]
 # (ord[dec],char,symbol,use in --chr)
+SPECIAL_BYTES = {special_char[0] for special_char in SPECIAL_CHARS}
+
+RAW_VIEW_CHUNK_SIZE = 1024 * 1024 # a multiple of 16 bytes
+HEX_TABLE = [f"{byte:02x}" for byte in range(256)]
+BIN_TABLE = [f"{byte:08b}" for byte in range(256)]
+try:
+    HEX_SEPARATOR_SUPPORT = bool(b''.hex(' ') == '') # Python >= 3.8
+except TypeError:
+    HEX_SEPARATOR_SUPPORT = False
 
 
 def get_display_char_gen(file_encoding: str = 'utf-8', base: int = 16):
@@ -87,6 +98,186 @@ def get_display_char_gen(file_encoding: str = 'utf-8', base: int = 16):
     return get_display_char
 
 
+def _get_raw_view_header(mode: str, colors: list) -> str:
+    """
+    return the header line of the hexviewer/binaryviewer
+
+    Parameters:
+    mode (str):
+        either 'x', 'X' for hexadecimal (lower- or upper case letters),
+        or 'b' for binary
+    colors (list):
+        the rawviewer color and the reset color
+
+    Returns:
+    header (str):
+        the header containing the column information
+    """
+    header = f"{colors[0]}Address  "
+    for i in range(16):
+        header += f"{i:0{2}X} " + '      ' * (mode == 'b')
+    header += f"# Decoded Text                   {colors[1]}"
+    return header
+
+
+def get_display_table(file_encoding: str = 'utf-8') -> tuple:
+    """
+    generate the tables to decode bytes in bulk, equivalent to
+    mapping get_display_char_gen(file_encoding) over the bytes.
+
+    Parameters:
+    file_encoding (str):
+        the file encoding to test with if the resulting chars can be displayed
+
+    Returns:
+    (translate_table, replacements) (tuple):
+        a bytes.translate() table, that keeps the printable ASCII chars and the
+        special chars, and maps every other byte to DEL (127); and the special
+        chars (and DEL) mapped to the symbols that replace them after decoding
+    """
+    get_display_char = get_display_char_gen(file_encoding)
+    translate_table = bytes(
+        byte if 32 <= byte <= 126 or byte in SPECIAL_BYTES else 127 for byte in range(256)
+    )
+    replacements = [
+        (chr(byte), get_display_char(byte)) for byte in sorted(SPECIAL_BYTES) + [127]
+    ]
+    return translate_table, replacements
+
+
+def _hex_spaced(raw_content: bytes) -> str:
+    """
+    the hexadecimal representation of the bytes, separated by a space
+    """
+    if HEX_SEPARATOR_SUPPORT:
+        return raw_content.hex(' ')
+    return ' '.join(map(HEX_TABLE.__getitem__, raw_content))
+
+
+def _decode_spaced(raw_content: bytes, display_table: tuple) -> str:
+    """
+    the decoded bytes, separated by a space
+    """
+    translate_table, replacements = display_table
+    decoded = bytearray(b' ' * (2 * len(raw_content) - 1))
+    decoded[::2] = raw_content.translate(translate_table)
+    decoded = decoded.decode('latin-1')
+    for special_char, symbol in replacements:
+        if special_char in decoded:
+            decoded = decoded.replace(special_char, symbol)
+    return decoded
+
+
+def _get_raw_view_rows(raw_content: bytes, address: int, mode: str,
+                       colors: list, display_table: tuple) -> list:
+    """
+    return the raw byte representation of some bytes in rows of 16 bytes.
+    The columns of all rows are formatted at once, and only sliced per row.
+
+    Parameters:
+    raw_content (bytes):
+        the bytes to display
+    address (int):
+        the address of the first byte
+    mode (str):
+        either 'x', 'X' for hexadecimal (lower- or upper case letters),
+        or 'b' for binary
+    colors (list):
+        the rawviewer color and the reset color
+    display_table (tuple):
+        the tables to decode the bytes, as returned by get_display_table()
+
+    Returns:
+    rows (list):
+        the address, the bytes and the decoded text of every row
+    """
+    if not raw_content:
+        return []
+    if mode == 'b':
+        byte_repr = ' '.join(map(BIN_TABLE.__getitem__, raw_content))
+    else:
+        byte_repr = _hex_spaced(raw_content)
+        if mode == 'X':
+            byte_repr = byte_repr.upper()
+    decoded = _decode_spaced(raw_content, display_table)
+    # the width of a row of bytes, including the trailing separator
+    repr_width = 16 * (9 if mode == 'b' else 3)
+    color, reset = colors
+    rows = [
+        f"{color}{address+i:08X}{reset} {byte_repr[r:r+repr_width-1]} {color}#{reset} {decoded[d:d+31]}"
+        for i, r, d in zip(
+            range(0, len(raw_content), 16),
+            range(0, len(byte_repr), repr_width),
+            range(0, len(decoded), 32),
+        )
+    ]
+    if len(raw_content) % 16:
+        # the last row is padded, so the decoded text stays aligned
+        r = len(rows) - 1
+        rows[-1] = f"{color}{address+16*r:08X}{reset} " \
+                   f"{byte_repr[r*repr_width:].ljust(repr_width-1)} {color}#{reset} {decoded[32*r:]}"
+    return rows
+
+
+def _yield_file_slice_chunks(src_file, file_slice: slice):
+    """
+    yield the bytes of a slice of a file in chunks of RAW_VIEW_CHUNK_SIZE bytes,
+    without reading the entire slice into memory.
+    """
+    with FileSlice(src_file, file_slice) as raw_content:
+        for i in range(0, len(raw_content), RAW_VIEW_CHUNK_SIZE):
+            yield raw_content[i:i+RAW_VIEW_CHUNK_SIZE]
+
+
+def _get_raw_view_rows_gen(ctx, file_index: int, mode: str):
+    """
+    return the raw byte representation of a file, in chunks of rows.
+
+    Parameters:
+    ctx (AppContext):
+        the app context containing file and configuration information
+    file_index (int):
+        the index of the file in ctx.u_files
+    mode (str):
+        either 'x', 'X' for hexadecimal (lower- or upper case letters),
+        or 'b' for binary
+
+    Yields:
+    rows (list):
+        the header, followed by the rows of each chunk of the file
+    """
+    if not (mode and mode in 'xXb'):
+        mode = 'X'
+    colors = [ctx.color_dic[CKW.RAWVIEWER], ctx.color_dic[CKW.RESET_ALL]]
+    file_truncate_slice = slice(*ctx.arg_parser.file_truncate)
+
+    display_table = get_display_table(ctx.arg_parser.file_encoding)
+
+    try:
+        if file_truncate_slice != slice(None):
+            chunks = _yield_file_slice_chunks(ctx.u_files[file_index].path, file_truncate_slice)
+        else:
+            chunks = IoHelper.yield_file_chunks(
+                ctx.u_files[file_index].path, RAW_VIEW_CHUNK_SIZE
+            )
+        chunk = next(chunks, b'')
+    except OSError as exc:
+        yield [type(exc).__name__]
+        return
+
+    yield [_get_raw_view_header(mode, colors)]
+    address = 0
+    while chunk:
+        yield _get_raw_view_rows(chunk, address, mode, colors, display_table)
+        address += len(chunk)
+        chunk = next(chunks, b'')
+    if file_truncate_slice != slice(None):
+        yield [
+            f"The raw file content was truncated to {file_truncate_slice}. "
+            f"The address information could be wrong."
+        ]
+
+
 def get_raw_view_lines_gen(ctx, file_index: int, mode: str = 'X'):
     """
     return the raw byte representation of a file in hexadecimal or binary
@@ -107,47 +298,74 @@ def get_raw_view_lines_gen(ctx, file_index: int, mode: str = 'X'):
         output containing the header and line information aswell
         as the bytes themselves
     """
+    for rows in _get_raw_view_rows_gen(ctx, file_index, mode):
+        yield from rows
+
+
+def get_raw_view_blocks_gen(ctx, file_index: int, mode: str = 'X'):
+    """
+    return the raw byte representation of a file in hexadecimal or binary,
+    in blocks of many lines, so they can be written at once.
+
+    Parameters:
+    ctx (AppContext):
+        the app context containing file and configuration information
+    file_index (int):
+        the index of the file in ctx.u_files
+    mode (str):
+        either 'x', 'X' for hexadecimal (lower- or upper case letters),
+        or 'b' for binary
+
+    Yields:
+    block (str):
+        the lines of get_raw_view_lines_gen(), joined by newlines
+    """
+    for rows in _get_raw_view_rows_gen(ctx, file_index, mode):
+        yield '\n'.join(rows)
+
+
+def get_raw_view_peek(ctx, file_index: int, mode: str = 'X', peek_size: int = 5) -> tuple:
+    """
+    return the raw byte representation of the first and the last rows of a file
+    in hexadecimal or binary, by only reading the bytes of these rows.
+
+    Parameters:
+    ctx (AppContext):
+        the app context containing file and configuration information
+    file_index (int):
+        the index of the file in ctx.u_files
+    mode (str):
+        either 'x', 'X' for hexadecimal (lower- or upper case letters),
+        or 'b' for binary
+    peek_size (int):
+        the amount of rows to display at the start and at the end
+
+    Returns:
+    (head, excluded, tail) (tuple):
+        the header followed by the first rows, the amount of rows excluded
+        in between, and the last rows
+    """
     if not (mode and mode in 'xXb'):
         mode = 'X'
     colors = [ctx.color_dic[CKW.RAWVIEWER], ctx.color_dic[CKW.RESET_ALL]]
-    file_truncate_slice = slice(*ctx.arg_parser.file_truncate)
 
-    get_display_char = get_display_char_gen(ctx.arg_parser.file_encoding)
+    display_table = get_display_table(ctx.arg_parser.file_encoding)
 
     try:
-        raw_file_content = IoHelper.read_file(ctx.u_files[file_index].path, True)
-        raw_file_content = raw_file_content[file_truncate_slice]
-        raw_file_content_length = len(raw_file_content)
+        with open(ctx.u_files[file_index].path, 'rb') as raw_f:
+            row_count = -(-raw_f.seek(0, os.SEEK_END) // 16)
+            raw_f.seek(0)
+            if row_count <= 2 * peek_size:
+                head_content, tail_address, tail_content = raw_f.read(), 0, b''
+            else:
+                head_content = raw_f.read(16 * peek_size)
+                tail_address = 16 * (row_count - peek_size)
+                raw_f.seek(tail_address)
+                tail_content = raw_f.read()
     except OSError as exc:
-        yield type(exc).__name__
-        return
+        return [type(exc).__name__], 0, []
 
-    repr_length = 2 * (mode in 'xX') + 8 * (mode == 'b')
-
-    current_line = f"{colors[0]}Address  "
-    for i in range(16):
-        current_line += f"{i:0{2}X} " + '      ' * (mode == 'b')
-    current_line += f"# Decoded Text                   {colors[1]}"
-    yield current_line
-
-    current_line = f"{colors[0]}{0:0{8}X}{colors[1]} "
-    line = []
-    for i, byte in enumerate(raw_file_content, start=1):
-        line.append(byte)
-        if not i % 16:
-            current_line += ' '.join(f"{b:0{repr_length}{mode}}" for b in line) + \
-                            f" {colors[0]}#{colors[1]} " + \
-                            ' '.join(map(get_display_char, line))
-            yield current_line
-            if i < raw_file_content_length:
-                current_line = f"{colors[0]}{i:0{8}X}{colors[1]} "
-            line = []
-    if line:
-        current_line += ' '.join(f"{b:0{repr_length}{mode}}" for b in line) + ' ' + \
-                        ' ' * ((repr_length + 1) * (16-len(line)) - 1) + \
-                        f" {colors[0]}#{colors[1]} " + \
-                        ' '.join(map(get_display_char, line))
-        yield current_line
-    if file_truncate_slice != slice(None):
-        yield f"The raw file content was truncated to {file_truncate_slice}. " \
-              f"The address information could be wrong."
+    head = [_get_raw_view_header(mode, colors)]
+    head.extend(_get_raw_view_rows(head_content, 0, mode, colors, display_table))
+    tail = _get_raw_view_rows(tail_content, tail_address, mode, colors, display_table)
+    return head, max(row_count - 2 * peek_size, 0), tail
@@ -2,7 +2,29 @@
 strings
 """
 
+import re
+from itertools import chain
+
 from cat_win.src.domain.contentbuffer import ContentBuffer
+from cat_win.src.service.helper.iohelper import IoHelper
+
+# the pattern, size and codec of one printable char, for each strings_encoding
+STRINGS_ENCODINGS = {
+    's': (rb'[\x20-\x7e]', 1, 'ascii'),        # single-7-bit-byte characters
+    'l': (rb'[\x20-\x7e]\x00', 2, 'utf-16-le'), # 16-bit littleendian
+    'b': (rb'\x00[\x20-\x7e]', 2, 'utf-16-be'), # 16-bit bigendian
+}
+# the ANSI CSI codes (see RE_ANSI_CSI) within an ascii compatible encoding, and the
+# start of one, that might be completed by the next chunk
+RE_ANSI_CSI_BYTES = re.compile(rb'\001?\033\[[\d;]*[a-zA-Z]\002?')
+RE_ANSI_CSI_BYTES_START = re.compile(rb'\001?\033(?:\[[\d;]*)?\Z')
+# the format of the byte offsets in front of each string, for each strings_offsets
+STRINGS_OFFSETS = {
+    '' : None,
+    'd': '{:>7d} ',
+    'o': '{:>7o} ',
+    'x': '{:>7x} ',
+}
 
 
 def get_strings(content: ContentBuffer, min_seq_len: int, delim: str) -> ContentBuffer:
@@ -22,23 +44,135 @@ def get_strings(content: ContentBuffer, min_seq_len: int, delim: str) -> Content
         the new file contentbuffer containing all found strings [('', string), ...]
     """
     content_type_raw = bool(content) and isinstance(content[0][0], bytes)
+    # printable ascii, bytes outside of it never decode to printable ascii
+    if content_type_raw:
+        string_pattern = re.compile(rb'[\x20-\x7e]{%d,}' % min_seq_len)
+    else:
+        string_pattern = re.compile(r'[\x20-\x7e]{%d,}' % min_seq_len)
     new_content = ContentBuffer()
-    new_string = ''
     for line, _, _ in content:
+        new_line = string_pattern.findall(line)
         if content_type_raw:
-            line = line.decode(errors='replace')
-        new_line = []
-        for char in line:
-            if 32 <= ord(char) <= 126: # if it is printable ascii
-                new_string += char
-                continue
-            if len(new_string) >= min_seq_len:
-                new_line.append(new_string)
-            new_string = ''
-        if len(new_string) >= min_seq_len:
-            new_line.append(new_string)
-        new_string = ''
-        for line in delim.join(new_line).splitlines():
-            new_content.append(line)
+            new_line = [string.decode('ascii') for string in new_line]
+        for string_line in delim.join(new_line).splitlines():
+            new_content.append(string_line)
 
     return new_content
+
+
+def strip_ansi_chunks(chunks):
+    """
+    remove the ANSI CSI codes from the chunks of bytes of a file,
+    including the ones crossing the boundaries of the chunks.
+    Expects supports_byte_lines(file_encoding) to be True.
+
+    Parameters:
+    chunks (Iterable[bytes]):
+        the bytes of the file in chunks
+
+    Yields:
+    byte_chunk (bytes):
+        the next chunk without ANSI codes
+    """
+    carry = b''
+    for byte_chunk in chunks:
+        data = RE_ANSI_CSI_BYTES.sub(b'', carry + byte_chunk)
+        incomplete = RE_ANSI_CSI_BYTES_START.search(data, max(data.rfind(b'\033') - 1, 0))
+        if incomplete is not None:
+            data, carry = data[:incomplete.start()], data[incomplete.start():]
+        else:
+            carry = b''
+        yield data
+    if carry:
+        yield carry
+
+
+def _yield_string_tokens(chunks, string_pattern, run_pattern, break_pattern,
+                         char_size: int, overlap: int):
+    """
+    find all strings within the chunks of bytes, including the ones
+    crossing the boundaries of the chunks.
+
+    Yields:
+    token (tuple):
+        the byte offset and the bytes of the next string,
+        or None if there is a line break in front of the next string
+    """
+    # a string reaching the end of the previous chunk, that might still continue
+    run_parts, run_start = None, 0
+    # the end of the previous chunk, that might still become (part of) a string or line break
+    carry, offset = b'', 0
+    for byte_chunk in chain(chunks, [None]):
+        final = byte_chunk is None
+        data = carry if final else carry + byte_chunk
+        position = 0
+        if run_parts is not None:
+            position = run_pattern.match(data).end()
+            run_parts.append(data[:position])
+            if len(data) - position < char_size and not final:
+                carry = data[position:]
+                offset += position
+                continue
+            yield (run_start, b''.join(run_parts))
+            run_parts = None
+        for match in string_pattern.finditer(data, position):
+            if break_pattern.search(data, position, match.start()):
+                yield None
+            position = match.end()
+            if len(data) - position < char_size and not final:
+                run_parts, run_start = [match.group()], offset + match.start()
+                break
+            yield (offset + match.start(), match.group())
+        if final:
+            return
+        if run_parts is None:
+            if break_pattern.search(data, position):
+                yield None
+            position = max(position, len(data) - overlap)
+        carry = data[position:]
+        offset += position
+
+
+def yield_strings(chunks, min_seq_len: int, delim: str, file_encoding: str = 'utf-8',
+                  encoding: str = 's', offsets: str = ''):
+    """
+    find all strings within the raw bytes of a file, without decoding it.
+    Expects supports_byte_lines(file_encoding) to be True.
+
+    Parameters:
+    chunks (Iterable[bytes]):
+        the bytes of the file in chunks
+    min_seq_len (int):
+        the minimum required length of a string
+    delim (str):
+        the delimeter to display the found strings on the same line
+    file_encoding (str):
+        the encoding of the file, used to find the line breaks
+    encoding (str):
+        the encoding of the strings, one of STRINGS_ENCODINGS
+    offsets (str):
+        the radix of the byte offsets to display in front of each string,
+        one of STRINGS_OFFSETS
+
+    Yields:
+    line (str):
+        the next line containing the found strings
+    """
+    printable_char, char_size, codec = STRINGS_ENCODINGS[encoding]
+    string_pattern = re.compile(b'(?:%s){%d,}' % (printable_char, min_seq_len))
+    run_pattern = re.compile(b'(?:%s)*' % printable_char)
+    line_breaks = IoHelper.get_encoded_line_breaks(file_encoding if encoding == 's' else codec)
+    break_pattern = re.compile(b'|'.join(map(re.escape, line_breaks)))
+    overlap = max(min_seq_len * char_size, max(map(len, line_breaks))) - 1
+    offset_format = STRINGS_OFFSETS[offsets]
+
+    group = []
+    for token in _yield_string_tokens(chunks, string_pattern, run_pattern,
+                                      break_pattern, char_size, overlap):
+        if token is None:
+            yield from delim.join(group).splitlines()
+            group = []
+            continue
+        string = token[1].decode(codec)
+        group.append(string if offset_format is None else offset_format.format(token[0]) + string)
+    yield from delim.join(group).splitlines()
@@ -3,14 +3,20 @@ visualizer
 """
 
 import shutil
+import sys
+from bisect import bisect_right
 from functools import lru_cache
+from itertools import groupby
 from pathlib import Path
 
 from cat_win.src.const.colorconstants import CVis
-from cat_win.src.service.helper.iohelper import IoHelper
-from cat_win.src.service.helper.vishelper import Entropy, SpaceFilling
+from cat_win.src.service.helper.iohelper import FileSlice, IoHelper
+from cat_win.src.service.helper.vishelper import Digraph, Entropy, Overview, SpaceFilling, \
+    get_fit_overview_square
 
 GRAY_SCALE_VECTOR    = r"█▓▒░ "
+# the amount of rendered rows written to stdout at once
+DISPLAY_BUFFER_ROWS  = 1024
 
 
 class Visualizer:
@@ -18,6 +24,7 @@ class Visualizer:
     visualize given files in different ways.
     """
     debug_mode: bool = False
+    overview_mode: bool = False
 
     def __init__(self, files: list, v_type: str = 'ByteView', truncate: list = None) -> None:
         self.files = files
@@ -85,22 +92,33 @@ class Visualizer:
             the function used to determine the color for each byte
         """
         d_char = GRAY_SCALE_VECTOR[0] * 2
+        empty_cell = '  ' + '  ' * Visualizer.debug_mode
+        # the color of every possible value, empty cells (-1) map to the last entry
+        color_table = [color_def(byte) for byte in range(256)] + [None]
 
-        vis_row, last_color_def = '', None
+        vis_rows, last_color_def = [], None
         for row in data_generator:
-            for byte in row:
-                if byte < 0:
-                    vis_row += '  ' + '  ' * Visualizer.debug_mode
+            vis_row = []
+            # every run of cells with the same color only needs one color code
+            for c_color_def, cells in groupby(row, color_table.__getitem__):
+                if c_color_def is None:
+                    vis_row.append(empty_cell * len(list(cells)))
                     continue
-                c_color_def = color_def(byte)
                 if c_color_def != last_color_def:
-                    vis_row += f"{CVis.COLOR_RESET}{c_color_def}"
+                    vis_row.append(f"{CVis.COLOR_RESET}{c_color_def}")
                     last_color_def = c_color_def
-                vis_row += str(byte).rjust(4) if Visualizer.debug_mode else d_char
+                if Visualizer.debug_mode:
+                    vis_row.extend(str(byte).rjust(4) for byte in cells)
+                else:
+                    vis_row.append(d_char * len(list(cells)))
             if vis_row:
-                print(vis_row)
-                vis_row = ''
-        print(CVis.COLOR_RESET)
+                vis_rows.append(''.join(vis_row))
+            if len(vis_rows) >= DISPLAY_BUFFER_ROWS:
+                vis_rows.append('')
+                sys.stdout.write('\n'.join(vis_rows))
+                vis_rows.clear()
+        vis_rows.append(f"{CVis.COLOR_RESET}\n")
+        sys.stdout.write('\n'.join(vis_rows))
 
     def visualize_byte_view(self, file_p: Path) -> None:
         """
@@ -111,8 +129,12 @@ class Visualizer:
         file_p (Path):
             a string representation of a file (-path)
         """
+        if Visualizer.overview_mode:
+            self.visualize_overview(file_p, 'scan', Overview.get_block_classes,
+                                    Visualizer.get_color_byte_view)
+            return
         width = shutil.get_terminal_size()[0] // 2
-        bin_content = IoHelper.read_file(file_p, True)[slice(*self.truncate)]
+        bin_content = IoHelper.read_file_slice(file_p, slice(*self.truncate))
         Visualizer.display_data(SpaceFilling.get_scan_curve(bin_content, width),
                                 Visualizer.get_color_byte_view)
 
@@ -125,10 +147,15 @@ class Visualizer:
         file_p (Path):
             a string representation of a file (-path)
         """
+        if Visualizer.overview_mode:
+            self.visualize_overview(file_p, 'zorder', Overview.get_block_classes,
+                                    Visualizer.get_color_byte_view)
+            return
         width = shutil.get_terminal_size()[0] // 2
-        bin_content = IoHelper.read_file(file_p, True)[slice(*self.truncate)]
-        Visualizer.display_data(SpaceFilling.get_zorder_curve(bin_content, width),
-                                Visualizer.get_color_byte_view)
+        # the chunks are read lazily, so files larger than the memory can be displayed
+        with FileSlice(file_p, slice(*self.truncate)) as bin_content:
+            Visualizer.display_data(SpaceFilling.get_zorder_curve(bin_content, width),
+                                    Visualizer.get_color_byte_view)
 
     def visualize_hilbert_curve_view(self, file_p: Path) -> None:
         """
@@ -139,10 +166,14 @@ class Visualizer:
         file_p (Path):
             a string representation of a file (-path)
         """
+        if Visualizer.overview_mode:
+            self.visualize_overview(file_p, 'hilbert', Overview.get_block_classes,
+                                    Visualizer.get_color_byte_view)
+            return
         width = shutil.get_terminal_size()[0] // 2
-        bin_content = IoHelper.read_file(file_p, True)[slice(*self.truncate)]
-        Visualizer.display_data(SpaceFilling.get_hilbert_curve(bin_content, width),
-                                Visualizer.get_color_byte_view)
+        with FileSlice(file_p, slice(*self.truncate)) as bin_content:
+            Visualizer.display_data(SpaceFilling.get_hilbert_curve(bin_content, width),
+                                    Visualizer.get_color_byte_view)
 
     def visualize_shannon_entropy(self, file_p: Path) -> None:
         """
@@ -153,12 +184,45 @@ class Visualizer:
         file_p (Path):
             a string representation of a file (-path)
         """
+        if Visualizer.overview_mode:
+            self.visualize_overview(file_p, 'hilbert', Overview.get_block_entropy,
+                                    Visualizer.get_color_entropy)
+            return
         width = shutil.get_terminal_size()[0] // 2
-        bin_content = IoHelper.read_file(file_p, True)[slice(*self.truncate)]
+        bin_content = IoHelper.read_file_slice(file_p, slice(*self.truncate))
         bin_content = Entropy.normalized_shannon_entropy(bin_content)
         Visualizer.display_data(SpaceFilling.get_hilbert_curve(bin_content, width),
                                 Visualizer.get_color_entropy)
 
+    def visualize_overview(self, file_p: Path, curve: str, get_block_stats, color_def) -> None:
+        """
+        visualize all bytes in a given file on a single screen.
+        every cell summarizes a block of bytes, the blocks are calculated
+        in one sequential read and displayed along the given curve.
+
+        Parameters:
+        file_p (Path):
+            a string representation of a file (-path)
+        curve (str):
+            the curve to display the blocks in, either 'scan', 'zorder' or 'hilbert'
+        get_block_stats (def):
+            the function used to summarize the blocks
+        color_def (def):
+            the function used to determine the color for each block
+        """
+        columns, lines = shutil.get_terminal_size()
+        # leave space for the file header and the final color reset
+        max_side = max(min(columns // 2, lines - 2), 1)
+        with FileSlice(file_p, slice(*self.truncate)) as bin_content:
+            side = get_fit_overview_square(len(bin_content), max_side)
+            block_stats = get_block_stats(bin_content, side**2)
+        curves = {
+            'scan': SpaceFilling.get_scan_curve,
+            'zorder': SpaceFilling.get_zorder_curve,
+            'hilbert': SpaceFilling.get_hilbert_curve,
+        }
+        Visualizer.display_data(curves[curve](block_stats, side), color_def)
+
     def visualize_digraph_dot_plot(self, file_p: Path) -> None:
         """
         visualize all bytes in a given file.
@@ -168,19 +232,8 @@ class Visualizer:
         file_p (Path):
             a string representation of a file (-path)
         """
-        bin_content = IoHelper.read_file(file_p, True)[slice(*self.truncate)]
-        digraph = [0] * 65536
-
-        bin_content_it = iter(bin_content)
-        for byte_a, byte_b in zip(bin_content_it, bin_content_it):
-            digraph[byte_a*256+byte_b] += 1
-        bin_content_it = iter(bin_content)
-        try:
-            next(bin_content_it)
-        except StopIteration:
-            pass
-        for byte_a, byte_b in zip(bin_content_it, bin_content_it):
-            digraph[byte_a*256+byte_b] += 1
+        with FileSlice(file_p, slice(*self.truncate)) as bin_content:
+            digraph = Digraph.count_pairs(bin_content)
 
         digraph_sorted = sorted(digraph.copy(), reverse=True)
 
@@ -204,18 +257,16 @@ class Visualizer:
                 borders[i] = 0
         borders.reverse()
 
-        vis_row = ''
+        # the shade of a count is determined by the amount of borders above it
+        borders_asc = borders[::-1]
+        shades = [g * 2 for g in GRAY_SCALE_VECTOR] + ['  ']
+        vis_rows = []
+        for i in range(0, 65536, 256):
+            vis_row = ''.join(shades[len(borders) - bisect_right(borders_asc, count)]
+                              for count in digraph[i:i+256])
+            vis_rows.append(f"{CVis.DIGRAPH_VIEW_CONTROL}|{vis_row}|{CVis.COLOR_RESET}")
         print(f"{CVis.DIGRAPH_VIEW_CONTROL}+{'-'*512}+{CVis.COLOR_RESET}")
-        for i in range(256):
-            for j in range(256):
-                for index, border in enumerate(borders):
-                    if digraph[i*256+j] >= border:
-                        vis_row += (GRAY_SCALE_VECTOR[index] * 2)
-                        break
-                else:
-                    vis_row += '  '
-            print(f"{CVis.DIGRAPH_VIEW_CONTROL}|{vis_row}|{CVis.COLOR_RESET}")
-            vis_row = ''
+        print('\n'.join(vis_rows))
 
         shading_info_list = list(zip(borders, GRAY_SCALE_VECTOR))
         boundary_top = d_max+1
@@ -252,12 +303,16 @@ class Visualizer:
             visualizer(file)
 
     @staticmethod
-    def set_flags(debug: bool) -> None:
+    def set_flags(debug: bool, overview: bool = False) -> None:
         """
         set the flags for the visualizer.
 
         Parameters:
         debug (bool):
             indicates if debug mode should be enabled
+        overview (bool):
+            indicates if every cell should summarize a block of bytes,
+            such that the whole file fits on one screen
         """
         Visualizer.debug_mode = debug
+        Visualizer.overview_mode = overview
@@ -6,6 +6,8 @@ argparser-related test mocks
 class DummyArgParser:
     def __init__(self, file_encoding='utf-8'):
         self.file_encoding = file_encoding
+        self.file_queries = []
+        self.file_queries_replacement = []
 
 
 class DummyReplArgParser(DummyArgParser):
@@ -5,6 +5,7 @@ argument-related test mocks
 from cat_win.src.const.argconstants import (
     ARGS_BINVIEW,
     ARGS_B64D,
+    ARGS_B64E,
     ARGS_CLIP,
     ARGS_CCONFIG,
     ARGS_CCONFIG_FLUSH,
@@ -19,6 +20,7 @@ from cat_win.src.const.argconstants import (
     ARGS_PLAIN_ONLY,
     ARGS_RAW,
     ARGS_REVERSE,
+    ARGS_STRINGS,
     ARGS_VERSION,
     ARGS_WATCH,
 )
@@ -31,6 +33,8 @@ class DummyArgs(dict):
                 ARGS_RAW: False,
                 ARGS_PLAIN_ONLY: False,
                 ARGS_REVERSE: False,
+                ARGS_STRINGS: False,
+                ARGS_B64E: False,
                 ARGS_HEXVIEW: False,
                 ARGS_BINVIEW: False,
                 ARGS_WATCH: False,
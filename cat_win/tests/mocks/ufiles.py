@@ -15,5 +15,5 @@ class DummyUFiles(list):
         self.clear()
         self.extend(files)
 
-    def generate_values(self, show_numbering, show_line_length):
-        self.generate_values_calls.append((show_numbering, show_line_length))
+    def generate_values(self, show_numbering, show_line_length, cache_metadata=True):
+        self.generate_values_calls.append((show_numbering, show_line_length, cache_metadata))
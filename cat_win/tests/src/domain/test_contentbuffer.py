@@ -160,3 +160,50 @@ class TestContentBuffer(TestCase):
         self.assertEqual(new_cb.lines, ['LINE1', 'LINE2'])
         self.assertEqual(new_cb.prefixes, ['P1', 'P2'])
         self.assertEqual(new_cb.suffixes, ['S1', 'S2'])
+
+    def test_contentbuffer_columns_are_lazy(self):
+        cb = ContentBuffer.from_lines(['line1', 'line2'], default_prefix='p')
+        self.assertIsNone(cb._prefixes)
+        self.assertIsNone(cb._suffixes)
+        self.assertEqual(list(cb), [('line1', 'p', ''), ('line2', 'p', '')])
+        self.assertEqual(cb[1], ('line2', 'p', ''))
+        cb.append('line3', prefix='p')
+        cb.reverse()
+        cb_slice = cb[::2]
+        self.assertIsNone(cb_slice._prefixes)
+        self.assertEqual(list(cb_slice), [('line3', 'p', ''), ('line1', 'p', '')])
+        self.assertIsNone((cb + cb_slice)._suffixes)
+        self.assertIsNone(cb._prefixes)
+        self.assertEqual(cb, ContentBuffer.from_rows([('line3', 'p'), ('line2', 'p'), ('line1', 'p')]))
+
+        self.assertEqual(cb.prefixes, ['p', 'p', 'p'])
+        cb.prefixes[0] = 'x'
+        self.assertEqual(cb[0], ('line3', 'x', ''))
+        cb.suffixes = (s for s in 'abc')
+        self.assertEqual(cb.suffixes, ['a', 'b', 'c'])
+
+    def test_contentbuffer_add_mixed_defaults(self):
+        cb = ContentBuffer.from_lines(['line1'], default_prefix='p1') + ContentBuffer.from_lines(['line2'])
+        self.assertEqual(cb.prefixes, ['p1', ''])
+        self.assertEqual(cb.suffixes, ['', ''])
+
+    def test_sort_calls_key_once_per_row(self):
+        cb = ContentBuffer.from_lines(['b', 'c', 'a', 'b'])
+        calls = []
+        cb.sort(key=lambda row: calls.append(row) or row[0], reverse=True)
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(cb.lines, ['c', 'b', 'b', 'a'])
+        self.assertIsNone(cb._prefixes)
+
+    def test_filter_in_place(self):
+        cb = ContentBuffer.from_rows([('line1', 'p1', 's1'), ('line2', 'p2', 's2')])
+        lines, prefixes = cb.lines, cb.prefixes
+        self.assertIs(cb.filter(lambda line, prefix, suffix: line == 'line2'), cb)
+        self.assertIs(cb.lines, lines)
+        self.assertIs(cb.prefixes, prefixes)
+        self.assertEqual(list(cb), [('line2', 'p2', 's2')])
+
+        cb = ContentBuffer.from_lines(['a', '', 'b'])
+        cb.filter(lambda line, prefix, suffix: line)
+        self.assertEqual(cb.lines, ['a', 'b'])
+        self.assertIsNone(cb._suffixes)
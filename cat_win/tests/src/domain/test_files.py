@@ -1,5 +1,8 @@
 from unittest import TestCase
+from unittest.mock import patch
 import os
+import shutil
+import tempfile
 
 from cat_win.src.domain.files import Files
 # import sys
@@ -16,6 +19,17 @@ test_file_empty       = os.path.join(test_file_dir, 'test_empty.txt')
 
 
 class TestFiles(TestCase):
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.env_patch = patch.dict(os.environ, {
+            'CAT_WIN_CONFIG_DIR': self.config_dir, 'CAT_WIN_CACHE_DIR': self.config_dir,
+        })
+        self.env_patch.start()
+
+    def tearDown(self):
+        self.env_patch.stop()
+        shutil.rmtree(self.config_dir, ignore_errors=True)
+
     def test__calc_max_line_length_(self):
         u_files = Files()
         self.assertEqual(u_files._calc_max_line_length_(test_file_path), 2)
@@ -179,3 +193,24 @@ class TestFiles(TestCase):
         self.assertEqual(u_files.file_number_place_holder, 1)
         self.assertEqual(u_files.all_line_number_place_holder, 2)
         self.assertEqual(u_files.file_line_length_place_holder, 1)
+
+    def test_files_generate_values_uses_cached_metadata(self):
+        u_files = Files()
+        u_files.set_files([test_file_path])
+        u_files.generate_values(True, True)
+        self.assertTrue(os.path.isfile(u_files.file_metadata.cache_file))
+
+        u_files = Files()
+        u_files.set_files([test_file_path])
+        with patch('cat_win.src.domain.files.FileMetadata.scan') as scan:
+            u_files.generate_values(True, True)
+        scan.assert_not_called()
+        self.assertEqual(u_files.all_files_lines[str(test_file_path)], 8)
+        self.assertEqual(u_files.file_line_length_place_holder, 2)
+
+    def test_files_generate_values_without_cache(self):
+        u_files = Files()
+        u_files.set_files([test_file_path])
+        u_files.generate_values(True, True, cache_metadata=False)
+        self.assertEqual(u_files.all_files_lines[str(test_file_path)], 8)
+        self.assertEqual(os.listdir(self.config_dir), [])
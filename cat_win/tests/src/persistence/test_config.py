@@ -13,7 +13,10 @@ from cat_win.src.persistence.config import (
     validator_int,
     validator_int_pos,
     validator_bool,
-    validator_encoding
+    validator_encoding,
+    validator_checksum_algorithms,
+    validator_strings_offsets,
+    validator_strings_encoding
 )
 # import sys
 # sys.path.append('../cat_win')
@@ -65,6 +68,37 @@ class TestConfig(TestCase):
         self.assertIn('Integer', logger.output())
         self.assertIn('greater than Zero', logger.output())
 
+    @patch('cat_win.src.persistence.config.logger', logger)
+    def test_validator_checksum_algorithms(self):
+        logger.clear()
+        self.assertTrue(validator_checksum_algorithms('crc32,md5,sha1,sha256,sha512'))
+        self.assertTrue(validator_checksum_algorithms('SHA256, adler32'))
+        self.assertFalse(validator_checksum_algorithms(''))
+        self.assertFalse(validator_checksum_algorithms('md5,'))
+        self.assertFalse(validator_checksum_algorithms('shake_128'))
+        self.assertFalse(validator_checksum_algorithms('md5', True))
+        self.assertIn('Checksum Algorithms', logger.output())
+
+    @patch('cat_win.src.persistence.config.logger', logger)
+    def test_validator_strings_offsets(self):
+        logger.clear()
+        for value in ['', 'd', 'o', 'x']:
+            self.assertTrue(validator_strings_offsets(value))
+        self.assertFalse(validator_strings_offsets('X'))
+        self.assertFalse(validator_strings_offsets('dx'))
+        self.assertFalse(validator_strings_offsets('', True))
+        self.assertIn('hexadecimal', logger.output())
+
+    @patch('cat_win.src.persistence.config.logger', logger)
+    def test_validator_strings_encoding(self):
+        logger.clear()
+        for value in ['s', 'l', 'b']:
+            self.assertTrue(validator_strings_encoding(value))
+        self.assertFalse(validator_strings_encoding(''))
+        self.assertFalse(validator_strings_encoding('L'))
+        self.assertFalse(validator_strings_encoding('s', True))
+        self.assertIn('littleendian', logger.output())
+
     @patch('cat_win.src.persistence.config.logger', logger)
     def test_validator_bool(self):
         logger.clear()
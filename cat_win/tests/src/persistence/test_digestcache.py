@@ -0,0 +1,117 @@
+from unittest import TestCase
+from unittest.mock import patch
+import json
+import os
+import shutil
+import tempfile
+
+from cat_win.src.persistence.digestcache import DigestCache
+
+
+class TestDigestCache(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.src_file = os.path.join(self.tmp_dir, 'file.bin')
+        self.cache_file = os.path.join(self.tmp_dir, 'cache', 'checksums.json')
+        with open(self.src_file, 'wb') as f:
+            f.write(b'abc')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_get_key_changes_with_file(self):
+        key = DigestCache.get_key(self.src_file)
+        self.assertEqual(DigestCache.get_key(self.src_file), key)
+        with open(self.src_file, 'ab') as f:
+            f.write(b'd')
+        self.assertNotEqual(DigestCache.get_key(self.src_file), key)
+        with self.assertRaises(OSError):
+            DigestCache.get_key(os.path.join(self.tmp_dir, 'missing'))
+
+    def test_put_save_load(self):
+        digest_cache = DigestCache(self.cache_file)
+        digest_cache.load()
+        self.assertEqual(digest_cache.get('k'), {})
+        digest_cache.put('k', {'md5': 'a'})
+        digest_cache.put('k', {'crc32': 'B'})
+        digest_cache.save()
+        self.assertFalse(digest_cache.changed)
+        loaded_cache = DigestCache(self.cache_file)
+        loaded_cache.load()
+        self.assertEqual(loaded_cache.get('k'), {'md5': 'a', 'crc32': 'B'})
+        # get() returns a copy
+        loaded_cache.get('k')['sha1'] = 'c'
+        self.assertEqual(loaded_cache.get('k'), {'md5': 'a', 'crc32': 'B'})
+
+    def test_put_known_digests_unchanged(self):
+        digest_cache = DigestCache(self.cache_file)
+        digest_cache.load()
+        digest_cache.put('k', {'md5': 'a', 'crc32': 'B'})
+        digest_cache.changed = False
+        digest_cache.put('k', {'md5': 'a'})
+        self.assertFalse(digest_cache.changed)
+        with patch('cat_win.src.persistence.digestcache.json.dump') as dump:
+            digest_cache.save()
+        dump.assert_not_called()
+
+    def test_put_limits_entries(self):
+        digest_cache = DigestCache(self.cache_file)
+        digest_cache.load()
+        with patch.object(DigestCache, 'MAX_ENTRIES', 2):
+            digest_cache.put('a', {'md5': '1'})
+            digest_cache.put('b', {'md5': '2'})
+            digest_cache.put('a', {'md5': '1'})
+            digest_cache.put('c', {'md5': '3'})
+        self.assertEqual(list(digest_cache.entries), ['a', 'c'])
+
+    def test_load_ignores_invalid_cache(self):
+        os.makedirs(os.path.dirname(self.cache_file))
+        for content in ['invalid', '[]', '{"k": 1}']:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                f.write(content)
+            digest_cache = DigestCache(self.cache_file)
+            digest_cache.load()
+            self.assertEqual(len(digest_cache.entries), 0)
+
+    def test_save_ignores_oserror(self):
+        digest_cache = DigestCache(self.cache_file)
+        digest_cache.load()
+        digest_cache.put('k', {'md5': 'a'})
+        with patch('cat_win.src.persistence.digestcache.os.replace', side_effect=OSError):
+            digest_cache.save()
+        self.assertTrue(digest_cache.changed)
+        self.assertEqual(os.listdir(os.path.dirname(self.cache_file)), [])
+        digest_cache.save()
+        with open(self.cache_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {'k': {'md5': 'a'}})
+
+    def test_put_blocks(self):
+        blocks_file = os.path.join(self.tmp_dir, 'cache', 'checksum_blocks.json')
+        digest_cache = DigestCache(self.cache_file, blocks_file)
+        self.assertIsNone(digest_cache.put_blocks(self.src_file, (4, 3, b'ab')))
+        self.assertEqual(digest_cache.put_blocks(self.src_file, (4, 3, b'ab')), (4, 3, b'ab'))
+        digest_cache.save()
+        self.assertFalse(digest_cache.blocks_changed)
+        self.assertFalse(os.path.isfile(self.cache_file))
+        loaded_cache = DigestCache(self.cache_file, blocks_file)
+        self.assertEqual(loaded_cache.put_blocks(self.src_file, (4, 5, b'cd')), (4, 3, b'ab'))
+        with patch.object(DigestCache, 'MAX_BLOCK_ENTRIES', 1):
+            loaded_cache.put_blocks(os.path.join(self.tmp_dir, 'other'), (4, 0, b''))
+        self.assertEqual(list(loaded_cache.block_entries), [os.path.realpath(os.path.join(self.tmp_dir, 'other'))])
+
+    def test_not_persistent(self):
+        blocks_file = os.path.join(self.tmp_dir, 'cache', 'checksum_blocks.json')
+        digest_cache = DigestCache(self.cache_file, blocks_file)
+        digest_cache.load()
+        digest_cache.put('k', {'md5': 'a'})
+        digest_cache.save()
+        digest_cache = DigestCache(self.cache_file, blocks_file, persistent=False)
+        digest_cache.load()
+        self.assertEqual(digest_cache.get('k'), {})
+        digest_cache.put('k', {'crc32': 'B'})
+        self.assertEqual(digest_cache.get('k'), {'crc32': 'B'})
+        self.assertIsNone(digest_cache.put_blocks(self.src_file, (4, 3, b'ab')))
+        digest_cache.save()
+        with open(self.cache_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {'k': {'md5': 'a'}})
+        self.assertFalse(os.path.isfile(blocks_file))
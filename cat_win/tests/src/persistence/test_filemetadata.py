@@ -0,0 +1,89 @@
+from unittest import TestCase
+from unittest.mock import patch
+import json
+import os
+import shutil
+import tempfile
+
+from cat_win.src.persistence.filemetadata import FileMetadata
+
+
+class TestFileMetadata(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.src_file = os.path.join(self.tmp_dir, 'file.txt')
+        self.cache_file = os.path.join(self.tmp_dir, 'cache', 'file_metadata.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write(self, data: bytes):
+        with open(self.src_file, 'wb') as f:
+            f.write(data)
+
+    def test_scan(self):
+        for data in [b'', b'\n', b'abc', b'a\r\nbcd\rxy\n', b'ab\r\n\r\nabcdef', b'abcdefgh\n\n']:
+            self._write(data)
+            expected = (data.count(b'\n'), max(map(len, data.splitlines()), default=0), len(data))
+            for block_size in range(1, 6):
+                with self.subTest(data=data, block_size=block_size):
+                    self.assertEqual(FileMetadata.scan(self.src_file, block_size), expected)
+
+    def test_get_caches_by_stat(self):
+        self._write(b'ab\nc\n')
+        file_metadata = FileMetadata(self.cache_file)
+        self.assertEqual(file_metadata.get(self.src_file), (2, 2, 5))
+        with patch.object(FileMetadata, 'scan') as scan:
+            self.assertEqual(file_metadata.get(self.src_file), (2, 2, 5))
+        scan.assert_not_called()
+        self.assertEqual(file_metadata.cache_info(), (1, 1, FileMetadata.MAX_ENTRIES, 1))
+
+        self._write(b'abcd\n')
+        self.assertEqual(file_metadata.get(self.src_file), (1, 4, 5))
+
+    def test_get_missing_file(self):
+        with self.assertRaises(OSError):
+            FileMetadata(self.cache_file).get(os.path.join(self.tmp_dir, 'missing.txt'))
+
+    def test_save_and_load(self):
+        self._write(b'a\nbcd')
+        file_metadata = FileMetadata(self.cache_file)
+        file_metadata.get(self.src_file)
+        file_metadata.save()
+        self.assertFalse(file_metadata.changed)
+        with open(self.cache_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(list(json.load(f).values()), [[1, 3]])
+
+        file_metadata = FileMetadata(self.cache_file)
+        with patch.object(FileMetadata, 'scan') as scan:
+            self.assertEqual(file_metadata.get(self.src_file), (1, 3, 5))
+        scan.assert_not_called()
+
+    def test_not_persistent(self):
+        self._write(b'ab\nc\n')
+        file_metadata = FileMetadata(self.cache_file, persistent=False)
+        self.assertEqual(file_metadata.get(self.src_file), (2, 2, 5))
+        self.assertEqual(file_metadata.get(self.src_file), (2, 2, 5))
+        self.assertEqual(file_metadata.cache_info(), (1, 1, FileMetadata.MAX_ENTRIES, 1))
+        file_metadata.save()
+        self.assertFalse(os.path.exists(self.cache_file))
+
+    def test_load_ignores_invalid_cache(self):
+        os.makedirs(os.path.dirname(self.cache_file))
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            f.write('{"invalid": 1}')
+        self._write(b'a\n')
+        self.assertEqual(FileMetadata(self.cache_file).get(self.src_file), (1, 1, 2))
+
+    def test_get_limits_entries(self):
+        file_metadata = FileMetadata(self.cache_file)
+        with patch.object(FileMetadata, 'MAX_ENTRIES', 2):
+            for i in range(3):
+                src_file = os.path.join(self.tmp_dir, f"file{i}.txt")
+                with open(src_file, 'wb') as f:
+                    f.write(b'a\n' * (i + 1))
+                file_metadata.get(src_file)
+                if i == 1:
+                    # using the first entry again keeps it cached
+                    file_metadata.get(os.path.join(self.tmp_dir, 'file0.txt'))
+        self.assertEqual(sorted(line_feeds for line_feeds, _ in file_metadata.entries.values()), [1, 3])
@@ -0,0 +1,154 @@
+from unittest import TestCase
+from unittest.mock import patch
+from pathlib import Path
+import os
+import shutil
+import tempfile
+
+from cat_win.src.persistence.lineindex import LineIndex
+from cat_win.src.service.helper.iohelper import IoHelper
+
+
+class TestLineIndex(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.src_file = os.path.join(self.tmp_dir, 'file.txt')
+        self.env_patch = patch.dict(os.environ, {'CAT_WIN_CACHE_DIR': os.path.join(self.tmp_dir, 'cache')})
+        self.env_patch.start()
+
+    def tearDown(self):
+        self.env_patch.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write(self, data: bytes, mode: str = 'wb'):
+        with open(self.src_file, mode) as f:
+            f.write(data)
+        # make sure the modification time changes, even on coarse clocks
+        f_stat = os.stat(self.src_file)
+        os.utime(self.src_file, ns=(f_stat.st_atime_ns, f_stat.st_mtime_ns + 1000000000))
+
+    def _assert_offsets(self, line_index: LineIndex, content: str):
+        lines = content.splitlines()
+        self.assertEqual(line_index.line_count, len(lines))
+        with open(self.src_file, 'rb') as raw_f:
+            for line in range(len(lines) + 1):
+                raw_f.seek(0)
+                expected = IoHelper.skip_lines(raw_f, line, line_index.file_encoding)
+                self.assertEqual(line_index.seek_line(raw_f, line), expected)
+                self.assertEqual(raw_f.tell(), expected)
+
+    def test_update_line_feeds(self):
+        content = ''.join(f"line {i}\n" for i in range(50)) + 'last'
+        self._write(content.encode())
+        line_index = LineIndex(self.src_file, sample_rate=4)
+        self.assertTrue(line_index.update(block_size=7))
+        self.assertEqual(len(line_index.offsets), 13)
+        self._assert_offsets(line_index, content)
+        self.assertFalse(line_index.update(block_size=7))
+
+    def test_update_mixed_line_breaks(self):
+        content = 'a\r\nb\rc\x0bd\x85e f\r\n\r\ng\n\rh\x1c' * 7
+        for encoding in ['utf-8', 'latin-1']:
+            with self.subTest(encoding=encoding):
+                self._write(content.encode(encoding, errors='ignore'))
+                line_index = LineIndex(self.src_file, encoding, sample_rate=3)
+                line_index.update(block_size=5)
+                self._assert_offsets(line_index, content.encode(encoding, errors='ignore').decode(encoding))
+
+    def test_update_crlf_across_blocks(self):
+        content = 'ab\r\ncd\r\n' * 20
+        for block_size in range(1, 9):
+            with self.subTest(block_size=block_size):
+                self._write(content.encode())
+                line_index = LineIndex(self.src_file, sample_rate=2)
+                line_index.update(block_size=block_size)
+                self._assert_offsets(line_index, content)
+
+    def test_update_empty_file(self):
+        self._write(b'')
+        line_index = LineIndex(self.src_file)
+        line_index.update()
+        self.assertEqual(line_index.line_count, 0)
+        self.assertEqual(list(line_index.offsets), [0])
+
+    def test_update_appended(self):
+        content = 'x\n' * 10 + 'y\r'
+        self._write(content.encode())
+        line_index = LineIndex(self.src_file, sample_rate=4)
+        line_index.update()
+        self._write(b'\nz\n' * 10, 'ab')
+        content += '\nz\n' * 10
+        scan_offsets = []
+        scan = line_index._scan
+        def _scan(*args):
+            scan_offsets.append(line_index.scan_offset)
+            scan(*args)
+        with patch.object(line_index, '_scan', side_effect=_scan):
+            self.assertTrue(line_index.update())
+        # only the incomplete last line gets scanned again
+        self.assertEqual(scan_offsets, [20])
+        self.assertEqual(line_index.scan_offset, len(content))
+        self._assert_offsets(line_index, content)
+
+    def test_update_rewritten(self):
+        self._write(b'a\n' * 20)
+        line_index = LineIndex(self.src_file, sample_rate=4)
+        line_index.update()
+        content = 'bb\n' * 30
+        self._write(content.encode())
+        line_index.update()
+        self._assert_offsets(line_index, content)
+        content = 'c\n' * 5
+        self._write(content.encode())
+        line_index.update()
+        self._assert_offsets(line_index, content)
+
+    def test_load_persists_index(self):
+        content = 'line\n' * 10000
+        self._write(content.encode())
+        line_index = LineIndex.load(self.src_file)
+        index_file = LineIndex.get_index_file(self.src_file, 'utf-8')
+        self.assertTrue(os.path.isfile(index_file))
+        with patch.object(LineIndex, '_scan') as scan:
+            loaded_index = LineIndex.load(self.src_file)
+        scan.assert_not_called()
+        self.assertEqual(loaded_index.line_count, 10000)
+        self.assertEqual(loaded_index.offsets, line_index.offsets)
+        self.assertEqual(loaded_index.key, line_index.key)
+
+    def test_load_ignores_invalid_index(self):
+        self._write(b'a\nb\n')
+        index_file = LineIndex.get_index_file(self.src_file, 'utf-8')
+        os.makedirs(index_file.parent, exist_ok=True)
+        with open(index_file, 'wb') as f:
+            f.write(b'invalid')
+        self.assertEqual(LineIndex.load(self.src_file).line_count, 2)
+        self.assertEqual(LineIndex.load(self.src_file).line_count, 2)
+
+    def test_get_index_file_depends_on_encoding(self):
+        self.assertEqual(LineIndex.get_index_file(self.src_file, 'utf-8').parent,
+                         Path(self.tmp_dir, 'cache', 'cat_win', 'line_index'))
+        self.assertEqual(LineIndex.get_index_file(self.src_file, 'utf-8'),
+                         LineIndex.get_index_file(self.src_file, 'UTF8'))
+        self.assertNotEqual(LineIndex.get_index_file(self.src_file, 'utf-8'),
+                            LineIndex.get_index_file(self.src_file, 'latin-1'))
+
+    def test_load_limits_cache_size(self):
+        files = []
+        for i in range(3):
+            src_file = os.path.join(self.tmp_dir, f"file{i}.txt")
+            with open(src_file, 'wb') as f:
+                f.write(b'a\n' * 10)
+            files.append(src_file)
+        index_files = [LineIndex.get_index_file(src_file, 'utf-8') for src_file in files]
+        LineIndex.load(files[0])
+        index_size = os.path.getsize(index_files[0])
+        os.utime(index_files[0], ns=(0, 0))
+        LineIndex.load(files[1])
+        os.utime(index_files[1], ns=(1000000000, 1000000000))
+        # loading the first index again marks it as recently used
+        LineIndex.load(files[0])
+        LineIndex.load(files[2], cache_size=2 * index_size + 64)
+        self.assertTrue(os.path.isfile(index_files[0]))
+        self.assertFalse(os.path.isfile(index_files[1]))
+        self.assertTrue(os.path.isfile(index_files[2]))
@@ -106,3 +106,53 @@ class TestXdgConfig(TestCase):
             result = xdgconfig.xdg_config('nested', 'state.json')
 
         self.assertEqual(result, Path('/base/cat_win/nested/state.json'))
+
+    def test_cache_root_uses_override_and_expands_user(self):
+        with patch.dict('os.environ', {xdgconfig.ENV_CACHE_OVERRIDE: '~/my_cache'}, clear=True):
+            with patch('cat_win.src.persistence.xdgconfig.os.path.expanduser', return_value='/expanded/my_cache') as expand_user:
+                root = xdgconfig._cache_root()
+
+        expand_user.assert_called_once_with('~/my_cache')
+        self.assertEqual(root, Path('/expanded/my_cache'))
+
+    def test_cache_root_windows_uses_localappdata(self):
+        env = {
+            'APPDATA': 'C:/Users/Test/AppData/Roaming',
+            'LOCALAPPDATA': 'C:/Users/Test/AppData/Local',
+        }
+        with patch.dict('os.environ', env, clear=True):
+            with patch('cat_win.src.persistence.xdgconfig.sys.platform', 'win32'):
+                root = xdgconfig._cache_root()
+
+        self.assertEqual(root, Path('C:/Users/Test/AppData/Local'))
+
+    def test_cache_root_darwin_uses_library_caches(self):
+        with patch.dict('os.environ', {}, clear=True):
+            with patch('cat_win.src.persistence.xdgconfig.sys.platform', 'darwin'):
+                with patch('cat_win.src.persistence.xdgconfig.Path.home', return_value=Path('/Users/test')):
+                    root = xdgconfig._cache_root()
+
+        self.assertEqual(root, Path('/Users/test/Library/Caches'))
+
+    def test_cache_root_linux_uses_xdg_cache_home_when_set(self):
+        with patch.dict('os.environ', {'XDG_CACHE_HOME': '/tmp/xdg_cache'}, clear=True):
+            with patch('cat_win.src.persistence.xdgconfig.sys.platform', 'linux'):
+                root = xdgconfig._cache_root()
+
+        self.assertEqual(root, Path('/tmp/xdg_cache'))
+
+    def test_cache_root_linux_falls_back_to_home_dot_cache(self):
+        with patch.dict('os.environ', {}, clear=True):
+            with patch('cat_win.src.persistence.xdgconfig.sys.platform', 'linux'):
+                with patch('cat_win.src.persistence.xdgconfig.Path.home', return_value=Path('/home/test')):
+                    root = xdgconfig._cache_root()
+
+        self.assertEqual(root, Path('/home/test/.cache'))
+
+    def test_xdg_cache_builds_path_without_creating_directory(self):
+        with patch('cat_win.src.persistence.xdgconfig._cache_root', return_value=Path('/base')):
+            with patch('cat_win.src.persistence.xdgconfig.Path.mkdir') as mkdir:
+                result = xdgconfig.xdg_cache('nested', 'cache.json')
+
+        self.assertEqual(result, Path('/base/cat_win/nested/cache.json'))
+        mkdir.assert_not_called()
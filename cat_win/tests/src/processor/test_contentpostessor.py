@@ -13,6 +13,7 @@ from cat_win.src.const.argconstants import (
     ARGS_SUM,
     ARGS_WORDCOUNT,
 )
+from cat_win.src.persistence.filemetadata import FileMetadata
 from cat_win.src.processor import contentpostessor as post
 from cat_win.tests.mocks.args import DummyStartupArgs
 
@@ -38,8 +39,7 @@ class TestContentPostessor(TestCase):
         ctx.u_files.files = ['f1']
         ctx.u_files.all_files_lines = 7
         ctx.u_files.all_line_number_place_holder = 2
-        ctx.u_files._get_file_lines_sum_ = _cache_stub('_get_file_lines_sum_')
-        ctx.u_files._calc_max_line_length_ = _cache_stub('_calc_max_line_length_')
+        ctx.u_files.file_metadata = FileMetadata()
         ctx.u_args = DummyStartupArgs(
             {
                 ARGS_FILES: False,
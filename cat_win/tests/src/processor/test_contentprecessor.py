@@ -1,3 +1,4 @@
+from collections import Counter, defaultdict
 from contextlib import contextmanager
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
@@ -5,6 +6,7 @@ from unittest.mock import MagicMock, patch
 from cat_win.src.const.argconstants import (
     ARGS_CCHARCOUNT,
     ARGS_CHECKSUM,
+    ARGS_CHECKSUM_CHECK,
     ARGS_DATA,
     ARGS_DDIRECTORIES,
     ARGS_DIFF,
@@ -25,6 +27,7 @@ from cat_win.src.const.argconstants import (
     ARGS_STDIN,
     ARGS_URI,
     ARGS_VISUALIZE_B,
+    ARGS_VISUALIZE_O,
     ARGS_WWORDCOUNT,
 )
 from cat_win.src.const.defaultconstants import DKW
@@ -233,22 +236,77 @@ class TestContentPrecessor(TestCase):
         ctx.u_args.find_first = MagicMock(return_value=None)
         self.assertFalse(pre._open_editors(ctx))
 
+    def test_check_checksums(self):
+        ctx = self._ctx()
+        ctx.u_files = [MagicMock(path='m1', displayname='m1'), MagicMock(path='m2', displayname='m2')]
+        ctx.const_dic[DKW.PARALLEL_JOBS] = 2
+        ctx.const_dic[DKW.PERSISTENT_CACHE] = False
+        results = [Counter({'OK': 2, 'INVALID': 1}), Counter({'OK': 1})]
+        with patch('cat_win.src.processor.contentprecessor.verify_manifest', side_effect=results) as vm:
+            with patch('cat_win.src.processor.contentprecessor.DigestCache') as dc:
+                with patch('cat_win.src.processor.contentprecessor.logger') as log:
+                    self.assertTrue(pre._check_checksums(ctx))
+        dc.assert_called_once_with(persistent=False)
+        vm.assert_any_call('m1', ctx.color_dic, 'utf-8', 2, dc.return_value)
+        self.assertEqual(vm.call_count, 2)
+        dc.return_value.save.assert_called_once_with()
+        log.assert_called_once()
+        self.assertIn('improperly formatted', log.call_args[0][0])
+
+        for results in [[Counter({'OK': 1, 'MISSING': 1})], [Counter({'FAILED': 1})], [Counter()], [OSError()]]:
+            with self.subTest(results=results):
+                ctx.u_files = [MagicMock(path='m1', displayname='m1')]
+                with patch('cat_win.src.processor.contentprecessor.verify_manifest', side_effect=results):
+                    with patch('cat_win.src.processor.contentprecessor.DigestCache'):
+                        with patch('cat_win.src.processor.contentprecessor.logger'):
+                            with self.assertRaises(SystemExit) as exc:
+                                pre._check_checksums(ctx)
+                self.assertEqual(exc.exception.code, 1)
+
     def test_meta_checksum_visualize_less_sum_word_char(self):
         ctx = self._ctx()
         ctx.u_files = [MagicMock(path='p1')]
         ctx.u_args[ARGS_DATA] = True
         ctx.u_args[ARGS_CHECKSUM] = True
+        ctx.arg_parser.checksum_algorithms = 'md5,crc32'
+        ctx.const_dic[DKW.PARALLEL_JOBS] = 2
+        ctx.const_dic[DKW.PERSISTENT_CACHE] = True
         with patch('cat_win.src.processor.contentprecessor.print_meta') as pm:
             with patch('cat_win.src.processor.contentprecessor.print_checksum') as pc:
-                self.assertTrue(pre._show_meta_and_checksum(ctx))
+                with patch('cat_win.src.processor.contentprecessor.DigestCache') as dc:
+                    with patch('cat_win.src.processor.contentprecessor.yield_checksums', return_value=iter(['CS'])) as yc:
+                        self.assertTrue(pre._show_meta_and_checksum(ctx))
         pm.assert_called_once_with('p1', ctx.color_dic)
-        pc.assert_called_once_with('p1', ctx.color_dic)
+        pc.assert_called_once_with('p1', ctx.color_dic, 'CS')
+        yc.assert_called_once_with(['p1'], ['md5', 'crc32'], 2, dc.return_value)
+        dc.assert_called_once_with(persistent=True)
+        dc.return_value.save.assert_called_once_with()
+
+        ctx.arg_parser.checksum_algorithms = 'md5,unknown'
+        with patch('cat_win.src.processor.contentprecessor.print_checksum') as pc:
+            with patch('cat_win.src.processor.contentprecessor.logger') as log:
+                with self.assertRaises(SystemExit) as exc:
+                    pre._show_meta_and_checksum(ctx)
+        self.assertEqual(exc.exception.code, 1)
+        pc.assert_not_called()
+        self.assertIn('unknown', log.call_args[0][0])
 
         run_vis = pre._visualize_files('ByteView')
         with patch('cat_win.src.processor.contentprecessor.Visualizer') as vis:
             self.assertTrue(run_vis(ctx))
         vis.return_value.visualize_files.assert_called_once()
 
+        u_args, ctx.u_args = ctx.u_args, defaultdict(bool, {ARGS_VISUALIZE_O: True})
+        with patch('cat_win.src.processor.contentprecessor.Visualizer') as vis:
+            self.assertTrue(pre._visualize_overview(ctx))
+        vis.assert_called_once_with(['p1'], 'HilbertCurveView', ctx.arg_parser.file_truncate)
+        vis.return_value.visualize_files.assert_called_once()
+        ctx.u_args[ARGS_VISUALIZE_B] = True
+        with patch('cat_win.src.processor.contentprecessor.Visualizer') as vis:
+            self.assertFalse(pre._visualize_overview(ctx))
+        vis.assert_not_called()
+        ctx.u_args = u_args
+
         with patch('cat_win.src.processor.contentprecessor.More') as more_cls:
             stepper = more_cls.return_value
             stepper.step_through.side_effect = SystemExit()
@@ -10,6 +10,8 @@ from cat_win.src.const.argconstants import (
     ARGS_ENDS,
     ARGS_FILE_PREFIX,
     ARGS_FFILE_PREFIX,
+    ARGS_GREP,
+    ARGS_GREP_ONLY,
     ARGS_LLENGTH,
     ARGS_MORE,
     ARGS_NUMBER,
@@ -28,6 +30,7 @@ from cat_win.src.processor import contentprocessor as pro
 from cat_win.tests.mocks.argparser import DummyArgParser
 from cat_win.tests.mocks.args import DummyStartupArgs
 from cat_win.tests.mocks.ctx import DummyCtx, DummyFile, DummyFiles
+from cat_win.tests.mocks.std import StdOutMock
 
 
 class TestContentProcessor(TestCase):
@@ -51,12 +54,15 @@ class TestContentProcessor(TestCase):
             ARGS_SQUEEZE: False,
             ARGS_SPECIFIC_FORMATS: False,
             ARGS_EOL: False,
+            ARGS_GREP: False,
+            ARGS_GREP_ONLY: False,
         }
         if args:
             defaults.update(args)
 
         arg_parser = DummyArgParser(file_encoding='utf-8')
         arg_parser.file_truncate = (None, None, None)
+        arg_parser.file_queries = []
 
         u_args = DummyStartupArgs(overrides=defaults, ordered_args=ordered or [])
 
@@ -83,6 +89,11 @@ class TestContentProcessor(TestCase):
         )
         return ctx
 
+    @staticmethod
+    def _apply(ctx, arg_id, param):
+        ctx.u_args.set_args([(arg_id, param)])
+        pro._apply_content_plan(ctx)
+
     def test_ansi_aware_slice_line_and_apply_cut(self):
         sl = pro._ansi_aware_slice_line((0, 2, 1), '<RST>')
         out = sl('\x1b[31mabc\x1b[0m')
@@ -91,7 +102,7 @@ class TestContentProcessor(TestCase):
 
         ctx = self._ctx()
         ctx.content = ContentBuffer.from_lines(['abcd'])
-        pro._apply_cut(ctx, (1, 3, 1))
+        self._apply(ctx, ARGS_CUT, (1, 3, 1))
         self.assertEqual(ctx.content.lines, ['bc'])
 
     def test_ansi_aware_slice_line_empty_and_reset_transition(self):
@@ -99,31 +110,31 @@ class TestContentProcessor(TestCase):
         self.assertEqual(sl_empty('abc'), '')
 
         with patch('cat_win.src.processor.contentprocessor.remove_ansi_codes_from_line', return_value='ab'):
-            with patch('cat_win.src.processor.contentprocessor._map_display_pos', side_effect=[0, 1]):
+            with patch('cat_win.src.processor.contentprocessor._build_display_offsets', return_value=[0, 1, 2]):
                 with patch('cat_win.src.processor.contentprocessor._build_ansi_restore', return_value=({0: '<RED>', 1: ''}, None)):
                     sl = pro._ansi_aware_slice_line((0, 2, 1), '<RST>')
-                    out = sl('ab')
+                    out = sl('ab\x1b')
         self.assertIn('<RST>', out)
 
     def test_apply_ends_chr_blank_reverse_sort_replace_and_squeeze(self):
         ctx = self._ctx()
         ctx.content = ContentBuffer.from_rows([('A', 'p', 's'), ('A', 'p2', 's2'), ('', 'p3', 's3')])
 
-        pro._apply_ends(ctx, None)
+        self._apply(ctx, ARGS_ENDS, None)
         self.assertTrue(ctx.content.suffixes[0].endswith('<E>$<RST>'))
 
         with patch.object(pro, 'SPECIAL_CHARS', [(9, 'I', None, True)]):
             ctx.content = ContentBuffer.from_lines(['a\tb'])
-            pro._apply_chr(ctx, None)
+            self._apply(ctx, ARGS_CHR, None)
             self.assertIn('^I', ctx.content.lines[0])
 
         with patch.object(pro, 'SPECIAL_CHARS', [(9, 'I', None, False)]):
             ctx.content = ContentBuffer.from_lines(['a\tb'])
-            pro._apply_chr(ctx, None)
+            self._apply(ctx, ARGS_CHR, None)
             self.assertEqual(ctx.content.lines, ['a\tb'])
 
         ctx.content = ContentBuffer.from_rows([('z', '1', ''), ('a', '2', ''), ('a', '3', ''), ('', '4', '')])
-        pro._apply_blank(ctx, None)
+        self._apply(ctx, ARGS_BLANK, None)
         self.assertNotIn('', ctx.content.lines)
         pro._apply_squeeze(ctx, None)
         self.assertEqual(ctx.content.lines, ['z', 'a'])
@@ -141,10 +152,62 @@ class TestContentProcessor(TestCase):
         self.assertEqual(ctx.content.suffixes, ['s1'])
 
         ctx.content = ContentBuffer.from_lines(['hello there'])
-        pro._apply_replace(ctx, ('there', 'world'))
+        self._apply(ctx, ARGS_REPLACE, ('there', 'world'))
         self.assertIn('world', ctx.content.lines[0])
         self.assertIn('<R>', ctx.content.lines[0])
 
+    def test_apply_chr_matches_replacing_one_after_another(self):
+        ctx = self._ctx()
+        line = ''.join(chr(c_id) for c_id, *_ in pro.SPECIAL_CHARS) * 2 + 'x\x1b[31my'
+        ctx.content = ContentBuffer.from_lines([line])
+        self._apply(ctx, ARGS_CHR, None)
+        expected = line
+        for c_id, char, _, possible in pro.SPECIAL_CHARS:
+            if possible:
+                expected = expected.replace(chr(c_id), f'<C>^{char}<RST>')
+        self.assertEqual(ctx.content.lines, [expected])
+
+    def test_compile_content_plan_fuses_line_actions(self):
+        ctx = self._ctx(ordered=[
+            (ARGS_ENDS, '-e'), (ARGS_BLANK, '-b'), (ARGS_CHR, '--chr'),
+            (ARGS_SQUEEZE, '-s'), (ARGS_CUT, (0, 1, None)),
+        ])
+        plan = pro._compile_content_plan(ctx, pro.PRO_CONTENT_ACTIONS)
+        self.assertEqual([fused for fused, _, _ in plan], [True, False, True])
+        self.assertIs(plan[1][1], pro._apply_squeeze)
+        with patch.object(pro, 'SPECIAL_CHARS', [(9, 'I', None, True)]):
+            plan = pro._compile_content_plan(ctx, pro.PRO_CONTENT_ACTIONS)
+        rows = list(plan[0][1]([('a\tb', 'p', 's'), ('', 'p2', 's2')]))
+        self.assertEqual(rows, [('a<C>^I<RST>b', 'p', 's<E>$<RST>')])
+        self.assertEqual(list(plan[2][1]([('abc', 'p', 's')])), [('a', 'p', 's')])
+
+    def test_apply_content_plan_keeps_default_columns_lazy(self):
+        ctx = self._ctx(ordered=[(ARGS_BLANK, '-b')])
+        content = ctx.content = ContentBuffer.from_lines(['ab', '', 'cd'])
+        pro._apply_content_plan(ctx)
+        self.assertIs(ctx.content, content)
+        self.assertEqual(ctx.content.lines, ['ab', 'cd'])
+        self.assertIsNone(ctx.content._prefixes)
+        self.assertIsNone(ctx.content._suffixes)
+
+        ctx = self._ctx(ordered=[(ARGS_BLANK, '-b'), (ARGS_CUT, (0, 1, None))])
+        ctx.content = ContentBuffer.from_lines(['ab', '', 'cd'])
+        pro._apply_content_plan(ctx)
+        self.assertEqual(ctx.content.lines, ['a', 'c'])
+        self.assertIsNone(ctx.content._prefixes)
+        self.assertIsNone(ctx.content._suffixes)
+
+        ctx = self._ctx(ordered=[(ARGS_ENDS, '-e'), (ARGS_CUT, (0, 1, None))])
+        ctx.content = ContentBuffer.from_lines(['ab', 'cd'])
+        pro._apply_content_plan(ctx)
+        self.assertEqual(list(ctx.content), [('a', '', '<E>$<RST>'), ('c', '', '<E>$<RST>')])
+        self.assertIsNone(ctx.content._prefixes)
+
+    def test_compile_content_plan_without_line_actions(self):
+        ctx = self._ctx(ordered=[(ARGS_SQUEEZE, '-s'), (ARGS_STDIN, '--stdin')])
+        plan = pro._compile_content_plan(ctx, pro.STREAM_CONTENT_ACTIONS)
+        self.assertEqual(plan, [(False, pro._stream_squeeze, '-s')])
+
     def test_apply_eval_and_convert(self):
         ctx = self._ctx()
         with patch('cat_win.src.processor.contentprocessor.comp_eval', return_value=ContentBuffer.from_lines(['E'])) as ce:
@@ -252,3 +315,176 @@ class TestContentProcessor(TestCase):
         self.assertEqual(len(ctx.content), 2)
         self.assertTrue(all(p.startswith('H') for p in ctx.content.prefixes))
         self.assertTrue(gfp.called)
+
+    def test_can_stream_content(self):
+        ctx = self._ctx(ordered=[(ARGS_ENDS, 'e'), (ARGS_SQUEEZE, 's')])
+        self.assertTrue(pro.can_stream_content(ctx))
+
+        for arg_id in (ARGS_STRINGS, ARGS_SPECIFIC_FORMATS, ARGS_PEEK, ARGS_MORE, ARGS_CLIP):
+            ctx = self._ctx(args={arg_id: True})
+            self.assertFalse(pro.can_stream_content(ctx))
+
+        # the encoded content is streamed, unless it is queried
+        ctx = self._ctx(args={ARGS_B64E: True})
+        self.assertTrue(pro.can_stream_content(ctx))
+        ctx.arg_parser.file_queries = [('a', False)]
+        self.assertFalse(pro.can_stream_content(ctx))
+        ctx = self._ctx(args={ARGS_B64E: True, ARGS_GREP: True})
+        self.assertFalse(pro.can_stream_content(ctx))
+
+        ctx = self._ctx()
+        ctx.arg_parser.file_truncate = (None, 5, None)
+        self.assertFalse(pro.can_stream_content(ctx))
+
+        with patch.dict(pro.PRO_CONTENT_ACTIONS, {-1: None}):
+            ctx = self._ctx(ordered=[(-1, 'x')])
+            self.assertFalse(pro.can_stream_content(ctx))
+
+    def test_edit_content_stream_matches_edit_content(self):
+        lines = ['b', 'a', 'a', '', '', 'a\tb', 'c']
+        for ordered in (
+            [(ARGS_SQUEEZE, '-s')],
+            [(ARGS_BLANK, '-b'), (ARGS_SQUEEZE, '-s')],
+            [(ARGS_ENDS, '-e'), (ARGS_CHR, '--chr'), (ARGS_SQUEEZE, '-s')],
+            [(ARGS_REPLACE, ('a', 'X')), (ARGS_CUT, (0, 1, None))],
+            [(ARGS_CHR, '--chr'), (ARGS_BLANK, '-b'), (ARGS_ENDS, '-e'), (ARGS_SQUEEZE, '-s'), (ARGS_BLANK, '-b')],
+        ):
+            with self.subTest(ordered=ordered):
+                args = {arg_id: True for arg_id, _ in ordered}
+                args[ARGS_NUMBER] = True
+                ctx = self._ctx(args=args, ordered=ordered)
+                ctx.content = ContentBuffer.from_lines(list(lines))
+                with patch('cat_win.src.processor.contentprocessor.get_line_prefix', side_effect=lambda _c, i, _f: f'{i}:'):
+                    with patch('cat_win.src.processor.contentprocessor.print_file', return_value=False):
+                        with patch('cat_win.src.processor.contentprocessor.More'):
+                            pro.edit_content(ctx, 0, 0)
+                expected = list(ctx.content)
+
+                streamed = []
+                with patch('cat_win.src.processor.contentprocessor.get_line_prefix', side_effect=lambda _c, i, _f: f'{i}:'):
+                    with patch('cat_win.src.processor.contentprocessor.print_stream', side_effect=lambda _c, rows: streamed.extend(rows) or True):
+                        pro.edit_content_stream(ctx, 0, iter(lines))
+                self.assertEqual(streamed, expected)
+                self.assertTrue(ctx.u_files[0].contains_queried)
+
+    def test_edit_content_stream_b64e_matches_edit_content(self):
+        lines = ['Test', '', 'ÄÖÜ'] * 3
+        ctx = self._ctx(args={ARGS_B64E: True, ARGS_NUMBER: True})
+        ctx.content = ContentBuffer.from_lines(list(lines))
+        with patch('cat_win.src.processor.contentprocessor.get_line_prefix', side_effect=lambda _c, i, _f: f'{i}:'):
+            with patch('cat_win.src.processor.contentprocessor.print_file', return_value=False):
+                with patch('cat_win.src.processor.contentprocessor.More'):
+                    pro.edit_content(ctx, 0, 0)
+        expected = ctx.content.lines[0] + '\n'
+
+        with patch('cat_win.src.processor.contentprocessor.STREAM_BATCH_SIZE', 2):
+            with patch('cat_win.src.processor.contentprocessor.get_line_prefix', side_effect=lambda _c, i, _f: f'{i}:'):
+                with patch('cat_win.src.service.cbase64.B64_ENCODE_CHUNK_SIZE', 6):
+                    with patch('sys.stdout', new=StdOutMock()) as fake_out:
+                        pro.edit_content_stream(ctx, 0, iter(lines))
+        self.assertEqual(fake_out.getvalue(), expected)
+        self.assertFalse(ctx.u_files[0].contains_queried)
+
+    def test_edit_content_stream_eol_and_prefixes(self):
+        ctx = self._ctx(args={ARGS_EOL: True, ARGS_LLENGTH: True, ARGS_FFILE_PREFIX: True})
+        streamed = []
+        with patch('cat_win.src.processor.contentprocessor.get_line_length_prefix', side_effect=lambda _c, p, l: p + str(len(l))):
+            with patch('cat_win.src.processor.contentprocessor.get_file_prefix', side_effect=lambda _c, p, _i, hyper=False: ('H' if hyper else 'F') + p):
+                with patch('cat_win.src.processor.contentprocessor._get_eol_suffix', side_effect=lambda _c, l: repr(l[-1:])):
+                    with patch('cat_win.src.processor.contentprocessor.print_stream', side_effect=lambda _c, rows: streamed.extend(rows) or False):
+                        pro.edit_content_stream(ctx, 0, ['ab\n', 'c'])
+        self.assertEqual(streamed, [('ab', 'H2', "'\\n'"), ('c', 'H1', "'c'")])
+
+    def test_edit_content_stream_line_offset(self):
+        ctx = self._ctx(args={ARGS_NUMBER: True})
+        streamed = []
+        with patch('cat_win.src.processor.contentprocessor.get_line_prefix', side_effect=lambda _c, i, _f: f'{i}:'):
+            with patch('cat_win.src.processor.contentprocessor.print_stream', side_effect=lambda _c, rows: streamed.extend(rows) or False):
+                pro.edit_content_stream(ctx, 0, ['a', 'b'], line_offset=5)
+        self.assertEqual(streamed, [('a', '6:', ''), ('b', '7:', '')])
+
+    def test_edit_content_stream_empty_warns_on_self_pipe(self):
+        ctx = self._ctx()
+        with patch('cat_win.src.processor.contentprocessor.os.isatty', return_value=False):
+            with patch('cat_win.src.processor.contentprocessor._warn_if_piped_into_itself') as warn:
+                with patch('cat_win.src.processor.contentprocessor.print_stream') as ps:
+                    pro.edit_content_stream(ctx, 0, [])
+        warn.assert_called_once_with(ctx, 0)
+        ps.assert_not_called()
+
+    def test_can_peek_content(self):
+        self.assertFalse(pro.can_peek_content(self._ctx()))
+        self.assertTrue(pro.can_peek_content(self._ctx(args={ARGS_PEEK: True})))
+        self.assertFalse(pro.can_peek_content(self._ctx(args={ARGS_PEEK: True, ARGS_STRINGS: True})))
+        self.assertFalse(pro.can_peek_content(self._ctx(args={ARGS_PEEK: True, ARGS_SPECIFIC_FORMATS: True})))
+        ctx = self._ctx(args={ARGS_PEEK: True})
+        ctx.arg_parser.file_truncate = (1, None, None)
+        self.assertFalse(pro.can_peek_content(ctx))
+
+    def test_edit_content_already_peeked_numbers_and_excluded(self):
+        ctx = self._ctx(args={ARGS_PEEK: True, ARGS_NUMBER: True})
+        ctx.content = ContentBuffer.from_lines(['first', 'last'])
+        with patch('cat_win.src.processor.contentprocessor.get_line_prefix', side_effect=lambda _c, i, _f: f'{i}:'):
+            with patch('cat_win.src.processor.contentprocessor.print_file', return_value=False) as pf:
+                with patch('cat_win.src.processor.contentprocessor.More'):
+                    pro.edit_content(ctx, 0, 0, 5, [1, 7])
+        self.assertEqual(ctx.content.prefixes, ['1:', '7:'])
+        self.assertEqual(ctx.content.lines, ['first', 'last'])
+        self.assertEqual(pf.call_args[0][2], 5)
+
+    def test_can_truncate_content(self):
+        ctx = self._ctx()
+        self.assertFalse(pro.can_truncate_content(ctx))
+        ctx.arg_parser.file_truncate = (None, None, -1)
+        self.assertTrue(pro.can_truncate_content(ctx))
+        ctx = self._ctx(args={ARGS_STRINGS: True})
+        ctx.arg_parser.file_truncate = (1, None, None)
+        self.assertFalse(pro.can_truncate_content(ctx))
+
+    def test_edit_content_already_truncated_is_not_sliced_again(self):
+        ctx = self._ctx(args={ARGS_NUMBER: True})
+        ctx.arg_parser.file_truncate = (4, 8, 2)
+        ctx.content = ContentBuffer.from_lines(['l5', 'l7'])
+        with patch('cat_win.src.processor.contentprocessor.get_line_prefix', side_effect=lambda _c, i, _f: f'{i}:'):
+            with patch('cat_win.src.processor.contentprocessor.print_file', return_value=False):
+                with patch('cat_win.src.processor.contentprocessor.More'):
+                    pro.edit_content(ctx, 0, 0, line_numbers=range(5, 9, 2))
+        self.assertEqual(ctx.content.lines, ['l5', 'l7'])
+        self.assertEqual(ctx.content.prefixes, ['5:', '7:'])
+
+    def test_can_passthrough_content(self):
+        self.assertTrue(pro.can_passthrough_content(self._ctx()))
+        for arg_id in (ARGS_NUMBER, ARGS_EOL, ARGS_PEEK, ARGS_GREP, ARGS_CLIP, ARGS_B64E):
+            self.assertFalse(pro.can_passthrough_content(self._ctx(args={arg_id: True})))
+        for ordered in ([(ARGS_BLANK, '-b')], [(ARGS_ENDS, '-e')], [(ARGS_CUT, (0, 1, None))]):
+            self.assertFalse(pro.can_passthrough_content(self._ctx(ordered=ordered)))
+        self.assertFalse(pro.can_passthrough_content(self._ctx(ordered=[(ARGS_SQUEEZE, '-s')])))
+        ctx = self._ctx()
+        ctx.arg_parser.file_queries = [('x', False)]
+        self.assertFalse(pro.can_passthrough_content(ctx))
+        ctx = self._ctx()
+        ctx.arg_parser.file_truncate = (None, 2, None)
+        self.assertFalse(pro.can_passthrough_content(ctx))
+
+    def test_can_grep_content(self):
+        ctx = self._ctx(args={ARGS_GREP: True})
+        self.assertFalse(pro.can_grep_content(ctx))
+        for args in ({ARGS_GREP: True}, {ARGS_GREP_ONLY: True}, {ARGS_GREP: True, ARGS_NUMBER: True}):
+            ctx = self._ctx(args=args)
+            ctx.arg_parser.file_queries = [('x', False)]
+            self.assertTrue(pro.can_grep_content(ctx))
+        for args in ({}, {ARGS_GREP: True, ARGS_PEEK: True}, {ARGS_GREP: True, ARGS_EOL: True}):
+            ctx = self._ctx(args=args)
+            ctx.arg_parser.file_queries = [('x', False)]
+            self.assertFalse(pro.can_grep_content(ctx))
+        ctx = self._ctx(args={ARGS_GREP: True}, ordered=[(ARGS_BLANK, '-b')])
+        ctx.arg_parser.file_queries = [('x', False)]
+        self.assertFalse(pro.can_grep_content(ctx))
+        ctx = self._ctx(args={ARGS_GREP: True})
+        ctx.arg_parser.file_queries = [('x', False)]
+        ctx.arg_parser.file_queries_replacement = ['y']
+        self.assertFalse(pro.can_grep_content(ctx))
+        ctx = self._ctx(args={ARGS_GREP: True})
+        ctx.arg_parser.file_queries = [('x', False)]
+        ctx.arg_parser.file_truncate = (None, 2, None)
+        self.assertFalse(pro.can_grep_content(ctx))
@@ -1,17 +1,31 @@
 from unittest import TestCase
-from unittest.mock import call, patch
+from unittest.mock import ANY, MagicMock, call, patch
+import os
+import re
+import sys
+import tempfile
 
-from cat_win.src.const.argconstants import ARGS_BINVIEW, ARGS_EOL, ARGS_HEXVIEW, ARGS_PLAIN_ONLY, ARGS_RAW, ARGS_REVERSE, ARGS_WATCH
+from cat_win.src.const.argconstants import ARGS_B64E, ARGS_BINVIEW, ARGS_CLIP, ARGS_EOL, ARGS_GREP, ARGS_GREP_ONLY, ARGS_HEXVIEW, ARGS_MORE, ARGS_NOBREAK, ARGS_PLAIN_ONLY, ARGS_RAW, ARGS_REVERSE, ARGS_STRINGS, ARGS_WATCH
 from cat_win.src.const.defaultconstants import DKW
+from cat_win.src.service.cbase64 import encode_base64
+from cat_win.src.service.clipboard import Clipboard
 
 from cat_win.src.processor.fileprocessor import (
+    _append_file,
+    _get_append_state,
+    _parallel_state,
+    _process_file_job,
+    can_append_content,
+    can_edit_files_parallel,
     decode_files_base64,
     edit_file,
     edit_files,
+    edit_files_parallel,
 )
 from cat_win.tests.mocks.argparser import DummyArgParser
 from cat_win.tests.mocks.args import DummyArgs
 from cat_win.tests.mocks.ctx import DummyCtx, DummyFile
+from cat_win.tests.mocks.std import StdOutMock
 from cat_win.tests.mocks.tmpfile import DummyTmpFileHelper
 
 class TestFileProcessor(TestCase):
@@ -21,6 +35,8 @@ class TestFileProcessor(TestCase):
                 DKW.LARGE_FILE_SIZE: 1024,
                 DKW.STRIP_COLOR_ON_PIPE: False,
                 DKW.IGNORE_UNKNOWN_BYTES: False,
+                DKW.PARALLEL_JOBS: 1,
+                DKW.LINE_INDEX_CACHE_SIZE: 0,
             }
         return DummyCtx(
             u_files=files,
@@ -162,45 +178,397 @@ class TestFileProcessor(TestCase):
         self.assertEqual(ctx.content.lines, ['a\r', 'b\n', 'c\r\n', 'd'])
         edit_content.assert_called_once_with(ctx, 0, 0)
 
+    def test_edit_file_strings_reads_bytes(self):
+        ctx = self._mk_ctx(
+            [DummyFile('x.bin', path='x.bin')], args=DummyArgs({ARGS_STRINGS: True}),
+            const_dic={
+                DKW.LARGE_FILE_SIZE: 1024, DKW.STRIP_COLOR_ON_PIPE: False,
+                DKW.STRINGS_MIN_SEQUENCE_LENGTH: 3, DKW.STRINGS_DELIMETER: '-',
+                DKW.STRINGS_ENCODING: 's', DKW.STRINGS_OFFSETS: 'x',
+            },
+        )
+        chunks = [b'\x00abc\x01de', b'f\n\xffgh\x00ijkl']
+        with patch('cat_win.src.processor.fileprocessor.IoHelper.yield_file_chunks', return_value=iter(chunks)) as yield_chunks:
+            with patch('cat_win.src.processor.fileprocessor.IoHelper.read_file') as read_file:
+                with patch('cat_win.src.processor.fileprocessor.edit_content') as edit_content:
+                    edit_file(ctx, 0)
+        yield_chunks.assert_called_once_with('x.bin')
+        read_file.assert_not_called()
+        self.assertEqual(ctx.content.lines, ['      1 abc-      5 def', '      d ijkl'])
+        edit_content.assert_called_once_with(ctx, 0, 0, strings_extracted=True)
+
+    def test_edit_file_strings_small_file_decodes(self):
+        ctx = self._mk_ctx(
+            [DummyFile('x.txt', path='x.txt')], args=DummyArgs({ARGS_STRINGS: True}),
+            const_dic={
+                DKW.LARGE_FILE_SIZE: 1024, DKW.STRIP_COLOR_ON_PIPE: True,
+                DKW.IGNORE_UNKNOWN_BYTES: False,
+                DKW.STRINGS_ENCODING: 's', DKW.STRINGS_OFFSETS: '',
+            },
+        )
+        with patch('cat_win.src.processor.fileprocessor.IoHelper.yield_file_chunks') as yield_chunks:
+            with patch('cat_win.src.processor.fileprocessor.IoHelper.read_file', return_value='\x1b[31mred\x1b[0m text'):
+                with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=False):
+                    with patch('cat_win.src.processor.fileprocessor.edit_content') as edit_content:
+                        edit_file(ctx, 0)
+        yield_chunks.assert_not_called()
+        self.assertEqual(ctx.content.lines, ['red text'])
+        edit_content.assert_called_once_with(ctx, 0, 0)
+
+    def test_edit_file_strings_large_file_strips_ansi_on_pipe(self):
+        ctx = self._mk_ctx(
+            [DummyFile('x.bin', path='x.bin', file_size=2048)], args=DummyArgs({ARGS_STRINGS: True}),
+            const_dic={
+                DKW.LARGE_FILE_SIZE: 1024, DKW.STRIP_COLOR_ON_PIPE: True,
+                DKW.STRINGS_MIN_SEQUENCE_LENGTH: 4, DKW.STRINGS_DELIMETER: '\n',
+                DKW.STRINGS_ENCODING: 's', DKW.STRINGS_OFFSETS: '',
+            },
+        )
+        chunks = [b'\x00\x1b[3', b'1mred\x1b[0m ERROR text\x00']
+        with patch('cat_win.src.processor.fileprocessor.can_passthrough_content', return_value=False), \
+            patch('cat_win.src.processor.fileprocessor.can_grep_content', return_value=False), \
+            patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=False), \
+            patch('cat_win.src.processor.fileprocessor.can_peek_content', return_value=False), \
+            patch('cat_win.src.processor.fileprocessor.can_truncate_content', return_value=False):
+            with patch('cat_win.src.processor.fileprocessor.IoHelper.yield_file_chunks', return_value=iter(chunks)):
+                with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=False):
+                    with patch('cat_win.src.processor.fileprocessor.edit_content') as edit_content:
+                        edit_file(ctx, 0)
+        self.assertEqual(ctx.content.lines, ['red ERROR text'])
+        edit_content.assert_called_once_with(ctx, 0, 0, strings_extracted=True)
+
+    def test_edit_file_strings_plain_only_decodes(self):
+        ctx = self._mk_ctx([DummyFile('x.txt', path='x.txt')], args=DummyArgs({ARGS_STRINGS: True, ARGS_PLAIN_ONLY: True}))
+        with patch('cat_win.src.processor.fileprocessor.IoHelper.yield_file_chunks') as yield_chunks:
+            with patch('cat_win.src.processor.fileprocessor.IoHelper.read_file', return_value='a\nb'):
+                with patch('cat_win.src.processor.fileprocessor.edit_content') as edit_content:
+                    edit_file(ctx, 0)
+        yield_chunks.assert_not_called()
+        edit_content.assert_called_once_with(ctx, 0, 0)
+
+    def test_edit_file_large_file_is_streamed(self):
+        ctx = self._mk_ctx([DummyFile('x.txt', path='x.txt', file_size=2048)], args=DummyArgs({ARGS_EOL: True}))
+        with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=True):
+            with patch('cat_win.src.processor.fileprocessor.IoHelper.yield_lines', return_value=iter(['a\n'])) as yield_lines:
+                with patch('cat_win.src.processor.fileprocessor.IoHelper.read_file') as read_file:
+                    with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=True):
+                        with patch('cat_win.src.processor.fileprocessor.edit_content_stream') as edit_stream:
+                            with patch('cat_win.src.processor.fileprocessor.edit_content') as edit_content:
+                                edit_file(ctx, 0)
+        yield_lines.assert_called_once_with(
+            'x.txt', file_encoding='utf-8', errors='strict', keepends=True, fallback_errors='replace',
+            on_fallback=ANY,
+        )
+        read_file.assert_not_called()
+        edit_content.assert_not_called()
+        self.assertEqual(list(edit_stream.call_args[0][2]), ['a\n'])
+
+    def test_edit_file_large_file_stream_fallback_on_unicode_error(self):
+        ctx = self._mk_ctx(
+            [DummyFile('x.txt', path='x.txt', file_size=2048)],
+            const_dic={DKW.LARGE_FILE_SIZE: 1024, DKW.STRIP_COLOR_ON_PIPE: True, DKW.IGNORE_UNKNOWN_BYTES: True},
+        )
+        err = UnicodeDecodeError('utf-8', b'\xff', 0, 1, 'invalid')
+        with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=True):
+            with patch('cat_win.src.processor.fileprocessor.IoHelper.yield_lines', return_value=iter(['\x1b[31ma'])) as yield_lines:
+                with patch('cat_win.src.processor.fileprocessor.display_archive', return_value=False):
+                    with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=False):
+                        with patch('cat_win.src.processor.fileprocessor.edit_content_stream', side_effect=[err, None]) as edit_stream:
+                            edit_file(ctx, 0)
+        self.assertEqual(ctx.u_files[0].plaintext_calls, [False])
+        self.assertEqual(yield_lines.call_args_list[1][1]['errors'], 'ignore')
+        self.assertEqual(edit_stream.call_count, 2)
+
+    def _mk_bad_block_file(self):
+        # the unknown byte is only found after the first (1 MB) block has been printed
+        with tempfile.NamedTemporaryFile('wb', suffix='.txt', delete=False) as tmp_f:
+            tmp_f.write(b'line\n' * 320000 + b'x\xffy\n')
+        self.addCleanup(os.remove, tmp_f.name)
+        return tmp_f.name
+
+    def test_edit_file_large_file_stream_plain_only_unknown_byte_after_first_block(self):
+        path = self._mk_bad_block_file()
+        ctx = self._mk_ctx(
+            [DummyFile(path, path=path, file_size=os.path.getsize(path))],
+            args=DummyArgs({ARGS_PLAIN_ONLY: True}),
+        )
+        with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=True):
+            with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=True):
+                with patch('cat_win.src.processor.fileprocessor.edit_content_stream') as edit_stream:
+                    edit_file(ctx, 0)
+        edit_stream.assert_not_called()
+        self.assertEqual(ctx.u_files[0].plaintext_calls, [False])
+
+    def test_edit_file_large_file_stream_unknown_byte_after_first_block(self):
+        path = self._mk_bad_block_file()
+        ctx = self._mk_ctx([DummyFile(path, path=path, file_size=os.path.getsize(path))])
+        streamed = []
+        with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=True):
+            with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=True):
+                with patch('cat_win.src.processor.fileprocessor.edit_content_stream',
+                           side_effect=lambda _ctx, _index, lines: streamed.extend(lines)) as edit_stream:
+                    edit_file(ctx, 0)
+        edit_stream.assert_called_once()
+        self.assertEqual(len(streamed), 320001)
+        self.assertEqual(streamed[-1], 'x\ufffdy')
+        self.assertEqual(ctx.u_files[0].plaintext_calls, [False])
+
+    def test_edit_file_large_file_stream_broken_pipe_propagates(self):
+        ctx = self._mk_ctx([DummyFile('x.txt', path='x.txt', file_size=2048)])
+        with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=True):
+            with patch('cat_win.src.processor.fileprocessor.IoHelper.yield_lines', return_value=iter([])):
+                with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=True):
+                    with patch('cat_win.src.processor.fileprocessor.edit_content_stream', side_effect=BrokenPipeError):
+                        with self.assertRaises(BrokenPipeError):
+                            edit_file(ctx, 0)
+
+    def test_edit_file_large_file_is_peeked(self):
+        ctx = self._mk_ctx(
+            [DummyFile('x.txt', path='x.txt', file_size=2048)],
+            const_dic={DKW.LARGE_FILE_SIZE: 1024, DKW.STRIP_COLOR_ON_PIPE: False, DKW.IGNORE_UNKNOWN_BYTES: False, DKW.PEEK_SIZE: 1, DKW.LINE_INDEX_CACHE_SIZE: 0},
+        )
+        ctx.arg_parser.file_truncate = [None, None, None]
+        with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=False):
+            with patch('cat_win.src.processor.fileprocessor.can_peek_content', return_value=True):
+                with patch('cat_win.src.processor.fileprocessor.IoHelper.count_lines', return_value=10):
+                    with patch('cat_win.src.processor.fileprocessor.IoHelper.peek_lines', return_value=(['a'], ['z'])) as peek_lines:
+                        with patch('cat_win.src.processor.fileprocessor.IoHelper.read_file') as read_file:
+                            with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=True):
+                                with patch('cat_win.src.processor.fileprocessor.edit_content') as edit_content:
+                                    edit_file(ctx, 0)
+        peek_lines.assert_called_once_with('x.txt', 1, file_encoding='utf-8', errors='strict', keepends=False)
+        read_file.assert_not_called()
+        self.assertEqual(ctx.content.lines, ['a', 'z'])
+        self.assertEqual(edit_content.call_args[0][:4], (ctx, 0, 0, 8))
+        self.assertEqual(list(edit_content.call_args[0][4]), [1, 10])
+
+    def test_edit_file_large_file_too_short_to_peek_is_read(self):
+        ctx = self._mk_ctx(
+            [DummyFile('x.txt', path='x.txt', file_size=2048)],
+            const_dic={DKW.LARGE_FILE_SIZE: 1024, DKW.STRIP_COLOR_ON_PIPE: False, DKW.IGNORE_UNKNOWN_BYTES: False, DKW.PEEK_SIZE: 1, DKW.LINE_INDEX_CACHE_SIZE: 0},
+        )
+        ctx.arg_parser.file_truncate = [None, None, None]
+        with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=False):
+            with patch('cat_win.src.processor.fileprocessor.can_peek_content', return_value=True):
+                with patch('cat_win.src.processor.fileprocessor.IoHelper.count_lines', return_value=2):
+                    with patch('cat_win.src.processor.fileprocessor.IoHelper.peek_lines') as peek_lines:
+                        with patch('cat_win.src.processor.fileprocessor.IoHelper.read_file', return_value='a\nz') as read_file:
+                            with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=True):
+                                with patch('cat_win.src.processor.fileprocessor.edit_content') as edit_content:
+                                    edit_file(ctx, 0)
+        peek_lines.assert_not_called()
+        read_file.assert_called_once()
+        edit_content.assert_called_once_with(ctx, 0, 0)
+
+    def test_edit_file_large_file_is_truncated_while_reading(self):
+        ctx = self._mk_ctx([DummyFile('x.txt', path='x.txt', file_size=2048)])
+        ctx.arg_parser.file_truncate = [2, None, 3]
+        with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=False):
+            with patch('cat_win.src.processor.fileprocessor.can_peek_content', return_value=False):
+                with patch('cat_win.src.processor.fileprocessor.can_truncate_content', return_value=True):
+                    with patch('cat_win.src.processor.fileprocessor.IoHelper.read_lines_slice', return_value=(['c', 'f'], range(3, 7, 3))) as read_slice:
+                        with patch('cat_win.src.processor.fileprocessor.IoHelper.read_file') as read_file:
+                            with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=True):
+                                with patch('cat_win.src.processor.fileprocessor.edit_content') as edit_content:
+                                    edit_file(ctx, 0)
+        read_slice.assert_called_once_with('x.txt', slice(2, None, 3), file_encoding='utf-8', errors='strict', keepends=False, line_index=None)
+        read_file.assert_not_called()
+        self.assertEqual(ctx.content.lines, ['c', 'f'])
+        edit_content.assert_called_once_with(ctx, 0, 0, line_numbers=range(3, 7, 3))
+
+    def test_edit_file_large_file_is_truncated_using_line_index(self):
+        ctx = self._mk_ctx([DummyFile('x.txt', path='x.txt', file_size=2048)])
+        ctx.const_dic[DKW.LINE_INDEX_CACHE_SIZE] = 4096
+        line_index = MagicMock()
+        for file_truncate, uses_line_index in (
+            ([2, None, 3], False),
+            ([None, 5, None], False),
+            ([-5, None, None], True),
+            ([None, -5, None], True),
+            ([None, None, -1], True),
+            ([5000, None, None], True),
+        ):
+            ctx.arg_parser.file_truncate = file_truncate
+            with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=False):
+                with patch('cat_win.src.processor.fileprocessor.can_peek_content', return_value=False):
+                    with patch('cat_win.src.processor.fileprocessor.can_truncate_content', return_value=True):
+                        with patch('cat_win.src.processor.fileprocessor.LineIndex.load', return_value=line_index) as load:
+                            with patch('cat_win.src.processor.fileprocessor.IoHelper.read_lines_slice', return_value=(['c'], range(3, 4))) as read_slice:
+                                with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=True):
+                                    with patch('cat_win.src.processor.fileprocessor.edit_content'):
+                                        edit_file(ctx, 0)
+            if uses_line_index:
+                load.assert_called_once_with('x.txt', 'utf-8', 4096)
+                self.assertIs(read_slice.call_args[1]['line_index'], line_index)
+            else:
+                load.assert_not_called()
+                self.assertIsNone(read_slice.call_args[1]['line_index'])
+
+    def test_edit_file_large_file_is_peeked_using_line_index(self):
+        ctx = self._mk_ctx(
+            [DummyFile('x.txt', path='x.txt', file_size=2048)],
+            const_dic={DKW.LARGE_FILE_SIZE: 1024, DKW.STRIP_COLOR_ON_PIPE: False, DKW.IGNORE_UNKNOWN_BYTES: False, DKW.PEEK_SIZE: 1, DKW.LINE_INDEX_CACHE_SIZE: 4096},
+        )
+        ctx.arg_parser.file_truncate = [None, None, None]
+        line_index = MagicMock()
+        line_index.line_count = 10
+        with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=False):
+            with patch('cat_win.src.processor.fileprocessor.can_peek_content', return_value=True):
+                with patch('cat_win.src.processor.fileprocessor.LineIndex.load', return_value=line_index):
+                    with patch('cat_win.src.processor.fileprocessor.IoHelper.count_lines') as count_lines:
+                        with patch('cat_win.src.processor.fileprocessor.IoHelper.peek_lines', return_value=(['a'], ['z'])):
+                            with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=True):
+                                with patch('cat_win.src.processor.fileprocessor.edit_content') as edit_content:
+                                    edit_file(ctx, 0)
+        count_lines.assert_not_called()
+        self.assertEqual(edit_content.call_args[0][:4], (ctx, 0, 0, 8))
+
+    def test_edit_file_large_file_is_copied_unchanged(self):
+        ctx = self._mk_ctx([DummyFile('x.txt', path='x.txt', file_size=2048)])
+        with patch('cat_win.src.processor.fileprocessor.on_windows_os', False):
+            with patch('cat_win.src.processor.fileprocessor.can_passthrough_content', return_value=True), \
+                patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=True):
+                with patch('cat_win.src.processor.fileprocessor.IoHelper.scan_plain_lines', return_value=4) as scan:
+                    with patch('cat_win.src.processor.fileprocessor.IoHelper.copy_file') as copy_file:
+                        with patch('cat_win.src.processor.fileprocessor.IoHelper.read_file_slice', return_value=b'b'):
+                            with patch('cat_win.src.processor.fileprocessor.sys.stdout') as stdout:
+                                stdout.encoding = 'UTF8'
+                                stdout.fileno.return_value = 1
+                                with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=True):
+                                    with patch('cat_win.src.processor.fileprocessor.edit_content') as edit_content:
+                                        with patch('builtins.print') as p:
+                                            edit_file(ctx, 0)
+        scan.assert_called_once_with('x.txt', 'utf-8', allow_esc=True)
+        copy_file.assert_called_once_with('x.txt', 1, 4)
+        p.assert_called_once_with()
+        edit_content.assert_not_called()
+        self.assertFalse(ctx.u_files[0].contains_queried)
+
+    def test_edit_file_large_file_not_copied_if_content_changes(self):
+        ctx = self._mk_ctx([DummyFile('x.txt', path='x.txt', file_size=2048)], const_dic={DKW.LARGE_FILE_SIZE: 1024, DKW.STRIP_COLOR_ON_PIPE: True, DKW.IGNORE_UNKNOWN_BYTES: False})
+        with patch('cat_win.src.processor.fileprocessor.on_windows_os', False):
+            with patch('cat_win.src.processor.fileprocessor.can_passthrough_content', return_value=True):
+                with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=True):
+                    with patch('cat_win.src.processor.fileprocessor.IoHelper.scan_plain_lines', return_value=-1) as scan:
+                        with patch('cat_win.src.processor.fileprocessor.IoHelper.copy_file') as copy_file:
+                            with patch('cat_win.src.processor.fileprocessor.sys.stdout') as stdout:
+                                stdout.encoding = 'utf-8'
+                                with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=False):
+                                    with patch('cat_win.src.processor.fileprocessor._stream_file') as stream_file:
+                                        edit_file(ctx, 0)
+        scan.assert_called_once_with('x.txt', 'utf-8', allow_esc=False)
+        copy_file.assert_not_called()
+        stream_file.assert_called_once_with(ctx, 0)
+
+    def test_edit_file_large_file_not_copied_on_encoding_mismatch(self):
+        ctx = self._mk_ctx([DummyFile('x.txt', path='x.txt', file_size=2048)])
+        with patch('cat_win.src.processor.fileprocessor.on_windows_os', False):
+            with patch('cat_win.src.processor.fileprocessor.can_passthrough_content', return_value=True):
+                with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=True):
+                    with patch('cat_win.src.processor.fileprocessor.IoHelper.scan_plain_lines') as scan:
+                        with patch('cat_win.src.processor.fileprocessor.sys.stdout') as stdout:
+                            stdout.encoding = 'cp1252'
+                            with patch('cat_win.src.processor.fileprocessor._stream_file') as stream_file:
+                                edit_file(ctx, 0)
+        scan.assert_not_called()
+        stream_file.assert_called_once_with(ctx, 0)
+
+    def test_edit_file_large_file_is_grepped(self):
+        ctx = self._mk_ctx(
+            [DummyFile('x.txt', path='x.txt', file_size=2048)], args=DummyArgs({ARGS_GREP_ONLY: False}),
+            const_dic={DKW.LARGE_FILE_SIZE: 1024, DKW.STRIP_COLOR_ON_PIPE: True, DKW.IGNORE_UNKNOWN_BYTES: False, DKW.GREP_CONTEXT_LINES: 2},
+        )
+        ctx.arg_parser.file_queries = [('a', False)]
+        with patch('cat_win.src.processor.fileprocessor.can_grep_content', return_value=True):
+            with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=True):
+                with patch('cat_win.src.processor.fileprocessor.IoHelper.grep_lines', return_value=(['\x1b[31ma', 'b'], [3, 4])) as grep_lines:
+                    with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=False):
+                        with patch('cat_win.src.processor.fileprocessor._stream_file') as stream_file:
+                            with patch('cat_win.src.processor.fileprocessor.edit_content') as edit_content:
+                                edit_file(ctx, 0)
+        self.assertEqual(grep_lines.call_args[0][0], 'x.txt')
+        self.assertEqual(grep_lines.call_args[0][2], 2)
+        self.assertEqual(ctx.content.lines, ['a', 'b'])
+        edit_content.assert_called_once_with(ctx, 0, 0, line_numbers=[3, 4])
+        stream_file.assert_not_called()
+
+    def test_edit_file_large_file_grep_without_hits(self):
+        ctx = self._mk_ctx([DummyFile('x.txt', path='x.txt', file_size=2048)], args=DummyArgs({ARGS_GREP_ONLY: True}))
+        ctx.arg_parser.file_queries = [('a', False)]
+        with patch('cat_win.src.processor.fileprocessor.can_grep_content', return_value=True), \
+            patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=True):
+            with patch('cat_win.src.processor.fileprocessor.IoHelper.grep_lines', return_value=([], [])) as grep_lines:
+                with patch('cat_win.src.processor.fileprocessor.edit_content') as edit_content:
+                    edit_file(ctx, 0)
+        self.assertEqual(grep_lines.call_args[0][2], 0)
+        edit_content.assert_not_called()
+        self.assertFalse(ctx.u_files[0].contains_queried)
+
+    def test_edit_file_large_file_regex_query_is_not_grepped(self):
+        ctx = self._mk_ctx([DummyFile('x.txt', path='x.txt', file_size=2048)])
+        ctx.arg_parser.file_queries = [(re.compile('a'), False)]
+        with patch('cat_win.src.processor.fileprocessor.can_grep_content', return_value=True):
+            with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=True):
+                with patch('cat_win.src.processor.fileprocessor.IoHelper.grep_lines') as grep_lines:
+                    with patch('cat_win.src.processor.fileprocessor._stream_file') as stream_file:
+                        edit_file(ctx, 0)
+        grep_lines.assert_not_called()
+        stream_file.assert_called_once_with(ctx, 0)
+
+    def _decode_files_base64(self, ctx, tmp, file_chunks):
+        written = []
+        with patch('cat_win.src.processor.fileprocessor.IoHelper.yield_file_chunks', side_effect=file_chunks) as chunks:
+            with patch('cat_win.src.processor.fileprocessor.IoHelper.write_file_chunks',
+                       side_effect=lambda path, content: written.append((path, b''.join(content)))):
+                decode_files_base64(ctx, tmp)
+        return chunks, written
+
     def test_decode_files_base64_raw_mode(self):
         files = [DummyFile('A', path='a.b64'), DummyFile('B', path='b.b64')]
         ctx = self._mk_ctx(files, args=DummyArgs({ARGS_RAW: True}))
         tmp = DummyTmpFileHelper(['tmp1', 'tmp2'])
-        with patch('cat_win.src.processor.fileprocessor.IoHelper.read_file', side_effect=['d1', 'd2']):
-            with patch('cat_win.src.processor.fileprocessor.decode_base64', side_effect=[b'x1', b'x2']) as b64:
-                with patch('cat_win.src.processor.fileprocessor.IoHelper.write_file') as write_file:
-                    decode_files_base64(ctx, tmp)
+        chunks, written = self._decode_files_base64(ctx, tmp, [[b'eDE=\n'], [b'eD', b'I\r\n']])
 
         self.assertEqual(files[0].path, 'tmp1')
         self.assertEqual(files[1].path, 'tmp2')
-        self.assertEqual(b64.call_args_list, [call('d1'), call('d2')])
-        self.assertEqual(write_file.call_args_list, [call('tmp1', b'x1'), call('tmp2', b'x2')])
+        self.assertEqual(chunks.call_args_list, [call('a.b64'), call('b.b64')])
+        self.assertEqual(written, [('tmp1', b'x1'), ('tmp2', b'x2')])
 
     def test_decode_files_base64_text_mode(self):
         files = [DummyFile('A', path='a.b64')]
         ctx = self._mk_ctx(files, args=DummyArgs({ARGS_RAW: False}))
         tmp = DummyTmpFileHelper(['tmp1'])
-        with patch('cat_win.src.processor.fileprocessor.IoHelper.read_file', return_value='d1'):
-            with patch('cat_win.src.processor.fileprocessor.decode_base64', return_value='decoded') as b64:
-                with patch('cat_win.src.processor.fileprocessor.IoHelper.write_file') as write_file:
-                    decode_files_base64(ctx, tmp)
+        # the invalid utf-8 byte is dropped, the split character is kept
+        encoded = encode_base64(b'd\xff' + 'écoded'.encode())
+        _, written = self._decode_files_base64(ctx, tmp, [[encoded[:5], encoded[5:]]])
 
-        b64.assert_called_once_with('d1', True, 'utf-8')
-        write_file.assert_called_once_with('tmp1', 'decoded', 'utf-8')
+        self.assertEqual(written, [('tmp1', 'décoded'.encode())])
 
     def test_decode_files_base64_logs_failures_and_continues(self):
         files = [DummyFile('A', path='a.b64'), DummyFile('B', path='b.b64')]
         ctx = self._mk_ctx(files)
         tmp = DummyTmpFileHelper(['tmp1', 'tmp2'])
-        with patch('cat_win.src.processor.fileprocessor.IoHelper.read_file', side_effect=[UnicodeError, 'ok']):
-            with patch('cat_win.src.processor.fileprocessor.decode_base64', return_value='decoded'):
-                with patch('cat_win.src.processor.fileprocessor.IoHelper.write_file'):
-                    with patch('cat_win.src.processor.fileprocessor.logger') as log:
-                        decode_files_base64(ctx, tmp)
+        with patch('cat_win.src.processor.fileprocessor.logger') as log:
+            _, written = self._decode_files_base64(ctx, tmp, [OSError, [b'b2s=']])
 
         self.assertIn('Base64 decoding failed for file: A', log.call_args_list[0][0][0])
         self.assertEqual(files[0].path, 'a.b64')
         self.assertEqual(files[1].path, 'tmp2')
+        self.assertEqual(written, [('tmp2', b'ok')])
+
+    def test_edit_file_raw_b64e_is_streamed(self):
+        ctx = self._mk_ctx([DummyFile('a.txt', path='a.txt')], args=DummyArgs({ARGS_RAW: True, ARGS_B64E: True, ARGS_CLIP: False}))
+        with patch('cat_win.src.processor.fileprocessor.IoHelper.yield_file_chunks', return_value=iter([b'ab', b'c'])):
+            with patch('cat_win.src.processor.fileprocessor.IoHelper.read_file') as read_file:
+                with patch('sys.stdout', new=StdOutMock()) as fake_out:
+                    edit_file(ctx, 0)
+        read_file.assert_not_called()
+        self.assertEqual(fake_out.getvalue(), 'YWJj\n')
+
+    def test_can_append_content_b64e(self):
+        ctx = self._mk_ctx([DummyFile('a.txt', path='a.txt')], args=DummyArgs({ARGS_B64E: True}))
+        with patch('cat_win.src.processor.fileprocessor.can_stream_content', return_value=True):
+            self.assertFalse(can_append_content(ctx))
 
     def test_edit_files_processes_in_forward_order(self):
         files = [DummyFile('a', path='a'), DummyFile('b', path='b'), DummyFile('c', path='c')]
@@ -238,13 +606,168 @@ class TestFileProcessor(TestCase):
         files = [DummyFile('A', path='a'), DummyFile('B', path='b')]
         ctx = self._mk_ctx(files, args=DummyArgs({ARGS_WATCH: True}))
 
-        mtime_values = [1, 2, 1, 3, 4]
-        with patch('cat_win.src.processor.fileprocessor.get_file_mtime', side_effect=mtime_values):
-            with patch('cat_win.src.processor.fileprocessor.edit_file') as edit_file_m:
-                with patch('cat_win.src.processor.fileprocessor.sleep', side_effect=[None, KeyboardInterrupt]):
+        changes = [{'b': ((1, 1, 1), (1, 1, 2))}, KeyboardInterrupt]
+        with patch('cat_win.src.processor.fileprocessor.FileWatcher') as watcher:
+            watcher.return_value.__enter__.return_value.wait_for_changes.side_effect = changes
+            with patch('cat_win.src.processor.fileprocessor.can_append_content', return_value=False):
+                with patch('cat_win.src.processor.fileprocessor.edit_file') as edit_file_m:
                     with patch('cat_win.src.processor.fileprocessor.logger') as log:
                         edit_files(ctx)
 
         self.assertEqual(edit_file_m.call_args_list[0:2], [call(ctx, 0), call(ctx, 1)])
         self.assertIn(call(ctx, 1), edit_file_m.call_args_list)
         self.assertTrue(any("File 'B' has been modified. Reloading" in c[0][0] for c in log.call_args_list if c[0]))
+
+    def test_edit_files_watch_mode_processes_appended_lines(self):
+        files = [DummyFile('A', path='a')]
+        ctx = self._mk_ctx(files, args=DummyArgs({ARGS_WATCH: True}))
+
+        changes = [{'a': ((1, 4, 1), (1, 8, 2))}, {'a': ((1, 8, 2), (2, 2, 3))}, KeyboardInterrupt]
+        with patch('cat_win.src.processor.fileprocessor.FileWatcher') as watcher:
+            watcher.return_value.__enter__.return_value.wait_for_changes.side_effect = changes
+            with patch('cat_win.src.processor.fileprocessor.can_append_content', return_value=True):
+                with patch('cat_win.src.processor.fileprocessor._get_append_state', side_effect=[(4, 2, b'\n'), (2, 1, b'\n')]) as get_state:
+                    with patch('cat_win.src.processor.fileprocessor._append_file', return_value=(8, 4, b'\n')) as append_file:
+                        with patch('cat_win.src.processor.fileprocessor.edit_file') as edit_file_m:
+                            with patch('cat_win.src.processor.fileprocessor.logger'):
+                                edit_files(ctx)
+
+        append_file.assert_called_once_with(ctx, 0, (4, 2, b'\n'))
+        # the states are taken with the stats from before processing the file
+        self.assertEqual(get_state.call_args_list, [
+            call(ctx, 0, watcher.return_value.__enter__.return_value.stats['a']),
+            call(ctx, 0, (2, 2, 3)),
+        ])
+        # the inode has changed with the second modification
+        self.assertEqual(edit_file_m.call_args_list, [call(ctx, 0), call(ctx, 0)])
+
+    def test_append_file(self):
+        fd, path = tempfile.mkstemp()
+        os.write(fd, b'a\nb\n')
+        file = DummyFile('A', path=path)
+        ctx = self._mk_ctx([file], args=DummyArgs({ARGS_EOL: False}))
+        try:
+            state = _get_append_state(ctx, 0, (1, 4, 1))
+            self.assertEqual(state, (4, 2, b'a\nb\n'))
+            self.assertIsNone(_get_append_state(ctx, 0, None))
+            os.write(fd, b'c\nd')
+            # the file has grown since its stats were taken
+            self.assertIsNone(_get_append_state(ctx, 0, (1, 4, 1)))
+            with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=True):
+                with patch('cat_win.src.processor.fileprocessor.sys.stdout'):
+                    with patch('cat_win.src.processor.fileprocessor.edit_content_stream') as edit_stream:
+                        state = _append_file(ctx, 0, state)
+            edit_stream.assert_called_once_with(ctx, 0, ['c'], line_offset=2)
+            self.assertEqual(state, (6, 3, b'a\nb\nc\n'))
+            self.assertIsNone(_get_append_state(ctx, 0, (1, 7, 2)))
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, b'X')
+            self.assertIsNone(_append_file(ctx, 0, state))
+        finally:
+            os.close(fd)
+            os.remove(path)
+
+    def test_can_edit_files_parallel(self):
+        files = [DummyFile('a', path='a'), DummyFile('b', path='b')]
+        const_dic = {DKW.PARALLEL_JOBS: 4}
+        grep_args = {ARGS_MORE: False, ARGS_GREP: False, ARGS_GREP_ONLY: False, ARGS_NOBREAK: False}
+        with patch('cat_win.src.processor.fileprocessor.on_windows_os', False):
+            with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=False):
+                with patch('cat_win.src.processor.fileprocessor.sys.stdout'):
+                    ctx = self._mk_ctx(files, args=DummyArgs(grep_args), const_dic=const_dic)
+                    ctx.arg_parser.file_queries = [('x', False)]
+                    self.assertFalse(can_edit_files_parallel(ctx))
+                    ctx.arg_parser.file_queries_replacement = ['y']
+                    self.assertTrue(can_edit_files_parallel(ctx))
+                    ctx = self._mk_ctx(files, args=DummyArgs({ARGS_MORE: False, ARGS_GREP: True}), const_dic=const_dic)
+                    ctx.arg_parser.file_queries = [('x', False)]
+                    self.assertTrue(can_edit_files_parallel(ctx))
+                    ctx = self._mk_ctx(files, args=DummyArgs({ARGS_MORE: True}), const_dic=const_dic)
+                    self.assertFalse(can_edit_files_parallel(ctx))
+                    ctx = self._mk_ctx(files[:1], args=DummyArgs({ARGS_MORE: False}), const_dic=const_dic)
+                    self.assertFalse(can_edit_files_parallel(ctx))
+                    ctx = self._mk_ctx(files, args=DummyArgs({ARGS_MORE: False}))
+                    self.assertFalse(can_edit_files_parallel(ctx))
+            with patch('cat_win.src.processor.fileprocessor.os.isatty', return_value=True):
+                with patch('cat_win.src.processor.fileprocessor.sys.stdout'):
+                    ctx = self._mk_ctx(files, args=DummyArgs({ARGS_MORE: False}), const_dic=const_dic)
+                    self.assertFalse(can_edit_files_parallel(ctx))
+        with patch('cat_win.src.processor.fileprocessor.on_windows_os', True):
+            ctx = self._mk_ctx(files, args=DummyArgs({ARGS_MORE: False}), const_dic=const_dic)
+            self.assertFalse(can_edit_files_parallel(ctx))
+
+    def test_edit_files_uses_parallel_processing(self):
+        files = [DummyFile('a', path='a'), DummyFile('b', path='b')]
+        ctx = self._mk_ctx(files, args=DummyArgs({ARGS_REVERSE: True}))
+        with patch('cat_win.src.processor.fileprocessor.can_edit_files_parallel', return_value=True):
+            with patch('cat_win.src.processor.fileprocessor.edit_files_parallel') as parallel:
+                with patch('cat_win.src.processor.fileprocessor.edit_file') as edit_file_m:
+                    edit_files(ctx)
+        parallel.assert_called_once_with(ctx, range(1, -1, -1), None)
+        edit_file_m.assert_not_called()
+
+    def test_edit_files_parallel_merges_results_in_order(self):
+        files = [DummyFile('a', path='a'), DummyFile('b', path='b'), DummyFile('c', path='c')]
+        ctx = self._mk_ctx(files, const_dic={DKW.PARALLEL_JOBS: 2})
+        out_dir = tempfile.mkdtemp()
+        out_files = []
+        for content in (b'A', b'C'):
+            out_fd, out_file = tempfile.mkstemp(dir=out_dir)
+            os.write(out_fd, content)
+            os.close(out_fd)
+            out_files.append(out_file)
+        results = {
+            2: (out_files[1], True, True, 'c'),
+            1: (None, False, False, ''),
+            0: (out_files[0], False, True, 'a'),
+        }
+        class _Pool:
+            def __init__(self, jobs):
+                self.jobs = jobs
+            def __enter__(self):
+                return self
+            def __exit__(self, *_):
+                return False
+            def imap(self, _func, file_indices):
+                return (results[i] for i in file_indices)
+        copied = []
+        Clipboard.clipboard = ''
+        with patch('cat_win.src.processor.fileprocessor.tempfile.mkdtemp', return_value=out_dir):
+            with patch('cat_win.src.processor.fileprocessor.multiprocessing.get_context') as get_context:
+                get_context.return_value.Pool = _Pool
+                with patch('cat_win.src.processor.fileprocessor.sys.stdout'):
+                    with patch('cat_win.src.processor.fileprocessor.IoHelper.copy_file', side_effect=lambda f, _fd: copied.append(open(f, 'rb').read())):
+                        edit_files_parallel(ctx, range(2, -1, -1), None)
+        get_context.assert_called_once_with('fork')
+        self.assertEqual(copied, [b'C', b'A'])
+        self.assertEqual(Clipboard.clipboard, 'ca')
+        self.assertEqual([f.contains_queried for f in files], [False, False, True])
+        self.assertEqual([f.plaintext_calls for f in files], [[True], [False], [True]])
+        self.assertFalse(os.path.exists(out_dir))
+        self.assertEqual(_parallel_state, {})
+        Clipboard.clipboard = ''
+
+    def test_process_file_job_captures_output(self):
+        file = DummyFile('a', path='a')
+        file.plaintext = True
+        ctx = self._mk_ctx([file])
+        out_dir = tempfile.mkdtemp()
+        _parallel_state.update(ctx=ctx, out_dir=out_dir, raw_view_mode='x')
+        def _print_raw_view(ctx, file_index, mode):
+            os.write(sys.stdout.fileno(), f"{file_index}{mode}".encode())
+            ctx.u_files[file_index].contains_queried = True
+            Clipboard.clipboard += 'clip'
+        try:
+            with patch('cat_win.src.processor.fileprocessor.print_raw_view', side_effect=_print_raw_view):
+                out_file, contains_queried, plaintext, clipboard = _process_file_job(0)
+            with open(out_file, 'rb') as out_f:
+                self.assertEqual(out_f.read(), b'0x')
+            self.assertEqual((contains_queried, plaintext, clipboard), (True, True, 'clip'))
+            with patch('cat_win.src.processor.fileprocessor.print_raw_view'):
+                self.assertIsNone(_process_file_job(0)[0])
+        finally:
+            _parallel_state.clear()
+            Clipboard.clipboard = ''
+            for out_file in os.listdir(out_dir):
+                os.remove(os.path.join(out_dir, out_file))
+            os.rmdir(out_dir)
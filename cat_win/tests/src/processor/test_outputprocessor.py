@@ -1,6 +1,6 @@
 from contextlib import contextmanager
 from unittest import TestCase
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 from cat_win.src.const.argconstants import (
     ARGS_GREP,
@@ -97,6 +97,7 @@ class TestOutputProcessor(TestCase):
 
     def test_print_raw_view_with_peek_queue(self):
         ctx = self._ctx(args={ARGS_PEEK: True})
+        ctx.arg_parser.file_truncate = [None, None, 1]
         ctx.u_files = [MagicMock(displayname='raw.bin')]
         gen = iter(['HDR', 'L1', 'L2', 'L3', 'L4'])
         with patch('cat_win.src.processor.outputprocessor.get_raw_view_lines_gen', return_value=gen):
@@ -106,6 +107,32 @@ class TestOutputProcessor(TestCase):
         part.assert_called_once()
         self.assertGreaterEqual(p.call_count, 4)
 
+    def test_print_raw_view_blocks(self):
+        ctx = self._ctx(args={ARGS_PEEK: False})
+        ctx.u_files = [MagicMock(displayname='raw.bin')]
+        with patch('cat_win.src.processor.outputprocessor.get_raw_view_blocks_gen', return_value=iter(['HDR', 'L1\nL2'])) as blocks:
+            with patch('cat_win.src.processor.outputprocessor.get_raw_view_lines_gen') as gen:
+                with patch('cat_win.src.processor.outputprocessor.print') as p:
+                    op.print_raw_view(ctx, 0, 'X')
+        blocks.assert_called_once_with(ctx, 0, 'X')
+        gen.assert_not_called()
+        self.assertEqual(p.call_args_list, [call('raw.bin', ':', sep=''), call('HDR'), call('L1\nL2'), call()])
+
+    def test_print_raw_view_with_peek_seeks(self):
+        ctx = self._ctx(args={ARGS_PEEK: True})
+        ctx.arg_parser.file_truncate = [None, None, None]
+        ctx.u_files = [MagicMock(displayname='raw.bin')]
+        with patch('cat_win.src.processor.outputprocessor.get_raw_view_peek', return_value=(['HDR', 'L1'], 3, ['L5'])) as peek:
+            with patch('cat_win.src.processor.outputprocessor.get_raw_view_lines_gen') as gen:
+                with patch('cat_win.src.processor.outputprocessor._print_excluded_by_peek') as part:
+                    with patch('cat_win.src.processor.outputprocessor.print') as p:
+                        op.print_raw_view(ctx, 0, 'X')
+        peek.assert_called_once_with(ctx, 0, 'X', 1)
+        gen.assert_not_called()
+        part.assert_called_once_with(21, 3, ctx.color_dic)
+        self.assertIn((('HDR', 'L1'), {'sep': '\n'}), [tuple(c) for c in p.call_args_list])
+        self.assertIn((('L5',), {'sep': '\n'}), [tuple(c) for c in p.call_args_list])
+
     def test_print_file_returns_false_on_empty(self):
         ctx = self._ctx()
         ctx.content = ContentBuffer.from_lines([])
@@ -177,7 +204,7 @@ class TestOutputProcessor(TestCase):
         with patch('cat_win.src.processor.outputprocessor.QueryManager', return_value=qm):
             with patch('cat_win.src.processor.outputprocessor.replace_queries_in_line', return_value=('abc', 'abc')):
                 with patch('cat_win.src.processor.outputprocessor._build_ansi_restore', return_value=({}, set())):
-                    with patch('cat_win.src.processor.outputprocessor._map_display_pos', side_effect=lambda line, pos: pos):
+                    with patch('cat_win.src.processor.outputprocessor._build_display_offsets', side_effect=lambda line: range(len(line) + 1)):
                         with patch('cat_win.src.processor.outputprocessor.IoHelper.dup_stdstreams', _noop_cm):
                             with patch('cat_win.src.processor.outputprocessor.input', side_effect=EOFError()) as inp:
                                 with patch('cat_win.src.processor.outputprocessor.print') as p:
@@ -199,7 +226,7 @@ class TestOutputProcessor(TestCase):
         with patch('cat_win.src.processor.outputprocessor.QueryManager', return_value=qm):
             with patch('cat_win.src.processor.outputprocessor.replace_queries_in_line', return_value=('abc', 'abc')):
                 with patch('cat_win.src.processor.outputprocessor._build_ansi_restore', return_value=({}, set())):
-                    with patch('cat_win.src.processor.outputprocessor._map_display_pos', side_effect=lambda line, pos: pos):
+                    with patch('cat_win.src.processor.outputprocessor._build_display_offsets', side_effect=lambda line: range(len(line) + 1)):
                         with patch('cat_win.src.processor.outputprocessor.print'):
                             with patch('cat_win.src.processor.outputprocessor.input') as inp:
                                 op.print_file(ctx, StepperStub(), 0)
@@ -258,7 +285,7 @@ class TestOutputProcessor(TestCase):
         with patch('cat_win.src.processor.outputprocessor.QueryManager', return_value=qm):
             with patch('cat_win.src.processor.outputprocessor.replace_queries_in_line', return_value=('abc', 'abc')):
                 with patch('cat_win.src.processor.outputprocessor._build_ansi_restore', return_value=({}, {1})):
-                    with patch('cat_win.src.processor.outputprocessor._map_display_pos', side_effect=lambda line, pos: pos):
+                    with patch('cat_win.src.processor.outputprocessor._build_display_offsets', side_effect=lambda line: range(len(line) + 1)):
                         op.print_file(ctx, st, 0)
         self.assertGreaterEqual(len(st.lines), 3)
 
@@ -297,3 +324,28 @@ class TestOutputProcessor(TestCase):
             with patch('cat_win.src.processor.outputprocessor.replace_queries_in_line', side_effect=[('pre', 'pre'), ('hit', 'hit')]):
                 op.print_file(ctx, st, 0)
         self.assertIn('p1-pre', st.lines)
+
+    def test_print_stream_plain_prints_in_batches(self):
+        ctx = self._ctx()
+        rows = ((f'l{i}', 'p-', 's') for i in range(5))
+        with patch.object(op, 'STREAM_BATCH_SIZE', 2):
+            with patch('builtins.print') as p:
+                self.assertFalse(op.print_stream(ctx, rows))
+        self.assertEqual(p.call_count, 3)
+        self.assertEqual(p.call_args_list[0][0], ('p-l0s', 'p-l1s'))
+        self.assertEqual(p.call_args_list[-1][0], ('p-l4s',))
+
+    def test_print_stream_grep_uses_query_loop(self):
+        ctx = self._ctx(args={ARGS_GREP: True, ARGS_NOKEYWORD: True})
+        ctx.arg_parser.file_queries = ['x']
+        qm = MagicMock()
+        qm.find_keywords.side_effect = [
+            ([], [], []),
+            ([(0, CKW.MATCHED), (3, CKW.RESET_MATCHED)], [], [('hit', (0, 3))]),
+        ]
+        with patch('cat_win.src.processor.outputprocessor.QueryManager', return_value=qm):
+            with patch('cat_win.src.processor.outputprocessor.replace_queries_in_line', side_effect=[('pre', 'pre'), ('hit', 'hit')]):
+                with patch('builtins.print') as p:
+                    self.assertTrue(op.print_stream(ctx, iter([('pre', 'p1-', ''), ('hit', 'p2-', '')])))
+        printed = [c[0][0] for c in p.call_args_list if c[0]]
+        self.assertEqual(printed, ['p1-pre'])
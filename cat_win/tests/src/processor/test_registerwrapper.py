@@ -1,11 +1,16 @@
 from unittest import TestCase
+from unittest.mock import patch
 
 from cat_win.src.processor.registerwrapper import (
     _wrapper_factory,
+    LINE_FILTER_ACTIONS,
+    LINE_MAPPER_ACTIONS,
     POST_CONTENT_ACTIONS,
     PRE_CONTENT_ACTIONS,
     PRO_CONTENT_ACTIONS,
     STARTUP_ACTIONS,
+    register_line_filter,
+    register_line_mapper,
     register_post,
     register_pre,
     register_pro,
@@ -122,6 +127,19 @@ class TestRegisterWrapper(TestCase):
 
         self.assertIs(PRO_CONTENT_ACTIONS[13], pro_action)
 
+    def test_register_line_actions_populate_line_registries(self):
+        with patch.dict(LINE_MAPPER_ACTIONS, clear=True), patch.dict(LINE_FILTER_ACTIONS, clear=True):
+            @register_line_mapper(15)
+            def mapper_action():
+                return 'mapper'
+
+            @register_line_filter(16)
+            def filter_action():
+                return 'filter'
+
+            self.assertEqual(LINE_MAPPER_ACTIONS, {15: mapper_action})
+            self.assertEqual(LINE_FILTER_ACTIONS, {16: filter_action})
+
     def test_register_post_populates_post_content_actions(self):
         @register_post(14)
         def post_action():
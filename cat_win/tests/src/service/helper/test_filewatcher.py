@@ -0,0 +1,86 @@
+from unittest import TestCase
+from unittest.mock import patch
+import os
+import tempfile
+import unittest
+
+from cat_win.src.service.helper import filewatcher
+from cat_win.src.service.helper.filewatcher import FileWatcher, INOTIFY_EVENT, IN_MODIFY, IN_Q_OVERFLOW
+# import sys
+# sys.path.append('../cat_win')
+
+
+class TestFileWatcher(TestCase):
+    maxDiff = None
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.files = [os.path.join(self.tmp_dir, name) for name in ('a.txt', 'b.txt')]
+        for file in self.files:
+            with open(file, 'w', encoding='utf-8') as w_f:
+                w_f.write('x\n')
+
+    def tearDown(self):
+        for file in os.listdir(self.tmp_dir):
+            os.remove(os.path.join(self.tmp_dir, file))
+        os.rmdir(self.tmp_dir)
+
+    def test_get_stat(self):
+        stat = FileWatcher.get_stat(self.files[0])
+        self.assertEqual(stat[1], 2)
+        self.assertIsNone(FileWatcher.get_stat(os.path.join(self.tmp_dir, 'missing')))
+
+    def test_polling_fallback(self):
+        with patch.object(filewatcher, 'INOTIFY_MODULE_ERROR', True):
+            watcher = FileWatcher(self.files, poll_interval=0)
+        self.assertFalse(watcher.uses_inotify)
+        old_stat = watcher.stats[self.files[1]]
+        def _append(_interval):
+            with open(self.files[1], 'a', encoding='utf-8') as a_f:
+                a_f.write('y\n')
+        with patch('cat_win.src.service.helper.filewatcher.sleep', side_effect=_append):
+            changes = watcher.wait_for_changes()
+        self.assertEqual(list(changes), [self.files[1]])
+        self.assertEqual(changes[self.files[1]][0], old_stat)
+        self.assertEqual(changes[self.files[1]][1][1], 4)
+        self.assertEqual(watcher.stats[self.files[1]], changes[self.files[1]][1])
+
+    def test_polling_ignores_unchanged_files(self):
+        with patch.object(filewatcher, 'INOTIFY_MODULE_ERROR', True):
+            watcher = FileWatcher(self.files, poll_interval=0)
+        with patch('cat_win.src.service.helper.filewatcher.sleep', side_effect=[None, KeyboardInterrupt]):
+            with self.assertRaises(KeyboardInterrupt):
+                watcher.wait_for_changes()
+
+    def test_read_events(self):
+        with patch.object(filewatcher, 'INOTIFY_MODULE_ERROR', True):
+            watcher = FileWatcher(self.files)
+        watcher.inotify_fd = 3
+        watcher.watched_names = {1: {b'a.txt': [self.files[0]]}}
+        def _event(w_d, mask, name):
+            name = name + b'\x00' * (16 - len(name))
+            return INOTIFY_EVENT.pack(w_d, mask, 0, len(name)) + name
+        buffers = [_event(1, IN_MODIFY, b'a.txt') + _event(1, IN_MODIFY, b'c.txt'), BlockingIOError]
+        with patch('cat_win.src.service.helper.filewatcher.os.read', side_effect=buffers):
+            self.assertEqual(watcher._read_events(), {self.files[0]})
+        buffers = [INOTIFY_EVENT.pack(-1, IN_Q_OVERFLOW, 0, 0), BlockingIOError]
+        with patch('cat_win.src.service.helper.filewatcher.os.read', side_effect=buffers):
+            self.assertEqual(watcher._read_events(), set(self.files))
+        watcher.inotify_fd = -1
+
+    @unittest.skipIf(filewatcher.INOTIFY_MODULE_ERROR, 'inotify is not available')
+    def test_inotify(self):
+        with FileWatcher(self.files) as watcher:
+            self.assertTrue(watcher.uses_inotify)
+            # replacing the file must still be noticed
+            tmp_file = os.path.join(self.tmp_dir, 'tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as w_f:
+                w_f.write('abc\n')
+            os.replace(tmp_file, self.files[0])
+            changes = watcher.wait_for_changes()
+            self.assertEqual(list(changes), [self.files[0]])
+            self.assertEqual(changes[self.files[0]][1][1], 4)
+            with open(self.files[0], 'a', encoding='utf-8') as a_f:
+                a_f.write('d\n')
+            self.assertEqual(watcher.wait_for_changes()[self.files[0]][1][1], 6)
+        self.assertFalse(watcher.uses_inotify)
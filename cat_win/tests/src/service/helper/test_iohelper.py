@@ -2,6 +2,7 @@ from unittest import TestCase
 from unittest.mock import Mock, patch
 import inspect
 import io
+import re
 import logging
 import os
 from types import SimpleNamespace
@@ -10,7 +11,7 @@ from cat_win.tests.mocks.std import StdInMock
 from cat_win.tests.mocks.logger import LoggerStub
 from cat_win.tests.mocks.pbar import PBarMock
 from cat_win.src.const.colorconstants import CKW
-from cat_win.src.service.helper.iohelper import IoHelper, StatusLogger, create_file, path_parts
+from cat_win.src.service.helper.iohelper import FileSlice, IoHelper, StatusLogger, create_file, path_parts
 
 
 test_file_dir = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'texts')
@@ -189,8 +190,7 @@ class TestStdInHelper(TestCase):
 
         with patch('cat_win.src.service.helper.iohelper.PBar', PBarMock):
             with patch('builtins.open', return_value=DummyBinaryFile()):
-                with patch('cat_win.src.service.helper.iohelper.io.BufferedReader', lambda f, buffer_size: f):
-                    self.assertEqual(IoHelper.read_file('dummy.txt', binary=False, file_length=3), 'abc')
+                self.assertEqual(IoHelper.read_file('dummy.txt', binary=False, file_length=3), 'abc')
 
     def test_yield_file(self):
         gen = IoHelper.yield_file(__file__)
@@ -236,6 +236,267 @@ class TestStdInHelper(TestCase):
         with patch('builtins.open', return_value=io.BytesIO(data)):
             self.assertEqual(list(IoHelper.yield_file('dummy', binary=True)), [65, 66])
 
+    def test_yield_lines_matches_splitlines_across_blocks(self):
+        data = 'ab\r\ncd\ref\n\ngh\u00e4i\r\n'
+        for block_size in range(1, 8):
+            for keepends in (False, True):
+                with patch('builtins.open', return_value=io.BytesIO(data.encode('utf-8'))):
+                    self.assertEqual(
+                        list(IoHelper.yield_lines('dummy', keepends=keepends, block_size=block_size)),
+                        data.splitlines(keepends),
+                    )
+
+    def test_read_file_large_keeps_split_multibyte_sequences(self):
+        class SmallReadsFile(io.BytesIO):
+            def read(self, _size=-1):
+                return super().read(4)
+
+        data = ('\u00e4\u20ac\n' * 10).encode('utf-8')
+        with patch('cat_win.src.service.helper.iohelper.PBar', PBarMock):
+            with patch('builtins.open', return_value=SmallReadsFile(data)):
+                self.assertEqual(IoHelper.read_file('dummy', file_length=len(data)), data.decode('utf-8'))
+
+    def test_yield_blocks_end_with_complete_lines(self):
+        data = 'ab\r\ncd\ref\n\ngh\u00e4i\u2028j\r'
+        for block_size in range(1, 8):
+            with patch('builtins.open', return_value=io.BytesIO(data.encode('utf-8'))):
+                blocks = list(IoHelper.yield_blocks('dummy', block_size=block_size))
+            self.assertEqual(''.join(blocks), data)
+            self.assertEqual([line for block in blocks for line in block.splitlines(True)], data.splitlines(True))
+            self.assertTrue(all(block for block in blocks))
+
+    def test_yield_lines_empty(self):
+        with patch('builtins.open', return_value=io.BytesIO(b'')):
+            self.assertEqual(list(IoHelper.yield_lines('dummy')), [])
+
+    def test_yield_lines_strict_first_block_raises(self):
+        with patch('builtins.open', return_value=io.BytesIO(b'\xffabc\n')):
+            with self.assertRaises(UnicodeDecodeError):
+                list(IoHelper.yield_lines('dummy', fallback_errors='replace', block_size=4))
+
+    def test_yield_lines_fallback_errors_after_first_block(self):
+        with patch('builtins.open', return_value=io.BytesIO(b'abcd\nx\xffy\n')):
+            self.assertEqual(
+                list(IoHelper.yield_lines('dummy', fallback_errors='ignore', block_size=5)),
+                ['abcd', 'xy'],
+            )
+        with patch('builtins.open', return_value=io.BytesIO(b'abcd\nx\xffy\n')):
+            with self.assertRaises(UnicodeDecodeError):
+                list(IoHelper.yield_lines('dummy', block_size=5))
+
+    def test_yield_lines_on_fallback(self):
+        on_fallback = Mock()
+        with patch('builtins.open', return_value=io.BytesIO(b'abcd\nx\xffy\n\xff')):
+            list(IoHelper.yield_lines('dummy', fallback_errors='replace', block_size=5,
+                                      on_fallback=on_fallback))
+        on_fallback.assert_called_once_with()
+        on_fallback.reset_mock()
+        with patch('builtins.open', return_value=io.BytesIO(b'abcd\nxy\n')):
+            list(IoHelper.yield_lines('dummy', fallback_errors='replace', block_size=5,
+                                      on_fallback=on_fallback))
+        on_fallback.assert_not_called()
+
+    def test_supports_byte_lines(self):
+        self.assertTrue(IoHelper.supports_byte_lines('utf-8'))
+        self.assertTrue(IoHelper.supports_byte_lines('cp1252'))
+        self.assertFalse(IoHelper.supports_byte_lines('utf-16'))
+        self.assertFalse(IoHelper.supports_byte_lines('randomEncodingThatDoesNotExist'))
+
+    def test_count_lines_matches_splitlines(self):
+        for data in ['', 'a', 'a\n', 'a\r\nb', 'a\rb\n\n', 'a\u2028b\x85c\x0cd\r', '\r\n\r\n']:
+            for block_size in (1, 2, 3, 1024):
+                with patch('builtins.open', return_value=io.BytesIO(data.encode('utf-8'))):
+                    self.assertEqual(
+                        IoHelper.count_lines('dummy', block_size=block_size),
+                        len(data.splitlines()),
+                        (data, block_size),
+                    )
+
+    def test_peek_lines(self):
+        data = 'l1\r\nl2\nl3\u00e4\rl4\r\nl5\nl6'
+        for block_size in (1, 2, 4, 1024):
+            for keepends in (False, True):
+                lines = data.splitlines(keepends)
+                with patch('builtins.open', side_effect=lambda *_: io.BytesIO(data.encode('utf-8'))):
+                    self.assertEqual(
+                        IoHelper.peek_lines('dummy', 2, keepends=keepends, block_size=block_size),
+                        (lines[:2], lines[-2:]),
+                    )
+        with patch('builtins.open', side_effect=lambda *_: io.BytesIO(b'a\nb\nc')):
+            self.assertEqual(IoHelper.peek_lines('dummy', 0), ([], []))
+
+    def test_peek_lines_strict_tail_raises(self):
+        with patch('builtins.open', side_effect=lambda *_: io.BytesIO(b'a\nb\nc\xff\n')):
+            with self.assertRaises(UnicodeDecodeError):
+                IoHelper.peek_lines('dummy', 1)
+        with patch('builtins.open', side_effect=lambda *_: io.BytesIO(b'a\nb\nc\xff\n')):
+            self.assertEqual(IoHelper.peek_lines('dummy', 1, errors='ignore'), (['a'], ['c']))
+
+    def test_skip_lines(self):
+        data = 'a\r\nb\rc\u2028d\ne'
+        lines = data.splitlines(True)
+        for block_size in (1, 2, 1024):
+            for line_count in range(len(lines) + 2):
+                raw_f = io.BytesIO(data.encode('utf-8'))
+                self.assertEqual(
+                    IoHelper.skip_lines(raw_f, line_count, block_size=block_size),
+                    len(''.join(lines[:line_count]).encode('utf-8')),
+                )
+
+    def test_read_lines_slice(self):
+        data = 'l1\nl2\r\nl3\rl4\nl5\nl6'
+        for file_slice in (slice(2, 4), slice(1, None, 2), slice(-2, None), slice(None, None, -2), slice(4, 1, -1), slice(9, 12)):
+            with patch('builtins.open', side_effect=lambda *_: io.BytesIO(data.encode('utf-8'))):
+                lines, line_numbers = IoHelper.read_lines_slice('dummy', file_slice)
+            self.assertEqual(lines, data.splitlines()[file_slice])
+            self.assertEqual(list(line_numbers), list(range(1, 7))[file_slice])
+
+    def test_read_lines_slice_line_index(self):
+        data = 'l1\nl2\r\nl3\rl4\nl5\nl6'
+        line_index = Mock()
+        line_index.line_count = 6
+        line_index.seek_line.side_effect = lambda raw_f, line: IoHelper.skip_lines(raw_f, line)
+        for file_slice in (slice(2, 4), slice(-2, None), slice(None, None, -2)):
+            with patch('builtins.open', side_effect=lambda *_: io.BytesIO(data.encode('utf-8'))):
+                with patch('cat_win.src.service.helper.iohelper.IoHelper.count_lines') as count_lines:
+                    lines, line_numbers = IoHelper.read_lines_slice('dummy', file_slice, line_index=line_index)
+            count_lines.assert_not_called()
+            self.assertEqual(lines, data.splitlines()[file_slice])
+            self.assertEqual(list(line_numbers), list(range(1, 7))[file_slice])
+
+    def test_yield_file_chunks(self):
+        data = b'0123456789'
+        with patch('builtins.open', return_value=io.BytesIO(data)):
+            self.assertEqual(list(IoHelper.yield_file_chunks('dummy', 4)), [b'0123', b'4567', b'89'])
+        with patch('builtins.open', return_value=io.BytesIO(b'')):
+            self.assertEqual(list(IoHelper.yield_file_chunks('dummy', 4)), [])
+
+    def test_read_file_slice(self):
+        data = b'0123456789'
+        for file_slice in (slice(2, 8), slice(None, None, 3), slice(-3, None), slice(None, None, -1), slice(8, 2, -2), slice(5, 2)):
+            with patch('builtins.open', return_value=io.BytesIO(data)):
+                self.assertEqual(IoHelper.read_file_slice('dummy', file_slice), data[file_slice])
+        with patch('cat_win.src.service.helper.iohelper.IoHelper.read_file', return_value=data) as read_file:
+            self.assertEqual(IoHelper.read_file_slice('dummy', slice(None)), data)
+        read_file.assert_called_once_with('dummy', True)
+
+    def test_file_slice(self):
+        data = b'0123456789'
+        for file_slice in (slice(None), slice(2, 8), slice(None, None, 3), slice(None, None, -1), slice(8, 2, -2), slice(5, 2)):
+            with patch('builtins.open', return_value=io.BytesIO(data)):
+                with FileSlice('dummy', file_slice) as bin_content:
+                    expected = data[file_slice]
+                    self.assertEqual(len(bin_content), len(expected))
+                    self.assertEqual(bin_content[:], expected)
+                    self.assertEqual(bin_content[1:3], expected[1:3])
+                    self.assertEqual(bin_content[5:], expected[5:])
+                    if expected:
+                        self.assertEqual(bin_content[-1], expected[-1])
+                self.assertTrue(bin_content.raw_f.closed)
+
+    def test_scan_plain_lines(self):
+        for data, allow_esc, expected in (
+            (b'', True, 0),
+            (b'a\nb\n', True, 4),
+            (b'a\nb', True, 3),
+            (b'\xc3\xa4\n\xe2\x82\xac', True, 6),
+            (b'a\r\nb', True, -1),
+            (b'a\x0cb', True, -1),
+            (b'a\xe2\x80\xa8b', True, -1),
+            (b'a\xc3', True, -1),
+            (b'\x1b[31ma', True, 6),
+            (b'\x1b[31ma', False, -1),
+        ):
+            for block_size in (1, 1024):
+                with patch('builtins.open', return_value=io.BytesIO(data)):
+                    self.assertEqual(
+                        IoHelper.scan_plain_lines('dummy', allow_esc=allow_esc, block_size=block_size),
+                        expected,
+                        (data, allow_esc, block_size),
+                    )
+
+    def test_grep_lines(self):
+        data = 'a\nxb\r\nc\u2028d\nx\n\ne\nf\ng\nhx'.encode('utf-8')
+        pattern = re.compile(b'x')
+        for context_lines, expected in (
+            (0, (['xb', 'x', 'hx'], [2, 5, 10])),
+            (1, (['a', 'xb', 'c', 'd', 'x', '', 'g', 'hx'], [1, 2, 3, 4, 5, 6, 9, 10])),
+        ):
+            for block_size in (1, 3, 1024):
+                with patch('builtins.open', return_value=io.BytesIO(data)):
+                    self.assertEqual(
+                        IoHelper.grep_lines('dummy', pattern, context_lines, block_size=block_size),
+                        expected,
+                        (context_lines, block_size),
+                    )
+
+    def test_grep_lines_long_lines(self):
+        data = ('a' * 100 + '\r\n' + 'b' * 50 + 'x' + 'c' * 50 + '\u2028' + 'd' * 100).encode('utf-8')
+        for block_size in (1, 4, 7):
+            with patch('builtins.open', return_value=io.BytesIO(data)):
+                self.assertEqual(
+                    IoHelper.grep_lines('dummy', re.compile(b'x'), 1, block_size=block_size),
+                    (['a' * 100, 'b' * 50 + 'x' + 'c' * 50, 'd' * 100], [1, 2, 3]),
+                    block_size,
+                )
+
+    def test_grep_lines_invalid_bytes(self):
+        with patch('builtins.open', return_value=io.BytesIO(b'x\n\xff\n')):
+            with self.assertRaises(UnicodeDecodeError):
+                IoHelper.grep_lines('dummy', re.compile(b'x'))
+
+    def test_read_appended_lines(self):
+        data = b'old\na\r\nb\xe2\x80\xa8c'
+        for offset, keepends, expected in (
+            (4, False, (['a', 'b'], 11)),
+            (4, True, (['a\r\n', 'b\u2028'], 11)),
+            (11, False, ([], 11)),
+        ):
+            with patch('builtins.open', return_value=io.BytesIO(data)):
+                self.assertEqual(IoHelper.read_appended_lines('dummy', offset, keepends=keepends), expected)
+        with patch('builtins.open', return_value=io.BytesIO(b'a\nb\r')):
+            self.assertEqual(IoHelper.read_appended_lines('dummy', 0), (['a'], 2))
+
+    def test_read_appended_lines_blocks(self):
+        data = b'old\n' + b'x' * 10 + b'\r\nyy\n'
+        for offset, expected in (
+            (4, (['x' * 10], 16)),
+            (16, (['yy'], 19)),
+        ):
+            with patch('builtins.open', return_value=io.BytesIO(data)):
+                self.assertEqual(IoHelper.read_appended_lines('dummy', offset, block_size=4), expected)
+        with patch('builtins.open', return_value=io.BytesIO(b'a\r\nb')):
+            self.assertEqual(IoHelper.read_appended_lines('dummy', 0, block_size=2), (['a'], 3))
+        with patch('builtins.open', return_value=io.BytesIO(b'a' * 9)):
+            self.assertEqual(IoHelper.read_appended_lines('dummy', 0, block_size=4), ([], 0))
+
+    def test_copy_file(self):
+        read_fd, write_fd = os.pipe()
+        try:
+            IoHelper.copy_file(__file__, write_fd, 100)
+            os.close(write_fd)
+            write_fd = None
+            with open(__file__, 'rb') as raw_f:
+                self.assertEqual(os.read(read_fd, 1000), raw_f.read(100))
+        finally:
+            os.close(read_fd)
+            if write_fd is not None:
+                os.close(write_fd)
+
+    def test_copy_file_buffered_fallback(self):
+        written = []
+        with patch('cat_win.src.service.helper.iohelper.os.sendfile', side_effect=OSError, create=True):
+            with patch('cat_win.src.service.helper.iohelper.os.copy_file_range', side_effect=OSError, create=True):
+                with patch('cat_win.src.service.helper.iohelper.os.write', side_effect=lambda _fd, data: written.append(bytes(data)) or len(data)):
+                    IoHelper.copy_file(__file__, 1, block_size=64)
+        with open(__file__, 'rb') as raw_f:
+            self.assertEqual(b''.join(written), raw_f.read())
+
+    def test_copy_file_broken_pipe(self):
+        with patch('cat_win.src.service.helper.iohelper.os.sendfile', side_effect=BrokenPipeError, create=True):
+            with self.assertRaises(BrokenPipeError):
+                IoHelper.copy_file(__file__, 1)
+
     def test_get_newline(self):
         self.assertEqual(IoHelper.get_newline(test_file_path), '\r\n')
         self.assertEqual(IoHelper.get_newline(test_file_path_empty), '\n')
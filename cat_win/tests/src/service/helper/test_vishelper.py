@@ -2,7 +2,7 @@ from unittest.mock import patch
 from unittest import TestCase
 
 from cat_win.src.service.helper.vishelper import get_fit_terminal_square, \
-    SpaceFilling, Entropy
+    get_fit_overview_square, SpaceFilling, Entropy, Digraph, Overview
 from cat_win.tests.mocks.pbar import PBarMock
 # import sys
 # sys.path.append('../cat_win')
@@ -20,6 +20,14 @@ class TestVisHelper(TestCase):
         self.assertEqual(get_fit_terminal_square(63,   300),    4)
         self.assertEqual(get_fit_terminal_square(62,   300),    4)
 
+    def test_get_fit_overview_square(self):
+        self.assertEqual(get_fit_overview_square(0, 30), 1)
+        self.assertEqual(get_fit_overview_square(15, 30), 2)
+        self.assertEqual(get_fit_overview_square(16, 30), 4)
+        self.assertEqual(get_fit_overview_square(10**9, 30), 16)
+        self.assertEqual(get_fit_overview_square(10**9, 32), 32)
+        self.assertEqual(get_fit_overview_square(10**9, 0), 1)
+
     def test_get_scan_curve(self):
         scan_curve = [p for p in SpaceFilling.get_scan_curve(b'ab'*600, 120)]
         for p in scan_curve:
@@ -96,10 +104,107 @@ class TestVisHelper(TestCase):
         out = [p for p in SpaceFilling.get_hilbert_curve(in_, 120)]
         self.assertEqual(out, out_)
 
+    def test_get_curve_permutation(self):
+        SpaceFilling._get_curve_permutation.cache_clear()
+        getter, indices = SpaceFilling._get_curve_permutation('hilbert', 4)
+        self.assertEqual(getter(range(16)), (0, 1, 14, 15, 3, 2, 13, 12, 4, 7, 8, 11, 5, 6, 9, 10))
+        if indices is not None:
+            self.assertListEqual(list(indices), list(getter(range(16))))
+        self.assertIs(SpaceFilling._get_curve_permutation('hilbert', 4)[0], getter)
+        getter, _ = SpaceFilling._get_curve_permutation('zorder', 1)
+        self.assertEqual(getter(b'a'), (97,))
+        self.assertEqual(SpaceFilling._get_curve_permutation.cache_info().currsize, 2)
+
+    def test_get_curve_without_numpy(self):
+        in_ = b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789?!.' * 2
+        expected_zorder = list(SpaceFilling.get_zorder_curve(in_, 120))
+        expected_hilbert = list(SpaceFilling.get_hilbert_curve(in_, 120))
+        SpaceFilling._get_curve_permutation.cache_clear()
+        with patch('cat_win.src.service.helper.vishelper.np', None):
+            self.assertEqual(list(SpaceFilling.get_zorder_curve(in_, 120)), expected_zorder)
+            self.assertEqual(list(SpaceFilling.get_hilbert_curve(in_, 120)), expected_hilbert)
+        SpaceFilling._get_curve_permutation.cache_clear()
+        self.assertEqual(len(expected_hilbert), 18)
+        self.assertEqual(expected_hilbert[-1], [46, -1, -1, -1, -1, -1, -1, -1])
+
     @patch('cat_win.src.service.helper.vishelper.PBar', PBarMock)
     def test_normalized_shannon_entropy(self):
-        self.assertListEqual(Entropy.normalized_shannon_entropy(b'a'*128), [0] * 128)
-        self.assertListEqual(Entropy.normalized_shannon_entropy(list(range(128))), [100] * 128)
-        self.assertListEqual(Entropy.normalized_shannon_entropy(b'ab'*64), [14] * 128)
-        self.assertListEqual(Entropy.normalized_shannon_entropy(b'abc'*64), [22] * 192)
-        self.assertListEqual(Entropy.normalized_shannon_entropy(b'abcd'*64), [28] * 256)
+        self.assertListEqual(list(Entropy.normalized_shannon_entropy(b'a'*128)), [0] * 128)
+        self.assertListEqual(list(Entropy.normalized_shannon_entropy(list(range(128)))), [100] * 128)
+        self.assertListEqual(list(Entropy.normalized_shannon_entropy(b'ab'*64)), [14] * 128)
+        self.assertListEqual(list(Entropy.normalized_shannon_entropy(b'abc'*64)), [22] * 192)
+        self.assertListEqual(list(Entropy.normalized_shannon_entropy(b'abcd'*64)), [28] * 256)
+
+    @patch('cat_win.src.service.helper.vishelper.PBar', PBarMock)
+    def test_normalized_shannon_entropy_empty(self):
+        self.assertEqual(Entropy.normalized_shannon_entropy(b''), bytearray())
+
+    @patch('cat_win.src.service.helper.vishelper.PBar', PBarMock)
+    def test_normalized_shannon_entropy_sliding(self):
+        # the window wraps around at the end of the data
+        data = b'a' * 64 + bytes(range(64)) + b'b' * 100
+        entropy = list(Entropy.normalized_shannon_entropy(data))
+        self.assertEqual(len(entropy), len(data))
+        self.assertEqual(entropy[0], 57)
+        self.assertEqual(entropy[64], 57)
+        self.assertEqual(entropy[128], 10)
+        with patch('cat_win.src.service.helper.vishelper.np', None):
+            self.assertListEqual(list(Entropy.normalized_shannon_entropy(data)), entropy)
+        with patch('cat_win.src.service.helper.vishelper.ENTROPY_STEPS', 7):
+            self.assertListEqual(list(Entropy.normalized_shannon_entropy(data)), entropy)
+            with patch('cat_win.src.service.helper.vishelper.np', None):
+                self.assertListEqual(list(Entropy.normalized_shannon_entropy(data)), entropy)
+
+    def test_count_pairs(self):
+        data = b'abcabca\x00\xff'
+        expected = [0] * 65536
+        for byte_a, byte_b in zip(data, data[1:]):
+            expected[byte_a*256+byte_b] += 1
+        self.assertEqual(Digraph.count_pairs(data)[ord('a')*256+ord('b')], 2)
+        self.assertEqual(Digraph.count_pairs(data)[255], 1)
+        for chunk_size in [1, 2, 3, 1 << 22]:
+            with patch('cat_win.src.service.helper.vishelper.DIGRAPH_CHUNK_SIZE', chunk_size):
+                self.assertListEqual(Digraph.count_pairs(data), expected)
+                with patch('cat_win.src.service.helper.vishelper.np', None):
+                    self.assertListEqual(Digraph.count_pairs(data), expected)
+
+    def test_count_pairs_empty(self):
+        for data in [b'', b'a']:
+            self.assertListEqual(Digraph.count_pairs(data), [0] * 65536)
+            with patch('cat_win.src.service.helper.vishelper.np', None):
+                self.assertListEqual(Digraph.count_pairs(data), [0] * 65536)
+
+    def test_overview_yield_blocks(self):
+        data = bytes(range(10))
+        for chunk_size in [1, 3, 4096]:
+            with patch('cat_win.src.service.helper.vishelper.OVERVIEW_CHUNK_SIZE', chunk_size):
+                blocks = [b''] * 4
+                for cell, part in Overview._yield_blocks(data, 4):
+                    blocks[cell] += part
+                self.assertListEqual(blocks, [b'\x00\x01', b'\x02\x03\x04', b'\x05\x06', b'\x07\x08\x09'])
+
+    @patch('cat_win.src.service.helper.vishelper.PBar', PBarMock)
+    def test_overview_get_block_classes(self):
+        # blocks of 5 bytes, a tie is resolved by the first byte class
+        data = b''.join([b'\x00' * 5, b'\x00\x00\x00\x01\x01', b'\x01\x01\x01aa', b'a' * 5,
+                         b'aaa\x80\x81', b'\x80\x81\x80\x81\xff', b'\xff\xff\xff\x00\x00',
+                         b'\x00\x00\xff\xff\x01'])
+        expected = [0, 0, 1, 65, 65, 128, 255, 0]
+        self.assertListEqual(Overview.get_block_classes(data, 8), expected)
+        with patch('cat_win.src.service.helper.vishelper.OVERVIEW_CHUNK_SIZE', 3):
+            self.assertListEqual(Overview.get_block_classes(data, 8), expected)
+            with patch('cat_win.src.service.helper.vishelper.np', None):
+                self.assertListEqual(Overview.get_block_classes(data, 8), expected)
+        self.assertListEqual(Overview.get_block_classes(b'', 1), [])
+
+    @patch('cat_win.src.service.helper.vishelper.PBar', PBarMock)
+    def test_overview_get_block_entropy(self):
+        data = b'a' * 256 + bytes(range(256)) + b'ab' * 128 + b'abcd' * 64
+        expected = [0, 100, 12, 25]
+        self.assertListEqual(Overview.get_block_entropy(data, 4), expected)
+        with patch('cat_win.src.service.helper.vishelper.OVERVIEW_CHUNK_SIZE', 100):
+            self.assertListEqual(Overview.get_block_entropy(data, 4), expected)
+            with patch('cat_win.src.service.helper.vishelper.np', None):
+                self.assertListEqual(Overview.get_block_entropy(data, 4), expected)
+        self.assertListEqual(Overview.get_block_entropy(b'ab', 1), [100])
+        self.assertListEqual(Overview.get_block_entropy(b'', 1), [])
@@ -1,6 +1,13 @@
 from unittest import TestCase
 
-from cat_win.src.service.cbase64 import encode_base64, decode_base64
+from unittest.mock import patch
+
+from cat_win.src.service.cbase64 import (
+    decode_base64,
+    encode_base64,
+    yield_decoded_base64,
+    yield_encoded_base64,
+)
 # import sys
 # sys.path.append('../cat_win')
 
@@ -45,3 +52,26 @@ class TestBase64(TestCase):
         test_input = 'VGVzdAoxMjM0MDQKw4TDlsOcIFRFU1Q='
         expected_output = 'Test\n123404\nÄÖÜ TEST'
         self.assertEqual(decode_base64(test_input, True), expected_output)
+
+    def test_yield_encoded_base64(self):
+        content = 'Test\n123404\nÄÖÜ  TEST'.encode()
+        for chunk_size in [3, 6, 7, 786432]:
+            with self.subTest(chunk_size=chunk_size):
+                with patch('cat_win.src.service.cbase64.B64_ENCODE_CHUNK_SIZE', chunk_size):
+                    encoded = list(yield_encoded_base64(content[i:i+5] for i in range(0, len(content), 5)))
+                self.assertEqual(b''.join(encoded), b'VGVzdAoxMjM0MDQKw4TDlsOcICBURVNU')
+                # only the last chunk may contain padding
+                self.assertTrue(all(len(chunk) % 4 == 0 and b'=' not in chunk for chunk in encoded[:-1]))
+        self.assertEqual(list(yield_encoded_base64([])), [])
+
+    def test_yield_decoded_base64(self):
+        test_input = 'VGVzdAox\r\nMjM0MDQK w4TDlsOc\nICBURVNU\nYWI='
+        expected_output = 'Test\n123404\nÄÖÜ  TESTab'.encode()
+        for size in range(1, 10):
+            with self.subTest(size=size):
+                chunks = [test_input[i:i+size] for i in range(0, len(test_input), size)]
+                self.assertEqual(b''.join(yield_decoded_base64(chunks)), expected_output)
+                chunks = [chunk.encode() for chunk in chunks]
+                self.assertEqual(b''.join(yield_decoded_base64(chunks)), expected_output)
+        # a single remaining character is ignored
+        self.assertEqual(b''.join(yield_decoded_base64(['YWJjZ'])), b'abc')
@@ -1,10 +1,27 @@
 from unittest import TestCase
 from unittest.mock import patch
+import hashlib
 import os
+import shutil
+import tempfile
+import zlib
 
 from cat_win.tests.mocks.std import StdOutMock
 from cat_win.src.const.colorconstants import CKW
-from cat_win.src.service.checksum import get_checksum_from_file, print_checksum
+from cat_win.src.persistence.digestcache import DigestCache
+from cat_win.src.service.checksum import (
+    _MerkleChecksum,
+    calc_checksums,
+    format_checksums,
+    get_algorithms,
+    get_changed_ranges,
+    get_checksum_from_file,
+    get_merkle_root,
+    parse_manifest,
+    print_checksum,
+    verify_manifest,
+    yield_checksums,
+)
 # import sys
 # sys.path.append('../cat_win')
 
@@ -61,3 +78,210 @@ class TestChecksum(TestCase):
         with patch('sys.stdout', new=StdOutMock()) as fake_out:
             print_checksum(test_file_path, color_dic)
             self.assertEqual(fake_out.getvalue(), expected_output)
+
+    def test_checksum_algorithms(self):
+        color_dic = {CKW.CHECKSUM: '', CKW.RESET_ALL: ''}
+        with open(test_file_path, 'rb') as raw_f:
+            data = raw_f.read()
+        expected_output = ''
+        expected_output += f"\tSHA256:  {hashlib.sha256(data).hexdigest()}\n"
+        expected_output += f"\tCRC32:   {zlib.crc32(data):08X}\n"
+        self.assertEqual(get_checksum_from_file(test_file_path, color_dic, 'sha256,CRC32'), expected_output)
+
+    def test_get_algorithms(self):
+        self.assertEqual(get_algorithms('SHA256, crc32,sha256'), ['sha256', 'crc32'])
+        self.assertEqual(get_algorithms('sha3-256'), ['sha3_256'])
+        self.assertEqual(get_algorithms('SHA-256,sha-1, MD5,SHA3-512'), ['sha256', 'sha1', 'md5', 'sha3_512'])
+        for algorithms in ['', 'md5,', 'unknown', 'shake_128']:
+            with self.assertRaises(ValueError):
+                get_algorithms(algorithms)
+
+    def test_calc_checksums(self):
+        with open(test_file_path, 'rb') as raw_f:
+            data = raw_f.read()
+        expected = {
+            'adler32': f"{zlib.adler32(data):08X}",
+            'sha3_256': hashlib.sha3_256(data).hexdigest(),
+            'blake2b': hashlib.blake2b(data).hexdigest(),
+        }
+        for buf_size in [1, 7, 4096]:
+            with self.subTest(buf_size=buf_size):
+                self.assertEqual(calc_checksums(test_file_path, list(expected), buf_size), expected)
+
+    def test_format_checksums(self):
+        color_dic = {CKW.CHECKSUM: '', CKW.RESET_ALL: ''}
+        self.assertEqual(format_checksums('OSError', color_dic), 'OSError')
+        self.assertEqual(format_checksums({'sha3_512': 'ab', 'md5': 'cd'}, color_dic),
+                         '\tSHA3_512: ab\n\tMD5:      cd\n')
+
+    def test_yield_checksums(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            files = []
+            for i in range(5):
+                files.append(os.path.join(tmp_dir, f"{i}.bin"))
+                with open(files[-1], 'wb') as f:
+                    f.write(bytes([i]) * 1000 * i)
+            files.insert(2, os.path.join(tmp_dir, 'missing.bin'))
+            expected = [
+                {'md5': hashlib.md5(open(file, 'rb').read()).hexdigest()}
+                if os.path.isfile(file) else 'FileNotFoundError' for file in files
+            ]
+            for jobs in [1, 3]:
+                with self.subTest(jobs=jobs):
+                    self.assertEqual(list(yield_checksums(files, ['md5'], jobs)), expected)
+
+            digest_cache = DigestCache(os.path.join(tmp_dir, 'checksums.json'))
+            self.assertEqual(list(yield_checksums(files, ['md5'], 2, digest_cache)), expected)
+            self.assertEqual(len(digest_cache.entries), 5)
+            with patch('cat_win.src.service.checksum.calc_checksums') as calc:
+                self.assertEqual(list(yield_checksums(files, ['md5'], 2, digest_cache)), expected)
+            calc.assert_not_called()
+            # only the missing algorithms are calculated
+            with patch('cat_win.src.service.checksum.calc_checksums', return_value={'crc32': 'X'}) as calc:
+                checksums = list(yield_checksums(files[:1], ['crc32', 'md5'], 1, digest_cache))
+            calc.assert_called_once_with(files[0], ['crc32'], hash_objs={})
+            self.assertEqual(checksums, [{'crc32': 'X', 'md5': expected[0]['md5']}])
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def test_print_checksum_calculated(self):
+        color_dic = {CKW.CHECKSUM: 'X', CKW.RESET_ALL: 'Y'}
+        with patch('sys.stdout', new=StdOutMock()) as fake_out:
+            print_checksum('file', color_dic, {'md5': 'ab'})
+            self.assertEqual(fake_out.getvalue(), "XChecksum of 'file':Y\n\tXMD5:     abY\n\n")
+
+    def test_parse_manifest(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            sha256 = hashlib.sha256(b'').hexdigest()
+            blake2b = hashlib.blake2b(b'').hexdigest()
+            lines = [
+                f"{sha256}  a.txt",
+                f"{sha256.upper()} *b c.txt",
+                f"\\{sha256}  d\\\\e\\nf",
+                '',
+                '# comment',
+                f"MD5 (g.txt) = {hashlib.md5(b'').hexdigest()}",
+                f"BLAKE2b (h.txt) = {blake2b}",
+                f"{blake2b}  i.txt",
+                'abc  j.txt',
+                f"UNKNOWN (k.txt) = {sha256}",
+                f"MD5 (l.txt) = {sha256}",
+                'not a checksum',
+            ]
+            manifest = os.path.join(tmp_dir, 'checksums')
+            with open(manifest, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\r\n')
+            self.assertEqual(list(parse_manifest(manifest)), [
+                ('a.txt', 'sha256', sha256),
+                ('b c.txt', 'sha256', sha256),
+                ('d\\e\nf', 'sha256', sha256),
+                ('g.txt', 'md5', hashlib.md5(b'').hexdigest()),
+                ('h.txt', 'blake2b', blake2b),
+                ('i.txt', 'sha512', blake2b),
+                (None, None, 'abc  j.txt'),
+                (None, None, lines[9]),
+                (None, None, lines[10]),
+                (None, None, 'not a checksum'),
+            ])
+            # the name of the manifest decides ambiguous lengths
+            manifest = os.path.join(tmp_dir, 'B2SUMS')
+            with open(manifest, 'w', encoding='utf-8') as f:
+                f.write(f"{blake2b}  i.txt\n")
+            self.assertEqual(list(parse_manifest(manifest)), [('i.txt', 'blake2b', blake2b)])
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def test_verify_manifest(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            files = [os.path.join(tmp_dir, f"{i}.bin") for i in range(4)]
+            for i, file in enumerate(files):
+                with open(file, 'wb') as f:
+                    f.write(bytes([i]) * 100 * i)
+            sha1 = [hashlib.sha1(bytes([i]) * 100 * i).hexdigest() for i in range(4)]
+            manifest = os.path.join(tmp_dir, 'manifest.sha1')
+            with open(manifest, 'w', encoding='utf-8') as f:
+                f.write(f"{sha1[0]}  {files[0]}\n")
+                f.write(f"{sha1[2]}  {files[1]}\n")
+                f.write(f"{sha1[2]}  {files[2]}\n")
+                f.write(f"{sha1[3]}  {os.path.join(tmp_dir, 'missing.bin')}\n")
+                f.write(f"{sha1[3]}  {tmp_dir}\n")
+                f.write('invalid\n')
+                f.write(f"{sha1[3]}  {files[3]}\n")
+            color_dic = {CKW.CHECKSUM: '', CKW.RESET_ALL: ''}
+            for jobs in [1, 3]:
+                with self.subTest(jobs=jobs):
+                    with patch('sys.stdout', new=StdOutMock()) as fake_out:
+                        results = verify_manifest(manifest, color_dic, jobs=jobs)
+                    self.assertEqual(results, {'OK': 3, 'FAILED': 2, 'MISSING': 1, 'INVALID': 1})
+                    output = fake_out.getvalue().splitlines()
+                    self.assertEqual(output[:4], [
+                        f"{files[0]}: OK", f"{files[1]}: FAILED", f"{files[2]}: OK",
+                        f"{os.path.join(tmp_dir, 'missing.bin')}: MISSING",
+                    ])
+                    self.assertTrue(output[4].startswith(f"{tmp_dir}: FAILED ("))
+                    self.assertEqual(output[5:], [f"{files[3]}: OK"])
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def test_merkle_checksum(self):
+        def _leaf(data):
+            return hashlib.blake2b(data, digest_size=32, person=b'catw-block').digest()
+        def _node(left, right):
+            return hashlib.blake2b(left + right, digest_size=32, person=b'catw-node').digest()
+
+        data = bytes(range(256)) * 5
+        merkle = _MerkleChecksum(256)
+        for i in range(0, len(data), 100):
+            merkle.update(data[i:i+100])
+        leaf = _leaf(bytes(range(256)))
+        self.assertEqual(merkle.get_blocks(), [leaf] * 5)
+        self.assertEqual(merkle.hexdigest(), _node(_node(_node(leaf, leaf), _node(leaf, leaf)), leaf).hex())
+        self.assertEqual(merkle.size, len(data))
+        merkle.update(memoryview(b'abc'))
+        self.assertEqual(merkle.get_blocks(), [leaf] * 5 + [_leaf(b'abc')])
+        self.assertEqual(_MerkleChecksum().get_blocks(), [_leaf(b'')])
+        self.assertEqual(get_merkle_root([leaf]), leaf)
+        # the root does not depend on how the data is read
+        self.assertEqual(calc_checksums(test_file_path, ['merkle'], 7),
+                         calc_checksums(test_file_path, ['merkle']))
+
+    def test_get_changed_ranges(self):
+        digests = [bytes([i]) * 32 for i in range(4)]
+        previous = (100, 350, b''.join(digests))
+        self.assertEqual(get_changed_ranges(previous, previous), [])
+        changed = (100, 350, b''.join([digests[0], b'x' * 32, b'y' * 32, digests[3]]))
+        self.assertEqual(get_changed_ranges(previous, changed), [(100, 300)])
+        appended = (100, 420, b''.join(digests[:3] + [b'x' * 32, b'y' * 32]))
+        self.assertEqual(get_changed_ranges(previous, appended), [(300, 420)])
+        truncated = (100, 150, b''.join([digests[0], b'x' * 32]))
+        self.assertEqual(get_changed_ranges(previous, truncated), [(100, 350)])
+        self.assertIsNone(get_changed_ranges(previous, (200, 350, b'')))
+
+    def test_yield_checksums_changed_ranges(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            file = os.path.join(tmp_dir, 'file.bin')
+            with open(file, 'wb') as f:
+                f.write(b'\x00' * 1000)
+            digest_cache = DigestCache(os.path.join(tmp_dir, 'checksums.json'),
+                                       os.path.join(tmp_dir, 'checksum_blocks.json'))
+            with patch.object(_MerkleChecksum.__init__, '__defaults__', (100,)):
+                checksums = list(yield_checksums([file], ['merkle'], 1, digest_cache))
+                self.assertEqual(list(checksums[0]), ['merkle'])
+                digest_cache.save()
+                with open(file, 'r+b') as f:
+                    f.seek(250)
+                    f.write(b'\x01' * 100)
+                    f.seek(0, os.SEEK_END)
+                    f.write(b'\x02' * 10)
+                os.utime(file, ns=(0, 0))
+                digest_cache = DigestCache(os.path.join(tmp_dir, 'checksums.json'),
+                                           os.path.join(tmp_dir, 'checksum_blocks.json'))
+                changed = list(yield_checksums([file], ['merkle'], 1, digest_cache))[0]
+            self.assertNotEqual(changed['merkle'], checksums[0]['merkle'])
+            self.assertEqual(changed['changed'], '0xc8-0x18f, 0x3e8-0x3f1')
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
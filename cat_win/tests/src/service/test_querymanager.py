@@ -1,13 +1,17 @@
 from unittest import TestCase
+from unittest.mock import patch
 
 import re
 
 from cat_win.src.const.colorconstants import CKW
 from cat_win.src.service.querymanager import (
     QueryManager,
+    _AhoCorasick,
+    _LiteralScanner,
     remove_ansi_codes_from_line,
-    _map_display_pos,
     _build_ansi_restore,
+    _build_display_offsets,
+    build_bytes_prefilter,
     find_literals,
     find_literals_no_overlap,
     find_regex,
@@ -22,14 +26,6 @@ class TestQueryManager(TestCase):
         line = '\x1b[31mRed\x1b[0m Text'
         self.assertEqual(remove_ansi_codes_from_line(line), 'Red Text')
 
-    def test_map_display_pos(self):
-        display = '\x1b[31mAB\x1b[0mC'
-        self.assertEqual(_map_display_pos(display, 0), 5)
-        self.assertEqual(_map_display_pos(display, 1), 6)
-        self.assertEqual(_map_display_pos(display, 2), 11)
-        # out-of-range plain index maps to end of display string
-        self.assertEqual(_map_display_pos(display, 99), len(display))
-
     def test_build_ansi_restore(self):
         reset = '\x1b[0m'
         display = '\x1b[31mA\x1b[32mB\x1b[0mC'
@@ -42,6 +38,24 @@ class TestQueryManager(TestCase):
         self.assertEqual(restore[3], '')
         self.assertSetEqual(ansi_set, {0, 1, 2})
 
+    def test_build_display_offsets(self):
+        for display, expected in (
+            ('\x1b[31mAB\x1b[0mC', [5, 6, 11, 12]),
+            ('A\x1b[0m', [0, 5]),
+            ('\x1b[31m', [5]),
+            ('\x1bA\x1b[B', [0, 1, 5]),
+            ('\x01\x1b[1;2m\x02AB', [8, 9, 10]),
+            ('', [0]),
+        ):
+            self.assertListEqual(list(_build_display_offsets(display)), expected, repr(display))
+        self.assertEqual(_build_display_offsets('plain'), range(6))
+
+    def test_build_ansi_restore_without_ansi(self):
+        self.assertEqual(_build_ansi_restore('\x1b[0m', 'plain'), ({}, set()))
+        restore, ansi_set = _build_ansi_restore('\x1b[0m', 'A\x1b[31m')
+        self.assertEqual(restore, {0: '', 1: '\x1b[31m'})
+        self.assertSetEqual(ansi_set, set())
+
     def test_find_literals_true(self):
         _x = list(find_literals('test', 'abctEStdef', True))
         self.assertListEqual(_x, [[3, 7]])
@@ -155,6 +169,55 @@ class TestQueryManager(TestCase):
         self.assertCountEqual(f_keywords, [('Is', [4, 6]), ('Test', [7, 11])])
         self.assertCountEqual(m_keywords, [(r"[0-9]\!", [12, 14])])
 
+    def test_aho_corasick_find_all(self):
+        automaton = _AhoCorasick(['he', 'she', 'his', 'hers'])
+        self.assertListEqual(
+            sorted(automaton.find_all('ushers his')),
+            [(1, 4, 1), (2, 4, 0), (2, 6, 3), (7, 10, 2)],
+        )
+        self.assertListEqual(list(automaton.find_all('nothing')), [])
+        self.assertListEqual(list(_AhoCorasick(['aa']).find_all('aaaa')), [(0, 2, 0), (1, 3, 0), (2, 4, 0)])
+
+    def test_literal_scanner_find_all(self):
+        scanner = _LiteralScanner(['he', 'she', 'his', 'hers'])
+        self.assertListEqual(
+            sorted(scanner.find_all('ushers his')),
+            [(1, 4, 1), (2, 4, 0), (2, 6, 3), (7, 10, 2)],
+        )
+        self.assertListEqual(list(scanner.find_all('nothing')), [])
+        self.assertListEqual(list(_LiteralScanner(['aa']).find_all('aaaa')), [(0, 2, 0), (1, 3, 0), (2, 4, 0)])
+
+    def test_build_finders_threshold(self):
+        queries = [('ab', False), ('cd', True)]
+        self.assertTrue(all(isinstance(finder, _LiteralScanner)
+                            for finder in QueryManager(queries)._literal_finders))
+        with patch('cat_win.src.service.querymanager.AHO_CORASICK_MIN_LITERALS', 1):
+            self.assertTrue(all(isinstance(finder, _AhoCorasick)
+                                for finder in QueryManager(queries)._literal_finders))
+
+    def test_find_keywords_matches_searching_each_query(self):
+        queries = [
+            ('ab', False), ('AB', True), ('b', True), ('ab', False), ('', True), ('abab', False),
+            (re.compile(r'a(b)\1', re.DOTALL), False), (re.compile(r'B+', re.DOTALL | re.IGNORECASE), True),
+            (re.compile(r'^a', re.DOTALL), False), (re.compile(r'x*', re.DOTALL), False),
+        ]
+        string_finder = QueryManager(queries)
+        with patch('cat_win.src.service.querymanager.AHO_CORASICK_MIN_LITERALS', 1):
+            automaton_finder = QueryManager(queries)
+        for line in ('', 'abAB', 'xababbbx', 'cdcd', 'Abab abb'):
+            found_list, matched_list = [], []
+            for query, ignore_case in queries:
+                if isinstance(query, str):
+                    found_list += [(query, _f) for _f in find_literals(query, line, ignore_case)]
+                else:
+                    matched_list += [(query.pattern, _m) for _m in find_regex(query, line)]
+            found_list.sort(key=lambda x: x[1][0])
+            matched_list.sort(key=lambda x: x[1][0])
+            for finder in (string_finder, automaton_finder):
+                _, f_keywords, m_keywords = finder.find_keywords(line)
+                self.assertListEqual(f_keywords, found_list, line)
+                self.assertListEqual(m_keywords, matched_list, line)
+
     def test_replace_queries_in_line_literal(self):
         color_dic = {
             CKW.REPLACE: '<R>',
@@ -188,3 +251,24 @@ class TestQueryManager(TestCase):
 
         self.assertEqual(plain_line, 'abc[123]def')
         self.assertIn('<R>[123]</R>', display_line)
+
+    def test_build_bytes_prefilter(self):
+        pattern = build_bytes_prefilter([('ab', False), ('Cd', True), ('\u00e4', False)], 'utf-8')
+        for line, expected in (
+            (b'xaby', True),
+            (b'xAby', False),
+            (b'xcDy', True),
+            (b'\xc3\xa4', True),
+            (b'\x1b[31mx', True),
+            (b'\xe2\x84\xaa', True),
+            (b'xyz', False),
+        ):
+            self.assertEqual(bool(pattern.search(line)), expected, line)
+        self.assertFalse(build_bytes_prefilter([('ab', False)], 'utf-8').search(b'\xe2\x84\xaa'))
+
+    def test_build_bytes_prefilter_unsupported(self):
+        self.assertIsNone(build_bytes_prefilter([('ab', False)], 'utf-16'))
+        self.assertIsNone(build_bytes_prefilter([('ab', False)], 'unknown-encoding'))
+        self.assertIsNone(build_bytes_prefilter([(re.compile('ab'), False)], 'utf-8'))
+        self.assertIsNone(build_bytes_prefilter([('', False)], 'utf-8'))
+        self.assertIsNone(build_bytes_prefilter([('\u00e4', True)], 'utf-8'))
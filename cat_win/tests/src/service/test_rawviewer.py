@@ -2,11 +2,12 @@ from unittest import TestCase
 from unittest.mock import patch
 from types import SimpleNamespace
 import os
+import tempfile
 
 from cat_win.src.const.colorconstants import CKW
 from cat_win.src.domain.file import File
 from cat_win.tests.mocks.error import ErrorDefGen
-from cat_win.src.service.rawviewer import get_display_char_gen, get_raw_view_lines_gen
+from cat_win.src.service.rawviewer import get_display_char_gen, get_display_table, get_raw_view_blocks_gen, get_raw_view_lines_gen, get_raw_view_peek
 
 
 test_file_path = os.path.join(os.path.dirname(__file__), '..', '..', 'texts', 'test.txt')
@@ -140,13 +141,13 @@ Address  00       01       02       03       04       05       06       07
         )
 
     def test_get_raw_view_lines_gen_oserror(self):
-        with patch('cat_win.src.service.helper.iohelper.IoHelper.read_file',
+        with patch('cat_win.src.service.helper.iohelper.IoHelper.yield_file_chunks',
                    ErrorDefGen.get_def(FileNotFoundError('Test123'))):
             self.assertEqual(
                 '\n'.join(get_raw_view_lines_gen(self._ctx(__file__), 0)),
                 'FileNotFoundError'
             )
-        with patch('cat_win.src.service.helper.iohelper.IoHelper.read_file',
+        with patch('cat_win.src.service.helper.iohelper.IoHelper.yield_file_chunks',
                    ErrorDefGen.get_def(PermissionError('Test123'))):
             self.assertEqual(
                 '\n'.join(get_raw_view_lines_gen(self._ctx(__file__), 0)),
@@ -169,10 +170,78 @@ Address  00       01       02       03       04       05       06       07
 Address  00 01 02 03 04 05 06 07 08 09 0A 0B 0C 0D 0E 0F # Decoded Text                   
 00000000 33 34 35 36 37 38                               # 3 4 5 6 7 8
 The raw file content was truncated to slice(2, 8, None). The address information could be wrong."""
-        with patch('cat_win.src.service.helper.iohelper.IoHelper.read_file', lambda *_: b'1234567890'):
-            result = '\n'.join(get_raw_view_lines_gen(
-                self._ctx(test_file_path, truncate=[2, 8]),
-                0,
-                'X'
-            ))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src_file = os.path.join(tmp_dir, 'digits.bin')
+            with open(src_file, 'wb') as f:
+                f.write(b'1234567890')
+            with patch('cat_win.src.service.helper.iohelper.IoHelper.read_file_slice') as read_file_slice:
+                result = '\n'.join(get_raw_view_lines_gen(
+                    self._ctx(src_file, truncate=[2, 8]),
+                    0,
+                    'X'
+                ))
+            read_file_slice.assert_not_called()
             self.assertEqual(result, expected_result)
+
+    def test_get_raw_view_peek(self):
+        lines = list(get_raw_view_lines_gen(self._ctx(__file__), 0, 'x'))
+        head, excluded, tail = get_raw_view_peek(self._ctx(__file__), 0, 'x', 2)
+        self.assertEqual(head, lines[:3])
+        self.assertEqual(excluded, len(lines) - 5)
+        self.assertEqual(tail, lines[-2:])
+
+        head, excluded, tail = get_raw_view_peek(self._ctx(__file__), 0, 'b', len(lines))
+        self.assertEqual(head, list(get_raw_view_lines_gen(self._ctx(__file__), 0, 'b')))
+        self.assertEqual(excluded, 0)
+        self.assertEqual(tail, [])
+
+    def test_get_raw_view_peek_oserror(self):
+        self.assertEqual(
+            get_raw_view_peek(self._ctx('randomFileThatHopefullyDoesNotExist'), 0),
+            (['FileNotFoundError'], 0, []),
+        )
+
+    def test_get_display_table(self):
+        for encoding in ['utf-8', 'utf-16']:
+            get_display_char = get_display_char_gen(encoding)
+            translate_table, replacements = get_display_table(encoding)
+            decoded = bytes(range(256)).translate(translate_table).decode('latin-1')
+            for special_char, symbol in replacements:
+                decoded = decoded.replace(special_char, symbol)
+            self.assertEqual(decoded, ''.join(map(get_display_char, range(256))))
+
+    def test_get_raw_view_lines_gen_chunks(self):
+        for mode in ['x', 'X', 'b']:
+            lines = list(get_raw_view_lines_gen(self._ctx(__file__), 0, mode))
+            truncated_lines = list(get_raw_view_lines_gen(self._ctx(__file__, truncate=[5, None]), 0, mode))
+            stepped_lines = list(get_raw_view_lines_gen(self._ctx(__file__, truncate=[-5, 3, -3]), 0, mode))
+            for chunk_size in [16, 48]:
+                with patch('cat_win.src.service.rawviewer.RAW_VIEW_CHUNK_SIZE', chunk_size):
+                    self.assertEqual(list(get_raw_view_lines_gen(self._ctx(__file__), 0, mode)), lines)
+                    self.assertEqual(
+                        list(get_raw_view_lines_gen(self._ctx(__file__, truncate=[5, None]), 0, mode)),
+                        truncated_lines,
+                    )
+                    self.assertEqual(
+                        list(get_raw_view_lines_gen(self._ctx(__file__, truncate=[-5, 3, -3]), 0, mode)),
+                        stepped_lines,
+                    )
+
+    def test_get_raw_view_lines_gen_rows(self):
+        result = list(get_raw_view_lines_gen(self._ctx(__file__), 0, 'x'))
+        with open(__file__, 'rb') as f:
+            content = f.read()
+        self.assertEqual(len(result), 1 + -(-len(content) // 16))
+        self.assertEqual(result[2][:9], '00000010 ')
+        self.assertEqual(result[2][9:56], ' '.join(f"{b:02x}" for b in content[16:32]))
+        self.assertEqual(len(result[-1].split(' # ')[0]), len(result[1].split(' # ')[0]))
+
+    def test_get_raw_view_blocks_gen(self):
+        for mode in ['x', 'b']:
+            with patch('cat_win.src.service.rawviewer.RAW_VIEW_CHUNK_SIZE', 64):
+                blocks = list(get_raw_view_blocks_gen(self._ctx(__file__), 0, mode))
+                self.assertEqual(blocks[1].count('\n'), 3)
+                self.assertEqual(
+                    '\n'.join(blocks),
+                    '\n'.join(get_raw_view_lines_gen(self._ctx(__file__), 0, mode))
+                )
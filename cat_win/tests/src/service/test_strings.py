@@ -2,7 +2,7 @@ from unittest import TestCase
 import os
 
 from cat_win.src.domain.contentbuffer import ContentBuffer
-from cat_win.src.service.strings import get_strings
+from cat_win.src.service.strings import get_strings, strip_ansi_chunks, yield_strings
 # import sys
 # sys.path.append('../cat_win')
 
@@ -12,7 +12,12 @@ test_file_path = os.path.join(test_file_dir, 'test.bin')
 with open(test_file_path, 'r', encoding='utf-8', errors='replace') as raw_f:
     test_content = ContentBuffer.from_lines(raw_f.read().splitlines())
 with open(test_file_path, 'rb') as raw_f:
-    test_content_binary = ContentBuffer.from_lines(raw_f.read().splitlines())
+    test_bytes = raw_f.read()
+    test_content_binary = ContentBuffer.from_lines(test_bytes.splitlines())
+
+
+def _chunks(data: bytes, chunk_size: int) -> list:
+    return [data[i:i+chunk_size] for i in range(0, len(data), chunk_size)]
 
 class TestFile(TestCase):
     def test_get_strings_default(self):
@@ -195,3 +200,48 @@ _init
 
         output = get_strings(ContentBuffer.from_lines(['12345678']), 9, '\n')
         self.assertEqual('', '\n'.join(map(lambda x: x[0], output)))
+
+    def test_yield_strings_matches_get_strings(self):
+        for min_seq_len, delim in [(4, '\n'), (6, ' | '), (1, '')]:
+            expected = [line for line, _, _ in get_strings(test_content, min_seq_len, delim)]
+            for chunk_size in [1, 2, 3, 7, 64, len(test_bytes)]:
+                with self.subTest(min_seq_len=min_seq_len, delim=delim, chunk_size=chunk_size):
+                    output = yield_strings(_chunks(test_bytes, chunk_size), min_seq_len, delim)
+                    self.assertEqual(list(output), expected)
+
+    def test_yield_strings_across_chunks(self):
+        data = b'\x00abc' + b'd' * 10 + b'\x01ef\x02ghij\nklmn\xe2\x80\xa8opqr\x00stuv'
+        for chunk_size in range(1, len(data) + 1):
+            with self.subTest(chunk_size=chunk_size):
+                output = yield_strings(_chunks(data, chunk_size), 4, ',')
+                self.assertEqual(list(output), ['abcdddddddddd,ghij', 'klmn', 'opqr,stuv'])
+
+    def test_yield_strings_offsets(self):
+        data = b'\x00\x01hello\x00' + b'\xff' * 20 + b'world!\n'
+        self.assertEqual(list(yield_strings([data], 4, '\n', offsets='x')),
+                         ['      2 hello', '     1c world!'])
+        self.assertEqual(list(yield_strings([data], 4, '\n', offsets='d')),
+                         ['      2 hello', '     28 world!'])
+        self.assertEqual(list(yield_strings([data], 4, '\n', offsets='o')),
+                         ['      2 hello', '     34 world!'])
+
+    def test_yield_strings_utf_16(self):
+        data = b'\xff\xfe' + 'wide string\nab\x00'.encode('utf-16-le') + b'narrow\x00'
+        for chunk_size in [1, 2, 3, 5, len(data)]:
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(list(yield_strings(_chunks(data, chunk_size), 4, '\n', encoding='l')),
+                                 ['wide string'])
+                self.assertEqual(list(yield_strings(_chunks(data, chunk_size), 4, '\n', encoding='s')),
+                                 ['narrow'])
+        data = 'wide\u2028text'.encode('utf-16-be')
+        self.assertEqual(list(yield_strings(_chunks(data, 3), 2, '|', encoding='b', offsets='d')),
+                         ['      0 wide', '     10 text'])
+
+    def test_strip_ansi_chunks(self):
+        data = b'\x1b[31mred\x1b[0m ERROR\x1b[1;32m text\x1b\x00\x1b['
+        for chunk_size in range(1, len(data) + 1):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(b''.join(strip_ansi_chunks(_chunks(data, chunk_size))),
+                                 b'red ERROR text\x1b\x00\x1b[')
+                self.assertEqual(list(yield_strings(strip_ansi_chunks(_chunks(data, chunk_size)), 4, '\n')),
+                                 ['red ERROR text'])
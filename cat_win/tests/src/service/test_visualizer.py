@@ -1,10 +1,14 @@
 from unittest import TestCase
 from unittest.mock import patch
+import io
 import os
 
 from cat_win.src.const.colorconstants import CVis
 from cat_win.src.service.visualizer import Visualizer
-from cat_win.src.service.helper.vishelper import Entropy
+from cat_win.src.service.helper.iohelper import FileSlice
+from cat_win.src.service.helper.vishelper import Entropy, Overview, \
+    BYTE_CLASS_BYTES, BYTE_CLASS_TABLE
+from cat_win.tests.mocks.pbar import PBarMock
 from cat_win.tests.mocks.std import StdOutMock
 
 test_file_path = os.path.join(os.path.dirname(__file__), '..', '..', 'texts', 'test.txt')
@@ -57,6 +61,37 @@ class TestVisualizer(TestCase):
             Visualizer.display_data(dummy_gen(), Visualizer.get_color_byte_view)
             self.assertEqual(fake_out.getvalue(), expected_result)
 
+    def test_display_data_buffered_writes(self):
+        def dummy_gen():
+            for i in range(6):
+                yield range(i*10, (i+1)*10)
+        with patch('sys.stdout', new=StdOutMock()) as fake_out:
+            Visualizer.display_data(dummy_gen(), Visualizer.get_color_byte_view)
+            expected = fake_out.getvalue()
+        with patch('sys.stdout.write') as mock_write:
+            Visualizer.display_data(dummy_gen(), Visualizer.get_color_byte_view)
+            mock_write.assert_called_once_with(expected)
+        with patch('cat_win.src.service.visualizer.DISPLAY_BUFFER_ROWS', 4), \
+            patch('sys.stdout', new=StdOutMock()) as fake_out:
+            with patch.object(fake_out, 'write', wraps=fake_out.write) as mock_write:
+                Visualizer.display_data(dummy_gen(), Visualizer.get_color_byte_view)
+            self.assertEqual(mock_write.call_count, 2)
+            self.assertEqual(fake_out.getvalue(), expected)
+
+    def test_display_data_runs(self):
+        def dummy_gen():
+            yield [0, 0, 1, -1, -1, 1]
+            yield []
+            yield [1, 65, 65]
+        with patch('sys.stdout', new=StdOutMock()) as fake_out:
+            Visualizer.display_data(dummy_gen(), Visualizer.get_color_byte_view)
+            self.assertEqual(fake_out.getvalue(), (
+                f"{CVis.COLOR_RESET}{CVis.BYTE_VIEW_0}\u2588\u2588\u2588\u2588"
+                f"{CVis.COLOR_RESET}{CVis.BYTE_VIEW_CONTROL}\u2588\u2588    \u2588\u2588\n"
+                f"\u2588\u2588{CVis.COLOR_RESET}{CVis.BYTE_VIEW_PRINTABLE}\u2588\u2588\u2588\u2588\n"
+                f"{CVis.COLOR_RESET}\n"
+            ))
+
     def test_display_data_negative_byte_debug_mode(self):
         backup = Visualizer.debug_mode
         Visualizer.set_flags(True)
@@ -80,7 +115,17 @@ class TestVisualizer(TestCase):
             vis.visualize_byte_view(files[0])
             mock_display_data.assert_called_once_with('get_scan_curve', Visualizer.get_color_byte_view)
 
-    @patch('cat_win.src.service.helper.iohelper.IoHelper.read_file', lambda *_: b'1234')
+    def test_visualize_byte_view_truncated_reads_slice(self):
+        files = [test_file_path]
+        vis = Visualizer(files, truncate=[1, 3, None])
+
+        with patch('cat_win.src.service.helper.iohelper.IoHelper.read_file_slice', return_value=b'23') as read_slice:
+            with patch('cat_win.src.service.helper.vishelper.SpaceFilling.get_scan_curve', return_value='get_scan_curve') as scan:
+                with patch.object(Visualizer, "display_data"):
+                    vis.visualize_byte_view(files[0])
+        read_slice.assert_called_once_with(files[0], slice(1, 3, None))
+        self.assertEqual(scan.call_args[0][0], b'23')
+
     @patch('cat_win.src.service.helper.vishelper.SpaceFilling.get_zorder_curve', lambda *_: 'get_zorder_curve')
     def test_visualize_zorder_curve_view(self):
         files = [test_file_path]
@@ -90,7 +135,6 @@ class TestVisualizer(TestCase):
             vis.visualize_zorder_curve_view(files[0])
             mock_display_data.assert_called_once_with('get_zorder_curve', Visualizer.get_color_byte_view)
 
-    @patch('cat_win.src.service.helper.iohelper.IoHelper.read_file', lambda *_: b'1234')
     @patch('cat_win.src.service.helper.vishelper.SpaceFilling.get_hilbert_curve', lambda *_: 'get_hilbert_curve')
     def test_visualize_hilbert_curve_view(self):
         files = [test_file_path]
@@ -100,6 +144,18 @@ class TestVisualizer(TestCase):
             vis.visualize_hilbert_curve_view(files[0])
             mock_display_data.assert_called_once_with('get_hilbert_curve', Visualizer.get_color_byte_view)
 
+    def test_visualize_hilbert_curve_view_reads_lazily(self):
+        files = [test_file_path]
+        vis = Visualizer(files, truncate=[1, 3, None])
+
+        with patch('cat_win.src.service.helper.vishelper.SpaceFilling.get_hilbert_curve', return_value='get_hilbert_curve') as hilbert:
+            with patch.object(Visualizer, "display_data"):
+                vis.visualize_hilbert_curve_view(files[0])
+        bin_content = hilbert.call_args[0][0]
+        self.assertIsInstance(bin_content, FileSlice)
+        self.assertEqual(bin_content.positions, range(1, 3))
+        self.assertTrue(bin_content.raw_f.closed)
+
     @patch('cat_win.src.service.helper.iohelper.IoHelper.read_file', lambda *_: b'1234')
     @patch('cat_win.src.service.helper.vishelper.SpaceFilling.get_hilbert_curve', lambda *_: 'get_hilbert_curve')
     def test_visualize_shannon_entropy(self):
@@ -120,7 +176,7 @@ class TestVisualizer(TestCase):
             vis.visualize_digraph_dot_plot(files[0])
             self.assertIn('Min: 0, Avg: 0.003, Max: 7', fake_out.getvalue())
 
-    @patch('cat_win.src.service.helper.iohelper.IoHelper.read_file', lambda *_: b'')
+    @patch('builtins.open', lambda *_: io.BytesIO(b''))
     def test_visualize_digraph_dot_plot_empty_file(self):
         files = [test_file_path]
         vis = Visualizer(files)
@@ -129,7 +185,7 @@ class TestVisualizer(TestCase):
             vis.visualize_digraph_dot_plot(files[0])
             self.assertIn('Min: 0, Avg: 0.0, Max: 0', mock_print.call_args_list[-1][0][0])
 
-    @patch('cat_win.src.service.helper.iohelper.IoHelper.read_file', lambda *_: b'\x00\x01')
+    @patch('builtins.open', lambda *_: io.BytesIO(b'\x00\x01'))
     def test_visualize_digraph_dot_plot_without_zero_border(self):
         files = [test_file_path]
         vis = Visualizer(files)
@@ -174,9 +230,58 @@ class TestVisualizer(TestCase):
             self.assertIn('Visualizing ', fake_out.getvalue())
 
     def test_set_flags(self):
-        backup = Visualizer.debug_mode
+        backup = Visualizer.debug_mode, Visualizer.overview_mode
         Visualizer.set_flags(True)
         self.assertTrue(Visualizer.debug_mode)
-        Visualizer.set_flags(False)
+        self.assertFalse(Visualizer.overview_mode)
+        Visualizer.set_flags(False, True)
         self.assertFalse(Visualizer.debug_mode)
-        Visualizer.set_flags(backup)
+        self.assertTrue(Visualizer.overview_mode)
+        Visualizer.set_flags(*backup)
+
+    def test_byte_classes_match_byte_view_colors(self):
+        for byte in range(256):
+            self.assertEqual(
+                Visualizer.get_color_byte_view(BYTE_CLASS_BYTES[BYTE_CLASS_TABLE[byte]]),
+                Visualizer.get_color_byte_view(byte)
+            )
+
+    @patch('cat_win.src.service.helper.vishelper.PBar', PBarMock)
+    def test_visualize_overview(self):
+        files = [test_file_path]
+        vis = Visualizer(files)
+        data = b'\x00' * 512 + b'a' * 512
+
+        # the first half of the hilbert curve fills the left half of the square
+        for curve, color_changes in [('scan', 1), ('zorder', 1), ('hilbert', 16)]:
+            with patch('builtins.open', lambda *_: io.BytesIO(data)), \
+                patch('sys.stdout', new=StdOutMock()) as fake_out:
+                vis.visualize_overview(files[0], curve, Overview.get_block_classes,
+                                       Visualizer.get_color_byte_view)
+                # a terminal of 120x30 fits 16x16 cells (each of 4 bytes)
+                rows = fake_out.getvalue().splitlines()
+                self.assertEqual(len(rows), 17)
+                self.assertEqual(fake_out.getvalue().count(CVis.BYTE_VIEW_0), color_changes)
+                self.assertEqual(fake_out.getvalue().count(CVis.BYTE_VIEW_PRINTABLE), color_changes)
+        with patch('builtins.open', lambda *_: io.BytesIO(b'')), \
+            patch('sys.stdout', new=StdOutMock()) as fake_out:
+            vis.visualize_overview(files[0], 'hilbert', Overview.get_block_entropy,
+                                   Visualizer.get_color_entropy)
+            self.assertEqual(fake_out.getvalue(), f"{CVis.COLOR_RESET}\n")
+
+    def test_visualize_views_in_overview_mode(self):
+        files = [test_file_path]
+        vis = Visualizer(files)
+        backup = Visualizer.overview_mode
+        Visualizer.set_flags(Visualizer.debug_mode, True)
+        views = [
+            (vis.visualize_byte_view, 'scan', Overview.get_block_classes, Visualizer.get_color_byte_view),
+            (vis.visualize_zorder_curve_view, 'zorder', Overview.get_block_classes, Visualizer.get_color_byte_view),
+            (vis.visualize_hilbert_curve_view, 'hilbert', Overview.get_block_classes, Visualizer.get_color_byte_view),
+            (vis.visualize_shannon_entropy, 'hilbert', Overview.get_block_entropy, Visualizer.get_color_entropy),
+        ]
+        for view, curve, get_block_stats, color_def in views:
+            with patch.object(Visualizer, 'visualize_overview') as mock_overview:
+                view(files[0])
+                mock_overview.assert_called_once_with(files[0], curve, get_block_stats, color_def)
+        Visualizer.set_flags(Visualizer.debug_mode, backup)
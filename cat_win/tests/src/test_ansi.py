@@ -37,6 +37,8 @@ with open(ansi_neg_file_path, 'r', encoding='utf-8') as f:
 strip_color_dic_true = Config.default_dic.copy()
 strip_color_dic_false = Config.default_dic.copy()
 strip_color_dic_false[DKW.STRIP_COLOR_ON_PIPE] = False
+strip_color_dic_true[DKW.PERSISTENT_CACHE] = False
+strip_color_dic_false[DKW.PERSISTENT_CACHE] = False
 
 
 @patch('cat_win.src.domain.appcontext.CConfig.load_config', lambda self: CConfig.default_dic.copy())
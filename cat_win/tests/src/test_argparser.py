@@ -74,6 +74,16 @@ class TestArgParser(TestCase):
         arg_parser.get_arguments(['CAT', 'enc=utf-8'])
         self.assertEqual(arg_parser.file_encoding, 'utf-8')
 
+    def test_get_arguments_hash(self):
+        arg_parser = ArgParser(default_checksum_algorithms='md5')
+        self.assertEqual(arg_parser.checksum_algorithms, 'md5')
+        arg_parser.get_arguments(['CAT', 'hash=sha256,crc32'])
+        self.assertEqual(arg_parser.checksum_algorithms, 'sha256,crc32')
+        arg_parser.get_arguments(['CAT', 'HASH:sha1'])
+        self.assertEqual(arg_parser.checksum_algorithms, 'sha1')
+        arg_parser.reset_values()
+        self.assertEqual(arg_parser.checksum_algorithms, 'md5')
+
     def test_get_arguments_match(self):
         arg_parser = ArgParser()
         arg_parser.get_arguments(['CAT', 'match:\\Atest\\Z'])
@@ -12,6 +12,7 @@ from cat_win.src.const.argconstants import (
     ARGS_SSUM,
     ARGS_STDIN,
     ARGS_SUM,
+    ARGS_VISUALIZE_O,
     ARGS_WATCH,
 )
 from cat_win.src.const.colorconstants import CKW
@@ -75,6 +76,7 @@ class TestCat(TestCase):
                 DKW.MORE_STEP_LENGTH: 20,
                 DKW.SUMMARY_UNIQUE_ELEMENTS: False,
                 DKW.IGNORE_UNKNOWN_BYTES: False,
+                DKW.PERSISTENT_CACHE: False,
             },
             arg_parser=DummyArgParser(),
         )
@@ -200,7 +202,7 @@ class TestCat(TestCase):
         logger_m.set_colors.assert_called_once_with(ctx.default_color_dic)
 
     def test_init_calls_all_subsystem_setups(self):
-        args = DummyStartupArgs(overrides={ARGS_DEBUG: True, ARGS_DEBUG_LOG: True, ARGS_STDIN: False, ARGS_WATCH: False}, ordered_args=[(ARGS_DEBUG, '-d')])
+        args = DummyStartupArgs(overrides={ARGS_DEBUG: True, ARGS_DEBUG_LOG: True, ARGS_STDIN: False, ARGS_WATCH: False, ARGS_VISUALIZE_O: False}, ordered_args=[(ARGS_DEBUG, '-d')])
         ctx = self._mk_base_ctx(u_args=args)
         with patch.object(cat_module, '_ctx', ctx):
             with patch('cat_win.src.cat.preprocess_context') as pre:
@@ -272,7 +274,7 @@ class TestCat(TestCase):
         init_m.assert_called_once_with(repl=False)
         materialize.assert_called_once_with(ctx, tmp_helper)
         self.assertEqual(len(ctx.u_files.set_files_calls), 1)
-        self.assertEqual(ctx.u_files.generate_values_calls, [(True, True)])
+        self.assertEqual(ctx.u_files.generate_values_calls, [(True, True, False)])
         dec_b64.assert_called_once_with(ctx, tmp_helper)
         edit_files.assert_called_once_with(ctx)
         post.assert_called_once_with(ctx)
@@ -3,6 +3,7 @@ from unittest import TestCase
 import os
 
 from cat_win.src import cat
+from cat_win.src.const.defaultconstants import DKW
 from cat_win.src.domain.appcontext import AppContext
 from cat_win.tests.mocks.logger import LoggerStub
 from cat_win.tests.mocks.std import StdInMock, StdOutMock
@@ -23,6 +24,7 @@ test_binary = os.path.join(test_res_dir, 'test.bin')
 
 
 DEFAULT_CONST_DIC = Config.default_dic.copy()
+DEFAULT_CONST_DIC[DKW.PERSISTENT_CACHE] = False
 DEFAULT_COLORLESS_DIC = dict.fromkeys(CConfig.default_dic, '')
 logger = LoggerStub()
 